@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+#
+# Copyright (c) 2018 F5 Networks Inc.
+# GNU General Public License v3.0 (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Compares the regular and compact forms of a Parameters class
+
+A recorded resource is copied as many times as asked for, and read into
+instances of both forms. The time to build them, the time to read their
+returnables back, and the memory they hold are reported for each form.
+"""
+
+import argparse
+import copy
+import gc
+import json
+import os
+import sys
+import timeit
+import tracemalloc
+
+from os.path import dirname
+from tabulate import tabulate
+
+
+tld = dirname(dirname(dirname(os.path.realpath(__file__))))
+sys.path.insert(0, tld)
+
+from library.bigip_gtm_facts import PoolParameters
+from library.bigip_gtm_facts import WideIpParameters
+
+
+CLASSES = dict(
+    pool=(PoolParameters, 'load_gtm_pool_a_with_members_1.json'),
+    wide_ip=(WideIpParameters, 'load_gtm_wide_ip_with_pools.json'),
+)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '-c', '--count',
+        action='store',
+        type=int,
+        help='Number of resources to read.',
+        default=5000
+    )
+    parser.add_argument(
+        '-r', '--repeat',
+        action='store',
+        type=int,
+        help='Number of times to time each form. The fastest run is reported.',
+        default=5
+    )
+    result = parser.parse_args()
+    return result
+
+
+def load_fixture(name):
+    path = os.path.join(tld, 'test', 'unit', 'fixtures', name)
+    with open(path) as fh:
+        return json.load(fh)
+
+
+def regular(params_class, items):
+    return [params_class(params=x) for x in items]
+
+
+def compact(params_class, items):
+    return params_class.from_collection(items)
+
+
+def read(params_class, instances):
+    for instance in instances:
+        for returnable in params_class.returnables:
+            if returnable in ('members', 'pools'):
+                # These change the values they read, so they can only be
+                # read once.
+                continue
+            getattr(instance, returnable)
+
+
+def measure(build, params_class, items, repeat):
+    gc.collect()
+    tracemalloc.start()
+    instances = build(params_class, items)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    built = min(timeit.repeat(lambda: build(params_class, items), number=1, repeat=repeat))
+    read_time = min(timeit.repeat(lambda: read(params_class, instances), number=1, repeat=repeat))
+    return [built * 1000, read_time * 1000, memory / 1024.0]
+
+
+def main():
+    args = parse_args()
+
+    table = []
+    for name in sorted(CLASSES):
+        params_class, fixture = CLASSES[name]
+        data = load_fixture(fixture)
+        items = [copy.deepcopy(data) for x in range(args.count)]
+        for form, build in [('regular', regular), ('compact', compact)]:
+            row = [name, form]
+            row += measure(build, params_class, items, args.repeat)
+            table.append(row)
+
+    headers = ['Class', 'Form', 'Build (ms)', 'Read (ms)', 'Memory (KiB)']
+    print(tabulate(table, headers=headers, tablefmt='grid', floatfmt='.1f'))
+
+
+if __name__ == '__main__':
+    main()
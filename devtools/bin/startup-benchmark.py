@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+#
+# Copyright (c) 2018 F5 Networks Inc.
+# GNU General Public License v3.0 (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Measures how long each module takes to start
+
+Every module is started in a fresh interpreter, the way Ansible runs it on
+the controller, so that nothing is shared between the modules. The time to
+import the module, and the time to build and parse its argument spec, are
+reported separately.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from os.path import dirname
+from tabulate import tabulate
+
+
+tld = dirname(dirname(dirname(os.path.realpath(__file__))))
+
+# Run in the child interpreter. The required options are given a value of
+# the right type so that the spec can be parsed, and a module that still
+# fails its own checks (required_if and friends) is timed up to that point.
+PROBE = """
+import json
+import sys
+import time
+
+from ansible.module_utils import basic
+from ansible.module_utils._text import to_bytes
+
+started = time.time()
+module = __import__('library.%(module)s', fromlist=['ArgumentSpec'])
+imported = time.time()
+
+spec = module.ArgumentSpec()
+args = dict(
+    server='localhost', user='admin', password='secret', validate_certs='no'
+)
+for name, option in spec.argument_spec.items():
+    if not option.get('required'):
+        continue
+    if option.get('choices'):
+        args[name] = option['choices'][0]
+    elif option.get('type') == 'list':
+        args[name] = ['foo']
+    elif option.get('type') == 'int':
+        args[name] = 1
+    else:
+        args[name] = 'foo'
+basic._ANSIBLE_ARGS = to_bytes(json.dumps(dict(ANSIBLE_MODULE_ARGS=args)))
+
+try:
+    basic.AnsibleModule(
+        argument_spec=spec.argument_spec,
+        supports_check_mode=spec.supports_check_mode
+    )
+except SystemExit:
+    pass
+parsed = time.time()
+
+sys.__stdout__.write(json.dumps(dict(
+    imported=imported - started,
+    parsed=parsed - imported
+)))
+"""
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '-m', '--module',
+        action='append',
+        help='Measure only the specified module. May be given more than once.',
+        default=[]
+    )
+    parser.add_argument(
+        '-r', '--repeat',
+        action='store',
+        type=int,
+        help='Number of times to start each module. The fastest run is reported.',
+        default=5
+    )
+    result = parser.parse_args()
+    return result
+
+
+def list_modules():
+    result = []
+    for file in sorted(os.listdir(tld + '/library')):
+        if not file.endswith('.py') or file.startswith('_'):
+            continue
+        result.append(os.path.splitext(file)[0])
+    return result
+
+
+def measure(module):
+    # The probe writes its result last, so any output the module prints
+    # while it is imported is skipped over.
+    output = subprocess.check_output(
+        [sys.executable, '-c', PROBE % dict(module=module)],
+        cwd=tld,
+        stderr=subprocess.STDOUT
+    )
+    output = output.decode('utf-8')
+    return json.loads(output[output.rindex('{'):])
+
+
+def main():
+    args = parse_args()
+    modules = args.module or list_modules()
+
+    table = []
+    for module in modules:
+        try:
+            runs = [measure(module) for x in range(args.repeat)]
+        except (subprocess.CalledProcessError, ValueError):
+            table.append([module, 'error', 'error', 'error'])
+            continue
+        imported = min(x['imported'] for x in runs) * 1000
+        parsed = min(x['parsed'] for x in runs) * 1000
+        table.append([module, imported, parsed, imported + parsed])
+
+    headers = ['Module', 'Import (ms)', 'Parse (ms)', 'Total (ms)']
+    print(tabulate(table, headers=headers, tablefmt='grid', floatfmt='.1f'))
+
+
+if __name__ == '__main__':
+    main()
@@ -220,6 +220,7 @@ import time
 from distutils.version import LooseVersion
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.basic import env_fallback
+from ansible.module_utils.six.moves.urllib import parse
 
 HAS_DEVEL_IMPORTS = False
 
@@ -232,6 +233,7 @@ try:
     from library.module_utils.network.f5.common import cleanup_tokens
     from library.module_utils.network.f5.common import fqdn_name
     from library.module_utils.network.f5.common import f5_argument_spec
+    from library.module_utils.network.f5.common import Waiter
     try:
         from library.module_utils.network.f5.common import iControlUnexpectedHTTPError
     except ImportError:
@@ -246,12 +248,67 @@ except ImportError:
     from ansible.module_utils.network.f5.common import cleanup_tokens
     from ansible.module_utils.network.f5.common import fqdn_name
     from ansible.module_utils.network.f5.common import f5_argument_spec
+    from ansible.module_utils.network.f5.common import Waiter
     try:
         from ansible.module_utils.network.f5.common import iControlUnexpectedHTTPError
     except ImportError:
         HAS_F5SDK = False
 
 
+# The ASM policy templates, by their name in the module, with the names the
+# device knows them by. The ones marked v13 are only on BIG-IP 13.0.0 and later.
+TEMPLATES = {
+    'ActiveSync v1.0 v2.0 (http)': 'POLICY_TEMPLATE_ACTIVESYNC_V1_0_V2_0_HTTP',
+    'ActiveSync v1.0 v2.0 (https)': 'POLICY_TEMPLATE_ACTIVESYNC_V1_0_V2_0_HTTPS',
+    'Comprehensive': 'POLICY_TEMPLATE_COMPREHENSIVE',  # v13
+    'Drupal': 'POLICY_TEMPLATE_DRUPAL',  # v13
+    'Fundamental': 'POLICY_TEMPLATE_FUNDAMENTAL',  # v13
+    'Joomla': 'POLICY_TEMPLATE_JOOMLA',  # v13
+    'LotusDomino 6.5 (http)': 'POLICY_TEMPLATE_LOTUSDOMINO_6_5_HTTP',
+    'LotusDomino 6.5 (https)': 'POLICY_TEMPLATE_LOTUSDOMINO_6_5_HTTPS',
+    'OWA Exchange 2003 (http)': 'POLICY_TEMPLATE_OWA_EXCHANGE_2003_HTTP',
+    'OWA Exchange 2003 (https)': 'POLICY_TEMPLATE_OWA_EXCHANGE_2003_HTTPS',
+    'OWA Exchange 2003 with ActiveSync (http)': 'POLICY_TEMPLATE_OWA_EXCHANGE_2003_WITH_ACTIVESYNC_HTTP',
+    'OWA Exchange 2003 with ActiveSync (https)': 'POLICY_TEMPLATE_OWA_EXCHANGE_2003_WITH_ACTIVESYNC_HTTPS',
+    'OWA Exchange 2007 (http)': 'POLICY_TEMPLATE_OWA_EXCHANGE_2007_HTTP',
+    'OWA Exchange 2007 (https)': 'POLICY_TEMPLATE_OWA_EXCHANGE_2007_HTTPS',
+    'OWA Exchange 2007 with ActiveSync (http)': 'POLICY_TEMPLATE_OWA_EXCHANGE_2007_WITH_ACTIVESYNC_HTTP',
+    'OWA Exchange 2007 with ActiveSync (https)': 'POLICY_TEMPLATE_OWA_EXCHANGE_2007_WITH_ACTIVESYNC_HTTPS',
+    'OWA Exchange 2010 (http)': 'POLICY_TEMPLATE_OWA_EXCHANGE_2010_HTTP',
+    'OWA Exchange 2010 (https)': 'POLICY_TEMPLATE_OWA_EXCHANGE_2010_HTTPS',
+    'Oracle 10g Portal (http)': 'POLICY_TEMPLATE_ORACLE_10G_PORTAL_HTTP',
+    'Oracle 10g Portal (https)': 'POLICY_TEMPLATE_ORACLE_10G_PORTAL_HTTPS',
+    'Oracle Applications 11i (http)': 'POLICY_TEMPLATE_ORACLE_APPLICATIONS_11I_HTTP',
+    'Oracle Applications 11i (https)': 'POLICY_TEMPLATE_ORACLE_APPLICATIONS_11I_HTTPS',
+    'PeopleSoft Portal 9 (http)': 'POLICY_TEMPLATE_PEOPLESOFT_PORTAL_9_HTTP',
+    'PeopleSoft Portal 9 (https)': 'POLICY_TEMPLATE_PEOPLESOFT_PORTAL_9_HTTPS',
+    'Rapid Deployment Policy': 'POLICY_TEMPLATE_RAPID_DEPLOYMENT',
+    'SAP NetWeaver 7 (http)': 'POLICY_TEMPLATE_SAP_NETWEAVER_7_HTTP',
+    'SAP NetWeaver 7 (https)': 'POLICY_TEMPLATE_SAP_NETWEAVER_7_HTTPS',
+    'SharePoint 2003 (http)': 'POLICY_TEMPLATE_SHAREPOINT_2003_HTTP',
+    'SharePoint 2003 (https)': 'POLICY_TEMPLATE_SHAREPOINT_2003_HTTPS',
+    'SharePoint 2007 (http)': 'POLICY_TEMPLATE_SHAREPOINT_2007_HTTP',
+    'SharePoint 2007 (https)': 'POLICY_TEMPLATE_SHAREPOINT_2007_HTTPS',
+    'SharePoint 2010 (http)': 'POLICY_TEMPLATE_SHAREPOINT_2010_HTTP',
+    'SharePoint 2010 (https)': 'POLICY_TEMPLATE_SHAREPOINT_2010_HTTPS',
+    'Vulnerability Assessment Baseline': 'POLICY_TEMPLATE_VULNERABILITY_ASSESSMENT',  # v13
+    'Wordpress': 'POLICY_TEMPLATE_WORDPRESS'  # v13
+}
+V13_TEMPLATES = frozenset([
+    'Comprehensive', 'Drupal', 'Fundamental', 'Joomla',
+    'Vulnerability Assessment Baseline', 'Wordpress'
+])
+V1_TEMPLATES = dict((k, v) for k, v in TEMPLATES.items() if k not in V13_TEMPLATES)
+TEMPLATE_NAMES = dict((v, k) for k, v in TEMPLATES.items())
+
+
+# The fields of a policy that are read from the device. The ``kind`` and
+# ``selfLink`` are needed for the SDK to be able to change the policy later.
+POLICY_FIELDS = [
+    'kind', 'selfLink', 'name', 'partition', 'fullPath', 'active'
+]
+
+
 class Parameters(AnsibleF5Parameters):
     updatables = [
         'active'
@@ -299,39 +356,8 @@ class V1Parameters(Parameters):
     def template(self):
         if self._values['template'] is None:
             return None
-        template_map = {
-            'ActiveSync v1.0 v2.0 (http)': 'POLICY_TEMPLATE_ACTIVESYNC_V1_0_V2_0_HTTP',
-            'ActiveSync v1.0 v2.0 (https)': 'POLICY_TEMPLATE_ACTIVESYNC_V1_0_V2_0_HTTPS',
-            'LotusDomino 6.5 (http)': 'POLICY_TEMPLATE_LOTUSDOMINO_6_5_HTTP',
-            'LotusDomino 6.5 (https)': 'POLICY_TEMPLATE_LOTUSDOMINO_6_5_HTTPS',
-            'OWA Exchange 2003 (http)': 'POLICY_TEMPLATE_OWA_EXCHANGE_2003_HTTP',
-            'OWA Exchange 2003 (https)': 'POLICY_TEMPLATE_OWA_EXCHANGE_2003_HTTPS',
-            'OWA Exchange 2003 with ActiveSync (http)': 'POLICY_TEMPLATE_OWA_EXCHANGE_2003_WITH_ACTIVESYNC_HTTP',
-            'OWA Exchange 2003 with ActiveSync (https)': 'POLICY_TEMPLATE_OWA_EXCHANGE_2003_WITH_ACTIVESYNC_HTTPS',
-            'OWA Exchange 2007 (http)': 'POLICY_TEMPLATE_OWA_EXCHANGE_2007_HTTP',
-            'OWA Exchange 2007 (https)': 'POLICY_TEMPLATE_OWA_EXCHANGE_2007_HTTPS',
-            'OWA Exchange 2007 with ActiveSync (http)': 'POLICY_TEMPLATE_OWA_EXCHANGE_2007_WITH_ACTIVESYNC_HTTP',
-            'OWA Exchange 2007 with ActiveSync (https)': 'POLICY_TEMPLATE_OWA_EXCHANGE_2007_WITH_ACTIVESYNC_HTTPS',
-            'OWA Exchange 2010 (http)': 'POLICY_TEMPLATE_OWA_EXCHANGE_2010_HTTP',
-            'OWA Exchange 2010 (https)': 'POLICY_TEMPLATE_OWA_EXCHANGE_2010_HTTPS',
-            'Oracle 10g Portal (http)': 'POLICY_TEMPLATE_ORACLE_10G_PORTAL_HTTP',
-            'Oracle 10g Portal (https)': 'POLICY_TEMPLATE_ORACLE_10G_PORTAL_HTTPS',
-            'Oracle Applications 11i (http)': 'POLICY_TEMPLATE_ORACLE_APPLICATIONS_11I_HTTP',
-            'Oracle Applications 11i (https)': 'POLICY_TEMPLATE_ORACLE_APPLICATIONS_11I_HTTPS',
-            'PeopleSoft Portal 9 (http)': 'POLICY_TEMPLATE_PEOPLESOFT_PORTAL_9_HTTP',
-            'PeopleSoft Portal 9 (https)': 'POLICY_TEMPLATE_PEOPLESOFT_PORTAL_9_HTTPS',
-            'Rapid Deployment Policy': 'POLICY_TEMPLATE_RAPID_DEPLOYMENT',
-            'SAP NetWeaver 7 (http)': 'POLICY_TEMPLATE_SAP_NETWEAVER_7_HTTP',
-            'SAP NetWeaver 7 (https)': 'POLICY_TEMPLATE_SAP_NETWEAVER_7_HTTPS',
-            'SharePoint 2003 (http)': 'POLICY_TEMPLATE_SHAREPOINT_2003_HTTP',
-            'SharePoint 2003 (https)': 'POLICY_TEMPLATE_SHAREPOINT_2003_HTTPS',
-            'SharePoint 2007 (http)': 'POLICY_TEMPLATE_SHAREPOINT_2007_HTTP',
-            'SharePoint 2007 (https)': 'POLICY_TEMPLATE_SHAREPOINT_2007_HTTPS',
-            'SharePoint 2010 (http)': 'POLICY_TEMPLATE_SHAREPOINT_2010_HTTP',
-            'SharePoint 2010 (https)': 'POLICY_TEMPLATE_SHAREPOINT_2010_HTTPS'
-        }
-        if self._values['template'] in template_map:
-            return template_map[self._values['template']]
+        if self._values['template'] in V1_TEMPLATES:
+            return V1_TEMPLATES[self._values['template']]
         else:
             raise F5ModuleError(
                 "The specified template is not valid for this version of BIG-IP."
@@ -343,44 +369,7 @@ class V2Parameters(Parameters):
     def template(self):
         if self._values['template'] is None:
             return None
-        template_map = {
-            'ActiveSync v1.0 v2.0 (http)': 'POLICY_TEMPLATE_ACTIVESYNC_V1_0_V2_0_HTTP',
-            'ActiveSync v1.0 v2.0 (https)': 'POLICY_TEMPLATE_ACTIVESYNC_V1_0_V2_0_HTTPS',
-            'Comprehensive': 'POLICY_TEMPLATE_COMPREHENSIVE',  # v13
-            'Drupal': 'POLICY_TEMPLATE_DRUPAL',  # v13
-            'Fundamental': 'POLICY_TEMPLATE_FUNDAMENTAL',  # v13
-            'Joomla': 'POLICY_TEMPLATE_JOOMLA',  # v13
-            'LotusDomino 6.5 (http)': 'POLICY_TEMPLATE_LOTUSDOMINO_6_5_HTTP',
-            'LotusDomino 6.5 (https)': 'POLICY_TEMPLATE_LOTUSDOMINO_6_5_HTTPS',
-            'OWA Exchange 2003 (http)': 'POLICY_TEMPLATE_OWA_EXCHANGE_2003_HTTP',
-            'OWA Exchange 2003 (https)': 'POLICY_TEMPLATE_OWA_EXCHANGE_2003_HTTPS',
-            'OWA Exchange 2003 with ActiveSync (http)': 'POLICY_TEMPLATE_OWA_EXCHANGE_2003_WITH_ACTIVESYNC_HTTP',
-            'OWA Exchange 2003 with ActiveSync (https)': 'POLICY_TEMPLATE_OWA_EXCHANGE_2003_WITH_ACTIVESYNC_HTTPS',
-            'OWA Exchange 2007 (http)': 'POLICY_TEMPLATE_OWA_EXCHANGE_2007_HTTP',
-            'OWA Exchange 2007 (https)': 'POLICY_TEMPLATE_OWA_EXCHANGE_2007_HTTPS',
-            'OWA Exchange 2007 with ActiveSync (http)': 'POLICY_TEMPLATE_OWA_EXCHANGE_2007_WITH_ACTIVESYNC_HTTP',
-            'OWA Exchange 2007 with ActiveSync (https)': 'POLICY_TEMPLATE_OWA_EXCHANGE_2007_WITH_ACTIVESYNC_HTTPS',
-            'OWA Exchange 2010 (http)': 'POLICY_TEMPLATE_OWA_EXCHANGE_2010_HTTP',
-            'OWA Exchange 2010 (https)': 'POLICY_TEMPLATE_OWA_EXCHANGE_2010_HTTPS',
-            'Oracle 10g Portal (http)': 'POLICY_TEMPLATE_ORACLE_10G_PORTAL_HTTP',
-            'Oracle 10g Portal (https)': 'POLICY_TEMPLATE_ORACLE_10G_PORTAL_HTTPS',
-            'Oracle Applications 11i (http)': 'POLICY_TEMPLATE_ORACLE_APPLICATIONS_11I_HTTP',
-            'Oracle Applications 11i (https)': 'POLICY_TEMPLATE_ORACLE_APPLICATIONS_11I_HTTPS',
-            'PeopleSoft Portal 9 (http)': 'POLICY_TEMPLATE_PEOPLESOFT_PORTAL_9_HTTP',
-            'PeopleSoft Portal 9 (https)': 'POLICY_TEMPLATE_PEOPLESOFT_PORTAL_9_HTTPS',
-            'Rapid Deployment Policy': 'POLICY_TEMPLATE_RAPID_DEPLOYMENT',
-            'SAP NetWeaver 7 (http)': 'POLICY_TEMPLATE_SAP_NETWEAVER_7_HTTP',
-            'SAP NetWeaver 7 (https)': 'POLICY_TEMPLATE_SAP_NETWEAVER_7_HTTPS',
-            'SharePoint 2003 (http)': 'POLICY_TEMPLATE_SHAREPOINT_2003_HTTP',
-            'SharePoint 2003 (https)': 'POLICY_TEMPLATE_SHAREPOINT_2003_HTTPS',
-            'SharePoint 2007 (http)': 'POLICY_TEMPLATE_SHAREPOINT_2007_HTTP',
-            'SharePoint 2007 (https)': 'POLICY_TEMPLATE_SHAREPOINT_2007_HTTPS',
-            'SharePoint 2010 (http)': 'POLICY_TEMPLATE_SHAREPOINT_2010_HTTP',
-            'SharePoint 2010 (https)': 'POLICY_TEMPLATE_SHAREPOINT_2010_HTTPS',
-            'Vulnerability Assessment Baseline': 'POLICY_TEMPLATE_VULNERABILITY_ASSESSMENT',  # v13
-            'Wordpress': 'POLICY_TEMPLATE_WORDPRESS'  # v13
-        }
-        return template_map[self._values['template']]
+        return TEMPLATES[self._values['template']]
 
 
 class Changes(Parameters):
@@ -388,44 +377,7 @@ class Changes(Parameters):
     def template(self):
         if self._values['template'] is None:
             return None
-        template_map = {
-            'POLICY_TEMPLATE_ACTIVESYNC_V1_0_V2_0_HTTP': 'ActiveSync v1.0 v2.0 (http)',
-            'POLICY_TEMPLATE_ACTIVESYNC_V1_0_V2_0_HTTPS': 'ActiveSync v1.0 v2.0 (https)',
-            'POLICY_TEMPLATE_COMPREHENSIVE': 'Comprehensive',
-            'POLICY_TEMPLATE_DRUPAL': 'Drupal',
-            'POLICY_TEMPLATE_FUNDAMENTAL': 'Fundamental',
-            'POLICY_TEMPLATE_JOOMLA': 'Joomla',
-            'POLICY_TEMPLATE_LOTUSDOMINO_6_5_HTTP': 'LotusDomino 6.5 (http)',
-            'POLICY_TEMPLATE_LOTUSDOMINO_6_5_HTTPS': 'LotusDomino 6.5 (https)',
-            'POLICY_TEMPLATE_OWA_EXCHANGE_2003_HTTP': 'OWA Exchange 2003 (http)',
-            'POLICY_TEMPLATE_OWA_EXCHANGE_2003_HTTPS': 'OWA Exchange 2003 (https)',
-            'POLICY_TEMPLATE_OWA_EXCHANGE_2003_WITH_ACTIVESYNC_HTTP': 'OWA Exchange 2003 with ActiveSync (http)',
-            'POLICY_TEMPLATE_OWA_EXCHANGE_2003_WITH_ACTIVESYNC_HTTPS': 'OWA Exchange 2003 with ActiveSync (https)',
-            'POLICY_TEMPLATE_OWA_EXCHANGE_2007_HTTP': 'OWA Exchange 2007 (http)',
-            'POLICY_TEMPLATE_OWA_EXCHANGE_2007_HTTPS': 'OWA Exchange 2007 (https)',
-            'POLICY_TEMPLATE_OWA_EXCHANGE_2007_WITH_ACTIVESYNC_HTTP': 'OWA Exchange 2007 with ActiveSync (http)',
-            'POLICY_TEMPLATE_OWA_EXCHANGE_2007_WITH_ACTIVESYNC_HTTPS': 'OWA Exchange 2007 with ActiveSync (https)',
-            'POLICY_TEMPLATE_OWA_EXCHANGE_2010_HTTP': 'OWA Exchange 2010 (http)',
-            'POLICY_TEMPLATE_OWA_EXCHANGE_2010_HTTPS': 'OWA Exchange 2010 (https)',
-            'POLICY_TEMPLATE_ORACLE_10G_PORTAL_HTTP': 'Oracle 10g Portal (http)',
-            'POLICY_TEMPLATE_ORACLE_10G_PORTAL_HTTPS': 'Oracle 10g Portal (https)',
-            'POLICY_TEMPLATE_ORACLE_APPLICATIONS_11I_HTTP': 'Oracle Applications 11i (http)',
-            'POLICY_TEMPLATE_ORACLE_APPLICATIONS_11I_HTTPS': 'Oracle Applications 11i (https)',
-            'POLICY_TEMPLATE_PEOPLESOFT_PORTAL_9_HTTP': 'PeopleSoft Portal 9 (http)',
-            'POLICY_TEMPLATE_PEOPLESOFT_PORTAL_9_HTTPS': 'PeopleSoft Portal 9 (https)',
-            'POLICY_TEMPLATE_RAPID_DEPLOYMENT': 'Rapid Deployment Policy',
-            'POLICY_TEMPLATE_SAP_NETWEAVER_7_HTTP': 'SAP NetWeaver 7 (http)',
-            'POLICY_TEMPLATE_SAP_NETWEAVER_7_HTTPS': 'SAP NetWeaver 7 (https)',
-            'POLICY_TEMPLATE_SHAREPOINT_2003_HTTP': 'SharePoint 2003 (http)',
-            'POLICY_TEMPLATE_SHAREPOINT_2003_HTTPS': 'SharePoint 2003 (https)',
-            'POLICY_TEMPLATE_SHAREPOINT_2007_HTTP': 'SharePoint 2007 (http)',
-            'POLICY_TEMPLATE_SHAREPOINT_2007_HTTPS': 'SharePoint 2007 (https)',
-            'POLICY_TEMPLATE_SHAREPOINT_2010_HTTP': 'SharePoint 2010 (http)',
-            'POLICY_TEMPLATE_SHAREPOINT_2010_HTTPS': 'SharePoint 2010 (https)',
-            'POLICY_TEMPLATE_VULNERABILITY_ASSESSMENT': 'Vulnerability Assessment Baseline',
-            'POLICY_TEMPLATE_WORDPRESS': 'Wordpress',
-        }
-        return template_map[self._values['template']]
+        return TEMPLATE_NAMES[self._values['template']]
 
 
 class Difference(object):
@@ -463,6 +415,8 @@ class BaseManager(object):
         self.module = kwargs.get('module', None)
         self.have = None
         self.changes = Changes()
+        self.policy = None
+        self.policy_is_stale = True
 
     def exec_module(self):
         changed = False
@@ -527,11 +481,32 @@ class BaseManager(object):
             return self.remove()
 
     def exists(self):
-        policies = self.client.api.tm.asm.policies_s.get_collection()
-        if any(p.name == self.want.name and p.partition == self.want.partition for p in policies):
+        if self.read_policy_from_device():
             return True
         return False
 
+    def read_policy_from_device(self):
+        """Finds the policy on the device by its name
+
+        ASM policies are addressed by an ID instead of by their name, so the
+        device is asked for only the policies with that name, and only for the
+        fields this module uses. The result is kept until the policy changes.
+        """
+        if not self.policy_is_stale:
+            return self.policy
+        policies = self.client.api.tm.asm.policies_s.get_collection(
+            requests_params=dict(
+                params="$filter=name+eq+'{0}'&$select={1}".format(
+                    parse.quote(self.want.name), ','.join(POLICY_FIELDS)
+                )
+            )
+        )
+        name = self.want.name
+        partition = self.want.partition
+        self.policy = next((p for p in policies if p.name == name and p.partition == partition), None)
+        self.policy_is_stale = False
+        return self.policy
+
     def _file_is_missing(self):
         if self.want.template and self.want.file is None:
             return False
@@ -557,6 +532,7 @@ class BaseManager(object):
                 self.create_from_template()
             elif self.want.file is not None:
                 self.create_from_file()
+        self.policy_is_stale = True
 
         if self.want.active:
             self.activate()
@@ -584,25 +560,28 @@ class BaseManager(object):
             raise F5ModuleError('Apply policy task failed.')
 
     def wait_for_task(self, task):
-        while True:
-            task.refresh()
-            if task.status in ['COMPLETED', 'FAILURE']:
-                break
-            time.sleep(1)
+        waiter = Waiter(interval=1, max_interval=10)
+        waiter.wait(
+            lambda: self._read_task_from_device(task),
+            done=lambda x: x[0] in ['COMPLETED', 'FAILURE']
+        )
         if task.status == 'FAILURE':
             return False
         if task.status == 'COMPLETED':
             return True
 
+    def _read_task_from_device(self, task):
+        # The device changes the task's lastUpdateMicros as it progresses
+        task.refresh()
+        return task.status, getattr(task, 'lastUpdateMicros', None)
+
     def update_on_device(self):
         params = self.changes.api_params()
-        policies = self.client.api.tm.asm.policies_s.get_collection()
-        name = self.want.name
-        partition = self.want.partition
-        resource = next((p for p in policies if p.name == name and p.partition == partition), None)
+        resource = self.read_policy_from_device()
         if resource:
             if not params['active']:
                 resource.modify(**params)
+                self.policy_is_stale = True
 
     def create_blank(self):
         self.create_on_device()
@@ -630,12 +609,11 @@ class BaseManager(object):
             return False
 
     def read_current_from_device(self):
-        policies = self.client.api.tm.asm.policies_s.get_collection()
-        for policy in policies:
-            if policy.name == self.want.name and policy.partition == self.want.partition:
-                params = policy.attrs
-                params.update(dict(self_link=policy.selfLink))
-                return Parameters(params=params)
+        policy = self.read_policy_from_device()
+        if policy:
+            params = policy.attrs
+            params.update(dict(self_link=policy.selfLink))
+            return Parameters(params=params)
         raise F5ModuleError("The policy was not found")
 
     def import_to_device(self):
@@ -672,15 +650,14 @@ class BaseManager(object):
             name=self.want.name,
             partition=self.want.partition
         )
+        self.policy_is_stale = True
         return result
 
     def remove_from_device(self):
-        policies = self.client.api.tm.asm.policies_s.get_collection()
-        name = self.want.name
-        partition = self.want.partition
-        resource = next((p for p in policies if p.name == name and p.partition == partition), None)
+        resource = self.read_policy_from_device()
         if resource:
             resource.delete()
+            self.policy_is_stale = True
 
 
 class ModuleManager(object):
@@ -773,43 +750,6 @@ class V2Manager(BaseManager):
 
 class ArgumentSpec(object):
     def __init__(self):
-        self.template_map = [
-            'ActiveSync v1.0 v2.0 (http)',
-            'ActiveSync v1.0 v2.0 (https)',
-            'Comprehensive',
-            'Drupal',
-            'Fundamental',
-            'Joomla',
-            'LotusDomino 6.5 (http)',
-            'LotusDomino 6.5 (https)',
-            'OWA Exchange 2003 (http)',
-            'OWA Exchange 2003 (https)',
-            'OWA Exchange 2003 with ActiveSync (http)',
-            'OWA Exchange 2003 with ActiveSync (https)',
-            'OWA Exchange 2007 (http)',
-            'OWA Exchange 2007 (https)',
-            'OWA Exchange 2007 with ActiveSync (http)',
-            'OWA Exchange 2007 with ActiveSync (https)',
-            'OWA Exchange 2010 (http)',
-            'OWA Exchange 2010 (https)',
-            'Oracle 10g Portal (http)',
-            'Oracle 10g Portal (https)',
-            'Oracle Applications 11i (http)',
-            'Oracle Applications 11i (https)',
-            'PeopleSoft Portal 9 (http)',
-            'PeopleSoft Portal 9 (https)',
-            'Rapid Deployment Policy',
-            'SAP NetWeaver 7 (http)',
-            'SAP NetWeaver 7 (https)',
-            'SharePoint 2003 (http)',
-            'SharePoint 2003 (https)',
-            'SharePoint 2007 (http)',
-            'SharePoint 2007 (https)',
-            'SharePoint 2010 (http)',
-            'SharePoint 2010 (https)',
-            'Vulnerability Assessment Baseline',
-            'Wordpress',
-        ]
         self.supports_check_mode = True
         argument_spec = dict(
             name=dict(
@@ -817,7 +757,7 @@ class ArgumentSpec(object):
             ),
             file=dict(),
             template=dict(
-                choices=self.template_map
+                choices=sorted(TEMPLATES)
             ),
             active=dict(
                 type='bool'
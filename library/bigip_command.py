@@ -60,6 +60,8 @@ options:
         before it is considered failed. The command is run on the
         target device every retry and evaluated against the I(wait_for)
         conditionals.
+      - Only the commands whose output the unsatisfied I(wait_for)
+        conditionals refer to, as C(result[N]), are run again.
     default: 10
   interval:
     description:
@@ -67,6 +69,8 @@ options:
         of the command. If the command does not pass the specified
         conditional, the interval indicates how to long to wait before
         trying the command again.
+      - The interval doubles after each retry, up to 30 seconds or
+        I(interval), whichever is longer.
     default: 1
   transport:
     description:
@@ -92,6 +96,23 @@ options:
     description:
       - Change into this directory before running the command.
     default: /Common
+  hosts:
+    description:
+      - List of BIG-IP hosts to run the I(commands) against, instead of only
+        the C(server).
+      - The hosts are connected to from the controller, several at a time,
+        with the credentials and port of the C(server). The output of each
+        host is returned in the C(hosts) return value.
+      - Each host is retried on its own. When a host's output does not yet
+        satisfy the I(wait_for) conditionals, only the commands that the
+        unsatisfied conditionals refer to are run again on it.
+      - Only supported with the C(rest) transport.
+    version_added: 2.7
+  concurrency:
+    description:
+      - The most I(hosts) that the commands are run against at the same time.
+    default: 10
+    version_added: 2.7
 extends_documentation_fragment: f5
 author:
   - Tim Rupp (@caphrim007)
@@ -155,6 +176,24 @@ EXAMPLES = r'''
     validate_certs: no
   delegate_to: localhost
 
+- name: Check that every device in the fleet is active
+  bigip_command:
+    commands:
+      - show sys failover
+      - show sys version
+    wait_for:
+      - result[0] contains active
+    hosts:
+      - lb1.mydomain.com
+      - lb2.mydomain.com
+      - lb3.mydomain.com
+    concurrency: 20
+    password: secret
+    user: admin
+    validate_certs: no
+  register: result
+  delegate_to: localhost
+
 - name: Delete all LTM nodes in Partition1, assuming no dependencies exist
   bigip_command:
     commands:
@@ -188,10 +227,17 @@ warn:
   returned: changed
   type: bool
   sample: True
+hosts:
+  description:
+    - The results of the commands on each of the I(hosts), by host.
+    - Hosts that failed have a C(msg), and C(failed_conditions) when their
+      output did not satisfy the I(wait_for) conditionals.
+  returned: when I(hosts) is specified
+  type: complex
+  sample: {"lb1.mydomain.com": {"stdout": ["..."], "stdout_lines": [["..."]]}}
 '''
 
 import re
-import time
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.six import string_types
@@ -199,6 +245,7 @@ from ansible.module_utils.network.common.parsing import FailedConditionsError
 from ansible.module_utils.network.common.parsing import Conditional
 from ansible.module_utils.network.common.utils import ComplexList
 from ansible.module_utils.network.common.utils import to_list
+from collections import OrderedDict
 from collections import deque
 
 HAS_DEVEL_IMPORTS = False
@@ -209,9 +256,11 @@ try:
     from library.module_utils.network.f5.bigip import F5Client
     from library.module_utils.network.f5.common import F5ModuleError
     from library.module_utils.network.f5.common import AnsibleF5Parameters
+    from library.module_utils.network.f5.common import CommandRunner
     from library.module_utils.network.f5.common import cleanup_tokens
     from library.module_utils.network.f5.common import fqdn_name
     from library.module_utils.network.f5.common import is_cli
+    from library.module_utils.network.f5.common import map_concurrently
     from library.module_utils.network.f5.common import f5_argument_spec
     try:
         from library.module_utils.network.f5.common import iControlUnexpectedHTTPError
@@ -229,9 +278,11 @@ except ImportError:
     from ansible.module_utils.network.f5.bigip import F5Client
     from ansible.module_utils.network.f5.common import F5ModuleError
     from ansible.module_utils.network.f5.common import AnsibleF5Parameters
+    from ansible.module_utils.network.f5.common import CommandRunner
     from ansible.module_utils.network.f5.common import cleanup_tokens
     from ansible.module_utils.network.f5.common import fqdn_name
     from ansible.module_utils.network.f5.common import is_cli
+    from ansible.module_utils.network.f5.common import map_concurrently
     from ansible.module_utils.network.f5.common import f5_argument_spec
     try:
         from ansible.module_utils.network.f5.common import iControlUnexpectedHTTPError
@@ -278,6 +329,16 @@ class Parameters(AnsibleF5Parameters):
             return self._values['chdir']
         return '/{0}'.format(self._values['chdir'])
 
+    @property
+    def concurrency(self):
+        if self._values['concurrency'] is None:
+            return None
+        if self._values['concurrency'] < 1:
+            raise F5ModuleError(
+                "The 'concurrency' parameter must be 1 or more."
+            )
+        return self._values['concurrency']
+
     @property
     def user_commands(self):
         commands = self._listify(self._values['commands'])
@@ -358,37 +419,19 @@ class ModuleManager(object):
         changed = ('tmsh modify', 'tmsh create', 'tmsh delete')
         commands = self.parse_commands(warnings)
         wait_for = self.want.wait_for or list()
-        retries = self.want.retries
         conditionals = [Conditional(c) for c in wait_for]
 
         if self.module.check_mode:
             return
 
-        while retries > 0:
-            if is_cli(self.module) and HAS_CLI_TRANSPORT:
-                if self.is_tmsh():
-                    for command in commands:
-                        command['command'] = command['command'][4:].strip()
-                responses = self._run_commands(self.module, commands)
-            else:
-                responses = self.execute_on_device(commands)
-
-            for item in list(conditionals):
-                if item(responses):
-                    if self.want.match == 'any':
-                        conditionals = list()
-                        break
-                    conditionals.remove(item)
-
-            if not conditionals:
-                break
-
-            time.sleep(self.want.interval)
-            retries -= 1
+        if is_cli(self.module) and HAS_CLI_TRANSPORT:
+            if self.is_tmsh():
+                for command in commands:
+                    command['command'] = command['command'][4:].strip()
+            runner = self.get_runner(lambda x: self._run_commands(self.module, x))
         else:
-            failed_conditions = [item.raw for item in conditionals]
-            errmsg = 'One or more conditional statements have not been satisfied'
-            raise FailedConditionsError(errmsg, failed_conditions)
+            runner = self.get_runner(self.execute_on_device)
+        responses = runner.wait(commands, conditionals)
 
         changes = {
             'stdout': responses,
@@ -403,7 +446,7 @@ class ModuleManager(object):
 
     def parse_commands(self, warnings):
         results = []
-        commands = list(deque(set(self.want.commands)))
+        commands = list(OrderedDict.fromkeys(self.want.commands))
         spec = dict(
             command=dict(key=True),
             output=dict(
@@ -445,10 +488,90 @@ class ModuleManager(object):
             try:
                 if hasattr(output, 'commandResult'):
                     responses.append(str(output.commandResult))
+                    continue
             except Exception:
                 pass
+            responses.append(None)
         return responses
 
+    def get_runner(self, run):
+        return CommandRunner(
+            run,
+            retries=self.want.retries,
+            interval=self.want.interval,
+            match=self.want.match
+        )
+
+
+class FanoutManager(ModuleManager):
+    """Runs the commands against many hosts from the controller
+
+    Every host gets its own client, and the hosts are worked through by a
+    pool of at most C(concurrency) threads. Failures on one host, including
+    failing to connect to it, are returned with that host's results and do
+    not stop the others.
+    """
+    def exec_module(self):
+        if is_cli(self.module):
+            raise F5ModuleError(
+                "The 'hosts' parameter is only supported with the 'rest' transport."
+            )
+        warnings = list()
+        changed = ('tmsh modify', 'tmsh create', 'tmsh delete')
+        commands = self.parse_commands(warnings)
+        result = dict()
+
+        if self.module.check_mode:
+            result.update(dict(changed=False))
+            return result
+
+        hosts = list(OrderedDict.fromkeys(self.want.hosts))
+        outcomes = map_concurrently(
+            lambda host: self.execute_on_host(host, commands), hosts, self.want.concurrency
+        )
+
+        result['hosts'] = dict(zip(hosts, outcomes))
+        failed = [host for host, outcome in zip(hosts, outcomes) if 'msg' in outcome]
+        if failed:
+            result['failed'] = True
+            result['msg'] = 'The commands failed on {0} of {1} hosts: {2}'.format(
+                len(failed), len(hosts), ', '.join(failed)
+            )
+        if self.want.warn:
+            result['warnings'] = warnings
+        result['changed'] = any(x for x in self.want.user_commands if x.startswith(changed))
+        return result
+
+    def execute_on_host(self, host, commands):
+        wait_for = self.want.wait_for or list()
+        conditionals = [Conditional(c) for c in wait_for]
+        client = self.get_client(host)
+        try:
+            manager = ModuleManager(module=self.module, client=client)
+            runner = self.get_runner(manager.execute_on_device)
+            responses = runner.wait(commands, conditionals)
+            result = dict(
+                stdout=responses,
+                stdout_lines=self._to_lines(responses)
+            )
+        except FailedConditionsError as ex:
+            result = dict(
+                msg=str(ex),
+                failed_conditions=ex.failed_conditions
+            )
+        except Exception as ex:
+            result = dict(msg=str(ex))
+        finally:
+            cleanup_tokens(client)
+        return result
+
+    def get_client(self, host):
+        params = dict(self.module.params)
+        params['server'] = host
+        if params.get('provider'):
+            params['provider'] = dict(params['provider'], server=host)
+        return F5Client(**params)
+
 
 class ArgumentSpec(object):
     def __init__(self):
@@ -485,6 +608,13 @@ class ArgumentSpec(object):
             ),
             chdir=dict(
                 default='/Common'
+            ),
+            hosts=dict(
+                type='list'
+            ),
+            concurrency=dict(
+                default=10,
+                type='int'
             )
         )
         self.argument_spec = {}
@@ -502,14 +632,22 @@ def main():
     if is_cli(module) and not HAS_F5SDK:
         module.fail_json(msg="The python f5-sdk module is required to use the rest api")
 
+    client = None
     try:
-        client = F5Client(**module.params)
-        mm = ModuleManager(module=module, client=client)
+        if module.params['hosts']:
+            mm = FanoutManager(module=module)
+        else:
+            client = F5Client(**module.params)
+            mm = ModuleManager(module=module, client=client)
         results = mm.exec_module()
-        cleanup_tokens(client)
+        if client:
+            cleanup_tokens(client)
+        if results.pop('failed', False):
+            module.fail_json(**results)
         module.exit_json(**results)
     except F5ModuleError as e:
-        cleanup_tokens(client)
+        if client:
+            cleanup_tokens(client)
         module.fail_json(msg=str(e))
 
 
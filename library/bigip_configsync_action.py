@@ -97,7 +97,6 @@ RETURN = r'''
 '''
 
 import re
-import time
 
 try:
     from objectpath import Tree
@@ -119,6 +118,7 @@ try:
     from library.module_utils.network.f5.common import cleanup_tokens
     from library.module_utils.network.f5.common import fqdn_name
     from library.module_utils.network.f5.common import f5_argument_spec
+    from library.module_utils.network.f5.common import Waiter
     try:
         from library.module_utils.network.f5.common import iControlUnexpectedHTTPError
     except ImportError:
@@ -133,6 +133,7 @@ except ImportError:
     from ansible.module_utils.network.f5.common import cleanup_tokens
     from ansible.module_utils.network.f5.common import fqdn_name
     from ansible.module_utils.network.f5.common import f5_argument_spec
+    from ansible.module_utils.network.f5.common import Waiter
     try:
         from ansible.module_utils.network.f5.common import iControlUnexpectedHTTPError
     except ImportError:
@@ -274,32 +275,37 @@ class ModuleManager(object):
     def _wait_for_sync(self):
         # Wait no more than half an hour
         resource = self.read_current_from_device()
-        for x in range(1, 180):
-            time.sleep(3)
-            status = self._get_status_from_resource(resource)
-
-            # Changes Pending:
-            #     The existing device has changes made to it that
-            #     need to be sync'd to the group.
-            #
-            # Awaiting Initial Sync:
-            #     This is a new device group and has not had any sync
-            #     done yet. You _must_ `sync_device_to_group` in this
-            #     case.
-            #
-            # Not All Devices Synced:
-            #     A device group will go into this state immediately
-            #     after starting the sync and stay until all devices finish.
-            #
-            if status in ['Changes Pending']:
-                details = self._get_details_from_resource(resource)
-                self._validate_pending_status(details)
-            elif status in ['Awaiting Initial Sync', 'Not All Devices Synced']:
-                pass
-            elif status == 'In Sync':
-                return
-            else:
-                raise F5ModuleError(status)
+        waiter = Waiter(interval=3, max_interval=15, delay=3, deadline=1800)
+        waiter.wait(
+            lambda: self._get_status_from_resource(resource),
+            done=lambda x: self._sync_is_complete(resource, x),
+            message="Timed out waiting for the device group to sync"
+        )
+
+    def _sync_is_complete(self, resource, status):
+        # Changes Pending:
+        #     The existing device has changes made to it that
+        #     need to be sync'd to the group.
+        #
+        # Awaiting Initial Sync:
+        #     This is a new device group and has not had any sync
+        #     done yet. You _must_ `sync_device_to_group` in this
+        #     case.
+        #
+        # Not All Devices Synced:
+        #     A device group will go into this state immediately
+        #     after starting the sync and stay until all devices finish.
+        #
+        if status in ['Changes Pending']:
+            details = self._get_details_from_resource(resource)
+            self._validate_pending_status(details)
+        elif status in ['Awaiting Initial Sync', 'Not All Devices Synced']:
+            pass
+        elif status == 'In Sync':
+            return True
+        else:
+            raise F5ModuleError(status)
+        return False
 
     def read_current_from_device(self):
         result = self.client.api.tm.cm.sync_status.load()
@@ -73,6 +73,11 @@ options:
         RAM.
       - When C(internal) is C(no), at least one record must be specified in either C(records)
         or C(records_content).
+      - When an existing internal data group is updated, only the records that were
+        added, removed or changed are sent. Removed, changed and added records are sent
+        in separate requests, and large changes are split over more of them. These
+        requests are not applied as a single transaction, so if one of them fails, the
+        records sent by the earlier ones stay changed on the device.
     suboptions:
       key:
         description:
@@ -241,28 +246,43 @@ EXAMPLES = r'''
 '''
 
 RETURN = r'''
-# only common fields returned
+records_added:
+  description: The number of records added to an internal data group.
+  returned: changed
+  type: int
+  sample: 10
+records_removed:
+  description: The number of records removed from an internal data group.
+  returned: changed
+  type: int
+  sample: 2
+records_modified:
+  description: The number of records in an internal data group whose value was changed.
+  returned: changed
+  type: int
+  sample: 1
 '''
 
 import hashlib
 import os
 import re
+import tempfile
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.basic import env_fallback
+from ansible.module_utils._text import to_bytes
 from ansible.module_utils._text import to_text
-from io import StringIO
 
 HAS_DEVEL_IMPORTS = False
 
 try:
     from library.module_utils.network.f5.bigip import HAS_F5SDK
     from library.module_utils.network.f5.bigip import F5Client
+    from library.module_utils.network.f5.bigip import upload_fileobj
     from library.module_utils.network.f5.common import F5ModuleError
     from library.module_utils.network.f5.common import AnsibleF5Parameters
     from library.module_utils.network.f5.common import cleanup_tokens
     from library.module_utils.network.f5.common import dict2tuple
-    from library.module_utils.network.f5.common import compare_dictionary
     from library.module_utils.network.f5.common import fq_name
     from library.module_utils.network.f5.common import f5_argument_spec
     from library.module_utils.network.f5.common import iControlUnexpectedHTTPError
@@ -271,11 +291,11 @@ except ImportError:
     # Upstream Ansible
     from ansible.module_utils.network.f5.bigip import HAS_F5SDK
     from ansible.module_utils.network.f5.bigip import F5Client
+    from ansible.module_utils.network.f5.bigip import upload_fileobj
     from ansible.module_utils.network.f5.common import F5ModuleError
     from ansible.module_utils.network.f5.common import AnsibleF5Parameters
     from ansible.module_utils.network.f5.common import cleanup_tokens
     from ansible.module_utils.network.f5.common import dict2tuple
-    from ansible.module_utils.network.f5.common import compare_dictionary
     from ansible.module_utils.network.f5.common import fq_name
     from ansible.module_utils.network.f5.common import f5_argument_spec
     from ansible.module_utils.network.f5.common import iControlUnexpectedHTTPError
@@ -290,6 +310,14 @@ except ImportError:
 LINE_LIMIT = 65000
 SIZE_LIMIT_BYTES = 4000000
 
+# Changes to more than this share of the records of an internal data group are
+# sent as the whole list of records, instead of as the records that changed.
+DELTA_LIMIT_RATIO = 0.5
+
+# The longest tmsh options that are sent in the URL of a single request. They
+# are URL encoded, which can more than double their length.
+OPTIONS_LIMIT_BYTES = 2048
+
 
 def zero_length(content):
     content.seek(0, os.SEEK_END)
@@ -319,6 +347,63 @@ def lines_exceeded(content):
     return result
 
 
+def records_delta(want, have):
+    """Compares two lists of records by their names
+
+    Returns:
+        dict: The records to ``add``, ``remove`` and ``modify`` to turn
+        ``have`` into ``want``.
+    """
+    have = dict((x['name'], x.get('data', '')) for x in have or [])
+    names = set()
+    result = dict(add=[], remove=[], modify=[])
+    for record in want:
+        name = record['name']
+        data = record.get('data', '')
+        names.add(name)
+        if name not in have:
+            result['add'].append(dict(name=name, data=data))
+        elif have[name] != data:
+            result['modify'].append(dict(name=name, data=data))
+    result['remove'] = [dict(name=x) for x in have if x not in names]
+    return result
+
+
+def records_options(action, records):
+    """Builds tmsh options that apply records to an internal data group
+
+    The options are split into as many chunks as are needed to keep each
+    one below ``OPTIONS_LIMIT_BYTES``.
+
+    Args:
+        action (string): One of ``add``, ``modify`` or ``delete``.
+        records (list): Records, with their ``name`` and ``data``.
+
+    Returns:
+        list: Options, such as ``records add { "foo" { data "bar" } }``.
+    """
+    def quote(value):
+        return '"{0}"'.format(str(value).replace('\\', '\\\\').replace('"', '\\"'))
+
+    result = []
+    items = []
+    size = 0
+    for record in records:
+        if action == 'delete':
+            item = quote(record['name'])
+        else:
+            item = '{0} {{ data {1} }}'.format(quote(record['name']), quote(record.get('data', '')))
+        if items and size + len(item) > OPTIONS_LIMIT_BYTES:
+            result.append('records {0} {{ {1} }}'.format(action, ' '.join(items)))
+            items = []
+            size = 0
+        items.append(item)
+        size += len(item) + 1
+    if items:
+        result.append('records {0} {{ {1} }}'.format(action, ' '.join(items)))
+    return result
+
+
 class RecordsEncoder(object):
     def __init__(self, record_type=None, separator=None):
         self._record_type = record_type
@@ -525,34 +610,35 @@ class Parameters(AnsibleF5Parameters):
             return self._values['records_src']
         except AttributeError:
             pass
-        if self._values['records_src']:
-            records = open(self._values['records_src'])
-        else:
-            records = self._values['records']
-
-        # There is a 98% chance that the user will supply a data group that is < 1MB.
-        # 99.917% chance it is less than 10 MB. This is well within the range of typical
-        # memory available on a system.
-        #
-        # If this changes, this may need to be changed to use temporary files instead.
-        self._values['records_src'] = StringIO()
+        path = self._values['records_src']
+
+        # Most data groups are small enough to be kept in memory, but some (such as
+        # IP reputation lists) are hundreds of megabytes. The encoded records are
+        # therefore spooled to a temporary file once they exceed the limit of an
+        # internal data group, so memory use stays bounded whatever their size.
+        self._values['records_src'] = tempfile.SpooledTemporaryFile(
+            max_size=SIZE_LIMIT_BYTES, mode='w+b'
+        )
 
-        self._write_records_to_file(records)
+        if path:
+            with open(path) as records:
+                self._write_records_to_file(records)
+        else:
+            self._write_records_to_file(self._values['records'] or [])
         return self._values['records_src']
 
     def _write_records_to_file(self, records):
-        bucket_size = 1000000
-        bucket = []
+        """Encodes the records, and computes their checksum, in a single pass"""
+        checksum = hashlib.sha1()
         encoder = RecordsEncoder(record_type=self.type, separator=self.separator)
         for record in records:
             result = encoder.encode(record)
             if result:
-                bucket.append(to_text(result + ",\n"))
-                if len(bucket) == bucket_size:
-                    self._values['records_src'].writelines(bucket)
-                    bucket = []
-        self._values['records_src'].writelines(bucket)
+                data = to_bytes(result + ",\n")
+                checksum.update(data)
+                self._values['records_src'].write(data)
         self._values['records_src'].seek(0)
+        self._values['checksum'] = checksum.hexdigest()
 
 
 class ApiParameters(Parameters):
@@ -577,18 +663,10 @@ class ApiParameters(Parameters):
 class ModuleParameters(Parameters):
     @property
     def checksum(self):
-        if self._values['checksum']:
-            return self._values['checksum']
-        result = hashlib.sha1()
-        records = self.records_src
-        while True:
-            data = records.read(4096)
-            if not data:
-                break
-            result.update(data)
-        result = result.hexdigest()
-        self._values['checksum'] = result
-        return result
+        if self._values['checksum'] is None:
+            # The checksum is computed as the records are written out
+            self.records_src
+        return self._values['checksum']
 
     @property
     def external_file_name(self):
@@ -607,7 +685,7 @@ class ModuleParameters(Parameters):
         results = []
         decoder = RecordsDecoder(record_type=self.type, separator=self.separator)
         for record in self.records_src:
-            result = decoder.decode(record)
+            result = decoder.decode(to_text(record))
             if result:
                 results.append(result)
         return results
@@ -620,6 +698,10 @@ class ModuleParameters(Parameters):
 
 
 class Changes(Parameters):
+    returnables = [
+        'records_added', 'records_removed', 'records_modified'
+    ]
+
     def to_return(self):
         result = {}
         try:
@@ -674,8 +756,9 @@ class Difference(object):
             return None
         if self.have.records is None:
             return self.want.records
-        result = compare_dictionary(self.want.records, self.have.records)
-        return result
+        delta = records_delta(self.want.records, self.have.records)
+        if any(delta.values()):
+            return self.want.records
 
     @property
     def type(self):
@@ -778,6 +861,10 @@ class BaseManager(object):
 
 
 class InternalManager(BaseManager):
+    def __init__(self, *args, **kwargs):
+        super(InternalManager, self).__init__(*args, **kwargs)
+        self.delta = None
+
     def create(self):
         self._set_changed_options()
         if size_exceeded(self.want.records_src) or lines_exceeded(self.want.records_src):
@@ -793,11 +880,21 @@ class InternalManager(BaseManager):
         self.have = self.read_current_from_device()
         if not self.should_update():
             return False
+        self.delta = records_delta(self.want.records, self.have.records)
+        self.changes.update(dict(
+            records_added=len(self.delta['add']),
+            records_removed=len(self.delta['remove']),
+            records_modified=len(self.delta['modify'])
+        ))
         if self.module.check_mode:
             return True
         self.update_on_device()
         return True
 
+    def delta_is_small(self):
+        changed = sum(len(x) for x in self.delta.values())
+        return changed <= len(self.want.records) * DELTA_LIMIT_RATIO
+
     def exists(self):
         result = self.client.api.tm.ltm.data_group.internals.internal.exists(
             name=self.want.name,
@@ -814,12 +911,26 @@ class InternalManager(BaseManager):
         )
 
     def update_on_device(self):
-        params = self.changes.api_params()
         resource = self.client.api.tm.ltm.data_group.internals.internal.load(
             name=self.want.name,
             partition=self.want.partition
         )
-        resource.modify(**params)
+        if self.delta is None or not self.delta_is_small():
+            params = self.changes.api_params()
+            resource.modify(**params)
+            return
+
+        # Only the records that changed are sent, so the cost of an update
+        # follows the size of the change rather than of the data group.
+        options = records_options('delete', self.delta['remove'])
+        options += records_options('modify', self.delta['modify'])
+        options += records_options('add', self.delta['add'])
+        for option in options:
+            resource.modify(
+                requests_params=dict(
+                    params=dict(options=option)
+                )
+            )
 
     def remove_from_device(self):
         resource = self.client.api.tm.ltm.data_group.internals.internal.load(
@@ -886,7 +997,7 @@ class ExternalManager(BaseManager):
         return result
 
     def _upload_to_file(self, name, type, remote_path, update=False):
-        self.client.api.shared.file_transfer.uploads.upload_stringio(self.want.records_src, name)
+        upload_fileobj(self.client.api.shared.file_transfer.uploads, self.want.records_src, name)
         resource = self.client.api.tm.sys.file.data_groups
         if update:
             resource = resource.data_group.load(
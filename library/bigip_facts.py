@@ -18,7 +18,8 @@ DOCUMENTATION = r'''
 module: bigip_facts
 short_description: Collect facts from F5 BIG-IP devices
 description:
-  - Collect facts from F5 BIG-IP devices via iControl SOAP API
+  - Collect facts from F5 BIG-IP devices via iControl SOAP API, or via the
+    iControl REST API.
 version_added: "1.6"
 author:
   - Matt Hite (@mhite)
@@ -29,6 +30,9 @@ notes:
   - Best run as a local_action in your playbook
   - Tested with manager and above account privilege level
   - C(provision) facts were added in 2.2
+  - With C(engine=rest), facts are named as in the iControl REST API (in
+    snake case) instead of the SOAP API, and C(system_info) only reports the
+    software version.
 requirements:
   - bigsuds
 options:
@@ -74,6 +78,17 @@ options:
     default: null
     choices: []
     aliases: []
+  engine:
+    description:
+      - The API that facts are collected with.
+      - C(soap) makes a request for every field of every category.
+      - C(rest) reads each category in a single request, and reads the
+        categories concurrently. It does not require bigsuds.
+    default: soap
+    choices:
+      - soap
+      - rest
+    version_added: 2.7
 extends_documentation_fragment: f5
 '''
 
@@ -85,6 +100,15 @@ EXAMPLES = r'''
     password: secret
     include: interface,vlan
   delegate_to: localhost
+
+- name: Collect BIG-IP facts over iControl REST
+  bigip_facts:
+    server: lb.mydomain.com
+    user: admin
+    password: secret
+    include: pool,virtual_server,node
+    engine: rest
+  delegate_to: localhost
 '''
 
 import fnmatch
@@ -98,13 +122,24 @@ except ImportError:
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.f5_utils import bigip_api, bigsuds_found
+from ansible.module_utils.six import iteritems
 from ansible.module_utils.six.moves import map, zip
+from multiprocessing.pool import ThreadPool
 
 try:
+    from library.module_utils.network.f5.bigip import F5RestClient
+    from library.module_utils.network.f5.common import F5ModuleError
+    from library.module_utils.network.f5.common import cleanup_tokens
     from library.module_utils.network.f5.common import f5_argument_spec
 except ImportError:
+    from ansible.module_utils.network.f5.bigip import F5RestClient
+    from ansible.module_utils.network.f5.common import F5ModuleError
+    from ansible.module_utils.network.f5.common import cleanup_tokens
     from ansible.module_utils.network.f5.common import f5_argument_spec
 
+# The most requests that are made to the device at the same time
+MAX_WORKERS = 4
+
 
 class F5(object):
     """F5 iControl class.
@@ -1644,6 +1679,222 @@ def generate_provision_dict(f5):
     return generate_simple_dict(provisioned, fields)
 
 
+# The REST collection that each fact category is read from. Each category is
+# read in one request; only the selected attributes are sent, and the
+# references that are listed are expanded into the response.
+REST_CATEGORIES = dict(
+    address_class=dict(
+        uri='/mgmt/tm/ltm/data-group/internal',
+        select=['name', 'fullPath', 'type', 'description', 'records'],
+        type='ip'
+    ),
+    certificate=dict(
+        uri='/mgmt/tm/sys/file/ssl-cert',
+        select=['name', 'fullPath', 'commonName', 'expirationDate', 'expirationString',
+                'fingerprint', 'issuer', 'keySize', 'keyType', 'subject']
+    ),
+    client_ssl_profile=dict(
+        uri='/mgmt/tm/ltm/profile/client-ssl',
+        select=['name', 'fullPath', 'alertTimeout', 'allowNonSsl', 'authenticate',
+                'authenticateDepth', 'caFile', 'cacheSize', 'cacheTimeout', 'cert',
+                'certKeyChain', 'chain', 'ciphers', 'clientCertCa', 'crlFile',
+                'defaultsFrom', 'description', 'handshakeTimeout', 'key', 'modSslMethods',
+                'mode', 'options', 'peerCertMode', 'proxyCaCert', 'proxyCaKey', 'proxySsl',
+                'renegotiateMaxRecordDelay', 'renegotiatePeriod', 'renegotiateSize',
+                'renegotiation', 'retainCertificate', 'secureRenegotiation', 'serverName',
+                'sessionTicket', 'sniDefault', 'sniRequire', 'strictResume', 'uncleanShutdown']
+    ),
+    device=dict(
+        uri='/mgmt/tm/cm/device',
+        select=['name', 'fullPath', 'activeModules', 'baseMac', 'build', 'chassisId',
+                'chassisType', 'comment', 'configsyncIp', 'contact', 'description', 'edition',
+                'failoverState', 'hostname', 'location', 'managementIp', 'marketingName',
+                'mirrorIp', 'mirrorSecondaryIp', 'multicastIp', 'optionalModules', 'platformId',
+                'product', 'timeLimitedModules', 'timeZone', 'unicastAddress', 'version']
+    ),
+    device_group=dict(
+        uri='/mgmt/tm/cm/device-group',
+        select=['name', 'fullPath', 'autoSync', 'description', 'devicesReference',
+                'fullLoadOnSync', 'incrementalConfigSyncSizeMax', 'networkFailover', 'type']
+    ),
+    interface=dict(
+        uri='/mgmt/tm/net/interface',
+        select=['name', 'fullPath', 'bundle', 'bundleSpeed', 'description', 'enabled',
+                'flowControl', 'ifIndex', 'lldpAdmin', 'lldpTlvmap', 'macAddress',
+                'mediaActive', 'mediaFixed', 'mediaMax', 'mediaSfp', 'mtu', 'preferPort',
+                'sflow', 'stp', 'stpAutoEdgePort', 'stpEdgePort', 'stpLinkType']
+    ),
+    key=dict(
+        uri='/mgmt/tm/sys/file/ssl-key',
+        select=['name', 'fullPath', 'keySize', 'keyType', 'securityType']
+    ),
+    node=dict(
+        uri='/mgmt/tm/ltm/node',
+        select=['name', 'fullPath', 'address', 'connectionLimit', 'description',
+                'dynamicRatio', 'fqdn', 'monitor', 'rateLimit', 'ratio', 'session', 'state']
+    ),
+    pool=dict(
+        uri='/mgmt/tm/ltm/pool',
+        select=['name', 'fullPath', 'allowNat', 'allowSnat', 'description',
+                'ignorePersistedWeight', 'ipTosToClient', 'ipTosToServer', 'linkQosToClient',
+                'linkQosToServer', 'loadBalancingMode', 'membersReference', 'minActiveMembers',
+                'minUpMembers', 'minUpMembersAction', 'minUpMembersChecking', 'monitor',
+                'queueDepthLimit', 'queueOnConnectionLimit', 'queueTimeLimit', 'reselectTries',
+                'serviceDownAction', 'slowRampTime']
+    ),
+    provision=dict(
+        uri='/mgmt/tm/sys/provision',
+        select=['name', 'fullPath', 'level']
+    ),
+    rule=dict(
+        uri='/mgmt/tm/ltm/rule',
+        select=['name', 'fullPath', 'apiAnonymous', 'description', 'ignoreVerification']
+    ),
+    self_ip=dict(
+        uri='/mgmt/tm/net/self',
+        select=['name', 'fullPath', 'address', 'allowService', 'description', 'floating',
+                'fwEnforcedPolicy', 'fwStagedPolicy', 'inheritedTrafficGroup', 'trafficGroup',
+                'vlan']
+    ),
+    software=dict(
+        uri='/mgmt/tm/sys/software/volume',
+        select=['name', 'fullPath', 'active', 'basebuild', 'build', 'product', 'status',
+                'version']
+    ),
+    system_info=dict(
+        uri='/mgmt/tm/sys/version'
+    ),
+    traffic_group=dict(
+        uri='/mgmt/tm/cm/traffic-group',
+        select=['name', 'fullPath', 'autoFailbackEnabled', 'autoFailbackTime',
+                'defaultDevice', 'description', 'haLoadFactor', 'haOrder', 'isFloating',
+                'mac', 'unitId']
+    ),
+    trunk=dict(
+        uri='/mgmt/tm/net/trunk',
+        select=['name', 'fullPath', 'cfgMbrCount', 'description', 'distributionHash',
+                'interfaces', 'lacp', 'lacpMode', 'lacpTimeout', 'linkSelectPolicy', 'stp',
+                'workingMbrCount']
+    ),
+    virtual_address=dict(
+        uri='/mgmt/tm/ltm/virtual-address',
+        select=['name', 'fullPath', 'address', 'arp', 'autoDelete', 'connectionLimit',
+                'description', 'enabled', 'floating', 'icmpEcho', 'mask', 'routeAdvertisement',
+                'trafficGroup']
+    ),
+    virtual_server=dict(
+        uri='/mgmt/tm/ltm/virtual',
+        select=['name', 'fullPath', 'autoLasthop', 'clonePools', 'cmpEnabled',
+                'connectionLimit', 'description', 'destination', 'disabled', 'enabled',
+                'fallbackPersistence', 'fwEnforcedPolicy', 'fwStagedPolicy', 'gtmScore',
+                'ipProtocol', 'lastHopPool', 'mask', 'mirror', 'nat64', 'persist', 'pool',
+                'profilesReference', 'rateClass', 'rateLimit', 'rateLimitDstMask',
+                'rateLimitMode', 'rateLimitSrcMask', 'relatedRules', 'rules',
+                'securityLogProfiles', 'source', 'sourceAddressTranslation', 'sourcePort',
+                'translateAddress', 'translatePort', 'vlans', 'vlansDisabled', 'vlansEnabled']
+    ),
+    vlan=dict(
+        uri='/mgmt/tm/net/vlan',
+        select=['name', 'fullPath', 'autoLasthop', 'cmpHash', 'description', 'failsafe',
+                'failsafeAction', 'failsafeTimeout', 'ifIndex', 'interfacesReference',
+                'learning', 'mtu', 'sflow', 'sourceChecking', 'tag']
+    ),
+)
+
+
+class RestFacts(object):
+    """Collects facts over iControl REST
+
+    Each category is read in a single request, and the categories are read
+    concurrently.
+
+    Attributes:
+        client: F5RestClient for the device.
+        regex: Regex that the full paths of the resources must match.
+    """
+
+    def __init__(self, client, regex=None):
+        self.client = client
+        self.regex = re.compile(regex) if regex else None
+
+    def get_uri(self, category):
+        spec = REST_CATEGORIES[category]
+        params = []
+        if 'select' in spec:
+            params.append('$select={0}'.format(','.join(spec['select'])))
+            if any(x.endswith('Reference') for x in spec['select']):
+                params.append('expandSubcollections=true')
+        if not params:
+            return spec['uri']
+        return '{0}?{1}'.format(spec['uri'], '&'.join(params))
+
+    def read_category_from_device(self, category):
+        response = self.client.api.get(self.get_uri(category))
+        return response.json()
+
+    def exec_module(self, include):
+        # Log in once, before the categories are read by many threads
+        self.client.api
+
+        if len(include) < 2:
+            responses = [self.read_category_from_device(x) for x in include]
+        else:
+            pool = ThreadPool(processes=min(MAX_WORKERS, len(include)))
+            try:
+                responses = pool.map(self.read_category_from_device, include)
+            finally:
+                pool.close()
+                pool.join()
+        result = dict()
+        for category, response in zip(include, responses):
+            result[category] = self.format_category(category, response)
+        return result
+
+    def format_category(self, category, response):
+        if category == 'system_info':
+            return self.format_stats(response)
+        spec = REST_CATEGORIES[category]
+        items = response.get('items', [])
+        if 'type' in spec:
+            items = [x for x in items if x.get('type', None) == spec['type']]
+        if category == 'software':
+            return [self.format_item(x) for x in items]
+        elif category == 'provision':
+            return dict(
+                list=[x['name'] for x in items],
+                provisioned_list=[x['name'] for x in items if x.get('level', 'none') != 'none']
+            )
+        result = dict()
+        for item in items:
+            if self.regex and not self.regex.search(item['fullPath']):
+                continue
+            result[item['fullPath']] = self.format_item(item)
+        return result
+
+    def format_item(self, item):
+        result = dict()
+        for k, v in iteritems(item):
+            if k in ['kind', 'selfLink', 'generation', 'fullPath']:
+                continue
+            if k.endswith('Reference'):
+                k = k[:-len('Reference')]
+                v = [self.format_item(x) for x in v.get('items', [])]
+            elif isinstance(v, dict):
+                v = self.format_item(v)
+            result[self.to_snake_case(k)] = v
+        return result
+
+    def format_stats(self, response):
+        result = dict()
+        for entry in response.get('entries', {}).values():
+            for k, v in iteritems(entry.get('nestedStats', {}).get('entries', {})):
+                result[self.to_snake_case(k)] = v.get('description', v.get('value'))
+        return result
+
+    def to_snake_case(self, name):
+        return re.sub(r'([a-z0-9])([A-Z])', r'\1_\2', name).lower()
+
+
 def main():
     argument_spec = f5_argument_spec
     meta_args = dict(
@@ -1659,6 +1910,7 @@ def main():
             ]
         ),
         filter=dict(type='str', required=False),
+        engine=dict(default='soap', choices=['soap', 'rest']),
     )
     argument_spec.update(meta_args)
 
@@ -1666,7 +1918,7 @@ def main():
         argument_spec=argument_spec
     )
 
-    if not bigsuds_found:
+    if module.params['engine'] == 'soap' and not bigsuds_found:
         module.fail_json(msg="the python suds and bigsuds modules are required")
 
     server = module.params['server']
@@ -1677,7 +1929,7 @@ def main():
     session = module.params['session']
     fact_filter = module.params['filter']
 
-    if validate_certs:
+    if validate_certs and module.params['engine'] == 'soap':
         import ssl
         if not hasattr(ssl, 'SSLContext'):
             module.fail_json(
@@ -1698,6 +1950,23 @@ def main():
     if not all(include_test):
         module.fail_json(msg="value of include must be one or more of: %s, got: %s" % (",".join(valid_includes), ",".join(include)))
 
+    if module.params['engine'] == 'rest':
+        client = F5RestClient(**module.params)
+        try:
+            facts = RestFacts(client, regex).exec_module(include)
+            cleanup_tokens(client)
+        except F5ModuleError as ex:
+            cleanup_tokens(client)
+            module.fail_json(msg=str(ex))
+        except Exception as e:
+            cleanup_tokens(client)
+            module.fail_json(msg="received exception: %s\ntraceback: %s" % (e, traceback.format_exc()))
+        result = dict(
+            ansible_facts=facts,
+        )
+        result.update(**facts)
+        module.exit_json(**result)
+
     try:
         facts = {}
 
@@ -33,6 +33,8 @@ options:
       - Perform regex filter of response. Filtering is done on the name of
         the resource. Valid filters are anything that can be provided to
         Python's C(re) module.
+      - Resources whose names do not match are skipped before their stats
+        are read from the device.
 extends_documentation_fragment: f5
 author:
   - Tim Rupp (@caphrim007)
@@ -169,6 +171,7 @@ server:
 import re
 
 from ansible.module_utils.basic import AnsibleModule
+from multiprocessing.pool import ThreadPool
 
 HAS_DEVEL_IMPORTS = False
 
@@ -206,7 +209,6 @@ except ImportError:
     import simplejson as json
 
 from ansible.module_utils.parsing.convert_bool import BOOLEANS_TRUE
-from ansible.module_utils.six import iteritems
 from distutils.version import LooseVersion
 
 try:
@@ -215,12 +217,17 @@ try:
 except ImportError:
     HAS_F5SDK = False
 
+# The most requests that are made to the device at the same time
+MAX_WORKERS = 4
+
 
 class BaseManager(object):
     def __init__(self, *args, **kwargs):
         self.module = kwargs.get('module', None)
         self.client = kwargs.get('client', None)
+        self.executor = kwargs.get('executor', None)
         self.kwargs = kwargs
+        self._filter = None
 
         self.types = dict(
             a_s='a',
@@ -231,15 +238,41 @@ class BaseManager(object):
             srvs='srv'
         )
 
+    @property
+    def filter(self):
+        if self._filter is None:
+            try:
+                self._filter = re.compile(self.want.filter)
+            except re.error as ex:
+                raise F5ModuleError(
+                    "The provided 'filter' is not a valid regular expression: {0}".format(str(ex))
+                )
+        return self._filter
+
     def filter_matches_name(self, name):
         if self.want.filter is None:
             return True
-        matches = re.match(self.want.filter, str(name))
+        matches = self.filter.match(str(name))
         if matches:
             return True
         else:
             return False
 
+    def filter_collection(self, collection):
+        if self.want.filter is None:
+            return collection
+        return [x for x in collection if self.filter_matches_name(x.name)]
+
+    def map(self, func, items):
+        """Calls func for each of the items, concurrently when possible
+
+        Only calls that make a single request to the device should be given
+        here. Calls that wait on others in the same executor can deadlock it.
+        """
+        if self.executor is None:
+            return [func(x) for x in items]
+        return self.executor.map(func, items)
+
     def version_is_less_than_12(self):
         version = self.client.api.tmos_version
         if LooseVersion(version) < LooseVersion('12.0.0'):
@@ -267,16 +300,18 @@ class UntypedManager(BaseManager):
         facts = self.read_facts()
         for item in facts:
             attrs = item.to_return()
-            filtered = [(k, v) for k, v in iteritems(attrs) if self.filter_matches_name(k)]
-            if filtered:
-                results.append(dict(filtered))
+            if attrs:
+                results.append(attrs)
         return results
 
 
 class TypedManager(BaseManager):
     def exec_module(self):
         results = []
-        for collection, type in iteritems(self.types):
+        names = list(self.types.keys())
+        collections = self.map(self.read_collection_from_device, names)
+        for name, collection in zip(names, collections):
+            type = self.types[name]
             facts = self.read_facts(collection)
             if not facts:
                 continue
@@ -284,9 +319,8 @@ class TypedManager(BaseManager):
                 x.update({'type': type})
             for item in facts:
                 attrs = item.to_return()
-                filtered = [(k, v) for k, v in iteritems(attrs) if self.filter_matches_name(k)]
-                if filtered:
-                    results.append(dict(filtered))
+                if attrs:
+                    results.append(attrs)
         return results
 
 
@@ -711,14 +745,14 @@ class TypedPoolFactManager(TypedManager):
         self.want = PoolParameters(params=self.module.params)
 
     def read_facts(self, collection):
-        results = []
-        collection = self.read_collection_from_device(collection)
-        for resource in collection:
+        collection = self.filter_collection(collection)
+        stats = self.map(self.read_stats_from_device, collection)
+        items = []
+        for resource, stat in zip(collection, stats):
             attrs = resource.attrs
-            attrs['stats'] = self.read_stats_from_device(resource)
-            params = PoolParameters(params=attrs)
-            results.append(params)
-        return results
+            attrs['stats'] = stat
+            items.append(attrs)
+        return PoolParameters.from_collection(items)
 
     def read_collection_from_device(self, collection_name):
         pools = self.client.api.tm.gtm.pools
@@ -739,14 +773,14 @@ class UntypedPoolFactManager(UntypedManager):
         self.want = PoolParameters(params=self.module.params)
 
     def read_facts(self):
-        results = []
-        collection = self.read_collection_from_device()
-        for resource in collection:
+        collection = self.filter_collection(self.read_collection_from_device())
+        stats = self.map(self.read_stats_from_device, collection)
+        items = []
+        for resource, stat in zip(collection, stats):
             attrs = resource.attrs
-            attrs['stats'] = self.read_stats_from_device(resource)
-            params = PoolParameters(params=attrs)
-            results.append(params)
-        return results
+            attrs['stats'] = stat
+            items.append(attrs)
+        return PoolParameters.from_collection(items)
 
     def read_collection_from_device(self):
         result = self.client.api.tm.gtm.pools.get_collection(
@@ -782,13 +816,8 @@ class TypedWideIpFactManager(TypedManager):
         self.want = WideIpParameters(params=self.module.params)
 
     def read_facts(self, collection):
-        results = []
-        collection = self.read_collection_from_device(collection)
-        for resource in collection:
-            attrs = resource.attrs
-            params = WideIpParameters(params=attrs)
-            results.append(params)
-        return results
+        collection = self.filter_collection(collection)
+        return WideIpParameters.from_collection(x.attrs for x in collection)
 
     def read_collection_from_device(self, collection_name):
         wideips = self.client.api.tm.gtm.wideips
@@ -809,13 +838,8 @@ class UntypedWideIpFactManager(UntypedManager):
         self.want = WideIpParameters(params=self.module.params)
 
     def read_facts(self):
-        results = []
-        collection = self.read_collection_from_device()
-        for resource in collection:
-            attrs = resource.attrs
-            params = WideIpParameters(params=attrs)
-            results.append(params)
-        return results
+        collection = self.filter_collection(self.read_collection_from_device())
+        return WideIpParameters.from_collection(x.attrs for x in collection)
 
     def read_collection_from_device(self):
         result = self.client.api.tm.gtm.wideips.get_collection(
@@ -839,13 +863,8 @@ class ServerFactManager(UntypedManager):
         return result
 
     def read_facts(self):
-        results = []
-        collection = self.read_collection_from_device()
-        for resource in collection:
-            attrs = resource.attrs
-            params = ServerParameters(params=attrs)
-            results.append(params)
-        return results
+        collection = self.filter_collection(self.read_collection_from_device())
+        return ServerParameters.from_collection(x.attrs for x in collection)
 
     def read_collection_from_device(self):
         result = self.client.api.tm.gtm.servers.get_collection(
@@ -873,8 +892,15 @@ class ModuleManager(object):
             names = ['pool', 'wide_ip', 'server']
         else:
             names = self.want.include
-        managers = [self.get_manager(name) for name in names]
-        result = self.execute_managers(managers)
+
+        executor = ThreadPool(processes=MAX_WORKERS)
+        try:
+            self.kwargs['executor'] = executor
+            managers = [self.get_manager(name) for name in names]
+            result = self.execute_managers(managers)
+        finally:
+            executor.close()
+            executor.join()
         if result:
             result['changed'] = True
         else:
@@ -893,9 +919,23 @@ class ModuleManager(object):
             )
 
     def execute_managers(self, managers):
+        """Collects the facts of each manager in its own thread
+
+        The managers only wait on their requests, which are made through the
+        shared executor. So the number of requests made to the device at the
+        same time is bounded, while the collections are all read together.
+        """
         results = dict()
-        for manager in managers:
-            result = manager.exec_module()
+        if len(managers) < 2:
+            facts = [manager.exec_module() for manager in managers]
+        else:
+            pool = ThreadPool(processes=len(managers))
+            try:
+                facts = pool.map(lambda x: x.exec_module(), managers)
+            finally:
+                pool.close()
+                pool.join()
+        for result in facts:
             results.update(result)
         return results
 
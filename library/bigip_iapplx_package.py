@@ -36,6 +36,23 @@ options:
     choices:
       - present
       - absent
+  upload_concurrency:
+    description:
+      - The number of chunks of the file that are sent to the device at the same time.
+      - When this is more than C(1), the chunks may reach the device out of order.
+        Only raise it for devices that are known to accept that.
+    type: int
+    default: 1
+    version_added: 2.7
+  verify_upload:
+    description:
+      - When C(yes), the SHA-256 checksum of the uploaded file on the device is
+        compared with the checksum of the file that was sent.
+      - The checksum is taken with C(sha256sum) through the bash utility, so the
+        user must be allowed to run bash on the device.
+    type: bool
+    default: no
+    version_added: 2.7
 notes:
   - Requires the rpm tool be installed on the host. This can be accomplished through
     different ways on each platform. On Debian based systems with C(apt);
@@ -81,7 +98,26 @@ EXAMPLES = r'''
 '''
 
 RETURN = r'''
-# only common fields returned
+upload:
+  description: How the files of the task were uploaded to the device.
+  returned: changed and a file was uploaded
+  type: complex
+  contains:
+    bytes:
+      description: The number of bytes sent.
+      returned: changed and a file was uploaded
+      type: int
+      sample: 1073741824
+    seconds:
+      description: The seconds spent sending them.
+      returned: changed and a file was uploaded
+      type: float
+      sample: 92.41
+    throughput:
+      description: The bytes sent per second.
+      returned: changed and a file was uploaded
+      type: int
+      sample: 11619043
 '''
 
 import os
@@ -97,6 +133,8 @@ try:
     # Sideband repository used for dev
     from library.module_utils.network.f5.bigip import HAS_F5SDK
     from library.module_utils.network.f5.bigip import F5Client
+    from library.module_utils.network.f5.bigip import FileUpload
+    from library.module_utils.network.f5.bigip import upload_summary
     from library.module_utils.network.f5.common import F5ModuleError
     from library.module_utils.network.f5.common import AnsibleF5Parameters
     from library.module_utils.network.f5.common import cleanup_tokens
@@ -111,6 +149,8 @@ except ImportError:
     # Upstream Ansible
     from ansible.module_utils.network.f5.bigip import HAS_F5SDK
     from ansible.module_utils.network.f5.bigip import F5Client
+    from ansible.module_utils.network.f5.bigip import FileUpload
+    from ansible.module_utils.network.f5.bigip import upload_summary
     from ansible.module_utils.network.f5.common import F5ModuleError
     from ansible.module_utils.network.f5.common import AnsibleF5Parameters
     from ansible.module_utils.network.f5.common import cleanup_tokens
@@ -186,6 +226,7 @@ class ModuleManager(object):
         self.client = kwargs.get('client', None)
         self.want = Parameters(params=self.module.params)
         self.changes = Parameters()
+        self.uploads = []
 
     def exec_module(self):
         result = dict()
@@ -209,6 +250,8 @@ class ModuleManager(object):
         changes = self.changes.to_return()
         result.update(**changes)
         result.update(dict(changed=changed))
+        if self.uploads:
+            result.update(dict(upload=upload_summary(self.uploads)))
         return result
 
     def present(self):
@@ -271,10 +314,14 @@ class ModuleManager(object):
             raise F5ModuleError("Failed to create the iApp template")
 
     def upload_to_device(self):
-        upload = self.client.api.shared.file_transfer.uploads
-        upload.upload_file(
-            self.want.package
-        )
+        uploads = self.client.api.shared.file_transfer.uploads
+        with open(self.want.package, 'rb') as fileobj:
+            upload = FileUpload(
+                uploads, fileobj, self.want.package_file, max_workers=self.want.upload_concurrency
+            ).upload()
+        self.uploads.append(upload)
+        if self.want.verify_upload:
+            upload.verify(self.client, '/var/config/rest/downloads/{0}'.format(self.want.package_file))
 
     def remove_package_file_from_device(self):
         self.client.api.tm.util.unix_rm.exec_cmd(
@@ -337,7 +384,15 @@ class ArgumentSpec(object):
                 default='present',
                 choices=['present', 'absent']
             ),
-            package=dict()
+            package=dict(),
+            upload_concurrency=dict(
+                type='int',
+                default=1
+            ),
+            verify_upload=dict(
+                type='bool',
+                default='no'
+            )
         )
         self.argument_spec = {}
         self.argument_spec.update(f5_argument_spec)
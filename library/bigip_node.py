@@ -44,7 +44,7 @@ options:
   name:
     description:
       - Specifies the name of the node.
-    required: True
+      - One of C(name) or C(aggregate) is required.
   monitor_type:
     description:
       - Monitor rule type when C(monitors) is specified. When creating a new
@@ -95,7 +95,17 @@ options:
       - Device partition to manage resources on.
     default: Common
     version_added: 2.5
+  aggregate:
+    description:
+      - List of nodes to manage. Each item takes the same options as this module,
+        and options that an item does not set are taken from the task.
+      - The changes to all of the nodes are committed in a single transaction. If
+        the device rejects any of them, none of the nodes are changed.
+    version_added: 2.7
 notes:
+  - When looping over many nodes, set the C(F5_COLLECTION_CACHE_TTL) environment
+    variable to a number of seconds to look them up in a copy of the node
+    collection fetched once, instead of asking the device about each one.
   - Requires the netaddr Python package on the host. This is as easy as
     C(pip install netaddr).
 requirements:
@@ -161,6 +171,22 @@ EXAMPLES = r'''
     name: 10.20.30.40
   delegate_to: localhost
 
+- name: Add many nodes in a single transaction
+  bigip_node:
+    server: lb.mydomain.com
+    user: admin
+    password: secret
+    partition: Common
+    aggregate:
+      - name: web1
+        address: 10.20.30.41
+      - name: web2
+        address: 10.20.30.42
+      - name: web3
+        address: 10.20.30.43
+        state: disabled
+  delegate_to: localhost
+
 - name: Add node by their FQDN
   bigip_node:
     server: lb.mydomain.com
@@ -210,6 +236,12 @@ state:
   returned: changed and success
   type: string
   sample: m_of_n
+aggregate:
+  description:
+    - Whether each node in C(aggregate) was changed.
+  returned: changed and success
+  type: list
+  sample: [{"name": "/Common/web1", "changed": true}]
 '''
 
 import re
@@ -217,6 +249,9 @@ import time
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.basic import env_fallback
+from ansible.module_utils.network.common.utils import remove_default_spec
+from ansible.module_utils.six import iteritems
+from copy import deepcopy
 
 HAS_DEVEL_IMPORTS = False
 
@@ -224,10 +259,14 @@ try:
     # Sideband repository used for dev
     from library.module_utils.network.f5.bigip import HAS_F5SDK
     from library.module_utils.network.f5.bigip import F5Client
+    from library.module_utils.network.f5.bigip import TransactionBatch
     from library.module_utils.network.f5.common import F5ModuleError
     from library.module_utils.network.f5.common import AnsibleF5Parameters
+    from library.module_utils.network.f5.common import CollectionCache
+    from library.module_utils.network.f5.common import CollectionSnapshot
     from library.module_utils.network.f5.common import cleanup_tokens
     from library.module_utils.network.f5.common import fqdn_name
+    from library.module_utils.network.f5.common import fq_name
     from library.module_utils.network.f5.common import f5_argument_spec
     try:
         from library.module_utils.network.f5.common import iControlUnexpectedHTTPError
@@ -238,10 +277,14 @@ except ImportError:
     # Upstream Ansible
     from ansible.module_utils.network.f5.bigip import HAS_F5SDK
     from ansible.module_utils.network.f5.bigip import F5Client
+    from ansible.module_utils.network.f5.bigip import TransactionBatch
     from ansible.module_utils.network.f5.common import F5ModuleError
     from ansible.module_utils.network.f5.common import AnsibleF5Parameters
+    from ansible.module_utils.network.f5.common import CollectionCache
+    from ansible.module_utils.network.f5.common import CollectionSnapshot
     from ansible.module_utils.network.f5.common import cleanup_tokens
     from ansible.module_utils.network.f5.common import fqdn_name
+    from ansible.module_utils.network.f5.common import fq_name
     from ansible.module_utils.network.f5.common import f5_argument_spec
     try:
         from ansible.module_utils.network.f5.common import iControlUnexpectedHTTPError
@@ -469,9 +512,25 @@ class ModuleManager(object):
     def __init__(self, *args, **kwargs):
         self.module = kwargs.get('module', None)
         self.client = kwargs.get('client', None)
+        self.batch = kwargs.get('batch', None)
         self.have = None
-        self.want = Parameters(params=self.module.params)
+        self.want = Parameters(params=kwargs.get('params', None) or self.module.params)
         self.changes = Changes()
+        self._collection = kwargs.get('collection', None)
+
+    @property
+    def collection(self):
+        if self._collection is None:
+            self._collection = CollectionCache(
+                self.client, 'ltm/node', self.read_collection_from_device
+            )
+        return self._collection
+
+    def submit(self, func, *args, **kwargs):
+        """Makes a change on the device, or queues it when batching changes"""
+        if self.batch is None:
+            return func(*args, **kwargs)
+        self.batch.add(fq_name(self.want.partition, self.want.name), func, *args, **kwargs)
 
     def _set_changed_options(self):
         changed = {}
@@ -587,7 +646,7 @@ class ModuleManager(object):
         if self.module.check_mode:
             return True
         self.create_on_device()
-        if not self.exists():
+        if self.batch is None and not self.exists():
             raise F5ModuleError("Failed to create the node")
         # It appears that you cannot create a node in an 'offline' state, so instead
         # we update its status to offline after we create it.
@@ -621,11 +680,18 @@ class ModuleManager(object):
         if self.module.check_mode:
             return True
         self.remove_from_device()
-        if self.exists():
+        if self.batch is None and self.exists():
             raise F5ModuleError("Failed to delete the node.")
         return True
 
+    def read_collection_from_device(self):
+        collection = self.client.api.tm.ltm.nodes.get_collection()
+        return [resource.attrs for resource in collection]
+
     def read_current_from_device(self):
+        known, result = self.collection.lookup(self.want.name, self.want.partition)
+        if known and result is not None:
+            return Parameters(params=result)
         resource = self.client.api.tm.ltm.nodes.node.load(
             name=self.want.name,
             partition=self.want.partition
@@ -634,6 +700,9 @@ class ModuleManager(object):
         return Parameters(params=result)
 
     def exists(self):
+        known, result = self.collection.lookup(self.want.name, self.want.partition)
+        if known:
+            return result is not None
         result = self.client.api.tm.ltm.nodes.node.exists(
             name=self.want.name,
             partition=self.want.partition
@@ -641,10 +710,19 @@ class ModuleManager(object):
         return result
 
     def update_node_offline_on_device(self):
+        self.collection.discard(self.want.name, self.want.partition)
         params = dict(
             session="user-disabled",
             state="user-down"
         )
+        if self.batch is not None:
+            # The node may be created by the same transaction, so it cannot
+            # be loaded yet. Queue the PATCH to its URI instead.
+            uri = '{0}~{1}~{2}'.format(
+                self.client.api.tm.ltm.nodes._meta_data['uri'], self.want.partition, self.want.name
+            )
+            self.submit(self.client.api._meta_data['icr_session'].patch, uri, json=params)
+            return
         result = self.client.api.tm.ltm.nodes.node.load(
             name=self.want.name,
             partition=self.want.partition
@@ -652,21 +730,25 @@ class ModuleManager(object):
         result.modify(**params)
 
     def update_on_device(self):
+        self.collection.discard(self.want.name, self.want.partition)
         params = self.changes.api_params()
         result = self.client.api.tm.ltm.nodes.node.load(
             name=self.want.name,
             partition=self.want.partition
         )
-        result.modify(**params)
+        self.submit(result.modify, **params)
 
     def create_on_device(self):
+        self.collection.discard(self.want.name, self.want.partition)
         params = self.want.api_params()
-        resource = self.client.api.tm.ltm.nodes.node.create(
+        resource = self.submit(
+            self.client.api.tm.ltm.nodes.node.create,
             name=self.want.name,
             partition=self.want.partition,
             **params
         )
-        self._wait_for_fqdn_checks(resource)
+        if self.batch is None:
+            self._wait_for_fqdn_checks(resource)
 
     def _wait_for_fqdn_checks(self, resource):
         while True:
@@ -677,19 +759,72 @@ class ModuleManager(object):
                 break
 
     def remove_from_device(self):
+        self.collection.discard(self.want.name, self.want.partition)
         result = self.client.api.tm.ltm.nodes.node.load(
             name=self.want.name,
             partition=self.want.partition
         )
         if result:
-            result.delete()
+            self.submit(result.delete)
+
+
+class AggregateManager(object):
+    """Manages the nodes listed in the ``aggregate`` parameter
+
+    Each node is compared with the device by its own ``ModuleManager``, but
+    their changes are queued and committed in a single transaction. The
+    existence checks and reads are answered from one fetch of the node
+    collection.
+    """
+    def __init__(self, *args, **kwargs):
+        self.module = kwargs.get('module', None)
+        self.client = kwargs.get('client', None)
+        self.batch = TransactionBatch(self.client)
+        self.collection = CollectionSnapshot(self.read_collection_from_device)
+
+    def read_collection_from_device(self):
+        collection = self.client.api.tm.ltm.nodes.get_collection()
+        return [resource.attrs for resource in collection]
+
+    def get_item_params(self, item):
+        result = dict(self.module.params)
+        result.update(dict((k, v) for k, v in iteritems(item) if v is not None))
+        result['aggregate'] = None
+        return result
+
+    def exec_module(self):
+        managers = []
+        for item in self.module.params['aggregate']:
+            mm = ModuleManager(
+                module=self.module, client=self.client, params=self.get_item_params(item),
+                batch=self.batch, collection=self.collection
+            )
+            managers.append((mm, mm.exec_module()))
+
+        errors = self.batch.commit()
+
+        aggregate = []
+        for mm, result in managers:
+            name = fq_name(mm.want.partition, mm.want.name)
+            aggregate.append(dict(name=name, changed=result['changed']))
+        if errors:
+            error = 'Failed to commit {0} of {1} nodes.'.format(len(errors), len(aggregate))
+            for name, message in iteritems(errors):
+                error += ' {0}: {1}'.format(name, message)
+            raise F5ModuleError(error)
+
+        result = dict(
+            changed=any(x['changed'] for x in aggregate),
+            aggregate=aggregate
+        )
+        return result
 
 
 class ArgumentSpec(object):
     def __init__(self):
         self.supports_check_mode = True
-        argument_spec = dict(
-            name=dict(required=True),
+        element_spec = dict(
+            name=dict(),
             address=dict(
                 aliases=['host', 'ip']
             ),
@@ -713,9 +848,25 @@ class ArgumentSpec(object):
                 fallback=(env_fallback, ['F5_PARTITION'])
             )
         )
+        aggregate_spec = deepcopy(element_spec)
+        aggregate_spec['name'] = dict(required=True)
+
+        # Options that an item does not set are taken from the task
+        remove_default_spec(aggregate_spec)
+
+        argument_spec = dict(
+            aggregate=dict(type='list', elements='dict', options=aggregate_spec)
+        )
+        argument_spec.update(element_spec)
         self.argument_spec = {}
         self.argument_spec.update(f5_argument_spec)
         self.argument_spec.update(argument_spec)
+        self.required_one_of = [
+            ['name', 'aggregate']
+        ]
+        self.mutually_exclusive = [
+            ['name', 'aggregate']
+        ]
 
 
 def main():
@@ -723,7 +874,9 @@ def main():
 
     module = AnsibleModule(
         argument_spec=spec.argument_spec,
-        supports_check_mode=spec.supports_check_mode
+        supports_check_mode=spec.supports_check_mode,
+        required_one_of=spec.required_one_of,
+        mutually_exclusive=spec.mutually_exclusive
     )
     if not HAS_F5SDK:
         module.fail_json(msg="The python f5-sdk module is required")
@@ -732,7 +885,10 @@ def main():
 
     try:
         client = F5Client(**module.params)
-        mm = ModuleManager(module=module, client=client)
+        if module.params['aggregate']:
+            mm = AggregateManager(module=module, client=client)
+        else:
+            mm = ModuleManager(module=module, client=client)
         results = mm.exec_module()
         cleanup_tokens(client)
         module.exit_json(**results)
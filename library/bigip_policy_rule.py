@@ -57,7 +57,42 @@ options:
   name:
     description:
       - The name of the rule.
-    required: True
+      - One of C(name) or C(rules) is required.
+  rules:
+    description:
+      - A list of rules to manage in the policy in one task, in place of
+        C(name), C(description), C(conditions) and C(actions).
+      - The rules of the policy are read once and compared with this list.
+        The rules that need to be created, changed or removed are then all
+        changed in a single draft of the policy, which is published once.
+      - When C(state) is C(absent), the rules in the list are removed from
+        the policy.
+      - One of C(name) or C(rules) is required.
+    version_added: 2.7
+    suboptions:
+      name:
+        description:
+          - The name of the rule.
+        required: True
+      description:
+        description:
+          - Description of the policy rule.
+      conditions:
+        description:
+          - A list of attributes that describe the condition.
+          - Takes the same values as the C(conditions) option.
+      actions:
+        description:
+          - The actions that you want the policy rule to perform.
+          - Takes the same values as the C(actions) option.
+  replace_all_with:
+    description:
+      - When C(yes), the rules of the policy that are not in C(rules) are
+        removed from it, in the same draft as the other changes.
+      - This parameter is only valid with C(rules) and a C(state) of C(present).
+    type: bool
+    default: no
+    version_added: 2.7
   conditions:
     description:
       - A list of attributes that describe the condition.
@@ -145,6 +180,27 @@ EXAMPLES = r'''
         - type: http_uri
           path_starts_with: /HomePage/
 
+- name: Replace all of the rules of the policy, publishing it once
+  bigip_policy_rule:
+    policy: Policy-Foo
+    rules:
+      - name: rule1
+        actions:
+          - type: forward
+            pool: pool-svrs
+        conditions:
+          - type: http_uri
+            path_begins_with_any: /euro
+      - name: rule2
+        actions:
+          - type: forward
+            pool: pool-svrs
+        conditions:
+          - type: http_uri
+            path_begins_with_any: /HomePage/
+    replace_all_with: yes
+  delegate_to: localhost
+
 - name: Remove all rules and confitions from the rule
   bigip_policy_rule:
     policy: Policy-Foo
@@ -194,8 +250,17 @@ description:
   returned: changed
   type: string
   sample: My rule
+rules:
+  description:
+    - The result of each rule that was in C(rules), in the order they were
+      given, followed by the rules removed because of C(replace_all_with).
+  returned: when C(rules) is specified
+  type: complex
+  sample: [{"name": "rule1", "changed": true, "state": "present"}]
 '''
 
+from collections import OrderedDict
+
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.basic import env_fallback
 from ansible.module_utils.six import iteritems
@@ -793,44 +858,179 @@ class ModuleManager(object):
         return ApiParameters(params=resource.attrs)
 
 
+class BulkManager(ModuleManager):
+    """Manages many rules of the policy in one draft
+
+    The rules of the policy, or of its draft when there is one, are read in
+    one request and compared with the wanted rules in memory. The rules to
+    create, change and remove are then all applied to a single draft, which
+    is published once, so that the device compiles the policy only once.
+    """
+    def exec_module(self):
+        if self.want.replace_all_with and self.want.state == 'absent':
+            raise F5ModuleError(
+                "The 'replace_all_with' parameter can only be used when 'state' is 'present'."
+            )
+        redraft = self.draft_exists()
+        current = self.read_rules_from_device(redraft)
+        wants = OrderedDict((x['name'], self._rule_parameters(x)) for x in self.want.rules)
+
+        results = OrderedDict()
+        creates = []
+        updates = []
+        removes = []
+        if self.want.state == 'present':
+            for name, want in iteritems(wants):
+                if name in current:
+                    have = ApiParameters(params=current[name].attrs)
+                else:
+                    have = ApiParameters()
+                changes = self._rule_changes(want, have)
+                results[name] = dict(name=name, changed=False, state='present')
+                if changes is None and name in current:
+                    continue
+                if name in current:
+                    updates.append((name, changes))
+                else:
+                    creates.append((name, changes or UsableChanges()))
+                results[name]['changed'] = True
+            if self.want.replace_all_with:
+                removes = [x for x in current if x not in wants]
+        else:
+            for name in wants:
+                results[name] = dict(name=name, changed=False, state='absent')
+            removes = [x for x in wants if x in current]
+        for name in removes:
+            results[name] = dict(name=name, changed=True, state='absent')
+
+        result = dict(rules=list(results.values()))
+        result['changed'] = bool(creates or updates or removes)
+        if not result['changed'] or self.module.check_mode:
+            return result
+
+        try:
+            if redraft is False:
+                self._create_existing_policy_draft_on_device()
+                current = self.read_rules_from_device(True)
+            self.apply_on_device(current, creates, updates, removes)
+            if redraft is False:
+                self.publish_on_device()
+        except iControlUnexpectedHTTPError as e:
+            raise F5ModuleError(str(e))
+        return result
+
+    def _rule_parameters(self, rule):
+        params = dict(
+            name=rule['name'],
+            description=rule.get('description', None),
+            conditions=rule.get('conditions', None),
+            actions=rule.get('actions', None),
+            policy=self.want.policy,
+            partition=self.want.partition
+        )
+        return ModuleParameters(params=params)
+
+    def _rule_changes(self, want, have):
+        diff = Difference(want, have)
+        changed = dict()
+        for k in Parameters.updatables:
+            change = diff.compare(k)
+            if change is None:
+                continue
+            if isinstance(change, dict):
+                changed.update(change)
+            else:
+                changed[k] = change
+        if changed:
+            return UsableChanges(params=changed)
+        return None
+
+    def apply_on_device(self, current, creates, updates, removes):
+        policy = self.client.api.tm.ltm.policys.policy.load(
+            name=self.want.policy,
+            partition=self.want.partition,
+            subPath='Drafts'
+        )
+        for name, changes in creates:
+            policy.rules_s.rules.create(
+                name=name,
+                **changes.api_params()
+            )
+        for name, changes in updates:
+            current[name].modify(**changes.api_params())
+        for name in removes:
+            current[name].delete()
+
+    def read_rules_from_device(self, draft=False):
+        args = dict(
+            name=self.want.policy,
+            partition=self.want.partition,
+        )
+        if draft:
+            args['subPath'] = 'Drafts'
+        policy = self.client.api.tm.ltm.policys.policy.load(**args)
+        rules = policy.rules_s.get_collection(
+            requests_params=dict(
+                params='expandSubcollections=true'
+            )
+        )
+        return OrderedDict((x.name, x) for x in rules)
+
+
 class ArgumentSpec(object):
     def __init__(self):
         self.supports_check_mode = True
+        actions = dict(
+            type='list',
+            elements='dict',
+            options=dict(
+                type=dict(
+                    choices=[
+                        'forward',
+                        'enable',
+                        'ignore'
+                    ],
+                    required=True
+                ),
+                pool=dict(),
+                asm_policy=dict()
+            ),
+            mutually_exclusive=[
+                ['pool', 'asm_policy']
+            ]
+        )
+        conditions = dict(
+            type='list',
+            options=dict(
+                type=dict(
+                    choices=[
+                        'http_uri',
+                        'all_traffic'
+                    ],
+                    required=True
+                ),
+                path_begins_with_any=dict()
+            ),
+        )
         argument_spec = dict(
             description=dict(),
-            actions=dict(
+            actions=actions,
+            conditions=conditions,
+            name=dict(),
+            rules=dict(
                 type='list',
                 elements='dict',
                 options=dict(
-                    type=dict(
-                        choices=[
-                            'forward',
-                            'enable',
-                            'ignore'
-                        ],
-                        required=True
-                    ),
-                    pool=dict(),
-                    asm_policy=dict()
-                ),
-                mutually_exclusive=[
-                    ['pool', 'asm_policy']
-                ]
+                    name=dict(required=True),
+                    description=dict(),
+                    conditions=conditions,
+                    actions=actions
+                )
             ),
-            conditions=dict(
-                type='list',
-                options=dict(
-                    type=dict(
-                        choices=[
-                            'http_uri',
-                            'all_traffic'
-                        ],
-                        required=True
-                    ),
-                    path_begins_with_any=dict()
-                ),
+            replace_all_with=dict(
+                type='bool',
+                default='no'
             ),
-            name=dict(required=True),
             policy=dict(required=True),
             state=dict(
                 default='present',
@@ -844,6 +1044,15 @@ class ArgumentSpec(object):
         self.argument_spec = {}
         self.argument_spec.update(f5_argument_spec)
         self.argument_spec.update(argument_spec)
+        self.mutually_exclusive = [
+            ['name', 'rules'],
+            ['description', 'rules'],
+            ['conditions', 'rules'],
+            ['actions', 'rules']
+        ]
+        self.required_one_of = [
+            ['name', 'rules']
+        ]
 
 
 def main():
@@ -851,14 +1060,19 @@ def main():
 
     module = AnsibleModule(
         argument_spec=spec.argument_spec,
-        supports_check_mode=spec.supports_check_mode
+        supports_check_mode=spec.supports_check_mode,
+        mutually_exclusive=spec.mutually_exclusive,
+        required_one_of=spec.required_one_of
     )
     if not HAS_F5SDK:
         module.fail_json(msg="The python f5-sdk module is required")
 
     try:
         client = F5Client(**module.params)
-        mm = ModuleManager(module=module, client=client)
+        if module.params['rules']:
+            mm = BulkManager(module=module, client=client)
+        else:
+            mm = ModuleManager(module=module, client=client)
         results = mm.exec_module()
         cleanup_tokens(client)
         module.exit_json(**results)
@@ -148,6 +148,9 @@ notes:
   - To add members do a pool, use the C(bigip_pool_member) module. Previously, the
     C(bigip_pool) module allowed the management of users, but this has been removed
     in version 2.5 of Ansible.
+  - When looping over many pools, set the C(F5_COLLECTION_CACHE_TTL) environment
+    variable to a number of seconds to look them up in a copy of the pool
+    collection fetched once, instead of asking the device about each one.
 extends_documentation_fragment: f5
 author:
   - Tim Rupp (@caphrim007)
@@ -347,6 +350,7 @@ try:
     from library.module_utils.network.f5.bigip import F5Client
     from library.module_utils.network.f5.common import F5ModuleError
     from library.module_utils.network.f5.common import AnsibleF5Parameters
+    from library.module_utils.network.f5.common import CollectionCache
     from library.module_utils.network.f5.common import cleanup_tokens
     from library.module_utils.network.f5.common import fqdn_name
     from library.module_utils.network.f5.common import f5_argument_spec
@@ -361,6 +365,7 @@ except ImportError:
     from ansible.module_utils.network.f5.bigip import F5Client
     from ansible.module_utils.network.f5.common import F5ModuleError
     from ansible.module_utils.network.f5.common import AnsibleF5Parameters
+    from ansible.module_utils.network.f5.common import CollectionCache
     from ansible.module_utils.network.f5.common import cleanup_tokens
     from ansible.module_utils.network.f5.common import fqdn_name
     from ansible.module_utils.network.f5.common import f5_argument_spec
@@ -715,6 +720,15 @@ class ModuleManager(object):
         self.want = ModuleParameters(params=self.module.params)
         self.have = ApiParameters()
         self.changes = UsableChanges()
+        self._collection = None
+
+    @property
+    def collection(self):
+        if self._collection is None:
+            self._collection = CollectionCache(
+                self.client, 'ltm/pool', self.read_collection_from_device
+            )
+        return self._collection
 
     def exec_module(self):
         changed = False
@@ -836,12 +850,14 @@ class ModuleManager(object):
         return True
 
     def create_on_device(self):
+        self.collection.discard(self.want.name, self.want.partition)
         params = self.want.api_params()
         self.client.api.tm.ltm.pools.pool.create(
             partition=self.want.partition, **params
         )
 
     def update_on_device(self):
+        self.collection.discard(self.want.name, self.want.partition)
         params = self.want.api_params()
         result = self.client.api.tm.ltm.pools.pool.load(
             name=self.want.name,
@@ -850,19 +866,34 @@ class ModuleManager(object):
         result.modify(**params)
 
     def exists(self):
+        known, result = self.collection.lookup(self.want.name, self.want.partition)
+        if known:
+            return result is not None
         return self.client.api.tm.ltm.pools.pool.exists(
             name=self.want.name,
             partition=self.want.partition
         )
 
     def remove_from_device(self):
+        self.collection.discard(self.want.name, self.want.partition)
         result = self.client.api.tm.ltm.pools.pool.load(
             name=self.want.name,
             partition=self.want.partition
         )
         result.delete()
 
+    def read_collection_from_device(self):
+        collection = self.client.api.tm.ltm.pools.get_collection(
+            requests_params=dict(
+                params='expandSubcollections=true'
+            )
+        )
+        return [resource.attrs for resource in collection]
+
     def read_current_from_device(self):
+        known, result = self.collection.lookup(self.want.name, self.want.partition)
+        if known and result is not None:
+            return ApiParameters(params=result)
         resource = self.client.api.tm.ltm.pools.pool.load(
             name=self.want.name,
             partition=self.want.partition,
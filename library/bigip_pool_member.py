@@ -40,7 +40,7 @@ options:
   pool:
     description:
       - Pool name. This pool must exist.
-    required: True
+      - Required when C(aggregate) is not used.
   partition:
     description:
       - Partition
@@ -71,7 +71,7 @@ options:
     description:
       - Pool member port.
       - This value cannot be changed after it has been set.
-    required: True
+      - Required when C(aggregate) is not used.
   connection_limit:
     description:
       - Pool member connection limit. Setting this to 0 disables the limit.
@@ -121,6 +121,19 @@ options:
       - When creating a new pool member, the default for this parameter is C(yes).
       - This parameter is ignored when C(reuse_nodes) is C(yes).
     version_added: 2.6
+  aggregate:
+    description:
+      - List of pool members to manage. Each item takes the same options as this
+        module, and options that an item does not set are taken from the task.
+      - The changes to all of the pool members are committed in a single
+        transaction. If the device rejects any of them, none of the pool members
+        are changed.
+    version_added: 2.7
+notes:
+  - When looping over many pool members, set the C(F5_COLLECTION_CACHE_TTL)
+    environment variable to a number of seconds to look them up in a copy of the
+    pool collection (with its members) fetched once, instead of asking the device
+    about each one.
 extends_documentation_fragment: f5
 author:
   - Tim Rupp (@caphrim007)
@@ -206,6 +219,24 @@ EXAMPLES = '''
     - host: 4.4.4.4
       name: web4
       priority_group: 1      
+
+- name: Add many members to a pool in a single transaction
+  bigip_pool_member:
+    server: lb.mydomain.com
+    user: admin
+    password: secret
+    pool: my-pool
+    partition: Common
+    port: 80
+    aggregate:
+      - host: 1.1.1.1
+        name: web1
+      - host: 2.2.2.2
+        name: web2
+      - host: 3.3.3.3
+        name: web3
+        port: 8080
+  delegate_to: localhost
 '''
 
 RETURN = '''
@@ -249,10 +280,19 @@ address:
   returned: changed
   type: string
   sample: 1.2.3.4
+aggregate:
+  description:
+    - Whether each pool member in C(aggregate) was changed.
+  returned: changed and success
+  type: list
+  sample: [{"pool": "/Common/my-pool", "name": "/Common/web1:80", "changed": true}]
 '''
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.basic import env_fallback
+from ansible.module_utils.network.common.utils import remove_default_spec
+from ansible.module_utils.six import iteritems
+from copy import deepcopy
 
 HAS_DEVEL_IMPORTS = False
 
@@ -260,10 +300,14 @@ try:
     # Sideband repository used for dev
     from library.module_utils.network.f5.bigip import HAS_F5SDK
     from library.module_utils.network.f5.bigip import F5Client
+    from library.module_utils.network.f5.bigip import TransactionBatch
     from library.module_utils.network.f5.common import F5ModuleError
     from library.module_utils.network.f5.common import AnsibleF5Parameters
+    from library.module_utils.network.f5.common import CollectionCache
+    from library.module_utils.network.f5.common import CollectionSnapshot
     from library.module_utils.network.f5.common import cleanup_tokens
     from library.module_utils.network.f5.common import fqdn_name
+    from library.module_utils.network.f5.common import fq_name
     from library.module_utils.network.f5.common import is_valid_hostname
     from library.module_utils.network.f5.common import f5_argument_spec
     try:
@@ -275,10 +319,14 @@ except ImportError:
     # Upstream Ansible
     from ansible.module_utils.network.f5.bigip import HAS_F5SDK
     from ansible.module_utils.network.f5.bigip import F5Client
+    from ansible.module_utils.network.f5.bigip import TransactionBatch
     from ansible.module_utils.network.f5.common import F5ModuleError
     from ansible.module_utils.network.f5.common import AnsibleF5Parameters
+    from ansible.module_utils.network.f5.common import CollectionCache
+    from ansible.module_utils.network.f5.common import CollectionSnapshot
     from ansible.module_utils.network.f5.common import cleanup_tokens
     from ansible.module_utils.network.f5.common import fqdn_name
+    from ansible.module_utils.network.f5.common import fq_name
     from ansible.module_utils.network.f5.common import is_valid_hostname
     from ansible.module_utils.network.f5.common import f5_argument_spec
     try:
@@ -537,9 +585,51 @@ class ModuleManager(object):
     def __init__(self, *args, **kwargs):
         self.module = kwargs.get('module', None)
         self.client = kwargs.get('client', None)
-        self.want = ModuleParameters(params=self.module.params)
+        self.batch = kwargs.get('batch', None)
+        self.want = ModuleParameters(params=kwargs.get('params', None) or self.module.params)
         self.have = ApiParameters()
         self.changes = UsableChanges()
+        self._pools = kwargs.get('pools', None)
+        self._nodes = kwargs.get('nodes', None)
+
+    @property
+    def pools(self):
+        if self._pools is None:
+            self._pools = CollectionCache(
+                self.client, 'ltm/pool', self.read_pools_from_device
+            )
+        return self._pools
+
+    @property
+    def nodes(self):
+        if self._nodes is None:
+            self._nodes = CollectionCache(
+                self.client, 'ltm/node', self.read_nodes_from_device
+            )
+        return self._nodes
+
+    @property
+    def member_path(self):
+        return fqdn_name(self.want.partition, self.want.full_name)
+
+    @property
+    def node_path(self):
+        return fq_name(self.want.partition, self.want.node_name)
+
+    def submit(self, func, *args, **kwargs):
+        """Makes a change on the device, or queues it when batching changes"""
+        item = '{0} {1}'.format(fq_name(self.want.partition, self.want.pool), self.member_path)
+        return self.submit_for(item, func, *args, **kwargs)
+
+    def submit_for(self, item, func, *args, **kwargs):
+        if self.batch is None:
+            return func(*args, **kwargs)
+        self.batch.add(item, func, *args, **kwargs)
+
+    def discard_from_cache(self):
+        self.pools.discard(self.want.pool, self.want.partition, member=self.member_path)
+        # Members implicitly create, and may remove, their node
+        self.nodes.discard(self.want.node_name, self.want.partition)
 
     def _set_changed_options(self):
         changed = {}
@@ -608,6 +698,12 @@ class ModuleManager(object):
             return self.create()
 
     def exists(self):
+        known, pool = self.pools.lookup(self.want.pool, self.want.partition)
+        if known and pool is None:
+            raise F5ModuleError('The specified pool does not exist')
+        known, result = self.pools.lookup(self.want.pool, self.want.partition, member=self.member_path)
+        if known:
+            return result is not None
         try:
             pool = self.client.api.tm.ltm.pools.pool.load(
                 name=self.want.pool,
@@ -622,6 +718,9 @@ class ModuleManager(object):
         return result
 
     def node_exists(self):
+        known, result = self.nodes.lookup(self.want.node_name, self.want.partition)
+        if known:
+            return result is not None
         resource = self.client.api.tm.ltm.nodes.node.exists(
             name=self.want.node_name,
             partition=self.want.partition
@@ -643,7 +742,7 @@ class ModuleManager(object):
         self.remove_from_device()
         if not self.want.preserve_node:
             self.remove_node_from_device()
-        if self.exists():
+        if self.batch is None and self.exists():
             raise F5ModuleError("Failed to delete the resource.")
         return True
 
@@ -728,18 +827,21 @@ class ModuleManager(object):
         return True
 
     def create_on_device(self):
+        self.discard_from_cache()
         params = self.changes.api_params()
         pool = self.client.api.tm.ltm.pools.pool.load(
             name=self.want.pool,
             partition=self.want.partition
         )
-        pool.members_s.members.create(
+        self.submit(
+            pool.members_s.members.create,
             name=self.want.full_name,
             partition=self.want.partition,
             **params
         )
 
     def update_on_device(self):
+        self.discard_from_cache()
         params = self.changes.api_params()
         pool = self.client.api.tm.ltm.pools.pool.load(
             name=self.want.pool,
@@ -749,7 +851,7 @@ class ModuleManager(object):
             name=self.want.full_name,
             partition=self.want.partition
         )
-        resource.modify(**params)
+        self.submit(resource.modify, **params)
 
     def absent(self):
         if self.exists():
@@ -759,6 +861,7 @@ class ModuleManager(object):
         return False
 
     def remove_from_device(self):
+        self.discard_from_cache()
         pool = self.client.api.tm.ltm.pools.pool.load(
             name=self.want.pool,
             partition=self.want.partition
@@ -768,17 +871,37 @@ class ModuleManager(object):
             partition=self.want.partition
         )
         if resource:
-            resource.delete()
+            self.submit(resource.delete)
 
     def remove_node_from_device(self):
+        # Members of different pools may share a node, which must only be
+        # deleted once in a transaction
+        if self.batch is not None and self.node_path in self.batch:
+            return
+        self.nodes.discard(self.want.node_name, self.want.partition)
         resource = self.client.api.tm.ltm.nodes.node.load(
             name=self.want.node_name,
             partition=self.want.partition
         )
         if resource:
-            resource.delete()
+            self.submit_for(self.node_path, resource.delete)
+
+    def read_pools_from_device(self):
+        collection = self.client.api.tm.ltm.pools.get_collection(
+            requests_params=dict(
+                params='expandSubcollections=true'
+            )
+        )
+        return [resource.attrs for resource in collection]
+
+    def read_nodes_from_device(self):
+        collection = self.client.api.tm.ltm.nodes.get_collection()
+        return [resource.attrs for resource in collection]
 
     def read_current_from_device(self):
+        known, result = self.pools.lookup(self.want.pool, self.want.partition, member=self.member_path)
+        if known and result is not None:
+            return ApiParameters(params=result)
         pool = self.client.api.tm.ltm.pools.pool.load(
             name=self.want.pool,
             partition=self.want.partition
@@ -790,6 +913,9 @@ class ModuleManager(object):
         return ApiParameters(params=resource.attrs)
 
     def read_current_node_from_device(self, node):
+        known, result = self.nodes.lookup(node, self.want.partition)
+        if known and result is not None:
+            return NodeApiParameters(params=result)
         resource = self.client.api.tm.ltm.nodes.node.load(
             name=node,
             partition=self.want.partition
@@ -797,17 +923,88 @@ class ModuleManager(object):
         return NodeApiParameters(params=resource.attrs)
 
 
+class AggregateManager(object):
+    """Manages the pool members listed in the ``aggregate`` parameter
+
+    Each member is compared with the device by its own ``ModuleManager``, but
+    their changes are queued and committed in a single transaction. The
+    existence checks and reads are answered from one fetch each of the pool
+    and node collections.
+    """
+    def __init__(self, *args, **kwargs):
+        self.module = kwargs.get('module', None)
+        self.client = kwargs.get('client', None)
+        self.batch = TransactionBatch(self.client)
+        self.pools = CollectionSnapshot(self.read_pools_from_device)
+        self.nodes = CollectionSnapshot(self.read_nodes_from_device)
+
+    def read_pools_from_device(self):
+        collection = self.client.api.tm.ltm.pools.get_collection(
+            requests_params=dict(
+                params='expandSubcollections=true'
+            )
+        )
+        return [resource.attrs for resource in collection]
+
+    def read_nodes_from_device(self):
+        collection = self.client.api.tm.ltm.nodes.get_collection()
+        return [resource.attrs for resource in collection]
+
+    def get_item_params(self, item):
+        result = dict(self.module.params)
+        result.update(dict((k, v) for k, v in iteritems(item) if v is not None))
+        result['aggregate'] = None
+        return result
+
+    def exec_module(self):
+        items = [self.get_item_params(x) for x in self.module.params['aggregate']]
+        for key in ['pool', 'port']:
+            if any(x[key] is None for x in items):
+                raise F5ModuleError(
+                    "The '{0}' parameter is required for every item in 'aggregate'.".format(key)
+                )
+
+        managers = []
+        for params in items:
+            mm = ModuleManager(
+                module=self.module, client=self.client, params=params,
+                batch=self.batch, pools=self.pools, nodes=self.nodes
+            )
+            managers.append((mm, mm.exec_module()))
+
+        errors = self.batch.commit()
+
+        aggregate = []
+        for mm, result in managers:
+            aggregate.append(dict(
+                pool=fq_name(mm.want.partition, mm.want.pool),
+                name=mm.member_path,
+                changed=bool(result['changed'])
+            ))
+        if errors:
+            error = 'Failed to commit {0} of {1} changes.'.format(len(errors), len(self.batch.names))
+            for name, message in iteritems(errors):
+                error += ' {0}: {1}'.format(name, message)
+            raise F5ModuleError(error)
+
+        result = dict(
+            changed=any(x['changed'] for x in aggregate),
+            aggregate=aggregate
+        )
+        return result
+
+
 class ArgumentSpec(object):
     def __init__(self):
         self.supports_check_mode = True
-        argument_spec = dict(
-            pool=dict(required=True),
+        element_spec = dict(
+            pool=dict(),
             address=dict(aliases=['host', 'ip']),
             fqdn=dict(
                 aliases=['hostname']
             ),
             name=dict(),
-            port=dict(type='int', required=True),
+            port=dict(type='int'),
             connection_limit=dict(type='int'),
             description=dict(),
             rate_limit=dict(type='int'),
@@ -830,6 +1027,25 @@ class ArgumentSpec(object):
             session_state=dict(choices=['enabled', 'disabled']),
             monitor_state=dict(choices=['enabled', 'disabled']),
         )
+        aggregate_spec = deepcopy(element_spec)
+
+        # Options that an item does not set are taken from the task
+        remove_default_spec(aggregate_spec)
+
+        argument_spec = dict(
+            aggregate=dict(
+                type='list',
+                elements='dict',
+                options=aggregate_spec,
+                mutually_exclusive=[
+                    ['address', 'fqdn']
+                ],
+                required_one_of=[
+                    ['name', 'address', 'fqdn']
+                ]
+            )
+        )
+        argument_spec.update(element_spec)
         self.argument_spec = {}
         self.argument_spec.update(f5_argument_spec)
         self.argument_spec.update(argument_spec)
@@ -837,7 +1053,9 @@ class ArgumentSpec(object):
             ['address', 'fqdn']
         ]
         self.required_one_of = [
-            ['name', 'address', 'fqdn'],
+            ['name', 'address', 'fqdn', 'aggregate'],
+            ['pool', 'aggregate'],
+            ['port', 'aggregate']
         ]
 
 
@@ -846,7 +1064,9 @@ def main():
 
     module = AnsibleModule(
         argument_spec=spec.argument_spec,
-        supports_check_mode=spec.supports_check_mode
+        supports_check_mode=spec.supports_check_mode,
+        mutually_exclusive=spec.mutually_exclusive,
+        required_one_of=spec.required_one_of
     )
     if not HAS_F5SDK:
         module.fail_json(msg="The python f5-sdk module is required")
@@ -855,7 +1075,10 @@ def main():
 
     try:
         client = F5Client(**module.params)
-        mm = ModuleManager(module=module, client=client)
+        if module.params['aggregate']:
+            mm = AggregateManager(module=module, client=client)
+        else:
+            mm = ModuleManager(module=module, client=client)
         results = mm.exec_module()
         cleanup_tokens(client)
         module.exit_json(**results)
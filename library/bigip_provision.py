@@ -118,6 +118,7 @@ try:
     from library.module_utils.network.f5.common import cleanup_tokens
     from library.module_utils.network.f5.common import fqdn_name
     from library.module_utils.network.f5.common import f5_argument_spec
+    from library.module_utils.network.f5.common import Waiter
     try:
         from library.module_utils.network.f5.common import iControlUnexpectedHTTPError
     except ImportError:
@@ -132,6 +133,7 @@ except ImportError:
     from ansible.module_utils.network.f5.common import cleanup_tokens
     from ansible.module_utils.network.f5.common import fqdn_name
     from ansible.module_utils.network.f5.common import f5_argument_spec
+    from ansible.module_utils.network.f5.common import Waiter
     try:
         from ansible.module_utils.network.f5.common import iControlUnexpectedHTTPError
     except ImportError:
@@ -406,26 +408,27 @@ class ModuleManager(object):
 
     def _wait_for_module_provisioning(self):
         # To prevent things from running forever, the hack is to check
-        # for mprov's status twice. If mprov is finished, then in most
+        # for mprov's status three times. If mprov is finished, then in most
         # cases (not ASM) the provisioning is probably ready.
-        nops = 0
-
+        #
         # Sleep a little to let provisioning settle and begin properly
-        time.sleep(5)
+        waiter = Waiter(interval=5, max_interval=15, delay=5)
+        waiter.wait(
+            self._read_mprov_state_from_device,
+            done=lambda x: not x,
+            settle=3
+        )
 
-        while nops < 3:
+    def _read_mprov_state_from_device(self):
+        try:
+            return self._is_mprov_running_on_device()
+        except Exception:
+            # This can be caused by restjavad restarting.
             try:
-                if not self._is_mprov_running_on_device():
-                    nops += 1
-                else:
-                    nops = 0
+                self.client.reconnect()
             except Exception:
-                # This can be caused by restjavad restarting.
-                try:
-                    self.client.reconnect()
-                except Exception:
-                    pass
-            time.sleep(5)
+                pass
+        return True
 
     def _is_mprov_running_on_device(self):
         # /usr/libexec/qemu-kvm is added here to prevent vcmp provisioning
@@ -456,20 +459,22 @@ class ModuleManager(object):
         the Policies API to stop raising errors
         :return:
         """
-        nops = 0
-        restarted_asm = False
-        while nops < 3:
-            try:
-                policies = self.client.api.tm.asm.policies_s.get_collection()
-                if len(policies) >= 0:
-                    nops += 1
-                else:
-                    nops = 0
-            except Exception as ex:
-                if not restarted_asm:
-                    self._restart_asm()
-                    restarted_asm = True
-            time.sleep(5)
+        waiter = Waiter(interval=5)
+        state = dict(restarted_asm=False)
+        waiter.wait(
+            lambda: self._is_asm_ready_on_device(state),
+            settle=3
+        )
+
+    def _is_asm_ready_on_device(self, state):
+        try:
+            self.client.api.tm.asm.policies_s.get_collection()
+            return True
+        except Exception:
+            if not state['restarted_asm']:
+                self._restart_asm()
+                state['restarted_asm'] = True
+        return False
 
     def _restart_asm(self):
         try:
@@ -496,27 +501,21 @@ class ModuleManager(object):
         return None
 
     def _wait_for_reboot(self):
-        nops = 0
-
         last_reboot = self._get_last_reboot()
 
-        # Sleep a little to let provisioning settle and begin properly
-        time.sleep(5)
+        # Sleep a little to let provisioning settle and begin properly.
+        # Exceptions can be caused by restjavad restarting.
+        waiter = Waiter(interval=10, max_interval=30, delay=5)
+        waiter.wait(
+            self._read_last_reboot_from_device,
+            done=lambda x: x is not None and x != last_reboot,
+            settle=6,
+            ignore=(Exception,)
+        )
 
-        while nops < 6:
-            try:
-                self.client.reconnect()
-                next_reboot = self._get_last_reboot()
-                if next_reboot is None:
-                    nops = 0
-                if next_reboot == last_reboot:
-                    nops = 0
-                else:
-                    nops += 1
-            except Exception as ex:
-                # This can be caused by restjavad restarting.
-                pass
-            time.sleep(10)
+    def _read_last_reboot_from_device(self):
+        self.client.reconnect()
+        return self._get_last_reboot()
 
 
 class ArgumentSpec(object):
@@ -62,6 +62,8 @@ options:
         before it is considered failed. The command is run on the
         target device every retry and evaluated against the I(wait_for)
         conditionals.
+      - Only the commands whose output the unsatisfied I(wait_for)
+        conditionals refer to, as C(result[N]), are run again.
     default: 10
   interval:
     description:
@@ -69,6 +71,8 @@ options:
         of the command. If the command does not pass the specified
         conditional, the interval indicates how to long to wait before
         trying the command again.
+      - The interval doubles after each retry, up to 30 seconds or
+        I(interval), whichever is longer.
     default: 1
 extends_documentation_fragment: f5
 author:
@@ -139,14 +143,12 @@ failed_conditions:
   sample: ['...', '...']
 '''
 
-import time
-
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.network.common.parsing import FailedConditionsError
 from ansible.module_utils.network.common.parsing import Conditional
 from ansible.module_utils.network.common.utils import ComplexList
 from ansible.module_utils.network.common.utils import to_list
 from ansible.module_utils.six import string_types
+from collections import OrderedDict
 from collections import deque
 
 HAS_DEVEL_IMPORTS = False
@@ -157,6 +159,7 @@ try:
     from library.module_utils.network.f5.bigip import F5Client
     from library.module_utils.network.f5.common import F5ModuleError
     from library.module_utils.network.f5.common import AnsibleF5Parameters
+    from library.module_utils.network.f5.common import CommandRunner
     from library.module_utils.network.f5.common import cleanup_tokens
     from library.module_utils.network.f5.common import fqdn_name
     from library.module_utils.network.f5.common import f5_argument_spec
@@ -171,6 +174,7 @@ except ImportError:
     from ansible.module_utils.network.f5.bigip import F5Client
     from ansible.module_utils.network.f5.common import F5ModuleError
     from ansible.module_utils.network.f5.common import AnsibleF5Parameters
+    from ansible.module_utils.network.f5.common import CommandRunner
     from ansible.module_utils.network.f5.common import cleanup_tokens
     from ansible.module_utils.network.f5.common import fqdn_name
     from ansible.module_utils.network.f5.common import f5_argument_spec
@@ -233,31 +237,19 @@ class ModuleManager(object):
         commands = self.parse_commands(warnings)
 
         wait_for = self.want.wait_for or list()
-        retries = self.want.retries
 
         conditionals = [Conditional(c) for c in wait_for]
 
         if self.module.check_mode:
             return
 
-        while retries > 0:
-            responses = self.execute_on_device(commands)
-
-            for item in list(conditionals):
-                if item(responses):
-                    if self.want.match == 'any':
-                        return item
-                    conditionals.remove(item)
-
-            if not conditionals:
-                break
-
-            time.sleep(self.want.interval)
-            retries -= 1
-        else:
-            failed_conditions = [item.raw for item in conditionals]
-            errmsg = 'One or more conditional statements have not been satisfied'
-            raise FailedConditionsError(errmsg, failed_conditions)
+        runner = CommandRunner(
+            self.execute_on_device,
+            retries=self.want.retries,
+            interval=self.want.interval,
+            match=self.want.match
+        )
+        responses = runner.wait(commands, conditionals)
 
         self.changes = Parameters({
             'stdout': responses,
@@ -267,7 +259,7 @@ class ModuleManager(object):
 
     def parse_commands(self, warnings):
         results = []
-        commands = list(deque(set(self.want.commands)))
+        commands = list(OrderedDict.fromkeys(self.want.commands))
         spec = dict(
             command=dict(key=True),
             output=dict(
@@ -296,6 +288,8 @@ class ModuleManager(object):
             )
             if hasattr(output, 'commandResult'):
                 responses.append(str(output.commandResult))
+            else:
+                responses.append(None)
         return responses
 
 
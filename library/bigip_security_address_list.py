@@ -77,6 +77,20 @@ options:
         of BIG-IP. If using C(bigip_command), this can be done with C(tmsh modify security
         firewall global-fqdn-policy FOO) where C(FOO) is a DNS resolver configured
         at C(tmsh create net dns-resolver FOO).
+  optimize:
+    description:
+      - When C(yes), the C(addresses) and C(address_ranges) are merged into
+        the fewest entries that cover the same addresses before they are
+        sent to the device.
+      - Addresses and ranges that overlap, or that are next to each other,
+        become one network in CIDR notation when they fill one exactly, or
+        one range when they do not.
+      - The addresses and ranges are treated as one set, so the address list
+        ends up with only the entries made from them.
+      - The number of entries before and after are returned in C(optimized).
+    type: bool
+    default: no
+    version_added: 2.7
   state:
     description:
       - When C(present), ensures that the address list and entries exists.
@@ -91,6 +105,17 @@ author:
 '''
 
 EXAMPLES = r'''
+- name: Create an address list from a feed, with as few entries as possible
+  bigip_security_address_list:
+    name: blocked
+    addresses: "{{ lookup('file', 'blocked.txt').splitlines() }}"
+    optimize: yes
+    password: secret
+    server: lb.mydomain.com
+    state: present
+    user: admin
+  delegate_to: localhost
+
 - name: Create an address list
   bigip_security_address_list:
     name: foo
@@ -146,6 +171,30 @@ geo_locations:
       returned: changed
       type: string
       sample: California
+optimized:
+  description: The number of addresses and ranges before, and after, they were optimized.
+  returned: when C(optimize) is C(yes)
+  type: complex
+  contains:
+    before:
+      description: Number of addresses and ranges that were given.
+      returned: when C(optimize) is C(yes)
+      type: int
+      sample: 1024
+    after:
+      description: Number of addresses and ranges that cover the same addresses.
+      returned: when C(optimize) is C(yes)
+      type: int
+      sample: 4
+delta:
+  description:
+    - The entries that were added to, and removed from, each of the lists
+      that changed.
+    - Addresses and ranges are compared in their canonical form, and ranges
+      that overlap are compared as one range.
+  returned: changed
+  type: complex
+  sample: {"addresses": {"added": ["10.0.0.0/24"], "removed": ["1.1.1.1"]}}
 '''
 
 import re
@@ -161,7 +210,9 @@ try:
     from library.module_utils.network.f5.bigip import F5Client
     from library.module_utils.network.f5.common import F5ModuleError
     from library.module_utils.network.f5.common import AnsibleF5Parameters
+    from library.module_utils.network.f5.common import ListDifference
     from library.module_utils.network.f5.common import cleanup_tokens
+    from library.module_utils.network.f5.common import collapse_ranges
     from library.module_utils.network.f5.common import fqdn_name
     from library.module_utils.network.f5.common import f5_argument_spec
     try:
@@ -175,7 +226,9 @@ except ImportError:
     from ansible.module_utils.network.f5.bigip import F5Client
     from ansible.module_utils.network.f5.common import F5ModuleError
     from ansible.module_utils.network.f5.common import AnsibleF5Parameters
+    from ansible.module_utils.network.f5.common import ListDifference
     from ansible.module_utils.network.f5.common import cleanup_tokens
+    from ansible.module_utils.network.f5.common import collapse_ranges
     from ansible.module_utils.network.f5.common import fqdn_name
     from ansible.module_utils.network.f5.common import f5_argument_spec
     try:
@@ -190,6 +243,307 @@ except ImportError:
     HAS_NETADDR = False
 
 
+# The ISO codes of the countries, by their name
+COUNTRY_ISO_MAP = {
+    'Afghanistan': 'AF',
+    'Albania': 'AL',
+    'Algeria': 'DZ',
+    'American Samoa': 'AS',
+    'Andorra': 'AD',
+    'Angola': 'AO',
+    'Anguilla': 'AI',
+    'Antarctica': 'AQ',
+    'Antigua and Barbuda': 'AG',
+    'Argentina': 'AR',
+    'Armenia': 'AM',
+    'Aruba': 'AW',
+    'Australia': 'AU',
+    'Austria': 'AT',
+    'Azerbaijan': 'AZ',
+    'Bahamas': 'BS',
+    'Bahrain': 'BH',
+    'Bangladesh': 'BD',
+    'Barbados': 'BB',
+    'Belarus': 'BY',
+    'Belgium': 'BE',
+    'Belize': 'BZ',
+    'Benin': 'BJ',
+    'Bermuda': 'BM',
+    'Bhutan': 'BT',
+    'Bolivia': 'BO',
+    'Bosnia and Herzegovina': 'BA',
+    'Botswana': 'BW',
+    'Brazil': 'BR',
+    'Brunei': 'BN',
+    'Bulgaria': 'BG',
+    'Burkina Faso': 'BF',
+    'Burundi': 'BI',
+    'Cameroon': 'CM',
+    'Canada': 'CA',
+    'Cape Verde': 'CV',
+    'Central African Republic': 'CF',
+    'Chile': 'CL',
+    'China': 'CN',
+    'Christmas Island': 'CX',
+    'Cocos Islands': 'CC',
+    'Colombia': 'CO',
+    'Cook Islands': 'CK',
+    'Costa Rica': 'CR',
+    'Cuba': 'CU',
+    'Curacao': 'CW',
+    'Cyprus': 'CY',
+    'Czech Republic': 'CZ',
+    'Democratic Republic of the Congo': 'CD',
+    'Denmark': 'DK',
+    'Djibouti': 'DJ',
+    'Dominica': 'DM',
+    'Dominican Republic': 'DO',
+    'Ecuador': 'EC',
+    'Egypt': 'EG',
+    'Eritrea': 'ER',
+    'Estonia': 'EE',
+    'Ethiopia': 'ET',
+    'Falkland Islands': 'FK',
+    'Faroe Islands': 'FO',
+    'Fiji': 'FJ',
+    'Finland': 'FI',
+    'France': 'FR',
+    'French Polynesia': 'PF',
+    'Gabon': 'GA',
+    'Gambia': 'GM',
+    'Georgia': 'GE',
+    'Germany': 'DE',
+    'Ghana': 'GH',
+    'Gilbraltar': 'GI',
+    'Greece': 'GR',
+    'Greenland': 'GL',
+    'Grenada': 'GD',
+    'Guam': 'GU',
+    'Guatemala': 'GT',
+    'Guernsey': 'GG',
+    'Guinea': 'GN',
+    'Guinea-Bissau': 'GW',
+    'Guyana': 'GY',
+    'Haiti': 'HT',
+    'Honduras': 'HN',
+    'Hong Kong': 'HK',
+    'Hungary': 'HU',
+    'Iceland': 'IS',
+    'India': 'IN',
+    'Indonesia': 'ID',
+    'Iran': 'IR',
+    'Iraq': 'IQ',
+    'Ireland': 'IE',
+    'Isle of Man': 'IM',
+    'Israel': 'IL',
+    'Italy': 'IT',
+    'Ivory Coast': 'CI',
+    'Jamaica': 'JM',
+    'Japan': 'JP',
+    'Jersey': 'JE',
+    'Jordan': 'JO',
+    'Kazakhstan': 'KZ',
+    'Laos': 'LA',
+    'Latvia': 'LV',
+    'Lebanon': 'LB',
+    'Lesotho': 'LS',
+    'Liberia': 'LR',
+    'Libya': 'LY',
+    'Liechtenstein': 'LI',
+    'Lithuania': 'LT',
+    'Luxembourg': 'LU',
+    'Macau': 'MO',
+    'Macedonia': 'MK',
+    'Madagascar': 'MG',
+    'Malawi': 'MW',
+    'Malaysia': 'MY',
+    'Maldives': 'MV',
+    'Mali': 'ML',
+    'Malta': 'MT',
+    'Marshall Islands': 'MH',
+    'Mauritania': 'MR',
+    'Mauritius': 'MU',
+    'Mayotte': 'YT',
+    'Mexico': 'MX',
+    'Micronesia': 'FM',
+    'Moldova': 'MD',
+    'Monaco': 'MC',
+    'Mongolia': 'MN',
+    'Montenegro': 'ME',
+    'Montserrat': 'MS',
+    'Morocco': 'MA',
+    'Mozambique': 'MZ',
+    'Myanmar': 'MM',
+    'Namibia': 'NA',
+    'Nauru': 'NR',
+    'Nepal': 'NP',
+    'Netherlands': 'NL',
+    'Netherlands Antilles': 'AN',
+    'New Caledonia': 'NC',
+    'New Zealand': 'NZ',
+    'Nicaragua': 'NI',
+    'Niger': 'NE',
+    'Nigeria': 'NG',
+    'Niue': 'NU',
+    'North Korea': 'KP',
+    'Northern Mariana Islands': 'MP',
+    'Norway': 'NO',
+    'Oman': 'OM',
+    'Pakistan': 'PK',
+    'Palau': 'PW',
+    'Palestine': 'PS',
+    'Panama': 'PA',
+    'Papua New Guinea': 'PG',
+    'Paraguay': 'PY',
+    'Peru': 'PE',
+    'Philippines': 'PH',
+    'Pitcairn': 'PN',
+    'Poland': 'PL',
+    'Portugal': 'PT',
+    'Puerto Rico': 'PR',
+    'Qatar': 'QA',
+    'Republic of the Congo': 'CG',
+    'Reunion': 'RE',
+    'Romania': 'RO',
+    'Russia': 'RU',
+    'Rwanda': 'RW',
+    'Saint Barthelemy': 'BL',
+    'Saint Helena': 'SH',
+    'Saint Kitts and Nevis': 'KN',
+    'Saint Lucia': 'LC',
+    'Saint Martin': 'MF',
+    'Saint Pierre and Miquelon': 'PM',
+    'Saint Vincent and the Grenadines': 'VC',
+    'Samoa': 'WS',
+    'San Marino': 'SM',
+    'Sao Tome and Principe': 'ST',
+    'Saudi Arabia': 'SA',
+    'Senegal': 'SN',
+    'Serbia': 'RS',
+    'Seychelles': 'SC',
+    'Sierra Leone': 'SL',
+    'Singapore': 'SG',
+    'Sint Maarten': 'SX',
+    'Slovakia': 'SK',
+    'Slovenia': 'SI',
+    'Solomon Islands': 'SB',
+    'Somalia': 'SO',
+    'South Africa': 'ZA',
+    'South Korea': 'KR',
+    'South Sudan': 'SS',
+    'Spain': 'ES',
+    'Sri Lanka': 'LK',
+    'Sudan': 'SD',
+    'Suriname': 'SR',
+    'Svalbard and Jan Mayen': 'SJ',
+    'Swaziland': 'SZ',
+    'Sweden': 'SE',
+    'Switzerland': 'CH',
+    'Syria': 'SY',
+    'Taiwan': 'TW',
+    'Tajikstan': 'TJ',
+    'Tanzania': 'TZ',
+    'Thailand': 'TH',
+    'Togo': 'TG',
+    'Tokelau': 'TK',
+    'Tonga': 'TO',
+    'Trinidad and Tobago': 'TT',
+    'Tunisia': 'TN',
+    'Turkey': 'TR',
+    'Turkmenistan': 'TM',
+    'Turks and Caicos Islands': 'TC',
+    'Tuvalu': 'TV',
+    'U.S. Virgin Islands': 'VI',
+    'Uganda': 'UG',
+    'Ukraine': 'UA',
+    'United Arab Emirates': 'AE',
+    'United Kingdom': 'GB',
+    'United States': 'US',
+    'Uruguay': 'UY',
+    'Uzbekistan': 'UZ',
+    'Vanuatu': 'VU',
+    'Vatican': 'VA',
+    'Venezuela': 'VE',
+    'Vietnam': 'VN',
+    'Wallis and Futuna': 'WF',
+    'Western Sahara': 'EH',
+    'Yemen': 'YE',
+    'Zambia': 'ZM',
+    'Zimbabwe': 'ZW'
+}
+COUNTRY_ISO_CODES = frozenset(COUNTRY_ISO_MAP.values())
+
+
+def address_intervals(addresses, ranges):
+    """Returns the addresses covered by addresses and ranges, by IP version
+
+    Args:
+        addresses (list): Addresses, or networks in CIDR notation.
+        ranges (list): Ranges of addresses, such as ``1.1.1.1-1.1.1.9``.
+
+    Returns:
+        dict: The IP version, and the sorted ``(first, last)`` integers of the
+        blocks of addresses that are covered in it. No two blocks overlap or
+        touch.
+    """
+    result = dict()
+    for x in addresses:
+        if '/' in x:
+            network = netaddr.IPNetwork(x)
+            result.setdefault(network.version, []).append((network.first, network.last))
+        else:
+            # Most entries are single addresses, which are much quicker to
+            # read as such than as networks.
+            address = netaddr.IPAddress(x)
+            result.setdefault(address.version, []).append((int(address), int(address)))
+    for x in ranges:
+        start, stop = [netaddr.IPAddress(y.strip()) for y in x.split('-')]
+        result.setdefault(start.version, []).append(
+            (min(int(start), int(stop)), max(int(start), int(stop)))
+        )
+    for version in result:
+        result[version] = collapse_ranges(result[version])
+    return result
+
+
+def optimize_addresses(addresses, ranges):
+    """Merges addresses and ranges into the fewest entries that cover them
+
+    Every block of addresses that are next to each other becomes a network,
+    when it fills one exactly, or a range. The result is checked to cover
+    exactly the addresses that were given.
+
+    Args:
+        addresses (list): Addresses, or networks in CIDR notation.
+        ranges (list): Ranges of addresses, such as ``1.1.1.1-1.1.1.9``.
+
+    Returns:
+        tuple: The list of addresses and networks, and the list of ranges.
+
+    Raises:
+        F5ModuleError: The merged entries do not cover the same addresses.
+    """
+    intervals = address_intervals(addresses, ranges)
+    result_addresses = []
+    result_ranges = []
+    for version in sorted(intervals):
+        for first, last in intervals[version]:
+            start = netaddr.IPAddress(first, version)
+            stop = netaddr.IPAddress(last, version)
+            cidrs = netaddr.iprange_to_cidrs(start, stop)
+            if len(cidrs) > 1:
+                result_ranges.append('{0}-{1}'.format(start, stop))
+            elif cidrs[0].size == 1:
+                result_addresses.append(str(cidrs[0].ip))
+            else:
+                result_addresses.append(str(cidrs[0]))
+    if address_intervals(result_addresses, result_ranges) != intervals:
+        raise F5ModuleError(
+            "The optimized addresses do not cover the same addresses as those that were given."
+        )
+    return result_addresses, result_ranges
+
+
 class Parameters(AnsibleF5Parameters):
     api_map = {
         'addressLists': 'address_lists',
@@ -236,7 +590,6 @@ class ApiParameters(Parameters):
             if '-' not in address_range['name']:
                 continue
             result.append(address_range['name'].strip())
-        result = sorted(result)
         return result
 
     @property
@@ -247,7 +600,6 @@ class ApiParameters(Parameters):
         for x in self._values['address_lists']:
             item = '/{0}/{1}'.format(x['partition'], x['name'])
             result.append(item)
-        result = sorted(result)
         return result
 
     @property
@@ -255,7 +607,6 @@ class ApiParameters(Parameters):
         if self._values['addresses'] is None:
             return None
         result = [x['name'] for x in self._values['addresses'] if '-' not in x['name']]
-        result = sorted(result)
         return result
 
     @property
@@ -263,7 +614,6 @@ class ApiParameters(Parameters):
         if self._values['fqdns'] is None:
             return None
         result = [str(x['name']) for x in self._values['fqdns']]
-        result = sorted(result)
         return result
 
     @property
@@ -276,236 +626,8 @@ class ApiParameters(Parameters):
 
 
 class ModuleParameters(Parameters):
-    def __init__(self, params=None):
-        super(ModuleParameters, self).__init__(params=params)
-        self.country_iso_map = {
-            'Afghanistan': 'AF',
-            'Albania': 'AL',
-            'Algeria': 'DZ',
-            'American Samoa': 'AS',
-            'Andorra': 'AD',
-            'Angola': 'AO',
-            'Anguilla': 'AI',
-            'Antarctica': 'AQ',
-            'Antigua and Barbuda': 'AG',
-            'Argentina': 'AR',
-            'Armenia': 'AM',
-            'Aruba': 'AW',
-            'Australia': 'AU',
-            'Austria': 'AT',
-            'Azerbaijan': 'AZ',
-            'Bahamas': 'BS',
-            'Bahrain': 'BH',
-            'Bangladesh': 'BD',
-            'Barbados': 'BB',
-            'Belarus': 'BY',
-            'Belgium': 'BE',
-            'Belize': 'BZ',
-            'Benin': 'BJ',
-            'Bermuda': 'BM',
-            'Bhutan': 'BT',
-            'Bolivia': 'BO',
-            'Bosnia and Herzegovina': 'BA',
-            'Botswana': 'BW',
-            'Brazil': 'BR',
-            'Brunei': 'BN',
-            'Bulgaria': 'BG',
-            'Burkina Faso': 'BF',
-            'Burundi': 'BI',
-            'Cameroon': 'CM',
-            'Canada': 'CA',
-            'Cape Verde': 'CV',
-            'Central African Republic': 'CF',
-            'Chile': 'CL',
-            'China': 'CN',
-            'Christmas Island': 'CX',
-            'Cocos Islands': 'CC',
-            'Colombia': 'CO',
-            'Cook Islands': 'CK',
-            'Costa Rica': 'CR',
-            'Cuba': 'CU',
-            'Curacao': 'CW',
-            'Cyprus': 'CY',
-            'Czech Republic': 'CZ',
-            'Democratic Republic of the Congo': 'CD',
-            'Denmark': 'DK',
-            'Djibouti': 'DJ',
-            'Dominica': 'DM',
-            'Dominican Republic': 'DO',
-            'Ecuador': 'EC',
-            'Egypt': 'EG',
-            'Eritrea': 'ER',
-            'Estonia': 'EE',
-            'Ethiopia': 'ET',
-            'Falkland Islands': 'FK',
-            'Faroe Islands': 'FO',
-            'Fiji': 'FJ',
-            'Finland': 'FI',
-            'France': 'FR',
-            'French Polynesia': 'PF',
-            'Gabon': 'GA',
-            'Gambia': 'GM',
-            'Georgia': 'GE',
-            'Germany': 'DE',
-            'Ghana': 'GH',
-            'Gilbraltar': 'GI',
-            'Greece': 'GR',
-            'Greenland': 'GL',
-            'Grenada': 'GD',
-            'Guam': 'GU',
-            'Guatemala': 'GT',
-            'Guernsey': 'GG',
-            'Guinea': 'GN',
-            'Guinea-Bissau': 'GW',
-            'Guyana': 'GY',
-            'Haiti': 'HT',
-            'Honduras': 'HN',
-            'Hong Kong': 'HK',
-            'Hungary': 'HU',
-            'Iceland': 'IS',
-            'India': 'IN',
-            'Indonesia': 'ID',
-            'Iran': 'IR',
-            'Iraq': 'IQ',
-            'Ireland': 'IE',
-            'Isle of Man': 'IM',
-            'Israel': 'IL',
-            'Italy': 'IT',
-            'Ivory Coast': 'CI',
-            'Jamaica': 'JM',
-            'Japan': 'JP',
-            'Jersey': 'JE',
-            'Jordan': 'JO',
-            'Kazakhstan': 'KZ',
-            'Laos': 'LA',
-            'Latvia': 'LV',
-            'Lebanon': 'LB',
-            'Lesotho': 'LS',
-            'Liberia': 'LR',
-            'Libya': 'LY',
-            'Liechtenstein': 'LI',
-            'Lithuania': 'LT',
-            'Luxembourg': 'LU',
-            'Macau': 'MO',
-            'Macedonia': 'MK',
-            'Madagascar': 'MG',
-            'Malawi': 'MW',
-            'Malaysia': 'MY',
-            'Maldives': 'MV',
-            'Mali': 'ML',
-            'Malta': 'MT',
-            'Marshall Islands': 'MH',
-            'Mauritania': 'MR',
-            'Mauritius': 'MU',
-            'Mayotte': 'YT',
-            'Mexico': 'MX',
-            'Micronesia': 'FM',
-            'Moldova': 'MD',
-            'Monaco': 'MC',
-            'Mongolia': 'MN',
-            'Montenegro': 'ME',
-            'Montserrat': 'MS',
-            'Morocco': 'MA',
-            'Mozambique': 'MZ',
-            'Myanmar': 'MM',
-            'Namibia': 'NA',
-            'Nauru': 'NR',
-            'Nepal': 'NP',
-            'Netherlands': 'NL',
-            'Netherlands Antilles': 'AN',
-            'New Caledonia': 'NC',
-            'New Zealand': 'NZ',
-            'Nicaragua': 'NI',
-            'Niger': 'NE',
-            'Nigeria': 'NG',
-            'Niue': 'NU',
-            'North Korea': 'KP',
-            'Northern Mariana Islands': 'MP',
-            'Norway': 'NO',
-            'Oman': 'OM',
-            'Pakistan': 'PK',
-            'Palau': 'PW',
-            'Palestine': 'PS',
-            'Panama': 'PA',
-            'Papua New Guinea': 'PG',
-            'Paraguay': 'PY',
-            'Peru': 'PE',
-            'Philippines': 'PH',
-            'Pitcairn': 'PN',
-            'Poland': 'PL',
-            'Portugal': 'PT',
-            'Puerto Rico': 'PR',
-            'Qatar': 'QA',
-            'Republic of the Congo': 'CG',
-            'Reunion': 'RE',
-            'Romania': 'RO',
-            'Russia': 'RU',
-            'Rwanda': 'RW',
-            'Saint Barthelemy': 'BL',
-            'Saint Helena': 'SH',
-            'Saint Kitts and Nevis': 'KN',
-            'Saint Lucia': 'LC',
-            'Saint Martin': 'MF',
-            'Saint Pierre and Miquelon': 'PM',
-            'Saint Vincent and the Grenadines': 'VC',
-            'Samoa': 'WS',
-            'San Marino': 'SM',
-            'Sao Tome and Principe': 'ST',
-            'Saudi Arabia': 'SA',
-            'Senegal': 'SN',
-            'Serbia': 'RS',
-            'Seychelles': 'SC',
-            'Sierra Leone': 'SL',
-            'Singapore': 'SG',
-            'Sint Maarten': 'SX',
-            'Slovakia': 'SK',
-            'Slovenia': 'SI',
-            'Solomon Islands': 'SB',
-            'Somalia': 'SO',
-            'South Africa': 'ZA',
-            'South Korea': 'KR',
-            'South Sudan': 'SS',
-            'Spain': 'ES',
-            'Sri Lanka': 'LK',
-            'Sudan': 'SD',
-            'Suriname': 'SR',
-            'Svalbard and Jan Mayen': 'SJ',
-            'Swaziland': 'SZ',
-            'Sweden': 'SE',
-            'Switzerland': 'CH',
-            'Syria': 'SY',
-            'Taiwan': 'TW',
-            'Tajikstan': 'TJ',
-            'Tanzania': 'TZ',
-            'Thailand': 'TH',
-            'Togo': 'TG',
-            'Tokelau': 'TK',
-            'Tonga': 'TO',
-            'Trinidad and Tobago': 'TT',
-            'Tunisia': 'TN',
-            'Turkey': 'TR',
-            'Turkmenistan': 'TM',
-            'Turks and Caicos Islands': 'TC',
-            'Tuvalu': 'TV',
-            'U.S. Virgin Islands': 'VI',
-            'Uganda': 'UG',
-            'Ukraine': 'UA',
-            'United Arab Emirates': 'AE',
-            'United Kingdom': 'GB',
-            'United States': 'US',
-            'Uruguay': 'UY',
-            'Uzbekistan': 'UZ',
-            'Vanuatu': 'VU',
-            'Vatican': 'VA',
-            'Venezuela': 'VE',
-            'Vietnam': 'VN',
-            'Wallis and Futuna': 'WF',
-            'Western Sahara': 'EH',
-            'Yemen': 'YE',
-            'Zambia': 'ZM',
-            'Zimbabwe': 'ZW'
-        }
-        self.choices_iso_codes = self.country_iso_map.values()
+    country_iso_map = COUNTRY_ISO_MAP
+    choices_iso_codes = COUNTRY_ISO_CODES
 
     def is_valid_hostname(self, host):
         """Reasonable attempt at validating a hostname
@@ -532,6 +654,38 @@ class ModuleParameters(Parameters):
 
     @property
     def addresses(self):
+        if self.optimize:
+            return self.optimized['addresses']
+        return self._given_addresses()
+
+    @property
+    def address_ranges(self):
+        if self.optimize:
+            return self.optimized['address_ranges']
+        return self._given_address_ranges()
+
+    @property
+    def optimized(self):
+        if self._values['optimized'] is not None:
+            return self._values['optimized']
+        addresses = self._given_addresses()
+        ranges = self._given_address_ranges()
+        if addresses is None and ranges is None:
+            result = dict(addresses=None, address_ranges=None, before=0, after=0)
+        else:
+            addresses = addresses or []
+            ranges = ranges or []
+            optimized = optimize_addresses(addresses, ranges)
+            result = dict(
+                addresses=optimized[0],
+                address_ranges=optimized[1],
+                before=len(addresses) + len(ranges),
+                after=len(optimized[0]) + len(optimized[1])
+            )
+        self._values['optimized'] = result
+        return result
+
+    def _given_addresses(self):
         if self._values['addresses'] is None:
             return None
         for x in self._values['addresses']:
@@ -549,11 +703,9 @@ class ModuleParameters(Parameters):
                         "Address {0} must be either an IPv4 or IPv6 address or network.".format(x)
                     )
         result = [str(x) for x in self._values['addresses']]
-        result = sorted(result)
         return result
 
-    @property
-    def address_ranges(self):
+    def _given_address_ranges(self):
         if self._values['address_ranges'] is None:
             return None
         result = []
@@ -572,7 +724,6 @@ class ModuleParameters(Parameters):
                 stop, start = start, stop
             item = '{0}-{1}'.format(str(start), str(stop))
             result.append(item)
-        result = sorted(result)
         return result
 
     @property
@@ -583,7 +734,6 @@ class ModuleParameters(Parameters):
         for x in self._values['address_lists']:
             item = self._fqdn_name(x)
             result.append(item)
-        result = sorted(result)
         return result
 
     @property
@@ -598,7 +748,6 @@ class ModuleParameters(Parameters):
                 raise F5ModuleError(
                     "The hostname '{0}' looks invalid.".format(x)
                 )
-        result = sorted(result)
         return result
 
     @property
@@ -701,6 +850,7 @@ class Difference(object):
     def __init__(self, want, have=None):
         self.want = want
         self.have = have
+        self.deltas = dict()
 
     def compare(self, param):
         try:
@@ -718,41 +868,94 @@ class Difference(object):
         except AttributeError:
             return attr1
 
+    def _list_changed(self, param, want, have):
+        """Compares the canonical entries of a list, keeping what changed
+
+        Address lists can hold many thousands of entries, so they are compared
+        as sets instead of being sorted. The entries that were added and
+        removed are kept in ``deltas`` to be reported.
+        """
+        diff = ListDifference(want, have or [])
+        if have is not None and not diff.changed:
+            return False
+        self.deltas[param] = diff.to_return()
+        return True
+
+    def _canonical_addresses(self, addresses):
+        if addresses is None:
+            return None
+        result = []
+        for x in addresses:
+            try:
+                network = netaddr.IPNetwork(x)
+            except (netaddr.core.AddrFormatError, ValueError):
+                result.append(x)
+                continue
+            if network.size == 1:
+                result.append(str(network.ip))
+            else:
+                result.append(str(network.cidr))
+        return result
+
+    def _canonical_ranges(self, ranges):
+        if ranges is None:
+            return None
+        intervals = address_intervals([], ranges)
+        result = []
+        for version in sorted(intervals):
+            for first, last in intervals[version]:
+                result.append('{0}-{1}'.format(
+                    netaddr.IPAddress(first, version), netaddr.IPAddress(last, version)
+                ))
+        return result
+
+    def _addresses_with_ranges(self):
+        # Addresses and address ranges are both sent in the "addresses"
+        # attribute. The one that did not change is sent again as it is on
+        # the device, or it would be removed from the list.
+        result = dict(
+            addresses=self.want.addresses,
+            address_ranges=self.want.address_ranges
+        )
+        if result['addresses'] is None:
+            result['addresses'] = self.have.addresses
+        if result['address_ranges'] is None:
+            result['address_ranges'] = self.have.address_ranges
+        return result
+
     @property
     def addresses(self):
-        if self.want.addresses is None:
+        want = self._canonical_addresses(self.want.addresses)
+        if want is None:
             return None
-        elif self.have.addresses is None:
-            return self.want.addresses
-        if sorted(self.want.addresses) != sorted(self.have.addresses):
-            return self.want.addresses
+        have = self._canonical_addresses(self.have.addresses)
+        if self._list_changed('addresses', want, have):
+            return self._addresses_with_ranges()
 
     @property
     def address_lists(self):
-        if self.want.address_lists is None:
+        want = self.want.address_lists
+        if want is None:
             return None
-        elif self.have.address_lists is None:
-            return self.want.address_lists
-        if sorted(self.want.address_lists) != sorted(self.have.address_lists):
-            return self.want.address_lists
+        if self._list_changed('address_lists', want, self.have.address_lists):
+            return want
 
     @property
     def address_ranges(self):
-        if self.want.address_ranges is None:
+        want = self._canonical_ranges(self.want.address_ranges)
+        if want is None:
             return None
-        elif self.have.address_ranges is None:
-            return self.want.address_ranges
-        if sorted(self.want.address_ranges) != sorted(self.have.address_ranges):
-            return self.want.address_ranges
+        have = self._canonical_ranges(self.have.address_ranges)
+        if self._list_changed('address_ranges', want, have):
+            return self._addresses_with_ranges()
 
     @property
     def fqdns(self):
-        if self.want.fqdns is None:
+        want = self.want.fqdns
+        if want is None:
             return None
-        elif self.have.fqdns is None:
-            return self.want.fqdns
-        if sorted(self.want.fqdns) != sorted(self.have.fqdns):
-            return self.want.fqdns
+        if self._list_changed('fqdns', want, self.have.fqdns):
+            return want
 
 
 class ModuleManager(object):
@@ -762,9 +965,11 @@ class ModuleManager(object):
         self.want = ModuleParameters(params=self.module.params)
         self.have = ApiParameters()
         self.changes = UsableChanges()
+        self.deltas = dict()
 
     def _update_changed_options(self):
         diff = Difference(self.want, self.have)
+        self.deltas = diff.deltas
         updatables = Parameters.updatables
         changed = dict()
         for k in updatables:
@@ -804,6 +1009,11 @@ class ModuleManager(object):
         changes = reportable.to_return()
         result.update(**changes)
         result.update(dict(changed=changed))
+        if changed and self.deltas:
+            result.update(dict(delta=self.deltas))
+        if self.want.optimize:
+            optimized = self.want.optimized
+            result.update(dict(optimized=dict(before=optimized['before'], after=optimized['after'])))
         self._announce_deprecations(result)
         return result
 
@@ -911,6 +1121,10 @@ class ArgumentSpec(object):
                 )
             ),
             fqdns=dict(type='list'),
+            optimize=dict(
+                type='bool',
+                default='no'
+            ),
             partition=dict(
                 default='Common',
                 fallback=(env_fallback, ['F5_PARTITION'])
@@ -158,6 +158,14 @@ port_lists:
   returned: changed
   type: list
   sample: [/Common/list1, /Common/list2]
+delta:
+  description:
+    - The entries that were added to, and removed from, each of the lists
+      that changed.
+    - Port ranges that overlap are compared as one range.
+  returned: changed
+  type: complex
+  sample: {"ports": {"added": [443], "removed": [80]}}
 '''
 
 from ansible.module_utils.basic import AnsibleModule
@@ -171,7 +179,9 @@ try:
     from library.module_utils.network.f5.bigip import F5Client
     from library.module_utils.network.f5.common import F5ModuleError
     from library.module_utils.network.f5.common import AnsibleF5Parameters
+    from library.module_utils.network.f5.common import ListDifference
     from library.module_utils.network.f5.common import cleanup_tokens
+    from library.module_utils.network.f5.common import collapse_ranges
     from library.module_utils.network.f5.common import fqdn_name
     from library.module_utils.network.f5.common import f5_argument_spec
     try:
@@ -185,7 +195,9 @@ except ImportError:
     from ansible.module_utils.network.f5.bigip import F5Client
     from ansible.module_utils.network.f5.common import F5ModuleError
     from ansible.module_utils.network.f5.common import AnsibleF5Parameters
+    from ansible.module_utils.network.f5.common import ListDifference
     from ansible.module_utils.network.f5.common import cleanup_tokens
+    from ansible.module_utils.network.f5.common import collapse_ranges
     from ansible.module_utils.network.f5.common import fqdn_name
     from ansible.module_utils.network.f5.common import f5_argument_spec
     try:
@@ -372,6 +384,7 @@ class Difference(object):
     def __init__(self, want, have=None):
         self.want = want
         self.have = have
+        self.deltas = dict()
 
     def compare(self, param):
         try:
@@ -389,32 +402,61 @@ class Difference(object):
         except AttributeError:
             return attr1
 
+    def _list_changed(self, param, want, have):
+        """Compares the entries of a list as sets, keeping what changed"""
+        diff = ListDifference(want, have or [])
+        if have is not None and not diff.changed:
+            return False
+        self.deltas[param] = diff.to_return()
+        return True
+
+    def _canonical_ranges(self, ranges):
+        if ranges is None:
+            return None
+        bounds = []
+        for x in ranges:
+            start, stop = [int(y) for y in x.split('-')]
+            bounds.append((min(start, stop), max(start, stop)))
+        return ['{0}-{1}'.format(*x) for x in collapse_ranges(bounds)]
+
+    def _ports_with_ranges(self):
+        # Ports and port ranges are both sent in the "ports" attribute. The
+        # one that did not change is sent again as it is on the device, or it
+        # would be removed from the list.
+        result = dict(
+            ports=self.want.ports,
+            port_ranges=self.want.port_ranges
+        )
+        if result['ports'] is None:
+            result['ports'] = self.have.ports
+        if result['port_ranges'] is None:
+            result['port_ranges'] = self.have.port_ranges
+        return result
+
     @property
     def ports(self):
-        if self.want.ports is None:
+        want = self.want.ports
+        if want is None:
             return None
-        elif self.have.ports is None:
-            return self.want.ports
-        if sorted(self.want.ports) != sorted(self.have.ports):
-            return self.want.ports
+        if self._list_changed('ports', want, self.have.ports):
+            return self._ports_with_ranges()
 
     @property
     def port_lists(self):
-        if self.want.port_lists is None:
+        want = self.want.port_lists
+        if want is None:
             return None
-        elif self.have.port_lists is None:
-            return self.want.port_lists
-        if sorted(self.want.port_lists) != sorted(self.have.port_lists):
-            return self.want.port_lists
+        if self._list_changed('port_lists', want, self.have.port_lists):
+            return want
 
     @property
     def port_ranges(self):
-        if self.want.port_ranges is None:
+        want = self._canonical_ranges(self.want.port_ranges)
+        if want is None:
             return None
-        elif self.have.port_ranges is None:
-            return self.want.port_ranges
-        if sorted(self.want.port_ranges) != sorted(self.have.port_ranges):
-            return self.want.port_ranges
+        have = self._canonical_ranges(self.have.port_ranges)
+        if self._list_changed('port_ranges', want, have):
+            return self._ports_with_ranges()
 
 
 class ModuleManager(object):
@@ -424,6 +466,7 @@ class ModuleManager(object):
         self.want = ModuleParameters(params=self.module.params)
         self.have = ApiParameters()
         self.changes = UsableChanges()
+        self.deltas = dict()
 
     def _set_changed_options(self):
         changed = {}
@@ -435,6 +478,7 @@ class ModuleManager(object):
 
     def _update_changed_options(self):
         diff = Difference(self.want, self.have)
+        self.deltas = diff.deltas
         updatables = Parameters.updatables
         changed = dict()
         for k in updatables:
@@ -474,6 +518,8 @@ class ModuleManager(object):
         changes = reportable.to_return()
         result.update(**changes)
         result.update(dict(changed=changed))
+        if changed and self.deltas:
+            result.update(dict(delta=self.deltas))
         self._announce_deprecations(result)
         return result
 
@@ -110,6 +110,23 @@ options:
        - This parameter also makes the C(software_md5sum) and C(hotfix_md5sum)
          mandatory when C(state is C(present), C(activated) or C(installed).
     default: 'no'
+  upload_concurrency:
+    description:
+      - The number of chunks of the file that are sent to the device at the same time.
+      - When this is more than C(1), the chunks may reach the device out of order.
+        Only raise it for devices that are known to accept that.
+    type: int
+    default: 1
+    version_added: 2.7
+  verify_upload:
+    description:
+      - When C(yes), the SHA-256 checksum of the uploaded file on the device is
+        compared with the checksum of the file that was sent.
+      - The checksum is taken with C(sha256sum) through the bash utility, so the
+        user must be allowed to run bash on the device.
+    type: bool
+    default: no
+    version_added: 2.7
 notes:
   - Requires the isoparser Python package on the host. This can be installed
     with pip install isoparser
@@ -384,12 +401,31 @@ volume:
   returned: changed
   type: string
   sample: HD1.2
+upload:
+  description: How the files of the task were uploaded to the device.
+  returned: changed and a file was uploaded
+  type: complex
+  contains:
+    bytes:
+      description: The number of bytes sent.
+      returned: changed and a file was uploaded
+      type: int
+      sample: 1073741824
+    seconds:
+      description: The seconds spent sending them.
+      returned: changed and a file was uploaded
+      type: float
+      sample: 92.41
+    throughput:
+      description: The bytes sent per second.
+      returned: changed and a file was uploaded
+      type: int
+      sample: 11619043
 '''
 
 import io
 import isoparser
 import os
-import time
 
 from ansible.module_utils.basic import AnsibleModule
 from lxml import etree
@@ -401,8 +437,11 @@ try:
     # Sideband repository used for dev
     from library.module_utils.network.f5.bigip import HAS_F5SDK
     from library.module_utils.network.f5.bigip import F5Client
+    from library.module_utils.network.f5.bigip import FileUpload
+    from library.module_utils.network.f5.bigip import upload_summary
     from library.module_utils.network.f5.common import F5ModuleError
     from library.module_utils.network.f5.common import AnsibleF5Parameters
+    from library.module_utils.network.f5.common import Waiter
     from library.module_utils.network.f5.common import cleanup_tokens
     from library.module_utils.network.f5.common import fqdn_name
     from library.module_utils.network.f5.common import f5_argument_spec
@@ -415,8 +454,11 @@ except ImportError:
     # Upstream Ansible
     from ansible.module_utils.network.f5.bigip import HAS_F5SDK
     from ansible.module_utils.network.f5.bigip import F5Client
+    from ansible.module_utils.network.f5.bigip import FileUpload
+    from ansible.module_utils.network.f5.bigip import upload_summary
     from ansible.module_utils.network.f5.common import F5ModuleError
     from ansible.module_utils.network.f5.common import AnsibleF5Parameters
+    from ansible.module_utils.network.f5.common import Waiter
     from ansible.module_utils.network.f5.common import cleanup_tokens
     from ansible.module_utils.network.f5.common import fqdn_name
     from ansible.module_utils.network.f5.common import f5_argument_spec
@@ -748,6 +790,7 @@ class BaseManager(object):
         self.have = None
         self.want = Parameters(client=self.client, params=self.module.params)
         self.changes = Changes()
+        self.uploads = []
 
     def exec_module(self):
         changed = False
@@ -769,6 +812,8 @@ class BaseManager(object):
         changes = self.changes.to_return()
         result.update(**changes)
         result.update(dict(changed=changed))
+        if self.uploads:
+            result.update(dict(upload=upload_summary(self.uploads)))
         return result
 
     def _set_changed_options(self):
@@ -944,60 +989,68 @@ class BaseManager(object):
     def wait_for_images(self, count, hotfix=False):
         current = len(count)
         if hotfix:
-            while True:
-                if len(self.list_hotfixes_on_device()) != current:
-                    break
-            time.sleep(1)
+            collection = self.list_hotfixes_on_device
         else:
-            while True:
-                if len(self.list_images_on_device()) != current:
-                    break
-            time.sleep(1)
+            collection = self.list_images_on_device
+        waiter = Waiter(interval=1, max_interval=10, deadline=600)
+        waiter.wait(
+            lambda: len(collection()),
+            done=lambda x: x != current,
+            message="Timed out waiting for the uploaded image to be listed on the device"
+        )
 
     def wait_for_device_reboot(self):
-        vol = self.want.volume
-        while True:
-            time.sleep(5)
-            try:
-                self._device_reconnect()
-                volume = self.client.api.tm.sys.software.volumes.volume.load(
-                    name=vol
-                )
-                if hasattr(volume, 'active') and volume.active is True:
-                    break
-            except Exception:
-                # Handle all exceptions because if the system is offline (for a
-                # reboot) the REST client will raise exceptions about
-                # connections
-                pass
+        # Handle all exceptions because if the system is offline (for a
+        # reboot) the REST client will raise exceptions about connections
+        waiter = Waiter(interval=5, max_interval=30, delay=5)
+        waiter.wait(
+            self._read_rebooted_volume_from_device,
+            done=lambda x: hasattr(x, 'active') and x.active is True,
+            ignore=(Exception,)
+        )
+
+    def _read_rebooted_volume_from_device(self):
+        self._device_reconnect()
+        volume = self.client.api.tm.sys.software.volumes.volume.load(
+            name=self.want.volume
+        )
+        return volume
 
     def wait_for_software_install_on_device(self):
         # We need to delay this slightly in case the the volume needs to be
         # created first
-        for _ in range(10):
-            try:
-                if self.volume_exists_on_device():
-                    break
-            except ConnectionError:
-                pass
-            time.sleep(5)
+        waiter = Waiter(interval=5, deadline=50)
+        waiter.wait(
+            self.volume_exists_on_device,
+            ignore=(ConnectionError,),
+            message="The volume {0} was not created on the device".format(self.want.volume)
+        )
         progress = self.load_volume_on_device()
-        while True:
-            time.sleep(10)
-            progress.refresh()
-            status = progress.status
-            if 'complete' in status:
-                break
-            elif 'failed' in status:
-                raise F5ModuleError(status)
+        waiter = Waiter(interval=10, max_interval=60, delay=10)
+        waiter.wait(
+            lambda: self._read_install_status(progress),
+            done=self._install_is_complete
+        )
+
+    def _read_install_status(self, progress):
+        progress.refresh()
+        return progress.status
+
+    def _install_is_complete(self, status):
+        if 'complete' in status:
+            return True
+        elif 'failed' in status:
+            raise F5ModuleError(status)
+        return False
 
     def delete_volume_on_device(self):
         volume = self.load_volume_on_device()
         volume.delete()
-        for _ in range(10):
-            time.sleep(5)
-            if not self.volume_exists_on_device():
-                break
+        waiter = Waiter(interval=5, delay=5, deadline=50)
+        waiter.wait(
+            lambda: not self.volume_exists_on_device(),
+            message="The volume {0} was not deleted from the device".format(self.want.volume)
+        )
 
     def get_current_active(self):
         volumes = self.list_volumes_on_device()
@@ -1078,9 +1131,13 @@ class LocalManager(BaseManager):
         return True
 
     def upload_to_device(self, filepath):
-        self.client.api.cm.autodeploy.software_image_uploads.upload_image(
-            filepath
-        )
+        uploads = self.client.api.cm.autodeploy.software_image_uploads
+        name = os.path.basename(filepath)
+        with open(filepath, 'rb') as fileobj:
+            upload = FileUpload(uploads, fileobj, name, max_workers=self.want.upload_concurrency).upload()
+        self.uploads.append(upload)
+        if self.want.verify_upload:
+            upload.verify(self.client, '/shared/images/{0}'.format(name))
 
     def image_exists_on_device(self):
         collection = self.client.api.tm.sys.software.images.get_collection()
@@ -1279,7 +1336,15 @@ class ArgumentSpec(object):
             ),
             volume=dict(),
             software_md5sum=dict(),
-            hotfix_md5sum=dict()
+            hotfix_md5sum=dict(),
+            upload_concurrency=dict(
+                type='int',
+                default=1
+            ),
+            verify_upload=dict(
+                type='bool',
+                default='no'
+            )
         )
         self.argument_spec = {}
         self.argument_spec.update(f5_argument_spec)
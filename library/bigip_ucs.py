@@ -75,6 +75,23 @@ options:
       - absent
       - installed
       - present
+  upload_concurrency:
+    description:
+      - The number of chunks of the file that are sent to the device at the same time.
+      - When this is more than C(1), the chunks may reach the device out of order.
+        Only raise it for devices that are known to accept that.
+    type: int
+    default: 1
+    version_added: 2.7
+  verify_upload:
+    description:
+      - When C(yes), the SHA-256 checksum of the uploaded file on the device is
+        compared with the checksum of the file that was sent.
+      - The checksum is taken with C(sha256sum) through the bash utility, so the
+        user must be allowed to run bash on the device.
+    type: bool
+    default: no
+    version_added: 2.7
 notes:
    - Only the most basic checks are performed by this module. Other checks and
      considerations need to be taken into account. See the following URL.
@@ -162,7 +179,26 @@ EXAMPLES = r'''
 '''
 
 RETURN = r'''
-# only common fields returned
+upload:
+  description: How the files of the task were uploaded to the device.
+  returned: changed and a file was uploaded
+  type: complex
+  contains:
+    bytes:
+      description: The number of bytes sent.
+      returned: changed and a file was uploaded
+      type: int
+      sample: 1073741824
+    seconds:
+      description: The seconds spent sending them.
+      returned: changed and a file was uploaded
+      type: float
+      sample: 92.41
+    throughput:
+      description: The bytes sent per second.
+      returned: changed and a file was uploaded
+      type: int
+      sample: 11619043
 '''
 
 import os
@@ -179,6 +215,8 @@ try:
     # Sideband repository used for dev
     from library.module_utils.network.f5.bigip import HAS_F5SDK
     from library.module_utils.network.f5.bigip import F5Client
+    from library.module_utils.network.f5.bigip import FileUpload
+    from library.module_utils.network.f5.bigip import upload_summary
     from library.module_utils.network.f5.common import F5ModuleError
     from library.module_utils.network.f5.common import AnsibleF5Parameters
     from library.module_utils.network.f5.common import cleanup_tokens
@@ -193,6 +231,8 @@ except ImportError:
     # Upstream Ansible
     from ansible.module_utils.network.f5.bigip import HAS_F5SDK
     from ansible.module_utils.network.f5.bigip import F5Client
+    from ansible.module_utils.network.f5.bigip import FileUpload
+    from ansible.module_utils.network.f5.bigip import upload_summary
     from ansible.module_utils.network.f5.common import F5ModuleError
     from ansible.module_utils.network.f5.common import AnsibleF5Parameters
     from ansible.module_utils.network.f5.common import cleanup_tokens
@@ -333,6 +373,7 @@ class BaseManager(object):
         self.client = kwargs.get('client', None)
         self.want = Parameters(params=self.module.params)
         self.changes = Parameters()
+        self.uploads = []
 
     def exec_module(self):
         changed = False
@@ -350,6 +391,8 @@ class BaseManager(object):
         changes = self.changes.to_return()
         result.update(**changes)
         result.update(dict(changed=changed))
+        if self.uploads:
+            result.update(dict(upload=upload_summary(self.uploads)))
         return result
 
     def present(self):
@@ -477,12 +520,18 @@ class V1Manager(BaseManager):
         remote_path = "/var/local/ucs"
         tpath_name = '/var/config/rest/downloads'
 
-        upload = self.client.api.shared.file_transfer.uploads
+        uploads = self.client.api.shared.file_transfer.uploads
 
         try:
-            upload.upload_file(self.want.ucs)
+            with open(self.want.ucs, 'rb') as fileobj:
+                upload = FileUpload(
+                    uploads, fileobj, self.want.basename, max_workers=self.want.upload_concurrency
+                ).upload()
         except IOError as ex:
             raise F5ModuleError(str(ex))
+        self.uploads.append(upload)
+        if self.want.verify_upload:
+            upload.verify(self.client, '{0}/{1}'.format(tpath_name, self.want.basename))
 
         self.client.api.tm.util.unix_mv.exec_cmd(
             'run',
@@ -589,7 +638,15 @@ class ArgumentSpec(object):
                 default='present',
                 choices=['absent', 'installed', 'present']
             ),
-            ucs=dict(required=True)
+            ucs=dict(required=True),
+            upload_concurrency=dict(
+                type='int',
+                default=1
+            ),
+            verify_upload=dict(
+                type='bool',
+                default='no'
+            )
         )
         self.argument_spec = {}
         self.argument_spec.update(f5_argument_spec)
@@ -194,6 +194,7 @@ import re
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.basic import env_fallback
+from ansible.module_utils.six.moves.urllib import parse
 from distutils.version import LooseVersion
 
 HAS_DEVEL_IMPORTS = False
@@ -542,7 +543,7 @@ class PartitionedManager(BaseManager):
     def _read_one_resource_from_collection(self):
         collection = self.client.api.tm.auth.users.get_collection(
             requests_params=dict(
-                params="$filter=partition+eq+'{0}'".format(self.want.partition)
+                params="$filter=partition+eq+'{0}'".format(parse.quote(self.want.partition))
             )
         )
         collection = [x for x in collection if x.name == self.want.name]
@@ -578,7 +579,7 @@ class PartitionedManager(BaseManager):
     def exists(self):
         collection = self.client.api.tm.auth.users.get_collection(
             requests_params=dict(
-                params="$filter=partition+eq+'{0}'".format(self.want.partition)
+                params="$filter=partition+eq+'{0}'".format(parse.quote(self.want.partition))
             )
         )
         collection = [x for x in collection if x.name == self.want.name]
@@ -324,6 +324,10 @@ options:
     version_added: 2.6
 notes:
   - Requires BIG-IP software version >= 11
+  - When looping over many virtual servers, set the C(F5_COLLECTION_CACHE_TTL)
+    environment variable to a number of seconds to look them up in a copy of the
+    virtual server collection fetched once, instead of asking the device about
+    each one.
   - Requires the netaddr Python package on the host. This is as easy as pip
     install netaddr.
 requirements:
@@ -598,6 +602,7 @@ from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.basic import env_fallback
 from ansible.module_utils.six import iteritems
 from collections import namedtuple
+from multiprocessing.pool import ThreadPool
 
 try:
     # Sideband repository used for dev
@@ -605,6 +610,7 @@ try:
     from library.module_utils.network.f5.bigip import F5Client
     from library.module_utils.network.f5.common import F5ModuleError
     from library.module_utils.network.f5.common import AnsibleF5Parameters
+    from library.module_utils.network.f5.common import CollectionCache
     from library.module_utils.network.f5.common import cleanup_tokens
     from library.module_utils.network.f5.common import fq_name
     from library.module_utils.network.f5.common import f5_argument_spec
@@ -619,6 +625,7 @@ except ImportError:
     from ansible.module_utils.network.f5.bigip import F5Client
     from ansible.module_utils.network.f5.common import F5ModuleError
     from ansible.module_utils.network.f5.common import AnsibleF5Parameters
+    from ansible.module_utils.network.f5.common import CollectionCache
     from ansible.module_utils.network.f5.common import cleanup_tokens
     from ansible.module_utils.network.f5.common import fq_name
     from ansible.module_utils.network.f5.common import f5_argument_spec
@@ -634,6 +641,75 @@ except ImportError:
     HAS_NETADDR = False
 
 
+class ProfileIndex(object):
+    """Profile types that the names of the profiles on a device belong to
+
+    Deciding the type of a virtual server, and checking that it has the
+    profiles its type needs, asks which of its profiles are of a given type.
+    The collections of those types are read once, at the same time, the
+    first time that any of them is asked about. The index is then shared by
+    everything that talks to the same device during the run.
+
+    Args:
+        client: The F5Client for the device.
+    """
+    # Profile type, and the SDK collection that holds the profiles of it.
+    collections = dict(
+        diameter='diameters',
+        sip='sips',
+        fastl4='fastl4s',
+        fasthttp='fasthttps',
+        dhcpv4='dhcpv4s',
+        dhcpv6='dhcpv6s',
+        udp='udps',
+    )
+
+    indexes = dict()
+
+    def __init__(self, client):
+        self.client = client
+        self._types = None
+
+    @classmethod
+    def for_client(cls, client):
+        params = client.merge_provider_params()
+        key = '{0}:{1}'.format(params['server'], params['server_port'])
+        if key not in cls.indexes:
+            cls.indexes[key] = cls(client)
+        return cls.indexes[key]
+
+    def _read_profiles_from_device(self, profile_type):
+        collection = getattr(self.client.api.tm.ltm.profile, self.collections[profile_type])
+        profiles = collection.get_collection(
+            requests_params=dict(
+                params='$select=name'
+            )
+        )
+        return profile_type, [x.name for x in profiles]
+
+    def _load(self):
+        if self._types is not None:
+            return self._types
+        pool = ThreadPool(processes=len(self.collections))
+        try:
+            found = pool.map(self._read_profiles_from_device, sorted(self.collections))
+        finally:
+            pool.close()
+            pool.join()
+        types = dict()
+        for profile_type, names in found:
+            for name in names:
+                types.setdefault(name, set()).add(profile_type)
+        self._types = types
+        return self._types
+
+    def names(self, *profile_types):
+        """Returns the names of the profiles of any of the given types"""
+        wanted = set(profile_types)
+        types = self._load()
+        return [name for name in sorted(types) if types[name] & wanted]
+
+
 class Parameters(AnsibleF5Parameters):
     api_map = {
         'sourceAddressTranslation': 'snat',
@@ -884,21 +960,13 @@ class Parameters(AnsibleF5Parameters):
         return False
 
     def _read_current_message_routing_profiles_from_device(self):
-        collection1 = self.client.api.tm.ltm.profile.diameters.get_collection()
-        collection2 = self.client.api.tm.ltm.profile.sips.get_collection()
-        result = [x.name for x in collection1]
-        result += [x.name for x in collection2]
-        return result
+        return ProfileIndex.for_client(self.client).names('diameter', 'sip')
 
     def _read_current_fastl4_profiles_from_device(self):
-        collection = self.client.api.tm.ltm.profile.fastl4s.get_collection()
-        result = [x.name for x in collection]
-        return result
+        return ProfileIndex.for_client(self.client).names('fastl4')
 
     def _read_current_fasthttp_profiles_from_device(self):
-        collection = self.client.api.tm.ltm.profile.fasthttps.get_collection()
-        result = [x.name for x in collection]
-        return result
+        return ProfileIndex.for_client(self.client).names('fasthttp')
 
 
 class ApiParameters(Parameters):
@@ -2093,26 +2161,20 @@ class VirtualServerValidator(object):
         )
 
     def read_dhcp_profiles_from_device(self):
-        collection = self.client.api.tm.ltm.profile.dhcpv4s.get_collection()
-        result = [fq_name(self.want.partition, x.name) for x in collection]
-        collection = self.client.api.tm.ltm.profile.dhcpv6s.get_collection()
-        result += [fq_name(self.want.partition, x.name) for x in collection]
-        return result
+        return self._read_profiles_from_device('dhcpv4', 'dhcpv6')
 
     def read_fastl4_profiles_from_device(self):
-        collection = self.client.api.tm.ltm.profile.fastl4s.get_collection()
-        result = [fq_name(self.want.partition, x.name) for x in collection]
-        return result
+        return self._read_profiles_from_device('fastl4')
 
     def read_fasthttp_profiles_from_device(self):
-        collection = self.client.api.tm.ltm.profile.fasthttps.get_collection()
-        result = [fq_name(self.want.partition, x.name) for x in collection]
-        return result
+        return self._read_profiles_from_device('fasthttp')
 
     def read_udp_profiles_from_device(self):
-        collection = self.client.api.tm.ltm.profile.udps.get_collection()
-        result = [fq_name(self.want.partition, x.name) for x in collection]
-        return result
+        return self._read_profiles_from_device('udp')
+
+    def _read_profiles_from_device(self, *profile_types):
+        names = ProfileIndex.for_client(self.client).names(*profile_types)
+        return [fq_name(self.want.partition, x) for x in names]
 
 
 class Difference(object):
@@ -2426,6 +2488,15 @@ class ModuleManager(object):
         self.have = ApiParameters(client=self.client)
         self.want = ModuleParameters(client=self.client, params=self.module.params)
         self.changes = UsableChanges()
+        self._collection = None
+
+    @property
+    def collection(self):
+        if self._collection is None:
+            self._collection = CollectionCache(
+                self.client, 'ltm/virtual', self.read_collection_from_device
+            )
+        return self._collection
 
     def exec_module(self):
         changed = False
@@ -2514,6 +2585,9 @@ class ModuleManager(object):
         return False
 
     def exists(self):
+        known, result = self.collection.lookup(self.want.name, self.want.partition)
+        if known:
+            return result is not None
         result = self.client.api.tm.ltm.virtuals.virtual.exists(
             name=self.want.name,
             partition=self.want.partition
@@ -2531,6 +2605,7 @@ class ModuleManager(object):
         return True
 
     def update_on_device(self):
+        self.collection.discard(self.want.name, self.want.partition)
         params = self.changes.api_params()
         resource = self.client.api.tm.ltm.virtuals.virtual.load(
             name=self.want.name,
@@ -2538,7 +2613,20 @@ class ModuleManager(object):
         )
         resource.modify(**params)
 
+    def read_collection_from_device(self):
+        collection = self.client.api.tm.ltm.virtuals.get_collection(
+            requests_params=dict(
+                params=dict(
+                    expandSubcollections='true'
+                )
+            )
+        )
+        return [resource.attrs for resource in collection]
+
     def read_current_from_device(self):
+        known, params = self.collection.lookup(self.want.name, self.want.partition)
+        if known and params is not None:
+            return ApiParameters(params=params, client=self.client)
         result = self.client.api.tm.ltm.virtuals.virtual.load(
             name=self.want.name,
             partition=self.want.partition,
@@ -2554,6 +2642,7 @@ class ModuleManager(object):
         return result
 
     def create_on_device(self):
+        self.collection.discard(self.want.name, self.want.partition)
         params = self.changes.api_params()
         self.client.api.tm.ltm.virtuals.virtual.create(
             name=self.want.name,
@@ -2562,6 +2651,7 @@ class ModuleManager(object):
         )
 
     def remove_from_device(self):
+        self.collection.discard(self.want.name, self.want.partition)
         resource = self.client.api.tm.ltm.virtuals.virtual.load(
             name=self.want.name,
             partition=self.want.partition
@@ -31,7 +31,23 @@ options:
   license_key:
     description:
       - The license key to put in the pool.
-    required: True
+      - One of C(license_key) or C(license_keys) is required.
+  license_keys:
+    description:
+      - A list of license keys to put in, or remove from, the pool in one task.
+      - The pool is read once to find which of the keys it already has. The
+        others are then added several at a time, and all of the licenses that
+        are being activated are waited on together.
+      - A failure of one license does not stop the others. The result of each
+        license is returned in the C(licenses) return value.
+      - One of C(license_key) or C(license_keys) is required.
+    version_added: 2.7
+  concurrency:
+    description:
+      - The most C(license_keys) that are added to, or removed from, the pool
+        at the same time.
+    default: 10
+    version_added: 2.7
   description:
     description:
       - Description of the license.
@@ -69,6 +85,20 @@ EXAMPLES = r'''
     user: admin
   delegate_to: localhost
 
+- name: Add many registration key licenses to a pool
+  bigiq_regkey_license:
+    regkey_pool: foo-pool
+    license_keys:
+      - XXXXX-XXXXX-XXXXX-XXXXX-XXXXX
+      - YYYYY-YYYYY-YYYYY-YYYYY-YYYYY
+      - ZZZZZ-ZZZZZ-ZZZZZ-ZZZZZ-ZZZZZ
+    accept_eula: yes
+    password: secret
+    server: lb.mydomain.com
+    state: present
+    user: admin
+  delegate_to: localhost
+
 - name: Remove a registration key license from a pool
   bigiq_regkey_license:
     regkey_pool: foo-pool
@@ -86,11 +116,21 @@ description:
   returned: changed
   type: string
   sample: My license for BIG-IP 1
+licenses:
+  description:
+    - The result of each of the C(license_keys), in the order they were given.
+    - Licenses that failed have a C(msg).
+  returned: when C(license_keys) is specified
+  type: complex
+  sample: [{"license_key": "XXXXX-XXXXX-XXXXX-XXXXX-XXXXX", "changed": true, "status": "READY"}]
 '''
 
 import time
 
+from collections import OrderedDict
+
 from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.six.moves.urllib import parse
 
 HAS_DEVEL_IMPORTS = False
 
@@ -100,9 +140,11 @@ try:
     from library.module_utils.network.f5.bigiq import F5Client
     from library.module_utils.network.f5.common import F5ModuleError
     from library.module_utils.network.f5.common import AnsibleF5Parameters
+    from library.module_utils.network.f5.common import Waiter
     from library.module_utils.network.f5.common import cleanup_tokens
     from library.module_utils.network.f5.common import fqdn_name
     from library.module_utils.network.f5.common import f5_argument_spec
+    from library.module_utils.network.f5.common import map_concurrently
     try:
         from library.module_utils.network.f5.common import iControlUnexpectedHTTPError
     except ImportError:
@@ -114,15 +156,21 @@ except ImportError:
     from ansible.module_utils.network.f5.bigiq import F5Client
     from ansible.module_utils.network.f5.common import F5ModuleError
     from ansible.module_utils.network.f5.common import AnsibleF5Parameters
+    from ansible.module_utils.network.f5.common import Waiter
     from ansible.module_utils.network.f5.common import cleanup_tokens
     from ansible.module_utils.network.f5.common import fqdn_name
     from ansible.module_utils.network.f5.common import f5_argument_spec
+    from ansible.module_utils.network.f5.common import map_concurrently
     try:
         from ansible.module_utils.network.f5.common import iControlUnexpectedHTTPError
     except ImportError:
         HAS_F5SDK = False
 
 
+# The number of licenses asked for in each page when the whole pool is read.
+OFFERINGS_PAGE_SIZE = 100
+
+
 class Parameters(AnsibleF5Parameters):
     api_map = {
         'regKey': 'license_key'
@@ -160,13 +208,27 @@ class ModuleParameters(Parameters):
     def regkey_pool_uuid(self):
         if self._values['regkey_pool_uuid']:
             return self._values['regkey_pool_uuid']
-        collection = self.client.api.cm.device.licensing.pool.regkey.licenses_s.get_collection()
+        collection = self.client.api.cm.device.licensing.pool.regkey.licenses_s.get_collection(
+            requests_params=dict(
+                params="$filter=name+eq+'{0}'".format(parse.quote(self.regkey_pool))
+            )
+        )
         resource = next((x for x in collection if x.name == self.regkey_pool), None)
         if resource is None:
             raise F5ModuleError("Could not find the specified regkey pool.")
         self._values['regkey_pool_uuid'] = resource.id
         return resource.id
 
+    @property
+    def concurrency(self):
+        if self._values['concurrency'] is None:
+            return None
+        if self._values['concurrency'] < 1:
+            raise F5ModuleError(
+                "The 'concurrency' parameter must be 1 or more."
+            )
+        return self._values['concurrency']
+
 
 class Changes(Parameters):
     def to_return(self):
@@ -217,6 +279,8 @@ class ModuleManager(object):
         self.want = ModuleParameters(client=self.client, params=self.module.params)
         self.have = ApiParameters()
         self.changes = UsableChanges()
+        self.offering = None
+        self.offering_is_stale = True
 
     def _set_changed_options(self):
         changed = {}
@@ -285,14 +349,31 @@ class ModuleManager(object):
             return self.create()
 
     def exists(self):
-        collection = self.client.api.cm.device.licensing.pool.regkey.licenses_s
-        pool = collection.licenses.load(id=self.want.regkey_pool_uuid)
-        collection = pool.offerings_s.get_collection()
-        resource = next((x for x in collection if x.regKey == self.want.license_key), None)
+        resource = self.read_offering_from_device()
         if resource is None:
             return False
         return True
 
+    def read_offering_from_device(self):
+        """Finds the license in the pool by its key
+
+        The offerings of a pool are paged, so rather than reading every page
+        the device is asked for only the offering with this key. The result
+        is kept until the license changes.
+        """
+        if not self.offering_is_stale:
+            return self.offering
+        collection = self.client.api.cm.device.licensing.pool.regkey.licenses_s
+        pool = collection.licenses.load(id=self.want.regkey_pool_uuid)
+        collection = pool.offerings_s.get_collection(
+            requests_params=dict(
+                params="$filter=regKey+eq+'{0}'".format(parse.quote(self.want.license_key))
+            )
+        )
+        self.offering = next((x for x in collection if x.regKey == self.want.license_key), None)
+        self.offering_is_stale = False
+        return self.offering
+
     def update(self):
         self.have = self.read_current_from_device()
         if not self.should_update():
@@ -329,6 +410,7 @@ class ModuleManager(object):
             status='ACTIVATING_AUTOMATIC',
             **params
         )
+        self.offering_is_stale = True
         for x in range(60):
             resource.refresh()
             if resource.status == 'READY':
@@ -351,13 +433,11 @@ class ModuleManager(object):
 
     def update_on_device(self):
         params = self.changes.api_params()
-        collection = self.client.api.cm.device.licensing.pool.regkey.licenses_s
-        pool = collection.licenses.load(id=self.want.regkey_pool_uuid)
-        collection = pool.offerings_s.get_collection()
-        resource = next((x for x in collection if x.regKey == self.want.license_key), None)
+        resource = self.read_offering_from_device()
         if resource is None:
             return False
         resource.modify(**params)
+        self.offering_is_stale = True
 
     def absent(self):
         if self.exists():
@@ -365,32 +445,175 @@ class ModuleManager(object):
         return False
 
     def remove_from_device(self):
-        collection = self.client.api.cm.device.licensing.pool.regkey.licenses_s
-        pool = collection.licenses.load(id=self.want.regkey_pool_uuid)
-        collection = pool.offerings_s.get_collection()
-        resource = next((x for x in collection if x.regKey == self.want.license_key), None)
+        resource = self.read_offering_from_device()
         if resource is None:
             return False
         if resource:
             resource.delete()
+            self.offering_is_stale = True
 
     def read_current_from_device(self):
-        collection = self.client.api.cm.device.licensing.pool.regkey.licenses_s
-        pool = collection.licenses.load(id=self.want.regkey_pool_uuid)
-        collection = pool.offerings_s.get_collection()
-        resource = next((x for x in collection if x.regKey == self.want.license_key), None)
+        resource = self.read_offering_from_device()
         if resource is None:
             return False
         result = resource.attrs
         return ApiParameters(params=result)
 
 
+class BulkManager(ModuleManager):
+    """Manages many licenses in the pool in one task
+
+    The offerings of the pool are read once, and indexed by their key, to
+    find which of the licenses the pool already has. Licenses are added or
+    removed by a pool of at most C(concurrency) threads, and those that are
+    activating are then polled together, in one loop, until all of them are
+    ready or have failed.
+    """
+    def exec_module(self):
+        keys = list(OrderedDict.fromkeys(self.want.license_keys))
+        pool = self.read_pool_from_device()
+        offerings = self.read_offerings_from_device(pool)
+        results = OrderedDict((x, dict(license_key=x, changed=False)) for x in keys)
+
+        try:
+            if self.want.state == 'present':
+                self.present_all(pool, offerings, results)
+            else:
+                self.absent_all(offerings, results)
+        except iControlUnexpectedHTTPError as e:
+            raise F5ModuleError(str(e))
+
+        result = dict(licenses=list(results.values()))
+        result['changed'] = any(x['changed'] for x in result['licenses'])
+        failed = [x for x in result['licenses'] if 'msg' in x]
+        if failed:
+            result['failed'] = True
+            result['msg'] = '{0} of {1} licenses failed.'.format(len(failed), len(keys))
+        return result
+
+    def present_all(self, pool, offerings, results):
+        missing = [x for x in results if x not in offerings]
+        outdated = []
+        for key in results:
+            if key not in offerings:
+                continue
+            results[key]['status'] = offerings[key].attrs.get('status', None)
+            if self.want.description is None:
+                continue
+            if offerings[key].attrs.get('description', None) != self.want.description:
+                outdated.append(key)
+        for key in missing + outdated:
+            results[key]['changed'] = True
+        if self.module.check_mode:
+            return
+        if missing and self.want.accept_eula is False:
+            raise F5ModuleError(
+                "To add a license, you must accept its EULA. Please see the module documentation for a link to this."
+            )
+        self.map(lambda x: offerings[x].modify(description=self.want.description), outdated, results)
+        created = self.map(lambda x: self.create_offering_on_device(pool, x), missing, results)
+        pending = dict((k, v) for k, v in zip(missing, created) if v is not None)
+        self.wait_for_activation(pending, results)
+
+    def absent_all(self, offerings, results):
+        present = [x for x in results if x in offerings]
+        for key in present:
+            results[key]['changed'] = True
+        if self.module.check_mode:
+            return
+        self.map(lambda x: offerings[x].delete(), present, results)
+
+    def map(self, func, keys, results):
+        """Calls func for each of the keys, at most C(concurrency) at a time
+
+        A key that func fails for has the error put in its result, and None
+        returned for it.
+        """
+        def failed(key, ex):
+            results[key]['changed'] = False
+            results[key]['msg'] = str(ex)
+        return map_concurrently(func, keys, self.want.concurrency, on_error=failed)
+
+    def wait_for_activation(self, pending, results):
+        def poll():
+            self.map(lambda x: self.refresh_activation_on_device(pending[x]), list(pending), results)
+            for key in list(pending):
+                status = pending[key].status
+                if 'msg' in results[key]:
+                    del pending[key]
+                elif status == 'READY':
+                    results[key]['status'] = status
+                    del pending[key]
+                elif status == 'ACTIVATION_FAILED':
+                    results[key]['status'] = status
+                    results[key]['changed'] = False
+                    results[key]['msg'] = str(pending[key].message)
+                    del pending[key]
+            return pending
+
+        # Each license is given as long as a single one would be, and a
+        # little more for every other license polled alongside it.
+        waiter = Waiter(interval=1, max_interval=10, deadline=60 + len(pending))
+        try:
+            waiter.wait(poll, done=lambda x: not x, generation=len)
+        except F5ModuleError:
+            for key in pending:
+                results[key]['status'] = pending[key].status
+                results[key]['msg'] = "Timed out waiting for the license to be activated."
+
+    def create_offering_on_device(self, pool, key):
+        params = dict(regKey=key)
+        if self.want.description is not None:
+            params['description'] = self.want.description
+        resource = pool.offerings_s.offerings.create(
+            status='ACTIVATING_AUTOMATIC',
+            **params
+        )
+        return resource
+
+    def refresh_activation_on_device(self, resource):
+        resource.refresh()
+        if resource.status == 'ACTIVATING_AUTOMATIC_NEED_EULA_ACCEPT':
+            resource.modify(
+                status='ACTIVATING_AUTOMATIC_EULA_ACCEPTED',
+                eulaText=resource.eulaText
+            )
+
+    def read_pool_from_device(self):
+        collection = self.client.api.cm.device.licensing.pool.regkey.licenses_s
+        return collection.licenses.load(id=self.want.regkey_pool_uuid)
+
+    def read_offerings_from_device(self, pool):
+        """Returns the licenses in the pool, by their key
+
+        The device returns large collections a page at a time, so pages are
+        asked for with C($top) and C($skip) until one comes back empty, or
+        holds no license that was not already read.
+        """
+        result = dict()
+        skip = 0
+        while True:
+            page = pool.offerings_s.get_collection(
+                requests_params=dict(
+                    params='$top={0}&$skip={1}'.format(OFFERINGS_PAGE_SIZE, skip)
+                )
+            )
+            added = [x for x in page if x.regKey not in result]
+            if not added:
+                break
+            result.update((x.regKey, x) for x in added)
+            skip += len(page)
+        return result
+
+
 class ArgumentSpec(object):
     def __init__(self):
         self.supports_check_mode = True
         argument_spec = dict(
             regkey_pool=dict(required=True),
-            license_key=dict(required=True, no_log=True),
+            license_key=dict(no_log=True),
+            license_keys=dict(type='list', no_log=True),
+            concurrency=dict(type='int', default=10),
             description=dict(),
             accept_eula=dict(type='bool'),
             state=dict(
@@ -404,6 +627,12 @@ class ArgumentSpec(object):
         self.required_if = [
             ['state', 'present', ['accept_eula']]
         ]
+        self.mutually_exclusive = [
+            ['license_key', 'license_keys']
+        ]
+        self.required_one_of = [
+            ['license_key', 'license_keys']
+        ]
 
 
 def main():
@@ -412,15 +641,22 @@ def main():
     module = AnsibleModule(
         argument_spec=spec.argument_spec,
         supports_check_mode=spec.supports_check_mode,
-        required_if=spec.required_if
+        required_if=spec.required_if,
+        mutually_exclusive=spec.mutually_exclusive,
+        required_one_of=spec.required_one_of
     )
     if not HAS_F5SDK:
         module.fail_json(msg="The python f5-sdk module is required")
 
     try:
         client = F5Client(**module.params)
-        mm = ModuleManager(module=module, client=client)
+        if module.params['license_keys']:
+            mm = BulkManager(module=module, client=client)
+        else:
+            mm = ModuleManager(module=module, client=client)
         results = mm.exec_module()
+        if results.pop('failed', False):
+            module.fail_json(**results)
         module.exit_json(**results)
     except F5ModuleError as e:
         module.fail_json(msg=str(e))
@@ -72,6 +72,7 @@ from ansible.module_utils.f5_utils import (
     HAS_F5SDK,
     iControlUnexpectedHTTPError
 )
+from ansible.module_utils.six.moves.urllib import parse
 
 
 class Parameters(AnsibleF5Parameters):
@@ -165,7 +166,7 @@ class ModuleManager(object):
         dg = self.client.api.shared.resolver.device_groups
         devices = dg.cm_cloud_managed_devices.devices_s.get_collection(
             requests_params=dict(
-                params="$filter=address+eq+'{0}'".format(self.want.device)
+                params="$filter=address+eq+'{0}'".format(parse.quote(self.want.device))
             )
         )
 
@@ -201,7 +202,7 @@ class ModuleManager(object):
         dg = self.client.api.shared.resolver.device_groups
         collection = dg.cm_cloud_managed_devices.devices_s.get_collection(
             requests_params=dict(
-                params="$filter=address+eq+'{0}'".format(self.want.device)
+                params="$filter=address+eq+'{0}'".format(parse.quote(self.want.device))
             )
         )
         resource = collection.pop()
@@ -221,7 +222,7 @@ class ModuleManager(object):
         dg = self.client.api.shared.resolver.device_groups
         collection = dg.cm_cloud_managed_devices.devices_s.get_collection(
             requests_params=dict(
-                params="$filter=address+eq+'{0}'".format(self.want.device)
+                params="$filter=address+eq+'{0}'".format(parse.quote(self.want.device))
             )
         )
         resource = collection.pop()
@@ -266,7 +267,7 @@ class ModuleManager(object):
         dg = self.client.api.shared.resolver.device_groups
         devices = dg.cm_cloud_managed_devices.devices_s.get_collection(
             requests_params=dict(
-                params="$filter=address+eq+'{0}'".format(self.want.device)
+                params="$filter=address+eq+'{0}'".format(parse.quote(self.want.device))
             )
         )
         device = devices.pop()
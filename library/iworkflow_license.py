@@ -98,6 +98,7 @@ from ansible.module_utils.f5_utils import (
     HAS_F5SDK,
     iControlUnexpectedHTTPError
 )
+from ansible.module_utils.six.moves.urllib import parse
 
 
 class Parameters(AnsibleF5Parameters):
@@ -212,7 +213,7 @@ class ModuleManager(object):
     def update_on_device(self):
         collection = self.client.api.cm.shared.licensing.pools_s.get_collection(
             requests_params=dict(
-                params="$filter=name+eq+'{0}'".format(self.want.name)
+                params="$filter=name+eq+'{0}'".format(parse.quote(self.want.name))
             )
         )
         resource = collection.pop()
@@ -236,7 +237,7 @@ class ModuleManager(object):
     def read_current_from_device(self):
         collection = self.client.api.cm.shared.licensing.pools_s.get_collection(
             requests_params=dict(
-                params="$filter=name+eq+'{0}'".format(self.want.name)
+                params="$filter=name+eq+'{0}'".format(parse.quote(self.want.name))
             )
         )
         resource = collection.pop()
@@ -283,7 +284,7 @@ class ModuleManager(object):
     def remove_from_device(self):
         collection = self.client.api.cm.shared.licensing.pools_s.get_collection(
             requests_params=dict(
-                params="$filter=name+eq+'{0}'".format(self.want.name)
+                params="$filter=name+eq+'{0}'".format(parse.quote(self.want.name))
             )
         )
         resource = collection.pop()
@@ -90,6 +90,7 @@ from ansible.module_utils.f5_utils import (
     HAS_F5SDK,
     iControlUnexpectedHTTPError
 )
+from ansible.module_utils.six.moves.urllib import parse
 
 
 class Parameters(AnsibleF5Parameters):
@@ -189,7 +190,7 @@ class ModuleManager(object):
     def exists(self):
         collection = self.client.api.cm.shared.licensing.pools_s.get_collection(
             requests_params=dict(
-                params="$filter=name+eq+'{0}'".format(self.want.name)
+                params="$filter=name+eq+'{0}'".format(parse.quote(self.want.name))
             )
         )
         if len(collection) == 1:
@@ -226,7 +227,7 @@ class ModuleManager(object):
     def update_on_device(self):
         collection = self.client.api.cm.shared.licensing.pools_s.get_collection(
             requests_params=dict(
-                params="$filter=name+eq+'{0}'".format(self.want.name)
+                params="$filter=name+eq+'{0}'".format(parse.quote(self.want.name))
             )
         )
         resource = collection.pop()
@@ -250,7 +251,7 @@ class ModuleManager(object):
     def read_current_from_device(self):
         collection = self.client.api.cm.shared.licensing.pools_s.get_collection(
             requests_params=dict(
-                params="$filter=name+eq+'{0}'".format(self.want.name)
+                params="$filter=name+eq+'{0}'".format(parse.quote(self.want.name))
             )
         )
         resource = collection.pop()
@@ -297,7 +298,7 @@ class ModuleManager(object):
     def remove_from_device(self):
         collection = self.client.api.cm.shared.licensing.pools_s.get_collection(
             requests_params=dict(
-                params="$filter=name+eq+'{0}'".format(self.want.name)
+                params="$filter=name+eq+'{0}'".format(parse.quote(self.want.name))
             )
         )
         resource = collection.pop()
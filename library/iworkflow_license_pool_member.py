@@ -68,6 +68,7 @@ from ansible.module_utils.f5_utils import (
     iteritems,
     defaultdict
 )
+from ansible.module_utils.six.moves.urllib import parse
 
 
 class Parameters(AnsibleF5Parameters):
@@ -189,7 +190,7 @@ class ModuleManager(object):
     def _load_pool_by_name(self):
         collection = self.client.api.cm.shared.licensing.pools_s.get_collection(
             requests_params=dict(
-                params="$filter=name+eq+'{0}'".format(self.want.pool)
+                params="$filter=name+eq+'{0}'".format(parse.quote(self.want.pool))
             )
         )
         if len(collection) == 1:
@@ -33,7 +33,39 @@ options:
   device:
     description:
       - Managed device to create node for.
-    required: True
+      - One of C(device) or C(devices) is required.
+  devices:
+    description:
+      - A list of managed devices to create nodes for, or to remove the nodes
+        of, in one task, in place of C(device).
+      - Each item takes the C(device), C(hostname) and C(interfaces) of one
+        device. The credentials are shared by all of the devices.
+      - The managed devices, and the nodes of the connector, are each read
+        once. Nodes are then created several at a time, and all of them are
+        waited on together.
+      - A failure of one node does not stop the others. The result of each
+        device is returned in the C(nodes) return value.
+      - One of C(device) or C(devices) is required.
+    version_added: 2.7
+    suboptions:
+      device:
+        description:
+          - Managed device to create node for.
+        required: True
+      hostname:
+        description:
+          - The hostname that you want to set on the remote managed BIG-IP.
+      interfaces:
+        description:
+          - The network interfaces of the device. Takes the same values as
+            the C(interfaces) option.
+          - This parameter is only required when C(state) is C(present).
+  concurrency:
+    description:
+      - The most C(devices) whose nodes are created in, or removed from, the
+        connector at the same time.
+    default: 10
+    version_added: 2.7
   key_content:
     description:
       - Private key content to use when iWorkflow attempts to communicate with
@@ -124,6 +156,29 @@ EXAMPLES = '''
       validate_certs: "no"
   delegate_to: localhost
 
+- name: Create nodes for many managed devices
+  iworkflow_local_connector_node:
+      devices:
+          - device: "10.144.128.137"
+            hostname: "lb1.example.com"
+            interfaces:
+                - local_address: "10.144.128.137"
+                  subnet_address: "10.144.128/24"
+          - device: "10.144.128.138"
+            hostname: "lb2.example.com"
+            interfaces:
+                - local_address: "10.144.128.138"
+                  subnet_address: "10.144.128/24"
+      password_credential: "secret"
+      username_credential: "admin"
+      state: "present"
+      connector: "Private OpenStack"
+      server: "iwf.mydomain.com"
+      password: "secret"
+      user: "admin"
+      validate_certs: "no"
+  delegate_to: localhost
+
 - name: Create node from managed device in Azure
   iworkflow_local_connector_node:
       device: "10.144.128.137"
@@ -148,13 +203,21 @@ EXAMPLES = '''
 '''
 
 RETURN = r'''
-# only common fields returned
+nodes:
+  description:
+    - The result of each of the C(devices), in the order they were given.
+    - Nodes that failed have a C(msg).
+  returned: when C(devices) is specified
+  type: complex
+  sample: [{"device": "10.144.128.137", "address": "10.144.128.137", "changed": true, "status": "FINISHED"}]
 '''
 
 import re
 import netaddr
 import time
 
+from collections import OrderedDict
+
 from ansible.module_utils.f5_utils import (
     AnsibleF5Client,
     AnsibleF5Parameters,
@@ -164,6 +227,16 @@ from ansible.module_utils.f5_utils import (
     iteritems,
     iControlUnexpectedHTTPError
 )
+from ansible.module_utils.six.moves.urllib import parse
+
+try:
+    from library.module_utils.network.f5.common import Waiter
+    from library.module_utils.network.f5.common import map_concurrently
+    from library.module_utils.network.f5.common import F5ModuleError as CommonF5ModuleError
+except ImportError:
+    from ansible.module_utils.network.f5.common import Waiter
+    from ansible.module_utils.network.f5.common import map_concurrently
+    from ansible.module_utils.network.f5.common import F5ModuleError as CommonF5ModuleError
 
 
 class Device(object):
@@ -251,6 +324,14 @@ class Device(object):
             return None
         return str(self._values['resource'].hostname)
 
+    @property
+    def resource(self):
+        return self._values['resource']
+
+    @resource.setter
+    def resource(self, value):
+        self._values['resource'] = value
+
 
 class Connector(object):
     def __init__(self, *args, **kwargs):
@@ -462,6 +543,9 @@ class Parameters(AnsibleF5Parameters):
 
     @connector.setter
     def connector(self, value):
+        if isinstance(value, Connector):
+            self._values['connector'] = value
+            return
         connector = Connector()
         connector.client = self.client
         connector.update(value)
@@ -473,6 +557,9 @@ class Parameters(AnsibleF5Parameters):
 
     @device.setter
     def device(self, value):
+        if value is None or isinstance(value, Device):
+            self._values['device'] = value
+            return
         device = Device()
         device.client = self.client
         device.update(value)
@@ -611,10 +698,21 @@ class Parameters(AnsibleF5Parameters):
         ]
         return result
 
+    @property
+    def concurrency(self):
+        if self._values['concurrency'] is None:
+            return None
+        if self._values['concurrency'] < 1:
+            raise F5ModuleError(
+                "The 'concurrency' parameter must be 1 or more."
+            )
+        return self._values['concurrency']
+
 
 class ModuleManager(object):
     def __init__(self, client):
         self.client = client
+        self.module = client.module
         self.have = None
         self.want = Parameters()
         self.want.client = self.client
@@ -665,12 +763,16 @@ class ModuleManager(object):
         return result
 
     def exists(self):
+        return bool(self.read_nodes_with_address_from_device())
+
+    def read_nodes_with_address_from_device(self):
         connector = self.want.connector.resource
-        collection = connector.nodes_s.get_collection()
-        for resource in collection:
-            if resource.ipAddress == self.want.device.address:
-                return True
-        return False
+        collection = connector.nodes_s.get_collection(
+            requests_params=dict(
+                params="$filter=ipAddress+eq+'{0}'".format(parse.quote(self.want.device.address))
+            )
+        )
+        return collection
 
     def present(self):
         if self.exists():
@@ -719,12 +821,7 @@ class ModuleManager(object):
         )
 
     def read_current_from_device(self):
-        connector = self.want.connector.resource
-        collection = connector.nodes_s.get_collection(
-            requests_params=dict(
-                params="$filter=ipAddress+eq+'{0}'".format(self.want.device.address)
-            )
-        )
+        collection = self.read_nodes_with_address_from_device()
         resource = collection.pop()
         resource.refresh(
             requests_params=dict(
@@ -760,7 +857,7 @@ class ModuleManager(object):
     def remove(self):
         if self.module.check_mode:
             return True
-        self.remove_connector_node_from_device()
+        self.remove_from_device()
         if self.exists():
             raise F5ModuleError(
                 "Failed to remove the node from the connector"
@@ -768,15 +865,170 @@ class ModuleManager(object):
         return True
 
     def remove_from_device(self):
-        connector = self.want.connector.resource
-        collection = connector.nodes_s.get_collection()
-        for resource in collection:
-            if resource.ipAddress == self.want.device.ip_address:
-                resource.delete()
-                return True
+        for resource in self.read_nodes_with_address_from_device():
+            resource.delete()
+            return True
         return False
 
 
+class BulkManager(ModuleManager):
+    """Manages the nodes of many devices in the connector in one task
+
+    The managed devices, and the nodes of the connector, are each read once
+    and indexed. Nodes are created, or removed, by a pool of at most
+    C(concurrency) threads. The configuration of all of the new nodes is then
+    followed in one loop, which reads the nodes of the connector once each
+    time around.
+    """
+    def exec_module(self):
+        items = OrderedDict((str(x['device']), x) for x in self.want.devices)
+        results = OrderedDict((x, dict(device=x, changed=False)) for x in items)
+        devices = self.read_devices_from_device()
+        nodes = self.read_nodes_from_device()
+
+        wants = OrderedDict()
+        for key, item in iteritems(items):
+            if key not in devices:
+                results[key]['msg'] = "Device {0} was not found".format(key)
+                continue
+            if self.want.state == 'present' and not item.get('interfaces', None):
+                results[key]['msg'] = "The interfaces of the device are required when state is present."
+                continue
+            wants[key] = self._device_parameters(item, devices[key])
+            results[key]['address'] = wants[key].device.address
+
+        try:
+            if self.want.state == 'present':
+                self.present_all(wants, nodes, results)
+            else:
+                self.absent_all(wants, nodes, results)
+        except iControlUnexpectedHTTPError as e:
+            raise F5ModuleError(str(e))
+
+        result = dict(nodes=list(results.values()))
+        result['changed'] = any(x['changed'] for x in result['nodes'])
+        failed = [x for x in result['nodes'] if 'msg' in x]
+        if failed:
+            result['failed'] = True
+            result['msg'] = '{0} of {1} nodes failed.'.format(len(failed), len(items))
+        return result
+
+    def _device_parameters(self, item, resource):
+        params = dict(
+            (k, v) for k, v in iteritems(self.module.params)
+            if k not in ['connector', 'device', 'devices', 'hostname', 'interfaces']
+        )
+        params['hostname'] = item.get('hostname', None)
+        params['interfaces'] = item.get('interfaces', None)
+        device = Device(client=self.client)
+        device.resource = resource
+        result = Parameters(client=self.client)
+        result.update(params)
+        result.update(dict(connector=self.want.connector, device=device))
+        return result
+
+    def _node_status(self, node):
+        task = node.attrs.get('currentConfigDeviceTaskReference', None) or {}
+        return task.get('status', None)
+
+    def present_all(self, wants, nodes, results):
+        missing = []
+        failed = []
+        for key, want in iteritems(wants):
+            node = nodes.get(want.device.address, None)
+            if node is None:
+                missing.append(key)
+            elif self._node_status(node) == 'FAILED':
+                failed.append(key)
+            else:
+                results[key]['status'] = self._node_status(node)
+        for key in missing + failed:
+            results[key]['changed'] = True
+        if self.module.check_mode:
+            return
+
+        # The only way to update is to delete the existing node and re-post.
+        self.map(lambda x: nodes[wants[x].device.address].delete(), failed, results)
+        keys = [x for x in missing + failed if 'msg' not in results[x]]
+        created = self.map(lambda x: self.create_node_on_device(wants[x]), keys, results)
+        pending = dict((k, wants[k].device.address) for k, v in zip(keys, created) if v is not None)
+        self.wait_for_configuration(pending, results)
+
+    def absent_all(self, wants, nodes, results):
+        present = [x for x in wants if wants[x].device.address in nodes]
+        for key in present:
+            results[key]['changed'] = True
+        if self.module.check_mode:
+            return
+        self.map(lambda x: nodes[wants[x].device.address].delete(), present, results)
+
+    def map(self, func, keys, results):
+        """Calls func for each of the keys, at most C(concurrency) at a time
+
+        A key that func fails for has the error put in its result, and None
+        returned for it.
+        """
+        def failed(key, ex):
+            results[key]['changed'] = False
+            results[key]['msg'] = str(ex)
+        return map_concurrently(func, keys, self.want.concurrency, on_error=failed)
+
+    def wait_for_configuration(self, pending, results):
+        def poll():
+            nodes = self.read_nodes_from_device()
+            for key in list(pending):
+                node = nodes.get(pending[key], None)
+                if node is None:
+                    continue
+                status = self._node_status(node)
+                if status == 'FINISHED':
+                    results[key]['status'] = status
+                    del pending[key]
+                elif status == 'FAILED':
+                    task = node.attrs['currentConfigDeviceTaskReference']
+                    results[key]['status'] = status
+                    results[key]['changed'] = False
+                    results[key]['msg'] = str(task.get('errorMessage', None))
+                    del pending[key]
+            return pending
+
+        waiter = Waiter(interval=10, max_interval=30, deadline=1800)
+        try:
+            waiter.wait(poll, done=lambda x: not x, generation=len)
+        except CommonF5ModuleError:
+            # The Waiter raises the F5ModuleError of module_utils common,
+            # which is a different class from the one in f5_utils.
+            for key in pending:
+                results[key]['msg'] = "Timed out waiting 30 minutes for node to finish."
+
+    def create_node_on_device(self, want):
+        params = want.api_params()
+        connector = want.connector.resource
+        return connector.nodes_s.node.create(**params)
+
+    def read_devices_from_device(self):
+        """Returns the managed BIG-IPs, by each of the names they may be given as"""
+        collection = Device(client=self.client)._get_device_collection()
+        result = dict()
+        for device in collection:
+            if str(device.product) != "BIG-IP":
+                continue
+            for name in [device.selfLink, device.hostname, device.address, device.managementAddress]:
+                if name is not None:
+                    result.setdefault(str(name), device)
+        return result
+
+    def read_nodes_from_device(self):
+        """Returns the nodes of the connector, by their address"""
+        connector = self.want.connector.resource
+        collection = connector.nodes_s.get_collection(
+            requests_params=dict(
+                params='$expand=currentConfigDeviceTaskReference'
+            )
+        )
+        return dict((str(x.ipAddress), x) for x in collection)
+
+
 class ArgumentSpec(object):
     def __init__(self):
         self.supports_check_mode = True
@@ -784,8 +1036,19 @@ class ArgumentSpec(object):
             connector=dict(
                 required=True
             ),
-            device=dict(
-                required=True
+            device=dict(),
+            devices=dict(
+                type='list',
+                elements='dict',
+                options=dict(
+                    device=dict(required=True),
+                    hostname=dict(),
+                    interfaces=dict(type='list')
+                )
+            ),
+            concurrency=dict(
+                type='int',
+                default=10
             ),
             device_root_password=dict(
                 no_log=True
@@ -807,9 +1070,15 @@ class ArgumentSpec(object):
 
         self.mutually_exclusive = [
             ['key_content', 'password_credential'],
+            ['device', 'devices'],
+            ['hostname', 'devices'],
+            ['interfaces', 'devices'],
         ]
         self.required_if = [
-            ['state', 'present', ['interfaces']]
+            ['state', 'present', ['interfaces', 'devices'], True]
+        ]
+        self.required_one_of = [
+            ['device', 'devices']
         ]
         self.f5_product_name = 'iworkflow'
 
@@ -825,14 +1094,20 @@ def main():
         supports_check_mode=spec.supports_check_mode,
         f5_product_name=spec.f5_product_name,
         required_if=spec.required_if,
+        required_one_of=spec.required_one_of,
         mutually_exclusive=spec.mutually_exclusive
     )
 
     try:
-        mm = ModuleManager(client)
+        if client.module.params['devices']:
+            mm = BulkManager(client)
+        else:
+            mm = ModuleManager(client)
         results = mm.exec_module()
+        if results.pop('failed', False):
+            client.module.fail_json(**results)
         client.module.exit_json(**results)
-    except F5ModuleError as e:
+    except (F5ModuleError, CommonF5ModuleError) as e:
         client.module.fail_json(msg=str(e))
 
 
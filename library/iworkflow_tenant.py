@@ -85,6 +85,7 @@ from ansible.module_utils.f5_utils import (
     HAS_F5SDK,
     iControlUnexpectedHTTPError
 )
+from ansible.module_utils.six.moves.urllib import parse
 
 
 class Parameters(AnsibleF5Parameters):
@@ -169,7 +170,7 @@ class ModuleManager(object):
     def exists(self):
         collection = self.client.api.cm.cloud.tenants_s.get_collection(
             requests_params=dict(
-                params="$filter=name+eq+'{0}'".format(self.want.name)
+                params="$filter=name+eq+'{0}'".format(parse.quote(self.want.name))
             )
         )
         if len(collection) == 1:
@@ -199,7 +200,7 @@ class ModuleManager(object):
     def read_current_from_device(self):
         collection = self.client.api.cm.cloud.tenants_s.get_collection(
             requests_params=dict(
-                params="$filter=name+eq+'{0}'".format(self.want.name)
+                params="$filter=name+eq+'{0}'".format(parse.quote(self.want.name))
             )
         )
         resource = collection.pop()
@@ -230,7 +231,7 @@ class ModuleManager(object):
     def remove_from_device(self):
         collection = self.client.api.cm.cloud.tenants_s.get_collection(
             requests_params=dict(
-                params="$filter=name+eq+'{0}'".format(self.want.name)
+                params="$filter=name+eq+'{0}'".format(parse.quote(self.want.name))
             )
         )
         resource = collection.pop()
@@ -6,11 +6,18 @@
 from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
-
+import hashlib
+import os
+import re
+import threading
 import time
 
+from ansible.module_utils.six.moves import shlex_quote
+from multiprocessing.pool import ThreadPool
+
 try:
     from f5.bigip import ManagementRoot
+    from f5.bigip.contexts import TransactionContextManager
     from icontrol.exceptions import iControlUnexpectedHTTPError
     HAS_F5SDK = True
 except ImportError:
@@ -19,71 +26,429 @@ except ImportError:
 try:
     from library.module_utils.network.f5.common import F5BaseClient
     from library.module_utils.network.f5.common import F5ModuleError
+    from library.module_utils.network.f5.common import RetryPolicy
+    from library.module_utils.network.f5.common import is_auth_error
+    from library.module_utils.network.f5.icontrol import iControlRestSession
 except ImportError:
     from ansible.module_utils.network.f5.common import F5BaseClient
     from ansible.module_utils.network.f5.common import F5ModuleError
+    from ansible.module_utils.network.f5.common import RetryPolicy
+    from ansible.module_utils.network.f5.common import is_auth_error
+    from ansible.module_utils.network.f5.icontrol import iControlRestSession
 
 
 class F5Client(F5BaseClient):
     @property
     def api(self):
-        exc = None
         if self._client:
             return self._client
-        for x in range(0, 60):
-            try:
-                server = self.params['provider']['server'] or self.params['server']
-                user = self.params['provider']['user'] or self.params['user']
-                password = self.params['provider']['password'] or self.params['password']
-                server_port = self.params['provider']['server_port'] or self.params['server_port'] or 443
-                validate_certs = self.params['provider']['validate_certs'] or self.params['validate_certs']
-
-                result = ManagementRoot(
-                    server,
-                    user,
-                    password,
-                    port=server_port,
-                    verify=validate_certs,
-                    token='tmos'
-                )
-                self._client = result
-                return self._client
-            except Exception as ex:
-                exc = ex
-                time.sleep(1)
-        error = 'Unable to connect to {0} on port {1}.'.format(server, server_port)
-        if exc is not None:
-            error += ' The reported error was "{0}".'.format(str(exc))
-        raise F5ModuleError(error)
+        self._client = self.connect(self._connect, self.merge_provider_params())
+        return self._client
+
+    def _management_root(self, params, **kwargs):
+        result = ManagementRoot(
+            params['server'],
+            params['user'],
+            params['password'],
+            port=params['server_port'],
+            verify=params['validate_certs'],
+            token='tmos',
+            **kwargs
+        )
+        return result
+
+    def _connect(self, params):
+        with self.token_cache:
+            token = self.token_cache.get()
+            if token is None:
+                # Log in while holding the lock, so that the token can be
+                # shared with the forks that are waiting on it.
+                return self._login(params)
+            expiration = self.token_cache.expiration()
+        # The lock is not held while connecting with a cached token, so
+        # that forks do not wait on each other to do so.
+        try:
+            return self._reuse_token(params, token, expiration)
+        except Exception as ex:
+            if not is_auth_error(ex):
+                raise
+        with self.token_cache:
+            # The cached token was revoked. Log in for a new one.
+            self.token_cache.invalidate(token)
+            return self._login(params)
+
+    def _login(self, params):
+        result = self._management_root(params)
+        self.token_cache.set(result.icrs.token, result.icrs.session.auth.expiration)
+        return result
+
+    def _reuse_token(self, params, token, expiration):
+        result = self._management_root(params, token_to_use=token)
+        # The SDK fills in placeholder credentials when it is given a token.
+        # Use the real ones, so that it logs in as the right user once the
+        # token expires.
+        auth = result.icrs.session.auth
+        auth.username = params['user']
+        auth.password = params['password']
+        auth.login_provider_name = 'tmos'
+        auth.expiration = expiration
+        return result
 
 
 class F5RestClient(F5BaseClient):
     @property
     def api(self):
-        ex = None
         if self._client:
             return self._client
-        for x in range(0, 10):
-            try:
-                server = self.params['provider']['server'] or self.params['server']
-                user = self.params['provider']['user'] or self.params['user']
-                password = self.params['provider']['password'] or self.params['password']
-                server_port = self.params['provider']['server_port'] or self.params['server_port'] or 443
-                validate_certs = self.params['provider']['validate_certs'] or self.params['validate_certs']
-
-                result = iControlRestSession(
-                    server,
-                    user,
-                    password,
-                    port=server_port,
-                    verify=validate_certs,
-                    token='tmos'
+        self._client = self.connect(self._connect, self.merge_provider_params())
+        return self._client
+
+    def _connect(self, params):
+        with self.token_cache:
+            token = self.token_cache.get()
+            if token is None:
+                # Log in now, while holding the lock, so that the token can
+                # be shared
+                result = self._session(params)
+                result.token
+                return result
+            expiration = self.token_cache.expiration()
+        return self._session(params, token=token, token_expiration=expiration)
+
+    def _session(self, params, **kwargs):
+        result = iControlRestSession(
+            params['server'],
+            params['user'],
+            params['password'],
+            server_port=params['server_port'],
+            validate_certs=params['validate_certs'],
+            auth_provider='tmos',
+            token_callback=self._store_token,
+            **kwargs
+        )
+        return result
+
+    def _store_token(self, token, expiration):
+        # Called by the session every time it logs in, including when it
+        # logs in again after the cached token was rejected.
+        self.token_cache.set(token, expiration)
+
+
+def upload_fileobj(uploads, fileobj, target, chunk_size=512 * 1024):
+    """Uploads a file object to the device in Content-Range chunks
+
+    The upload methods of the SDK read the whole file into memory to learn
+    its size. This learns the size by seeking instead, so that only one
+    chunk is held in memory at a time, whatever the size of the file.
+
+    Args:
+        uploads: The SDK file upload resource to upload to. For example,
+            ``client.api.shared.file_transfer.uploads``.
+        fileobj: Seekable file object, opened in binary mode.
+        target (string): Name to give the file on the device.
+        chunk_size (int): Size of each chunk, in bytes.
+    """
+    upload = FileUpload(uploads, fileobj, target, chunk_size=chunk_size, max_workers=1)
+    upload.upload()
+    fileobj.seek(0)
+
+
+class FileUpload(object):
+    """Uploads a file to the device in Content-Range chunks
+
+    The file is read once, in order, and a SHA-256 checksum of it is kept as
+    it is read. By default, chunks are sent one at a time, in order. When
+    ``max_workers`` is raised, up to that many chunks are sent to the device
+    at the same time, and so may arrive out of order. No more than that many
+    chunks are held in memory. The first chunk is always sent on its own, so
+    that the device has created the file before the rest of the chunks arrive.
+
+    Each chunk is retried as the ``retry`` policy allows. The offsets of the
+    chunks that the device acknowledged are remembered, so if the upload
+    still fails, calling ``upload`` again only sends the chunks that are
+    missing.
+
+    Usage is,
+
+        with open('/path/to/BIGIP-13.1.0.iso', 'rb') as fileobj:
+            upload = FileUpload(client.api.cm.autodeploy.software_image_uploads, fileobj, 'BIGIP-13.1.0.iso')
+            upload.upload()
+        # Optional. Needs a user that may run bash on the device.
+        upload.verify(client, '/shared/images/BIGIP-13.1.0.iso')
+
+    Args:
+        uploads: The SDK file upload resource to upload to. For example,
+            ``client.api.shared.file_transfer.uploads``.
+        fileobj: Seekable file object, opened in binary mode.
+        target (string): Name to give the file on the device.
+        chunk_size (int): Size of each chunk, in bytes.
+        max_workers (int): The most chunks that are sent at the same time.
+            Only raise this for devices that accept chunks out of order.
+        retry (RetryPolicy): Decides when a failed chunk is sent again.
+        progress (callable): Called with the number of bytes acknowledged so
+            far, and the size of the file, each time a chunk is acknowledged.
+    """
+    def __init__(self, uploads, fileobj, target, chunk_size=512 * 1024, max_workers=1,
+                 retry=None, progress=None):
+        if max_workers < 1:
+            raise F5ModuleError(
+                "The number of chunks to upload at the same time must be at least 1."
+            )
+        self.uri = uploads._meta_data['uri'] + target
+        self.session = uploads._meta_data['icr_session']
+        self.fileobj = fileobj
+        self.target = target
+        self.chunk_size = chunk_size
+        self.max_workers = max_workers
+        self.retry = retry or RetryPolicy()
+        self.progress = progress
+        self.acknowledged = set()
+        self.checksum = None
+        self.elapsed = 0
+        self.bytes_sent = 0
+        self._error = None
+        self._lock = threading.Lock()
+
+        fileobj.seek(0, os.SEEK_END)
+        self.size = fileobj.tell()
+        fileobj.seek(0)
+
+    @property
+    def offset(self):
+        """The offset up to which every chunk was acknowledged by the device"""
+        result = 0
+        while result < self.size and result in self.acknowledged:
+            result += self.chunk_size
+        return min(result, self.size)
+
+    @property
+    def throughput(self):
+        """Bytes sent to the device per second, over all calls to ``upload``"""
+        if not self.elapsed:
+            return 0
+        return self.bytes_sent / self.elapsed
+
+    def upload(self):
+        """Sends the chunks of the file that the device has not acknowledged
+
+        Returns:
+            FileUpload: This upload, for chaining.
+        Raises:
+            F5ModuleError: A chunk could not be sent within the retry policy.
+        """
+        self._error = None
+        digest = hashlib.sha256()
+        slots = threading.BoundedSemaphore(self.max_workers)
+        pool = ThreadPool(self.max_workers)
+        started = time.time()
+        try:
+            self.fileobj.seek(0)
+            start = 0
+            while start < self.size and self._error is None:
+                data = self.fileobj.read(self.chunk_size)
+                if not data:
+                    break
+                digest.update(data)
+                if start not in self.acknowledged:
+                    slots.acquire()
+                    if start == 0:
+                        self._send(slots, start, data)
+                    else:
+                        pool.apply_async(self._send, (slots, start, data))
+                start += len(data)
+        finally:
+            pool.close()
+            pool.join()
+            self.elapsed += time.time() - started
+        if self._error is not None:
+            raise F5ModuleError(
+                "Failed to upload {0}; the first {1} of {2} bytes were acknowledged. {3}".format(
+                    self.target, self.offset, self.size, self._error
                 )
-                self._client = result
-                return self._client
+            )
+        self.checksum = digest.hexdigest()
+        return self
+
+    def _send(self, slots, start, data):
+        try:
+            if self._error is not None:
+                return
+            end = start + len(data)
+            headers = {
+                'Content-Range': '{0}-{1}/{2}'.format(start, end - 1, self.size),
+                'Content-Type': 'application/octet-stream'
+            }
+            try:
+                self.retry.call(self.session.post, self.uri, data=data, headers=headers)
             except Exception as ex:
-                time.sleep(1)
-        error = 'Unable to connect to {0} on port {1}.'.format(server, server_port)
-        if ex is not None:
-            error += ' The reported error was "{0}".'.format(str(ex))
-        raise F5ModuleError(error)
+                self._error = str(ex)
+                return
+            with self._lock:
+                self.acknowledged.add(start)
+                self.bytes_sent += len(data)
+                sent = self.bytes_sent
+            if self.progress:
+                self.progress(sent, self.size)
+        finally:
+            slots.release()
+
+    def verify(self, client, path):
+        """Compares the checksum of the file on the device with the one sent
+
+        The checksum is taken by running ``sha256sum`` through the bash
+        utility, so the user must be allowed to run it.
+
+        Args:
+            client (F5Client): The client for the device.
+            path (string): Where the uploaded file is on the device.
+        Raises:
+            F5ModuleError: The checksums differ.
+        """
+        output = client.api.tm.util.bash.exec_cmd(
+            'run',
+            utilCmdArgs='-c "sha256sum {0}"'.format(shlex_quote(path))
+        )
+        result = None
+        if hasattr(output, 'commandResult'):
+            result = output.commandResult.split(' ')[0].strip()
+        if result != self.checksum:
+            raise F5ModuleError(
+                "The checksum of {0} on the device, {1}, does not match the checksum of the file that was sent, {2}".format(
+                    path, result, self.checksum
+                )
+            )
+
+
+def upload_summary(uploads):
+    """Sums up the uploads of a task, for the result of the module
+
+    Args:
+        uploads (list): The ``FileUpload`` objects of the task.
+
+    Returns:
+        dict: The bytes sent, the seconds spent sending them and the bytes
+        sent per second.
+    """
+    sent = sum(x.bytes_sent for x in uploads)
+    elapsed = sum(x.elapsed for x in uploads)
+    return dict(
+        bytes=sent,
+        seconds=round(elapsed, 2),
+        throughput=int(sent / elapsed) if elapsed else 0
+    )
+
+
+class TransactionAborted(Exception):
+    pass
+
+
+class TransactionBatch(object):
+    """Queues changes to many resources and commits them in one transaction
+
+    BIG-IP validates and commits every REST call that changes its
+    configuration on its own. When many resources are changed at once,
+    queueing those calls in an iControl REST transaction lets the device
+    validate and commit all of them together.
+
+    Changes are added as callables, which are only called when the batch is
+    committed. Any reads that a change needs (such as loading the resource
+    that it modifies) must be made before it is added, because calls made
+    inside the transaction are queued and not answered.
+
+    Usage is,
+
+        batch = TransactionBatch(client)
+        batch.add('/Common/foo', client.api.tm.ltm.nodes.node.create, name='foo', address='1.1.1.1')
+        resource = client.api.tm.ltm.nodes.node.load(name='bar')
+        batch.add('/Common/bar', resource.modify, description='bar')
+        errors = batch.commit()
+
+    Args:
+        client (F5Client): The client for the device.
+        validate_only (bool): Have the device validate the transaction, but
+            not commit it.
+    """
+    def __init__(self, client, validate_only=False):
+        self.client = client
+        self.validate_only = validate_only
+        self.operations = []
+
+    def __len__(self):
+        return len(self.operations)
+
+    def __contains__(self, item):
+        return any(name == item for name, func, args, kwargs in self.operations)
+
+    @property
+    def names(self):
+        result = []
+        for name, func, args, kwargs in self.operations:
+            if name not in result:
+                result.append(name)
+        return result
+
+    def add(self, item, func, *args, **kwargs):
+        """Queues a change
+
+        The device rejects the whole transaction when, for example, it is
+        asked to delete the same resource twice. Callers that may queue such
+        a change more than once should check ``item in batch`` first.
+
+        Args:
+            item (string): Name of the item that the change is for. Errors
+                are reported by this name.
+            func: Called, with the remaining arguments, inside the transaction.
+        """
+        self.operations.append((item, func, args, kwargs))
+
+    def named_in(self, message):
+        """Returns the names of the items that a message mentions
+
+        Names are only matched whole, so that an error about ``/Common/web10``
+        is not also reported for ``/Common/web1``.
+        """
+        result = []
+        for name in self.names:
+            pattern = r'(?<![\w.-]){0}(?![\w-]|\.\w)'.format(re.escape(name))
+            if re.search(pattern, message):
+                result.append(name)
+        return result
+
+    def commit(self):
+        """Commits the queued changes in a single transaction
+
+        The transaction is only committed when every change in it could be
+        queued. Otherwise, nothing is changed on the device.
+
+        When the device rejects the transaction, its error is reported for
+        the items that it names. If it names none of them, it is reported for
+        every item.
+
+        Returns:
+            dict: Error messages, keyed by the names of the items that
+            failed. Empty when the transaction was committed.
+        """
+        errors = dict()
+        if not self.operations:
+            return errors
+        not_committed = 'Not committed because other changes in the transaction failed.'
+        tx = self.client.api.tm.transactions.transaction
+        try:
+            with TransactionContextManager(tx, validate_only=self.validate_only):
+                for name, func, args, kwargs in self.operations:
+                    try:
+                        func(*args, **kwargs)
+                    except Exception as ex:
+                        errors[name] = str(ex)
+                if errors:
+                    raise TransactionAborted()
+        except TransactionAborted:
+            pass
+        except Exception as ex:
+            message = str(ex)
+            for name in self.named_in(message) or self.names:
+                errors[name] = message
+        if errors:
+            for name in self.names:
+                errors.setdefault(name, not_committed)
+        return errors
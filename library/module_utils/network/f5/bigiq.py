@@ -7,8 +7,6 @@ from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
 
-import time
-
 try:
     from f5.bigiq import ManagementRoot
     from icontrol.exceptions import iControlUnexpectedHTTPError
@@ -18,12 +16,10 @@ except ImportError:
 
 try:
     from library.module_utils.network.f5.common import F5BaseClient
-    from library.module_utils.network.f5.common import F5ModuleError
     from library.module_utils.network.f5.common import is_ansible_debug
     from library.module_utils.network.f5.icontrol import iControlRestSession
 except ImportError:
     from ansible.module_utils.network.f5.common import F5BaseClient
-    from ansible.module_utils.network.f5.common import F5ModuleError
     from ansible.module_utils.network.f5.common import is_ansible_debug
     from ansible.module_utils.network.f5.icontrol import iControlRestSession
 
@@ -31,66 +27,40 @@ except ImportError:
 class F5Client(F5BaseClient):
     @property
     def api(self):
-        exc = None
         if self._client:
             return self._client
-        for x in range(0, 3):
-            try:
-                server = self.params['provider']['server'] or self.params['server']
-                user = self.params['provider']['user'] or self.params['user']
-                password = self.params['provider']['password'] or self.params['password']
-                server_port = self.params['provider']['server_port'] or self.params['server_port'] or 443
-                validate_certs = self.params['provider']['validate_certs'] or self.params['validate_certs']
-
-                result = ManagementRoot(
-                    server,
-                    user,
-                    password,
-                    port=server_port,
-                    verify=validate_certs
-                )
-                self._client = result
-                return self._client
-            except Exception as ex:
-                exc = ex
-                time.sleep(1)
-        error = 'Unable to connect to {0} on port {1}.'.format(self.params['server'], self.params['server_port'])
-        if exc is not None:
-            error += ' The reported error was "{0}".'.format(str(exc))
-        raise F5ModuleError(error)
+        self._client = self.connect(self._connect, self.merge_provider_params())
+        return self._client
 
+    def _connect(self, params):
+        result = ManagementRoot(
+            params['server'],
+            params['user'],
+            params['password'],
+            port=params['server_port'],
+            verify=params['validate_certs']
+        )
+        return result
 
 
 class F5RestClient(F5BaseClient):
     @property
     def api(self):
-        ex = None
         if self._client:
             return self._client
-        for x in range(0, 10):
-            try:
-                server = self.params['provider']['server'] or self.params['server']
-                user = self.params['provider']['user'] or self.params['user']
-                password = self.params['provider']['password'] or self.params['password']
-                server_port = self.params['provider']['server_port'] or self.params['server_port'] or 443
-                validate_certs = self.params['provider']['validate_certs'] or self.params['validate_certs']
+        self._client = self.connect(self._connect, self.merge_provider_params())
+        return self._client
 
-                # Should we import from module??
-                # self.module.params['server'],
-                result = iControlRestSession(
-                    server,
-                    user,
-                    password,
-                    port=server_port,
-                    verify=validate_certs,
-                    auth_provider='local',
-                    debug=is_ansible_debug(self.module)
-                )
-                self._client = result
-                return self._client
-            except Exception as ex:
-                time.sleep(1)
-        error = 'Unable to connect to {0} on port {1}.'.format(self.params['server'], self.params['server_port'])
-        if ex is not None:
-            error += ' The reported error was "{0}".'.format(str(ex))
-        raise F5ModuleError(error)
+    def _connect(self, params):
+        result = iControlRestSession(
+            params['server'],
+            params['user'],
+            params['password'],
+            server_port=params['server_port'],
+            validate_certs=params['validate_certs'],
+            auth_provider='local',
+            debug=is_ansible_debug(self.module)
+        )
+        # Log in now, so that authentication errors surface here
+        result.token
+        return result
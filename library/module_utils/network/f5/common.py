@@ -6,14 +6,24 @@
 from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
+import hashlib
+import json
+import os
+import random
 import re
+import socket
+import time
 
+from ansible.module_utils._text import to_bytes
 from ansible.module_utils._text import to_text
 from ansible.module_utils.basic import env_fallback
+from ansible.module_utils.parsing.convert_bool import BOOLEANS_FALSE
 from ansible.module_utils.connection import exec_command
+from ansible.module_utils.network.common.parsing import FailedConditionsError
 from ansible.module_utils.network.common.utils import to_list, ComplexList
 from ansible.module_utils.six import iteritems
 from collections import defaultdict
+from multiprocessing.pool import ThreadPool
 
 try:
     from icontrol.exceptions import iControlUnexpectedHTTPError
@@ -21,6 +31,26 @@ try:
 except ImportError:
     HAS_F5SDK = False
 
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
+
+
+# Messages that resolvers give when a name does not exist. Retrying these
+# will not make the name exist, so they fail immediately.
+DNS_ERROR_MESSAGES = (
+    'Name or service not known',
+    'nodename nor servname provided',
+    'No address associated with hostname',
+    'getaddrinfo failed',
+)
+
+# Tokens that expire within this many seconds are not handed out of the
+# token cache. A new token is requested instead.
+TOKEN_REFRESH_MARGIN = 120
+
 
 f5_provider_spec = {
     'server': dict(
@@ -192,8 +222,13 @@ def run_commands(module, commands, check_rc=True):
 
 def cleanup_tokens(client):
     try:
+        token = client.api.icrs.token
+        if client.token_cache.contains(token):
+            # The token is shared with other module invocations through
+            # the token cache. It is left to expire on the device.
+            return
         resource = client.api.shared.authz.tokens_s.token.load(
-            name=client.api.icrs.token
+            name=token
         )
         resource.delete()
     except Exception:
@@ -309,6 +344,58 @@ def compare_dictionary(want, have):
         return want
 
 
+def collapse_ranges(ranges):
+    """Merges ranges that overlap, or that touch, into one
+
+    Args:
+        ranges (list): Tuples of ``(start, stop)`` integers. The order of the
+            ranges does not matter.
+
+    Returns:
+        list: Tuples of ``(start, stop)`` integers, in order, of which no two
+        overlap or touch.
+    """
+    result = []
+    for start, stop in sorted(ranges):
+        if result and start <= result[-1][1] + 1:
+            if stop > result[-1][1]:
+                result[-1] = (result[-1][0], stop)
+            continue
+        result.append((start, stop))
+    return result
+
+
+class ListDifference(object):
+    """Difference between two lists whose order does not matter
+
+    The lists are compared as sets of their canonical entries, so that no
+    sorting is needed to find that they are the same. Only the entries that
+    were added or removed are sorted, to report them.
+
+    Args:
+        want (list): Canonical entries that are wanted.
+        have (list): Canonical entries that are on the device.
+    """
+    def __init__(self, want, have):
+        self.want = frozenset(want)
+        self.have = frozenset(have)
+
+    @property
+    def changed(self):
+        return self.want != self.have
+
+    @property
+    def added(self):
+        return sorted(self.want - self.have)
+
+    @property
+    def removed(self):
+        return sorted(self.have - self.want)
+
+    def to_return(self):
+        return dict(added=self.added, removed=self.removed)
+
+
 def is_ansible_debug(module):
     if module._debug and module._verbosity >= 4:
         return True
@@ -341,17 +428,710 @@ class Noop(object):
     pass
 
 
+def get_status_code(ex):
+    """Returns the HTTP status code that an exception was raised for
+
+    Exceptions raised by the f5-sdk carry the ``requests`` response, those
+    raised by ``open_url`` carry the code, and those raised by the
+    ``iControlRestSession`` carry it in their message.
+
+    Returns:
+        int: The status code, or ``None`` if the error was not an HTTP error.
+    """
+    response = getattr(ex, 'response', None)
+    code = getattr(response, 'status_code', None)
+    if code is None:
+        code = getattr(ex, 'code', None)
+    if code is None:
+        match = re.match(r'^(?:HTTP Error )?(?P<code>[1-5][0-9]{2})[: ]', str(ex))
+        if match:
+            code = match.group('code')
+    try:
+        return int(code)
+    except (TypeError, ValueError):
+        return None
+
+
+def is_auth_error(ex):
+    return get_status_code(ex) == 401
+
+
+def is_dns_error(ex):
+    if isinstance(ex, socket.gaierror) and ex.args and ex.args[0] in (socket.EAI_NONAME, getattr(socket, 'EAI_NODATA', None)):
+        return True
+    return any(x in str(ex) for x in DNS_ERROR_MESSAGES)
+
+
+class RetryPolicy(object):
+    """Decides whether, and when, a failed request is tried again
+
+    Delays grow exponentially with each attempt, and the actual delay is
+    picked at random between zero and that value ("full jitter"). This keeps
+    forks that failed at the same moment from all trying again at the same
+    moment.
+
+    Errors are sorted into kinds, each with their own budget of retries.
+
+    * ``connect`` - the device could not be reached, or the connection broke.
+    * ``server`` - the device answered with a 5xx status.
+    * ``fatal`` - authentication failures (401), names that do not resolve,
+      and other 4xx statuses. These are raised immediately.
+
+    No retry is started once ``deadline`` seconds have passed since the
+    first attempt.
+
+    Args:
+        connect_retries (int): Retries allowed for connection errors.
+        server_error_retries (int): Retries allowed for 5xx errors.
+        base_delay (float): Upper bound of the first delay, in seconds.
+        max_delay (float): Upper bound of any delay, in seconds.
+        deadline (float): Seconds after which no more retries are made.
+    """
+    def __init__(self, connect_retries=5, server_error_retries=3, base_delay=1,
+                 max_delay=16, deadline=60, sleep=time.sleep, clock=time.time):
+        self.connect_retries = connect_retries
+        self.server_error_retries = server_error_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self._sleep = sleep
+        self._clock = clock
+
+    def classify(self, ex):
+        if is_auth_error(ex) or is_dns_error(ex):
+            return 'fatal'
+        code = get_status_code(ex)
+        if code is None:
+            return 'connect'
+        if code >= 500:
+            return 'server'
+        return 'fatal'
+
+    def budget(self, kind):
+        if kind == 'connect':
+            return self.connect_retries
+        elif kind == 'server':
+            return self.server_error_retries
+        return 0
+
+    def delay(self, attempt):
+        """Returns the delay before a retry
+
+        Args:
+            attempt (int): The number of retries made so far.
+        """
+        ceiling = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    def call(self, func, *args, **kwargs):
+        """Calls a function, retrying it as the policy allows
+
+        Returns:
+            The return value of ``func``.
+        Raises:
+            The exception of the last failed attempt.
+        """
+        start = self._clock()
+        retries = dict(connect=0, server=0)
+        while True:
+            try:
+                return func(*args, **kwargs)
+            except Exception as ex:
+                kind = self.classify(ex)
+                if retries.get(kind, 0) >= self.budget(kind):
+                    raise
+                remaining = self.deadline - (self._clock() - start)
+                if remaining <= 0:
+                    raise
+                delay = min(self.delay(sum(retries.values())), remaining)
+                retries[kind] += 1
+                self._sleep(delay)
+
+
+class Waiter(object):
+    """Polls the device until an operation on it has finished
+
+    Polls start ``interval`` seconds apart. Each poll whose result is no
+    different from the one before makes the next wait ``backoff`` times
+    longer, up to ``max_interval``. As soon as the result changes the wait
+    drops back to ``interval``, because a device that is making progress is
+    likely to finish soon.
+
+    Results are told apart by their ``generation``. For REST resources this
+    should be something the device changes whenever the resource changes,
+    such as its ``generation`` or ``lastUpdateMicros`` attribute. By default
+    the result itself is compared.
+
+    Args:
+        interval (float): Seconds between polls while the result changes.
+        max_interval (float): Most seconds between polls. Defaults to
+            ``interval``, which polls at a fixed rate.
+        backoff (float): Factor that the wait grows by while nothing changes.
+        delay (float): Seconds to wait before the first poll.
+        deadline (float): Seconds after which the wait is given up, or
+            ``None`` to wait for as long as it takes.
+        progress (callable): Called with each result whose generation
+            differs from the one before, and the seconds waited so far.
+    """
+    def __init__(self, interval=1, max_interval=None, backoff=1.5, delay=0, deadline=None,
+                 progress=None, sleep=None, clock=None):
+        self.interval = interval
+        self.max_interval = max(interval, max_interval or interval)
+        self.backoff = backoff
+        self.delay = delay
+        self.deadline = deadline
+        self.progress = progress
+        self._sleep = sleep or time.sleep
+        self._clock = clock or time.time
+
+    def wait(self, poll, done=bool, generation=None, settle=1, ignore=(), message=None):
+        """Calls ``poll`` until ``done`` is true of its result
+
+        Args:
+            poll (callable): Reads the state of the operation from the device.
+            done (callable): Tells whether a result of ``poll`` means that the
+                operation finished. To stop waiting on failed operations, it
+                may raise an ``F5ModuleError``.
+            generation (callable): Returns what a result of ``poll`` is told
+                apart by.
+            settle (int): How many polls in a row must be done. This is for
+                states that the device may briefly pass through.
+            ignore (tuple): Exceptions that ``poll`` may raise while the device
+                is unreachable, such as while it reboots. These count as a poll
+                that is not done.
+            message (string): Error to raise when the deadline passes.
+
+        Returns:
+            The last result of ``poll``.
+
+        Raises:
+            F5ModuleError: The deadline passed.
+        """
+        start = self._clock()
+        interval = self.interval
+        last = None
+        done_count = 0
+        if self.delay:
+            self._sleep(self.delay)
+        while True:
+            try:
+                result = poll()
+            except ignore:
+                result = None
+                done_count = 0
+            else:
+                if done(result):
+                    done_count += 1
+                    if done_count >= settle:
+                        return result
+                else:
+                    done_count = 0
+            elapsed = self._clock() - start
+            current = result if generation is None or result is None else generation(result)
+            if current != last:
+                interval = self.interval
+                if self.progress and result is not None:
+                    self.progress(result, elapsed)
+            else:
+                interval = min(self.max_interval, interval * self.backoff)
+            last = current
+            if self.deadline is not None:
+                remaining = self.deadline - elapsed
+                if remaining <= 0:
+                    raise F5ModuleError(
+                        message or "Timed out after {0} seconds waiting for the device".format(int(elapsed))
+                    )
+                interval = min(interval, remaining)
+            self._sleep(interval)
+
+
+def map_concurrently(func, items, concurrency, on_error=None):
+    """Calls func for each of the items, at most ``concurrency`` at a time
+
+    This is for modules that make the same change to many resources, or
+    devices, in one task.
+
+    Args:
+        func (callable): Called with each of the items.
+        items (list): The items to call func for.
+        concurrency (int): The most calls that are made at the same time.
+        on_error (callable): Called with the item and the error when func
+            raises for an item. The result for that item is then None, and
+            the other items are not affected. When ``None``, the error is
+            raised instead.
+
+    Returns:
+        list: The results of func, in the order of the items.
+
+    Raises:
+        F5ModuleError: The concurrency is less than 1.
+    """
+    if concurrency is None or concurrency < 1:
+        raise F5ModuleError(
+            "The concurrency must be 1 or more."
+        )
+
+    def call(item):
+        try:
+            return func(item)
+        except Exception as ex:
+            if on_error is None:
+                raise
+            on_error(item, ex)
+            return None
+
+    items = list(items)
+    if not items:
+        return []
+    pool = ThreadPool(processes=min(concurrency, len(items)))
+    try:
+        return pool.map(call, items)
+    finally:
+        pool.close()
+        pool.join()
+
+
+class CommandRunner(object):
+    """Runs commands until their output satisfies ``wait_for`` conditionals
+
+    Every command is run the first time. After that, only the commands whose
+    output is referred to (as ``result[N]``) by a conditional that is not
+    yet satisfied are run again. The last output of each command is kept in
+    ``cache``, by the command's index, with the time that it was read, and
+    is reused for the commands that are not run again.
+
+    The wait between retries starts at ``interval`` and doubles after each
+    retry, up to ``max_interval`` or ``interval``, whichever is longer.
+
+    Args:
+        run (callable): Runs a list of commands on the device. Returns their
+            output in the same order, with ``None`` for commands that had
+            none.
+        retries (int): The most times that the commands are run.
+        interval (float): Seconds to wait before the first retry.
+        match (string): ``all`` if every conditional must be satisfied, or
+            ``any`` if one is enough.
+        max_interval (float): Most seconds to wait between retries.
+    """
+    def __init__(self, run, retries=10, interval=1, match='all', max_interval=30,
+                 sleep=None, clock=None):
+        self.run = run
+        self.retries = retries
+        self.interval = interval
+        self.match = match
+        self.max_interval = max(interval, max_interval)
+        self.cache = dict()
+        self._sleep = sleep or time.sleep
+        self._clock = clock or time.time
+
+    def wait(self, commands, conditionals):
+        """Runs the commands until the conditionals are satisfied
+
+        Returns:
+            list: The output of the commands that had output, in order.
+
+        Raises:
+            FailedConditionsError: The conditionals were still not satisfied
+                after all of the retries.
+        """
+        conditionals = list(conditionals)
+        pending = list(range(len(commands)))
+        interval = self.interval
+        retries = self.retries
+        while retries > 0:
+            outputs = self.run([commands[i] for i in pending])
+            now = self._clock()
+            for index, output in zip(pending, outputs):
+                self.cache[index] = (now, output)
+            responses = self.responses
+
+            for item in list(conditionals):
+                if item(responses):
+                    if self.match == 'any':
+                        return responses
+                    conditionals.remove(item)
+
+            if not conditionals:
+                return responses
+
+            retries -= 1
+            if retries == 0:
+                break
+            pending = self.commands_for(conditionals, len(commands))
+            self._sleep(interval)
+            interval = min(self.max_interval, interval * 2)
+
+        failed_conditions = [item.raw for item in conditionals]
+        errmsg = 'One or more conditional statements have not been satisfied'
+        raise FailedConditionsError(errmsg, failed_conditions)
+
+    @property
+    def responses(self):
+        result = [self.cache[i][1] for i in sorted(self.cache)]
+        return [x for x in result if x is not None]
+
+    def commands_for(self, conditionals, count):
+        """Returns the indexes of the commands that the conditionals refer to
+
+        Commands without output are left out of the results, so ``result[N]``
+        is the Nth command that had output. Conditionals that refer to no
+        single command, or to one that is not there, need every command.
+        """
+        positions = [i for i in sorted(self.cache) if self.cache[i][1] is not None]
+        result = set()
+        for item in conditionals:
+            matches = re.match(r'^result\[(?P<index>\d+)\]', item.key)
+            if not matches or int(matches.group('index')) >= len(positions):
+                return list(range(count))
+            result.add(positions[int(matches.group('index'))])
+        return sorted(result)
+
+
+class DiskCache(object):
+    """Base class for caches that are shared by module invocations
+
+    Every module invocation in a play runs in its own process, so anything
+    that should outlive a single task has to be kept on the controller's
+    disk. Each cache entry is one JSON file, named after a digest of its key,
+    next to a lock file. Use the cache as a context manager to hold the lock
+    while reading and writing an entry.
+
+    Entries are only readable by the user that runs the play.
+    """
+    def __init__(self, key, path=None):
+        self.path = path
+        self._lock_fd = None
+        digest = hashlib.sha1(to_bytes(key, errors='surrogate_or_strict')).hexdigest()
+        if self.enabled:
+            self.filename = os.path.join(self.path, digest + '.json')
+            self.lockfile = os.path.join(self.path, digest + '.lock')
+
+    @staticmethod
+    def default_path(name, env):
+        if not HAS_FCNTL:
+            return None
+        path = os.environ.get(env, None)
+        if path is None:
+            path = os.path.join(os.path.expanduser('~'), '.ansible', 'f5', name)
+        return path
+
+    @property
+    def enabled(self):
+        return self.path is not None
+
+    def __enter__(self):
+        if not self.enabled:
+            return self
+        if not os.path.isdir(self.path):
+            try:
+                os.makedirs(self.path, 0o700)
+            except OSError:
+                # Another fork created it first
+                pass
+        self._lock_fd = os.open(self.lockfile, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self._lock_fd is not None:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+    def _read(self):
+        if not self.enabled:
+            return None
+        try:
+            with open(self.filename) as fh:
+                return json.load(fh)
+        except (IOError, OSError, ValueError):
+            return None
+
+    def _write(self, entry):
+        if not os.path.isdir(self.path):
+            os.makedirs(self.path, 0o700)
+        tmp = '{0}.{1}'.format(self.filename, os.getpid())
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as fh:
+            json.dump(entry, fh)
+        os.rename(tmp, self.filename)
+
+    def _remove(self):
+        try:
+            os.remove(self.filename)
+        except OSError:
+            pass
+
+
+class TokenCache(DiskCache):
+    """On-disk cache of authentication tokens
+
+    Each module invocation would otherwise log in to the device to get a
+    token of its own. Devices limit the number of tokens that a user may
+    hold, so large plays can run out of them.
+
+    This cache stores one token per server, port, user and auth provider.
+    Parallel forks that all need a token wait on the lock for the first of
+    them to log in, and then share the token it got.
+
+    Tokens are stored with their expiration time (as seconds since the
+    epoch on the controller). Tokens that are about to expire are not
+    returned by ``get``, so that the caller logs in again and replaces
+    them.
+
+    The cache lives in ``~/.ansible/f5/tokens`` unless the ``F5_TOKEN_CACHE_DIR``
+    environment variable says otherwise. Setting the ``F5_TOKEN_CACHE``
+    environment variable to ``no`` disables it.
+
+    Usage is,
+
+        cache = TokenCache(server, server_port, user, auth_provider)
+        with cache:
+            token = cache.get()
+            if token is None:
+                token, expiration = login()
+                cache.set(token, expiration)
+    """
+    def __init__(self, server, server_port, user, auth_provider=None, path=None,
+                 refresh_margin=TOKEN_REFRESH_MARGIN):
+        if path is None and os.environ.get('F5_TOKEN_CACHE', '').lower() not in BOOLEANS_FALSE:
+            path = self.default_path('tokens', 'F5_TOKEN_CACHE_DIR')
+        key = '{0}:{1}:{2}:{3}'.format(server, server_port, user, auth_provider)
+        super(TokenCache, self).__init__(key, path=path)
+        self.refresh_margin = refresh_margin
+
+    def get(self):
+        """Returns the cached token, if it is not about to expire
+
+        Returns:
+            string: The token, or ``None`` if there is no usable token.
+        """
+        entry = self._read()
+        if not entry or not entry.get('token', None):
+            return None
+        if entry.get('expiration', 0) - self.refresh_margin < time.time():
+            return None
+        return entry['token']
+
+    def expiration(self):
+        entry = self._read()
+        if not entry:
+            return None
+        return entry.get('expiration', None)
+
+    def set(self, token, expiration):
+        if not self.enabled or not token or not expiration:
+            return
+        self._write(dict(token=token, expiration=expiration))
+
+    def invalidate(self, token=None):
+        """Removes the cached token
+
+        Args:
+            token (string): Only remove the cached token if it is this one.
+                When ``None``, the cached token is always removed.
+        """
+        if not self.enabled:
+            return
+        if token is not None and not self.contains(token):
+            return
+        self._remove()
+
+    def contains(self, token):
+        entry = self._read()
+        if not entry or token is None:
+            return False
+        return entry.get('token', None) == token
+
+
+class CollectionSnapshot(object):
+    """In-memory copy of a whole collection
+
+    The collection is fetched, with its sub-collections expanded, the first
+    time that it is looked up. After that, existence checks and reads of
+    the resources in it are answered from the copy.
+
+    Writes to a resource mark it as stale. Lookups of stale resources are
+    not answered; the caller must ask the device instead.
+
+    Args:
+        fetch: Called with no arguments, returns the list of resource dicts
+            in the collection.
+    """
+    enabled = True
+
+    def __init__(self, fetch):
+        self.fetch = fetch
+        self.fetched = False
+        self._entry = None
+
+    def _fetch(self):
+        result = dict(
+            items=dict((x['fullPath'], x) for x in self.fetch()),
+            stale=[]
+        )
+        self.fetched = True
+        return result
+
+    def _load(self):
+        if self._entry is None:
+            self._entry = self._fetch()
+        return self._entry
+
+    def _mark_stale(self, key):
+        if self._entry is not None and key not in self._entry['stale']:
+            self._entry['stale'].append(key)
+
+    def lookup(self, name, partition='Common', member=None, subcollection='membersReference'):
+        """Looks up a resource, or a member of a resource, in the collection
+
+        Args:
+            name (string): Name of the resource.
+            partition (string): Partition of the resource.
+            member (string): Full path of a member in the sub-collection of the
+                resource to look up instead of the resource itself.
+            subcollection (string): Attribute holding the sub-collection.
+
+        Returns:
+            tuple: ``(known, attrs)``. When ``known`` is ``False`` the copy
+            cannot answer and the caller must ask the device. Otherwise
+            ``attrs`` are the attributes of the resource, or ``None`` when
+            it does not exist.
+        """
+        if not self.enabled:
+            return False, None
+        key = fq_name(partition, name)
+        entry = self._load()
+        if key in entry['stale'] or (member and '{0}|{1}'.format(key, member) in entry['stale']):
+            return False, None
+        resource = entry['items'].get(key, None)
+        if member is None or resource is None:
+            return True, resource
+        items = (resource.get(subcollection, None) or {}).get('items', [])
+        for item in items:
+            if item.get('fullPath', None) == member:
+                return True, item
+        return True, None
+
+    def discard(self, name, partition='Common', member=None):
+        """Marks a resource, or a member of it, as changed on the device"""
+        if not self.enabled:
+            return
+        key = fq_name(partition, name)
+        if member is not None:
+            key = '{0}|{1}'.format(key, member)
+        self._mark_stale(key)
+
+
+class CollectionCache(DiskCache, CollectionSnapshot):
+    """On-disk, short lived copy of a whole collection
+
+    Modules that manage one resource per task, when run in a loop over
+    thousands of resources, make a round trip per resource to find out if
+    it exists and another to read it. This cache keeps a ``CollectionSnapshot``
+    on the controller's disk for ``ttl`` seconds, so that all of the tasks
+    in the loop share a single fetch of the collection.
+
+    Writes to a resource mark it as stale in the cache instead of throwing
+    the whole collection away, so the rest of the loop keeps using it.
+
+    The cache is off unless the ``F5_COLLECTION_CACHE_TTL`` environment
+    variable is set to the number of seconds that a copy may be used for.
+    ``F5_COLLECTION_CACHE_DIR`` may be used to move it from its default of
+    ``~/.ansible/f5/collections``.
+
+    Args:
+        client: The F5Client for the device.
+        name (string): Name of the collection, such as ``ltm/pool``.
+        fetch: Called with no arguments, returns the list of resource dicts
+            in the collection.
+        ttl (int): Seconds that a copy of the collection may be used for.
+    """
+    def __init__(self, client, name, fetch, ttl=None, path=None):
+        if ttl is None:
+            try:
+                ttl = int(os.environ.get('F5_COLLECTION_CACHE_TTL', 0))
+            except ValueError:
+                ttl = 0
+        if path is None and ttl > 0:
+            path = self.default_path('collections', 'F5_COLLECTION_CACHE_DIR')
+        key = name
+        if path is not None:
+            params = client.merge_provider_params()
+            key = '{0}:{1}:{2}:{3}'.format(params['server'], params['server_port'], params['user'], name)
+        DiskCache.__init__(self, key, path=path)
+        CollectionSnapshot.__init__(self, fetch)
+        self.ttl = ttl
+
+    def _load(self):
+        with self:
+            entry = self._read()
+            if entry and entry.get('expiration', 0) > time.time():
+                return entry
+            entry = self._fetch()
+            entry['expiration'] = time.time() + self.ttl
+            self._write(entry)
+            return entry
+
+    def _mark_stale(self, key):
+        with self:
+            entry = self._read()
+            if not entry or key in entry['stale']:
+                return
+            entry['stale'].append(key)
+            self._write(entry)
+
+
 class F5BaseClient(object):
     def __init__(self, *args, **kwargs):
         self.params = kwargs
         self.module = kwargs.get('module', None)
         load_params(self.params)
         self._client = None
+        self._token_cache = None
+        self.retry_policy = kwargs.get('retry_policy', None) or RetryPolicy()
 
     @property
     def api(self):
         raise F5ModuleError("Management root must be used from the concrete product classes.")
 
+    def merge_provider_params(self):
+        provider = self.params.get('provider', None) or {}
+        result = dict(
+            server=provider.get('server', None) or self.params.get('server', None),
+            user=provider.get('user', None) or self.params.get('user', None),
+            password=provider.get('password', None) or self.params.get('password', None),
+            server_port=provider.get('server_port', None) or self.params.get('server_port', None) or 443,
+            validate_certs=provider.get('validate_certs', None) or self.params.get('validate_certs', None),
+        )
+        return result
+
+    def connect(self, func, params):
+        """Connects to the device, retrying as the retry policy allows
+
+        Args:
+            func: Called with the merged provider params. Returns the client.
+            params (dict): The merged provider params.
+        Raises:
+            F5ModuleError: When no connection could be made.
+        """
+        try:
+            return self.retry_policy.call(func, params)
+        except Exception as ex:
+            error = 'Unable to connect to {0} on port {1}.'.format(params['server'], params['server_port'])
+            error += ' The reported error was "{0}".'.format(str(ex))
+            raise F5ModuleError(error)
+
+    @property
+    def token_cache(self):
+        if self._token_cache is None:
+            params = self.merge_provider_params()
+            self._token_cache = TokenCache(
+                params['server'], params['server_port'], params['user'],
+                self.params.get('auth_provider', None)
+            )
+        return self._token_cache
+
     def reconnect(self):
         """Attempts to reconnect to a device
 
@@ -383,29 +1163,57 @@ class AnsibleF5Parameters(object):
             self.update(params=params)
             self._params.update(params)
 
+    @classmethod
+    def _setters(cls):
+        """Returns the names of the properties of the class that have a setter
+
+        The names are found once for each class, the first time that one of
+        its instances is updated, and kept on the class.
+        """
+        result = cls.__dict__.get('_setter_names', None)
+        if result is None:
+            result = frozenset(
+                name for name in dir(cls)
+                if isinstance(getattr(cls, name, None), property) and getattr(cls, name).fset is not None
+            )
+            cls._setter_names = result
+        return result
+
+    @classmethod
+    def compact(cls):
+        """Returns the compact form of the class
+
+        The compact form is a subclass that keeps its values in slots rather
+        than in a dictionary, for modules that read many resources of the
+        same kind from the device. It is made once for each class.
+        """
+        result = cls.__dict__.get('_compact_class', None)
+        if result is None:
+            result = CompactParameters.make(cls)
+            cls._compact_class = result
+        return result
+
+    @classmethod
+    def from_collection(cls, items, client=None, module=None):
+        """Returns the compact form of each of the API dicts in items"""
+        compact = cls.compact()
+        return [compact(params=x, client=client, module=module) for x in items]
+
     def update(self, params=None):
         if params:
             self._params.update(params)
+            api_map = self.api_map or {}
+            setters = self._setters()
             for k, v in iteritems(params):
-                if self.api_map is not None and k in self.api_map:
-                    map_key = self.api_map[k]
-                else:
-                    map_key = k
-
                 # Handle weird API parameters like `dns.proxy.__iter__` by
                 # using a map provided by the module developer
-                class_attr = getattr(type(self), map_key, None)
-                if isinstance(class_attr, property):
-                    # There is a mapped value for the api_map key
-                    if class_attr.fset is None:
-                        # If the mapped value does not have
-                        # an associated setter
-                        self._values[map_key] = v
-                    else:
-                        # The mapped value has a setter
-                        setattr(self, map_key, v)
+                map_key = api_map.get(k, k)
+                if map_key in setters:
+                    # The mapped value has a setter
+                    setattr(self, map_key, v)
                 else:
-                    # If the mapped value is not a @property
+                    # The mapped value is not a @property, or does not
+                    # have an associated setter
                     self._values[map_key] = v
 
     def api_params(self):
@@ -437,5 +1245,159 @@ class AnsibleF5Parameters(object):
         return dict((k, v) for k, v in iteritems(params) if v is not None)
 
 
+class CompactParameters(object):
+    """Keeps the values of a Parameters class in slots
+
+    This is mixed into a subclass of a Parameters class, with a slot for each
+    of the names in its ``api_map``, ``api_attributes``, ``returnables`` and
+    ``updatables``. The instances serve as their own ``_values``, so that the
+    properties of the class work unchanged. Values of any other names are
+    kept in a dictionary that is only made when one is set.
+
+    The translation of API names is worked out once, when the subclass is
+    made, rather than for each value of each instance.
+
+    The ``__init__`` of the Parameters class is not called, so classes that
+    set attributes of their own there should not be made compact.
+
+    As a stand-in for ``_values``, the instances also answer ``in``, ``keys``,
+    ``items`` and iteration. A name counts as set when its value is not None.
+
+    The Parameters classes do not declare ``__slots__`` themselves, so the
+    instances still have a ``__dict__``. It is only made if an attribute that
+    has no slot is set, which the properties of the class do not do, as they
+    go through ``_values``.
+    """
+    __slots__ = ()
+
+    reserved = ['client', '_module', '_extra']
+
+    def __init__(self, params=None, client=None, module=None):
+        self.client = client
+        self._module = module
+        self._extra = None
+        for clear in self._clear:
+            clear(self, None)
+        if params:
+            self.update(params=params)
+
+    @classmethod
+    def make(cls, params_class):
+        api_map = getattr(params_class, 'api_map', None) or {}
+        api_attributes = getattr(params_class, 'api_attributes', None) or []
+        names = set(api_map.values())
+        names.update(api_map.get(x, x) for x in api_attributes)
+        names.update(getattr(params_class, 'returnables', None) or [])
+        names.update(getattr(params_class, 'updatables', None) or [])
+        names.update(['name', 'partition'])
+        names = sorted(x for x in names if re.match(r'^[A-Za-z_][A-Za-z0-9_]*$', x))
+
+        # Names that are not attributes of the class are given a slot of the
+        # same name, so that reading them does not go through __getattr__.
+        # The others, mostly properties, are kept under a prefixed name.
+        slots = dict(
+            (x, '_v_' + x if hasattr(params_class, x) or x in cls.reserved else x) for x in names
+        )
+        result = type(
+            str('Compact' + params_class.__name__),
+            (cls, params_class),
+            dict(
+                __module__=params_class.__module__,
+                __slots__=cls.reserved + sorted(slots.values())
+            )
+        )
+        result._slots = dict((x, getattr(result, y)) for x, y in iteritems(slots))
+        result._getters = dict((x, y.__get__) for x, y in iteritems(result._slots))
+        result._clear = tuple(x.__set__ for x in result._slots.values())
+
+        # Values that are stored as they are given are written straight into
+        # their slot. Those with a setter go through the setter.
+        setters = params_class._setters()
+        result._setter_names = setters
+        writers = dict((x, y.__set__) for x, y in iteritems(result._slots) if x not in setters)
+        for api_name, name in iteritems(api_map):
+            if name in writers:
+                writers[api_name] = writers[name]
+            else:
+                writers.pop(api_name, None)
+        result._writers = writers
+        result._api_map = api_map
+        result._api_pairs = [(x, api_map.get(x, x)) for x in api_attributes]
+        return result
+
+    @property
+    def _values(self):
+        return self
+
+    def __getitem__(self, key):
+        try:
+            return self._getters[key](self)
+        except KeyError:
+            pass
+        extra = self._extra
+        if key == '__warnings':
+            if extra is None:
+                extra = self._extra = {}
+            return extra.setdefault(key, [])
+        if extra is None:
+            return None
+        return extra.get(key, None)
+
+    def __setitem__(self, key, value):
+        slot = self._slots.get(key, None)
+        if slot is not None:
+            slot.__set__(self, value)
+            return
+        if self._extra is None:
+            self._extra = {}
+        self._extra[key] = value
+
+    def get(self, key, default=None):
+        result = self[key]
+        if result is None:
+            return default
+        return result
+
+    def keys(self):
+        result = [x for x, y in iteritems(self._getters) if y(self) is not None]
+        if self._extra:
+            result += [x for x, y in iteritems(self._extra) if y is not None]
+        return result
+
+    def items(self):
+        return [(x, self[x]) for x in self.keys()]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __contains__(self, key):
+        return self[key] is not None
+
+    def update(self, params=None):
+        if not params:
+            return
+        writers = self._writers
+        extra = self._extra
+        for k, v in iteritems(params):
+            writer = writers.get(k, None)
+            if writer is not None:
+                writer(self, v)
+                continue
+            map_key = self._api_map.get(k, k)
+            if map_key in self._setter_names:
+                setattr(self, map_key, v)
+            elif map_key in self._slots:
+                self[map_key] = v
+            else:
+                if extra is None:
+                    extra = self._extra = {}
+                extra[map_key] = v
+
+    def api_params(self):
+        result = dict((x, getattr(self, y)) for x, y in self._api_pairs)
+        result = self._filter_params(result)
+        return result
+
+
 class F5ModuleError(Exception):
     pass
@@ -8,9 +8,18 @@ from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
 
-from ansible.module_utils.urls import open_url
+import codecs
+import socket
+import ssl
+import threading
+import time
+
+from collections import deque
+from multiprocessing.pool import ThreadPool
+
 from ansible.module_utils.parsing.convert_bool import BOOLEANS
 from ansible.module_utils.six import string_types
+from ansible.module_utils.six.moves import http_client
 from six import iteritems
 
 try:
@@ -43,6 +52,392 @@ Available functions:
 """
 
 
+DEFAULT_POOL_SIZE = 4
+
+# The number of items asked for in each page of a collection that is read
+# with ``iter_collection``.
+DEFAULT_PAGE_SIZE = 100
+
+# The number of bytes read from the socket at a time when a response is
+# streamed.
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Errors raised when a kept-alive connection was closed by the remote end
+# between two requests.
+STALE_CONNECTION_ERRORS = (
+    http_client.BadStatusLine,
+    http_client.CannotSendRequest,
+    socket.error,
+)
+
+# Methods that can be sent a second time without changing the result. When
+# a re-used connection fails after the request was written to it, the REST
+# server may have acted on it already, so only these are sent again.
+IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'])
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class HTTPSConnection(http_client.HTTPSConnection):
+    """HTTPS connection that resumes the TLS session of its pool
+
+    Resuming a TLS session lets a new socket skip the full handshake (and
+    the certificate exchange that comes with it) when the pool needs to
+    replace a connection that the server closed.
+    """
+    def __init__(self, pool, **kwargs):
+        self._pool = pool
+        http_client.HTTPSConnection.__init__(self, pool.host, port=pool.port, timeout=pool.timeout, **kwargs)
+
+    def connect(self):
+        sock = socket.create_connection((self.host, self.port), self.timeout)
+        kwargs = dict(server_hostname=self.host)
+        if self._pool.tls_session is not None:
+            kwargs['session'] = self._pool.tls_session
+        self.sock = self._pool.context.wrap_socket(sock, **kwargs)
+        self._pool.record_handshake(self.sock)
+
+
+class HTTPSConnectionPool(object):
+    """A fixed size pool of keep-alive HTTPS connections to a single host
+
+    At most ``maxsize`` connections are open to the host at any time. Callers
+    that want a connection when all of them are in use block until one is
+    returned to the pool.
+
+    The pool keeps the following counters, available through ``stats``,
+
+    * ``hits`` - requests that were sent over an already open connection.
+    * ``misses`` - requests that required a new connection.
+    * ``handshakes`` - TLS handshakes performed.
+    * ``resumed`` - TLS handshakes that resumed a previous session.
+    * ``retries`` - requests re-sent because a kept-alive connection was stale.
+    """
+    def __init__(self, host, port=443, maxsize=DEFAULT_POOL_SIZE, validate_certs=True, timeout=10):
+        self.host = host
+        self.port = int(port)
+        self.maxsize = int(maxsize)
+        self.timeout = timeout
+        self.context = self._create_context(validate_certs)
+        self.tls_session = None
+        self.hits = 0
+        self.misses = 0
+        self.handshakes = 0
+        self.resumed = 0
+        self.retries = 0
+        self._idle = deque()
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.maxsize)
+
+    def _create_context(self, validate_certs):
+        if validate_certs:
+            return ssl.create_default_context()
+        context = ssl.SSLContext(ssl.PROTOCOL_SSLv23)
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+        return context
+
+    @property
+    def stats(self):
+        return dict(
+            hits=self.hits,
+            misses=self.misses,
+            handshakes=self.handshakes,
+            resumed=self.resumed,
+            retries=self.retries,
+            idle=len(self._idle),
+            maxsize=self.maxsize
+        )
+
+    def record_handshake(self, sock):
+        with self._lock:
+            self.handshakes += 1
+            if getattr(sock, 'session_reused', False):
+                self.resumed += 1
+            session = getattr(sock, 'session', None)
+            if session is not None:
+                self.tls_session = session
+
+    def _get_conn(self):
+        with self._lock:
+            if self._idle:
+                self.hits += 1
+                return self._idle.pop(), True
+            self.misses += 1
+        return HTTPSConnection(self, context=self.context), False
+
+    def _put_conn(self, conn):
+        with self._lock:
+            self._idle.append(conn)
+
+    def close(self):
+        with self._lock:
+            while self._idle:
+                self._idle.pop().close()
+
+    def urlopen(self, method, url, data=None, headers=None, stream=False):
+        """Sends a request over a pooled connection
+
+        The response body is read in full so that the connection can be
+        handed back to the pool for the next request.
+
+        When ``stream`` is set, the body is instead read as the caller asks
+        for it, and the connection is only handed back once all of it has
+        been read, or the response is closed.
+
+        Args:
+            method (string): The HTTP verb to use.
+            url (string): Path of URL on the server, including the query string.
+            data (bytes): Body of the request, if any.
+            headers (dict): Headers to send with the request.
+            stream (bool): Whether to read the body as it is asked for.
+
+        Returns:
+            PooledResponse: The status, headers and body of the response. Or
+            a StreamedResponse, when ``stream`` is set.
+        """
+        if hasattr(data, 'read'):
+            # File-like bodies cannot be replayed, so never retry them.
+            retryable = False
+        else:
+            retryable = True
+        self._slots.acquire()
+        try:
+            conn, reused = self._get_conn()
+            sent = False
+            try:
+                conn.request(method, url, body=data, headers=headers or {})
+                sent = True
+                response = conn.getresponse()
+            except socket.timeout:
+                conn.close()
+                raise
+            except STALE_CONNECTION_ERRORS:
+                conn.close()
+                if not reused or not retryable:
+                    raise
+                if sent and method.upper() not in IDEMPOTENT_METHODS:
+                    raise
+                with self._lock:
+                    self.retries += 1
+                    self.misses += 1
+                conn = HTTPSConnection(self, context=self.context)
+                response = self._send(conn, method, url, data, headers)
+        except Exception:
+            self._slots.release()
+            raise
+        if stream:
+            return StreamedResponse(self, conn, response)
+        try:
+            result = PooledResponse(response)
+        finally:
+            self.release(conn, response)
+        return result
+
+    def release(self, conn, response):
+        """Hands a connection back to the pool once its response is done
+
+        Connections whose response was not read to the end cannot be used
+        for another request, so they are closed instead.
+        """
+        try:
+            if response.will_close or not response.isclosed():
+                conn.close()
+            else:
+                self._put_conn(conn)
+        finally:
+            self._slots.release()
+
+    def _send(self, conn, method, url, data, headers):
+        conn.request(method, url, body=data, headers=headers or {})
+        response = conn.getresponse()
+        return response
+
+
+class PooledResponse(object):
+    """A fully read response from a pooled connection
+
+    Exposes the subset of the ``open_url`` response interface that the
+    session and ``Response`` classes use.
+    """
+    def __init__(self, response):
+        self._payload = response.read()
+        self.code = int(response.status)
+        self.status = self.code
+        self.reason = response.reason
+        self.headers = dict((k.lower(), v) for k, v in response.getheaders())
+        self.will_close = response.will_close
+
+    def read(self):
+        return self._payload
+
+    def getheader(self, name, default=None):
+        return self.headers.get(name.lower(), default)
+
+
+class StreamedResponse(object):
+    """A response from a pooled connection that is read as it arrives
+
+    The connection is held until the body has been read to the end, or the
+    response is closed, and is then handed back to the pool.
+    """
+    def __init__(self, pool, conn, response):
+        self._pool = pool
+        self._conn = conn
+        self._response = response
+        self.code = int(response.status)
+        self.status = self.code
+        self.reason = response.reason
+        self.headers = dict((k.lower(), v) for k, v in response.getheaders())
+        self.will_close = response.will_close
+
+    def read(self, amt=None):
+        if self._response is None:
+            return b''
+        try:
+            if amt is None:
+                data = self._response.read()
+            else:
+                data = self._response.read(amt)
+        except Exception:
+            self.close()
+            raise
+        if not data or self._response.isclosed():
+            self.close()
+        return data
+
+    def close(self):
+        if self._response is None:
+            return
+        self._pool.release(self._conn, self._response)
+        self._response = None
+
+    def getheader(self, name, default=None):
+        return self.headers.get(name.lower(), default)
+
+
+class CollectionReader(object):
+    """Reads the items of a collection from a response as they arrive
+
+    Only the item being read, and what is left of the last chunk read from
+    the socket, are held in memory. Other values at the top level of the
+    response, such as ``nextLink``, are kept in ``properties`` as they are
+    read.
+
+    Attributes:
+        fp: A file-like object with the JSON body of the response.
+        chunk_size (int): The number of bytes to read from ``fp`` at a time.
+    """
+    def __init__(self, fp, chunk_size=STREAM_CHUNK_SIZE):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.properties = {}
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder('utf-8')()
+        self._buffer = u''
+        self._pos = 0
+        self._eof = False
+
+    def __iter__(self):
+        self._expect('{')
+        if self._peek() == '}':
+            self._pos += 1
+            return
+        while True:
+            key = self._value()
+            self._expect(':')
+            if key == 'items':
+                for item in self._array():
+                    yield item
+            else:
+                self.properties[key] = self._value()
+            if self._expect(',}') == '}':
+                break
+
+    def _array(self):
+        self._expect('[')
+        if self._peek() == ']':
+            self._pos += 1
+            return
+        while True:
+            yield self._value()
+            if self._expect(',]') == ']':
+                break
+
+    def _fill(self):
+        if self._eof:
+            raise F5ModuleError(
+                "The response ended before the collection did."
+            )
+        data = self.fp.read(self.chunk_size)
+        if data:
+            text = self._text.decode(data)
+        else:
+            text = self._text.decode(b'', True)
+            self._eof = True
+        self._buffer = self._buffer[self._pos:] + text
+        self._pos = 0
+
+    def _peek(self):
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in ' \t\r\n':
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            self._fill()
+
+    def _expect(self, chars):
+        char = self._peek()
+        if char not in chars:
+            raise F5ModuleError(
+                "Expected one of '{0}' in the response, but found '{1}'.".format(chars, char)
+            )
+        self._pos += 1
+        return char
+
+    def _value(self):
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except ValueError:
+                # The value has not all arrived yet
+                self._fill()
+                continue
+            if end == len(self._buffer) and not self._eof:
+                # A number may go on in the next chunk
+                self._fill()
+                continue
+            self._pos = end
+            return value
+
+
+def get_connection_pool(server, server_port=443, validate_certs=True, timeout=10, maxsize=DEFAULT_POOL_SIZE):
+    """Returns the shared connection pool for a host
+
+    Sessions to the same host, port and certificate validation setting share
+    one pool so that sockets and TLS sessions are re-used between them.
+    """
+    key = (server, int(server_port), bool(validate_certs))
+    with _pools_lock:
+        pool = _pools.get(key, None)
+        if pool is None:
+            pool = HTTPSConnectionPool(
+                server, port=server_port, maxsize=maxsize,
+                validate_certs=validate_certs, timeout=timeout
+            )
+            _pools[key] = pool
+        return pool
+
+
+def close_connection_pools():
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
+
+
 class iControlRestSession(object):
     """Represents a session that communicates with a BigIP.
 
@@ -59,7 +454,8 @@ class iControlRestSession(object):
     """
     def __init__(self, server=None, username=None, password=None, server_port=443,
                  validate_certs=True, auth_provider=None, timeout=10, token=None,
-                 debug=False, **kwargs):
+                 debug=False, pool_size=DEFAULT_POOL_SIZE, token_expiration=None, token_callback=None,
+                 **kwargs):
         """Instantiate REST session.
 
         Attributes:
@@ -83,6 +479,14 @@ class iControlRestSession(object):
                 to prevent token abuse on the F5 device. There is a limit
                 that users may not go beyond when creating tokens and their
                 re-use is an attempt to mitigate this scenario.
+            pool_size (int): The maximum number of keep-alive connections to
+                hold open to the server.
+            token_expiration (float): When the token given in ``token`` expires,
+                in seconds since the epoch. A new token is requested once it
+                has expired.
+            token_callback: Called with the token and its expiration every
+                time the session logs in for a new token. Used to keep a
+                token cache up to date.
         """
 
         self._auth_provider = auth_provider
@@ -93,10 +497,14 @@ class iControlRestSession(object):
         }
         self._parsed = {}
         self._password = password
+        self._pool = None
+        self._pool_size = pool_size
         self._server = server
         self._server_port = server_port
         self._timeout = timeout
         self._token = token
+        self._token_callback = token_callback
+        self._token_expiration = token_expiration
         self._username = username
         self._validate_certs = validate_certs
 
@@ -109,16 +517,13 @@ class iControlRestSession(object):
         have its auth provider specified if you're using one of the non-default
         ones.
         """
-        url = "https://{0}:{1}/info/system?null".format(self._server, self._server_port)
-        response = open_url(
-            url, method='GET', validate_certs=self._validate_certs,
-            timeout=self._timeout, headers=self._default_headers
-        )
+        url = "/info/system?null"
+        response = self.pool.urlopen('GET', url, headers=self._default_headers)
         if response.code != 200:
             raise F5ModuleError('{0} Unexpected Error: {1} for uri: {2}\nText: {3}'.format(
-                response.status_code, response.reason, response.url, response.text
+                response.code, response.reason, url, response.read()
             ))
-        resp = json.loads(response)
+        resp = json.loads(response.read())
         return resp['providers']
 
     @property
@@ -143,7 +548,7 @@ class iControlRestSession(object):
         it can be called if it is known that the authentication token has
         been invalidated by other means.
         """
-        if self._token:
+        if self._token and not self.token_expired:
             return self._token
         login_body = {
             'username': self._username,
@@ -152,24 +557,52 @@ class iControlRestSession(object):
         if self._auth_provider:
             login_body['loginProviderName'] = self.auth_provider
 
-        url = "https://{0}:{1}/mgmt/shared/authn/login".format(self._server, self._server_port)
+        url = "/mgmt/shared/authn/login"
 
-        response = open_url(
-            url, method='POST', data=json.dumps(login_body),
-            validate_certs=self._validate_certs
+        response = self.pool.urlopen(
+            'POST', url, data=json.dumps(login_body), headers=self._default_headers
         )
         if response.code not in [200]:
             raise F5ModuleError('{0} Unexpected Error: {1} for uri: {2}\nText: {3}'.format(
-                response.status_code, response.reason, response.url, response.text
+                response.code, response.reason, url, response.read()
             ))
         resp = json.loads(response.read())
-        self._token = resp.get('token', None)
-        if self._token.get('token') is not None:
+        token = resp.get('token', None)
+        if token.get('token') is not None:
             # BIG-IQ stores tokens in the 'token' key
-            return self._token.get('token', None)
+            self._token = token.get('token', None)
         else:
             # BIG-IP stores tokens in the token dict, 'name' key
-            return self._token.get('name', None)
+            self._token = token.get('name', None)
+        self._token_expiration = self._get_token_expiration(token)
+        if self._token_callback:
+            self._token_callback(self._token, self._token_expiration)
+        return self._token
+
+    def _get_token_expiration(self, token):
+        """Returns when a token expires, relative to the local clock
+
+        The clocks of the controller and the device need not agree, so the
+        lifetime of the token is measured with the device's own timestamps
+        and then added to the local time.
+        """
+        if 'expirationMicros' in token and 'lastUpdateMicros' in token:
+            lifetime = (int(token['expirationMicros']) - int(token['lastUpdateMicros'])) / 1000000.0
+        elif 'timeout' in token:
+            lifetime = int(token['timeout'])
+        else:
+            return None
+        return time.time() + lifetime
+
+    @property
+    def token_expiration(self):
+        return self._token_expiration
+
+    @property
+    def token_expired(self):
+        if self._token_expiration is None:
+            return False
+        return time.time() > self._token_expiration
 
     def get_headers(self, *args, **kwargs):
         result = {}
@@ -179,6 +612,20 @@ class iControlRestSession(object):
             result.update(kwargs['headers'])
         return result
 
+    @property
+    def pool(self):
+        """The keep-alive connection pool used to talk to the server."""
+        if self._pool is None:
+            self._pool = get_connection_pool(
+                self._server, server_port=self._server_port, validate_certs=self._validate_certs,
+                timeout=self._timeout, maxsize=self._pool_size
+            )
+        return self._pool
+
+    @property
+    def pool_stats(self):
+        return self.pool.stats
+
     def get_full_url(self, url):
         if url.startswith('/'):
             url = url[1:]
@@ -198,6 +645,27 @@ class iControlRestSession(object):
     def debug_output(self):
         return self._debug_output
 
+    def _request(self, method, url, data=None, headers=None, stream=False):
+        if url.startswith('https://'):
+            url = '/' + url.split('/', 3)[-1]
+        try:
+            response = self.pool.urlopen(method, url, data=data, headers=headers, stream=stream)
+            if response.code == 401 and self._password:
+                # The token was revoked, or was handed to us by a cache that
+                # did not know better. Log in again and re-send.
+                response.read()
+                self._token = None
+                headers['X-F5-Auth-Token'] = self.token
+                response = self.pool.urlopen(method, url, data=data, headers=headers, stream=stream)
+        except F5ModuleError:
+            raise
+        except Exception as ex:
+            raise F5ModuleError(str(ex))
+        if response.code >= 400:
+            response.read()
+            raise F5ModuleError('HTTP Error {0}: {1}'.format(response.code, response.reason))
+        return Response(response=response, stream=stream)
+
     def delete(self, url, data=None, **kwargs):
         """Sends a HTTP DELETE command to an F5 REST Server.
 
@@ -218,22 +686,17 @@ class iControlRestSession(object):
         url = self.get_full_url(url)
         if self.debug:
             self._debug_output.append(debug_prepared_request(url, 'DELETE', headers, data))
-        try:
-            response = open_url(
-                url, method='DELETE', data=data, headers=headers,
-                validate_certs=self._validate_certs
-            )
-            return Response(response=response)
-        except Exception as ex:
-            raise F5ModuleError(str(ex))
+        return self._request('DELETE', url, data=data, headers=headers)
 
-    def get(self, url, **kwargs):
+    def get(self, url, stream=False, **kwargs):
         """Sends a HTTP GET command to an F5 REST Server.
 
         Use this method to send a GET command to an F5 product.
 
         Args:
             url (string): Path of URL on the server to call.
+            stream (bool): Whether to read the body of the response as it is
+                used, rather than all at once. See ``Response.iter_items``.
             \*\*kwargs (dict): Dictionary containing other information that may need to be
                 sent to the request. Typically this contains extra headers, or headers that the
                 caller wants to override, such as the Content-Type.
@@ -242,13 +705,29 @@ class iControlRestSession(object):
         url = self.get_full_url(url)
         if self.debug:
             self._debug_output.append(debug_prepared_request(url, 'GET', headers))
-        try:
-            response = open_url(
-                url, method='GET', headers=headers, validate_certs=self._validate_certs
-            )
-            return Response(response=response)
-        except Exception as ex:
-            raise F5ModuleError(str(ex))
+        return self._request('GET', url, headers=headers, stream=stream)
+
+    def iter_collection(self, url, page_size=DEFAULT_PAGE_SIZE, **kwargs):
+        """Yields the items of a collection on an F5 REST Server.
+
+        The collection is read ``page_size`` items at a time, using ``$top``
+        and ``$skip``, and following the ``nextLink`` of each page to the
+        next one. The items of each page are parsed as they arrive, so the
+        memory used does not grow with the size of the collection.
+
+        Args:
+            url (string): Path of URL of the collection on the server.
+            page_size (int): The number of items to ask for in each request.
+            \*\*kwargs (dict): Dictionary containing other information that may need to be
+                sent to the request. Typically this contains extra headers, or headers that the
+                caller wants to override, such as the Content-Type.
+        """
+        url = first_page_url(url, page_size)
+        while url:
+            response = self.get(url, stream=True, **kwargs)
+            for item in response.iter_items():
+                yield item
+            url = next_page_url(response.properties)
 
     def patch(self, url, data=None, **kwargs):
         """Sends a HTTP PATCH command to an F5 REST Server.
@@ -270,14 +749,7 @@ class iControlRestSession(object):
         url = self.get_full_url(url)
         if self.debug:
             self._debug_output.append(debug_prepared_request(url, 'PATCH', headers, data))
-        try:
-            response = open_url(
-                url, method='PATCH', data=data, headers=headers,
-                validate_certs=self._validate_certs
-            )
-            return Response(response=response)
-        except Exception as ex:
-            raise F5ModuleError(str(ex))
+        return self._request('PATCH', url, data=data, headers=headers)
 
     def post(self, url, data=None, **kwargs):
         """Sends a HTTP POST command to an F5 REST Server.
@@ -299,14 +771,7 @@ class iControlRestSession(object):
         url = self.get_full_url(url)
         if self.debug:
             self._debug_output.append(debug_prepared_request(url, 'POST', headers, data))
-        try:
-            response = open_url(
-                url, method='POST', data=data, headers=headers,
-                validate_certs=self._validate_certs
-            )
-            return Response(response=response)
-        except Exception as ex:
-            raise F5ModuleError(str(ex))
+        return self._request('POST', url, data=data, headers=headers)
 
     def put(self, url, data=None, **kwargs):
         """Sends a HTTP PUT command to an F5 REST Server.
@@ -328,28 +793,158 @@ class iControlRestSession(object):
         url = self.get_full_url(url)
         if self.debug:
             self._debug_output.append(debug_prepared_request(url, 'PUT', headers, data))
-        try:
-            response = open_url(
-                url, method='PUT', data=data, headers=headers,
-                validate_certs=self._validate_certs
+        return self._request('PUT', url, data=data, headers=headers)
+
+
+class PagedCollection(object):
+    """A collection on an F5 REST Server that is read a page at a time
+
+    Pages are asked for with ``$top`` and ``$skip``, and the ``nextLink`` of
+    each page is followed to the next one. Pages are only read as they are
+    needed.
+
+    When ``prefetch`` is set, the next page is requested in a background
+    thread while the items of the current one are used.
+
+    When ``key`` is set, ``get`` finds items by their value of that key.
+    The items of the pages read so far are indexed by it, so a lookup reads
+    only as many pages as it needs to, and looking up an item that was
+    already seen reads none.
+
+    Attributes:
+        session (iControlRestSession): The session to read the collection with.
+        url (string): Path of URL of the collection on the server.
+        page_size (int): The number of items to ask for in each request.
+        prefetch (bool): Whether to read the next page in the background.
+        key (string): The key that ``get`` finds items by.
+        pages_read (int): The number of pages that have been requested.
+    """
+    def __init__(self, session, url, page_size=DEFAULT_PAGE_SIZE, prefetch=False, key=None):
+        self.session = session
+        self.url = url
+        self.page_size = page_size
+        self.prefetch = prefetch
+        self.key = key
+        self.pages_read = 0
+        self._index = {}
+        self._pages = None
+
+    def __iter__(self):
+        for page in self.iter_pages():
+            for item in page.get('items', []):
+                yield item
+
+    def get(self, value):
+        """Returns the item whose ``key`` has the given value, or None"""
+        if self.key is None:
+            raise F5ModuleError(
+                "A key must be given to look up items in the collection."
             )
-            return Response(response=response)
-        except Exception as ex:
-            raise F5ModuleError(str(ex))
+        if value in self._index:
+            return self._index[value]
+        if self._pages is None:
+            self._pages = self.iter_pages()
+        for page in self._pages:
+            for item in page.get('items', []):
+                self._index[item.get(self.key, None)] = item
+            if value in self._index:
+                return self._index[value]
+        return None
+
+    def close(self):
+        """Stops reading the collection, waiting for any page in flight"""
+        if self._pages is not None:
+            self._pages.close()
+            self._pages = None
+
+    def read_page(self, url):
+        response = self.session.get(url)
+        self.pages_read += 1
+        return response.json()
+
+    def iter_pages(self):
+        url = first_page_url(self.url, self.page_size)
+        if not self.prefetch:
+            while url:
+                page = self.read_page(url)
+                url = next_page_url(page)
+                yield page
+            return
+        pool = ThreadPool(processes=1)
+        try:
+            pending = pool.apply_async(self.read_page, (url,))
+            while pending is not None:
+                page = pending.get()
+                url = next_page_url(page)
+                if url:
+                    pending = pool.apply_async(self.read_page, (url,))
+                else:
+                    pending = None
+                yield page
+        finally:
+            pool.close()
+            pool.join()
+
+
+def first_page_url(url, page_size):
+    separator = '&' if '?' in url else '?'
+    return '{0}{1}$top={2}&$skip=0'.format(url, separator, page_size)
+
+
+def next_page_url(page):
+    """Returns the path of the page after the given one, or None"""
+    url = page.get('nextLink', None)
+    if url and url.startswith('https://'):
+        # The device names itself "localhost" in the links it returns, so
+        # only the path is kept.
+        url = '/' + url.split('/', 3)[-1]
+    return url
 
 
 class Response(object):
-    def __init__(self, response):
+    def __init__(self, response, stream=False):
         self._response = response
-        self._payload = response.read()
+        self._payload = None if stream else response.read()
+        self._reader = None
         self._status_code = int(response.code)
         self._metadata = [
             'generation', 'kind', 'selfLink'
         ]
 
+    @property
+    def properties(self):
+        """The values at the top level of the response, other than its items"""
+        if self._reader is not None:
+            return self._reader.properties
+        return dict((k, v) for k, v in iteritems(self.json()) if k != 'items')
+
     def json(self):
+        if self._payload is None:
+            if self._reader is not None:
+                raise F5ModuleError(
+                    "The items of this response have already been read."
+                )
+            self._payload = self._response.read()
         return json.loads(self._payload)
 
+    def iter_items(self):
+        """Yields the items of a collection in the response
+
+        When the response was streamed, the items are parsed as they arrive
+        and are not kept. Once all of them have been yielded, ``properties``
+        holds the rest of the response.
+        """
+        if self._payload is not None:
+            for item in self.json().get('items', []):
+                yield item
+            return
+        self._reader = CollectionReader(self._response)
+        try:
+            for item in self._reader:
+                yield item
+        finally:
+            self._response.close()
+
     def status_code(self):
         return self._status_code
 
@@ -7,8 +7,6 @@ from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
 
-import time
-
 try:
     from f5.iworkflow import ManagementRoot
     from icontrol.exceptions import iControlUnexpectedHTTPError
@@ -18,40 +16,25 @@ except ImportError:
 
 try:
     from library.module_utils.network.f5.common import F5BaseClient
-    from library.module_utils.network.f5.common import F5ModuleError
 except ImportError:
     from ansible.module_utils.network.f5.common import F5BaseClient
-    from ansible.module_utils.network.f5.common import F5ModuleError
 
 
 class F5Client(F5BaseClient):
     @property
     def api(self):
-        exc = None
         if self._client:
             return self._client
-        for x in range(0, 3):
-            try:
-                server = self.params['provider']['server'] or self.params['server']
-                user = self.params['provider']['user'] or self.params['user']
-                password = self.params['provider']['password'] or self.params['password']
-                server_port = self.params['provider']['server_port'] or self.params['server_port'] or 443
-                validate_certs = self.params['provider']['validate_certs'] or self.params['validate_certs']
-
-                result = ManagementRoot(
-                    server,
-                    user,
-                    password,
-                    port=server_port,
-                    verify=validate_certs,
-                    token='local'
-                )
-                self._client = result
-                return self._client
-            except Exception as ex:
-                exc = ex
-                time.sleep(3)
-        error = 'Unable to connect to {0} on port {1}.'.format(self.params['server'], self.params['server_port'])
-        if exc is not None:
-            error += ' The reported error was "{0}".'.format(str(exc))
-        raise F5ModuleError(error)
+        self._client = self.connect(self._connect, self.merge_provider_params())
+        return self._client
+
+    def _connect(self, params):
+        result = ManagementRoot(
+            params['server'],
+            params['user'],
+            params['password'],
+            port=params['server_port'],
+            verify=params['validate_certs'],
+            token='local'
+        )
+        return result
@@ -590,3 +590,78 @@ class TestManager(unittest.TestCase):
         with pytest.raises(F5ModuleError) as err:
             mm.exec_module()
         assert str(err.value) == msg
+
+    def test_deactivate_policy_reads_policy_once(self, *args):
+        set_module_args(dict(
+            name='fake_policy',
+            state='present',
+            active='no',
+            server='localhost',
+            password='password',
+            user='admin',
+        ))
+
+        module = AnsibleModule(
+            argument_spec=self.spec.argument_spec,
+            supports_check_mode=self.spec.supports_check_mode
+        )
+
+        policy = Mock(partition='Common', selfLink='https://localhost/mgmt/tm/asm/policies/fake')
+        policy.name = 'fake_policy'
+        policy.attrs = dict(name='fake_policy', partition='Common', active=True)
+        client = Mock()
+        client.api.tm.asm.policies_s.get_collection.return_value = [policy]
+
+        v2 = V2Manager(module=module, client=client)
+
+        # Override methods to force specific logic in the module to happen
+        mm = ModuleManager(module=module)
+        mm.version_is_less_than_13 = Mock(return_value=False)
+        mm.get_manager = Mock(return_value=v2)
+
+        results = mm.exec_module()
+
+        assert results['changed'] is True
+        assert results['active'] is False
+        policy.modify.assert_called_once_with(active=False)
+
+        get_collection = client.api.tm.asm.policies_s.get_collection
+        assert get_collection.call_count == 1
+        params = get_collection.call_args[1]['requests_params']['params']
+        assert "$filter=name+eq+'fake_policy'" in params
+        assert '$select=kind,selfLink,name,partition' in params
+
+    def test_delete_policy_reads_policy_again(self, *args):
+        set_module_args(dict(
+            name='fake_policy',
+            state='absent',
+            server='localhost',
+            password='password',
+            user='admin',
+        ))
+
+        module = AnsibleModule(
+            argument_spec=self.spec.argument_spec,
+            supports_check_mode=self.spec.supports_check_mode
+        )
+
+        policy = Mock(partition='Common')
+        policy.name = 'fake_policy'
+        other = Mock(partition='Other')
+        other.name = 'fake_policy'
+        client = Mock()
+        client.api.tm.asm.policies_s.get_collection.side_effect = [[other, policy], [other]]
+
+        v2 = V2Manager(module=module, client=client)
+
+        # Override methods to force specific logic in the module to happen
+        mm = ModuleManager(module=module)
+        mm.version_is_less_than_13 = Mock(return_value=False)
+        mm.get_manager = Mock(return_value=v2)
+
+        results = mm.exec_module()
+
+        assert results['changed'] is True
+        assert policy.delete.call_count == 1
+        assert other.delete.call_count == 0
+        assert client.api.tm.asm.policies_s.get_collection.call_count == 2
@@ -9,6 +9,7 @@ __metaclass__ = type
 import os
 import json
 import sys
+import threading
 
 from nose.plugins.skip import SkipTest
 if sys.version_info < (2, 7):
@@ -18,10 +19,12 @@ from ansible.compat.tests import unittest
 from ansible.compat.tests.mock import patch
 from ansible.compat.tests.mock import Mock
 from ansible.module_utils.basic import AnsibleModule
+from collections import OrderedDict
 
 try:
     from library.bigip_command import Parameters
     from library.bigip_command import ModuleManager
+    from library.bigip_command import FanoutManager
     from library.bigip_command import ArgumentSpec
     from library.module_utils.network.f5.common import F5ModuleError
     from library.module_utils.network.f5.common import iControlUnexpectedHTTPError
@@ -30,6 +33,7 @@ except ImportError:
     try:
         from ansible.modules.network.f5.bigip_command import Parameters
         from ansible.modules.network.f5.bigip_command import ModuleManager
+        from ansible.modules.network.f5.bigip_command import FanoutManager
         from ansible.modules.network.f5.bigip_command import ArgumentSpec
         from ansible.module_utils.network.f5.common import F5ModuleError
         from ansible.module_utils.network.f5.common import iControlUnexpectedHTTPError
@@ -186,3 +190,140 @@ class TestManager(unittest.TestCase):
         assert results['changed'] is True
         assert mm._run_commands.call_count == 0
         assert mm.execute_on_device.call_count == 1
+
+
+class FakeDevice(object):
+    """Answers the commands sent to one host
+
+    Each command is answered with the next of its outputs, or the last one
+    when they run out.
+    """
+    def __init__(self, outputs, running):
+        self.outputs = outputs
+        self.running = running
+        self.calls = []
+        self.client = Mock()
+        self.client.api.tm.util.bash.exec_cmd.side_effect = self.exec_cmd
+
+    def exec_cmd(self, command, utilCmdArgs=None):
+        with self.running['lock']:
+            self.running['now'] += 1
+            self.running['most'] = max(self.running['most'], self.running['now'])
+        threading.Event().wait(0.01)
+        with self.running['lock']:
+            self.running['now'] -= 1
+        for key, outputs in self.outputs.items():
+            if key in utilCmdArgs:
+                self.calls.append(key)
+                if isinstance(outputs, Exception):
+                    raise outputs
+                output = outputs.pop(0) if len(outputs) > 1 else outputs[0]
+                return Mock(commandResult=output)
+        return Mock(spec=[])
+
+
+class TestFanoutManager(unittest.TestCase):
+    def setUp(self):
+        self.spec = ArgumentSpec()
+        self.patcher1 = patch('time.sleep')
+        self.patcher1.start()
+        self.running = dict(lock=threading.Lock(), now=0, most=0)
+
+    def tearDown(self):
+        self.patcher1.stop()
+
+    def device(self, failover, version='BIG-IP 13.1.0'):
+        return FakeDevice(
+            OrderedDict([('show sys failover', failover), ('show sys version', [version])]),
+            self.running
+        )
+
+    def test_run_on_many_hosts(self, *args):
+        set_module_args(dict(
+            commands=[
+                "show sys failover",
+                "show sys version"
+            ],
+            wait_for=[
+                "result[0] contains active",
+                "result[1] contains BIG-IP"
+            ],
+            retries=5,
+            hosts=['lb1', 'lb2', 'lb3', 'lb4', 'lb5'],
+            concurrency=2,
+            user='admin',
+            password='password'
+        ))
+
+        module = AnsibleModule(
+            argument_spec=self.spec.argument_spec,
+            supports_check_mode=self.spec.supports_check_mode
+        )
+        devices = dict(
+            lb1=self.device(['active']),
+            lb2=self.device(['standby', 'standby', 'active']),
+            lb3=self.device(['standby']),
+            lb4=self.device(Exception('Unable to connect to lb4 on port 443.')),
+            lb5=self.device(['active']),
+        )
+
+        mm = FanoutManager(module=module)
+        mm.get_client = Mock(side_effect=lambda host: devices[host].client)
+
+        results = mm.exec_module()
+
+        assert results['changed'] is False
+        assert results['failed'] is True
+        assert 'lb3, lb4' in results['msg']
+        assert sorted(results['hosts'].keys()) == ['lb1', 'lb2', 'lb3', 'lb4', 'lb5']
+        assert results['hosts']['lb1']['stdout'] == ['active', 'BIG-IP 13.1.0']
+        assert results['hosts']['lb2']['stdout'] == ['active', 'BIG-IP 13.1.0']
+        assert results['hosts']['lb3']['failed_conditions'] == ['result[0] contains active']
+        assert results['hosts']['lb4']['msg'] == 'Unable to connect to lb4 on port 443.'
+
+        # Only the command of the unsatisfied conditional was run again
+        assert devices['lb2'].calls == ['show sys failover', 'show sys version'] + ['show sys failover'] * 2
+        assert devices['lb3'].calls.count('show sys failover') == 5
+        assert devices['lb3'].calls.count('show sys version') == 1
+        assert 1 < self.running['most'] <= 2
+
+    def test_cli_transport_is_not_supported(self, *args):
+        set_module_args(dict(
+            commands=[
+                "show sys version"
+            ],
+            hosts=['lb1', 'lb2'],
+            transport='cli',
+            user='admin',
+            password='password'
+        ))
+
+        module = AnsibleModule(
+            argument_spec=self.spec.argument_spec,
+            supports_check_mode=self.spec.supports_check_mode
+        )
+        mm = FanoutManager(module=module)
+
+        with self.assertRaises(F5ModuleError):
+            mm.exec_module()
+
+    def test_concurrency_must_be_positive(self, *args):
+        set_module_args(dict(
+            commands=[
+                "show sys version"
+            ],
+            hosts=['lb1', 'lb2'],
+            concurrency=0,
+            user='admin',
+            password='password'
+        ))
+
+        module = AnsibleModule(
+            argument_spec=self.spec.argument_spec,
+            supports_check_mode=self.spec.supports_check_mode
+        )
+        mm = FanoutManager(module=module)
+
+        with self.assertRaises(F5ModuleError) as ex:
+            mm.exec_module()
+        assert 'concurrency' in str(ex.exception)
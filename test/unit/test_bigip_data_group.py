@@ -6,6 +6,7 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
+import hashlib
 import os
 import json
 import pytest
@@ -21,21 +22,27 @@ from ansible.compat.tests.mock import patch
 from ansible.module_utils.basic import AnsibleModule
 
 try:
+    from library.bigip_data_group import ApiParameters
     from library.bigip_data_group import ModuleParameters
     from library.bigip_data_group import ModuleManager
     from library.bigip_data_group import ExternalManager
     from library.bigip_data_group import InternalManager
     from library.bigip_data_group import ArgumentSpec
+    from library.bigip_data_group import records_delta
+    from library.bigip_data_group import records_options
     from library.module_utils.network.f5.common import F5ModuleError
     from library.module_utils.network.f5.common import iControlUnexpectedHTTPError
     from test.unit.modules.utils import set_module_args
 except ImportError:
     try:
+        from ansible.modules.network.f5.bigip_data_group import ApiParameters
         from ansible.modules.network.f5.bigip_data_group import ModuleParameters
         from ansible.modules.network.f5.bigip_data_group import ModuleManager
         from ansible.modules.network.f5.bigip_data_group import ExternalManager
         from ansible.modules.network.f5.bigip_data_group import InternalManager
         from ansible.modules.network.f5.bigip_data_group import ArgumentSpec
+        from ansible.modules.network.f5.bigip_data_group import records_delta
+        from ansible.modules.network.f5.bigip_data_group import records_options
         from ansible.module_utils.network.f5.common import F5ModuleError
         from ansible.module_utils.network.f5.common import iControlUnexpectedHTTPError
         from units.modules.utils import set_module_args
@@ -95,6 +102,34 @@ class TestParameters(unittest.TestCase):
         assert p.state == 'present'
         assert p.partition == 'Common'
 
+    def test_records_src_checksum(self):
+        args = dict(
+            name='foo',
+            type='string',
+            records_src="{0}/data-group-string.txt".format(fixture_path),
+            separator=':=',
+        )
+
+        p = ModuleParameters(params=args)
+        content = p.records_src.read()
+        assert len(content.splitlines()) == 6
+        assert p.checksum == hashlib.sha1(content).hexdigest()
+        assert p.records[0] == dict(name='a', data='alpha')
+
+    @patch('library.bigip_data_group.SIZE_LIMIT_BYTES', 64)
+    def test_large_records_src_is_spooled_to_disk(self):
+        args = dict(
+            name='foo',
+            type='integer',
+            records=[dict(key=str(x), value='y' * 10) for x in range(100)],
+            separator=':=',
+        )
+
+        p = ModuleParameters(params=args)
+        records = p.records_src
+        assert records._rolled is True
+        assert p.checksum == hashlib.sha1(records.read()).hexdigest()
+
 
 @patch('ansible.module_utils.f5_utils.AnsibleF5Client._get_mgmt_root',
        return_value=True)
@@ -461,3 +496,103 @@ class TestManager(unittest.TestCase):
         results = mm0.exec_module()
 
         assert results['changed'] is True
+
+
+class TestRecordsDelta(unittest.TestCase):
+    def test_delta(self):
+        want = [
+            dict(name='a', data='alpha'),
+            dict(name='b', data='beta'),
+            dict(name='d', data=''),
+        ]
+        have = [
+            dict(name='a', data='alpha'),
+            dict(name='b', data='bravo'),
+            dict(name='c', data='charlie'),
+            dict(name='d'),
+        ]
+        delta = records_delta(want, have)
+        assert delta['add'] == []
+        assert delta['modify'] == [dict(name='b', data='beta')]
+        assert delta['remove'] == [dict(name='c')]
+
+    def test_options_are_chunked(self):
+        records = [dict(name='key{0}'.format(x), data='value') for x in range(500)]
+        options = records_options('add', records)
+        assert len(options) > 1
+        assert all(len(x) < 2200 for x in options)
+        assert options[0].startswith('records add { "key0" { data "value" } "key1"')
+        assert sum(x.count(' data ') for x in options) == 500
+
+    def test_options_are_quoted(self):
+        options = records_options('delete', [dict(name='foo "bar"')])
+        assert options == ['records delete { "foo \\"bar\\"" }']
+
+
+class TestInternalUpdate(unittest.TestCase):
+    def setUp(self):
+        self.spec = ArgumentSpec()
+
+    def get_manager(self, records):
+        set_module_args(dict(
+            name='foo',
+            internal=True,
+            records=records,
+            separator=':=',
+            state='present',
+            partition='Common',
+            server='localhost',
+            password='password',
+            user='admin'
+        ))
+        module = AnsibleModule(
+            argument_spec=self.spec.argument_spec,
+            supports_check_mode=self.spec.supports_check_mode,
+            mutually_exclusive=self.spec.mutually_exclusive,
+        )
+        mm = InternalManager(module=module, client=Mock())
+        mm.exists = Mock(return_value=True)
+        mm.read_current_from_device = Mock(return_value=ApiParameters(params=dict(
+            records=[dict(name='key{0}'.format(x), data='value') for x in range(100)]
+        )))
+        return mm
+
+    def test_update_sends_delta(self, *args):
+        records = [dict(key='key{0}'.format(x), value='value') for x in range(100)]
+        records[10]['value'] = 'changed'
+        records.append(dict(key='new', value='value'))
+        del records[0]
+        mm = self.get_manager(records)
+
+        results = mm.exec_module()
+
+        assert results['changed'] is True
+        assert results['records_added'] == 1
+        assert results['records_removed'] == 1
+        assert results['records_modified'] == 1
+        resource = mm.client.api.tm.ltm.data_group.internals.internal.load.return_value
+        options = [x[1]['requests_params']['params']['options'] for x in resource.modify.call_args_list]
+        assert options == [
+            'records delete { "key0" }',
+            'records modify { "key10" { data "changed" } }',
+            'records add { "new" { data "value" } }',
+        ]
+
+    def test_update_sends_all_records_when_most_changed(self, *args):
+        records = [dict(key='key{0}'.format(x), value='changed') for x in range(100)]
+        mm = self.get_manager(records)
+
+        results = mm.exec_module()
+
+        assert results['records_modified'] == 100
+        resource = mm.client.api.tm.ltm.data_group.internals.internal.load.return_value
+        assert resource.modify.call_count == 1
+        assert len(resource.modify.call_args[1]['records']) == 100
+
+    def test_no_change(self, *args):
+        records = [dict(key='key{0}'.format(x), value='value') for x in range(100)]
+        mm = self.get_manager(records)
+
+        results = mm.exec_module()
+
+        assert results['changed'] is False
@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2017 F5 Networks Inc.
+# GNU General Public License v3.0 (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import os
+import json
+import sys
+import threading
+import time
+
+from nose.plugins.skip import SkipTest
+if sys.version_info < (2, 7):
+    raise SkipTest("F5 Ansible modules require Python >= 2.7")
+
+from ansible.compat.tests import unittest
+from ansible.compat.tests.mock import Mock
+
+try:
+    from library.bigip_facts import RestFacts
+    from library.bigip_facts import generate_vs_dict
+except ImportError:
+    try:
+        from ansible.modules.network.f5.bigip_facts import RestFacts
+        from ansible.modules.network.f5.bigip_facts import generate_vs_dict
+    except ImportError:
+        raise SkipTest("F5 Ansible modules require the f5-sdk Python library")
+
+fixture_path = os.path.join(os.path.dirname(__file__), 'fixtures')
+fixture_data = {}
+
+
+def load_fixture(name):
+    path = os.path.join(fixture_path, name)
+
+    if path in fixture_data:
+        return fixture_data[path]
+
+    with open(path) as f:
+        data = f.read()
+
+    try:
+        data = json.loads(data)
+    except Exception:
+        pass
+
+    fixture_data[path] = data
+    return data
+
+
+class FakeSoapInterface(object):
+    """Answers every SOAP call from a recorded REST collection
+
+    Each call counts as one round trip to the device, which is what the
+    two engines are compared by.
+    """
+    def __init__(self, items, latency=0):
+        self.items = items
+        self.latency = latency
+        self.calls = 0
+
+    def __getattr__(self, name):
+        def call(*args):
+            self.calls += 1
+            time.sleep(self.latency)
+            if name == 'get_list':
+                return [x['fullPath'] for x in self.items]
+            return [x.get(name[4:], None) for x in self.items]
+        return call
+
+
+class FakeRestClient(object):
+    def __init__(self, fixtures, latency=0):
+        self.fixtures = fixtures
+        self.latency = latency
+        self.uris = []
+        self.lock = threading.Lock()
+        self.running = 0
+        self.most_running = 0
+        self.api = Mock()
+        self.api.get.side_effect = self.get
+
+    def get(self, uri):
+        with self.lock:
+            self.uris.append(uri)
+            self.running += 1
+            self.most_running = max(self.most_running, self.running)
+        time.sleep(self.latency)
+        with self.lock:
+            self.running -= 1
+        path = uri.split('?')[0]
+        return Mock(json=Mock(return_value=self.fixtures.get(path, dict(items=[]))))
+
+
+class TestRestFacts(unittest.TestCase):
+    def setUp(self):
+        self.virtuals = load_fixture('load_ltm_virtual_collection_expanded.json')
+
+    def test_virtual_server_facts(self, *args):
+        client = FakeRestClient({'/mgmt/tm/ltm/virtual': self.virtuals})
+
+        results = RestFacts(client).exec_module(['virtual_server'])
+
+        assert len(client.uris) == 1
+        assert '$select=' in client.uris[0]
+        assert 'expandSubcollections=true' in client.uris[0]
+
+        facts = results['virtual_server']
+        assert sorted(facts.keys()) == ['/Common/my-virtual-server', '/Common/web-virtual']
+        vs = facts['/Common/my-virtual-server']
+        assert vs['name'] == 'my-virtual-server'
+        assert vs['destination'] == '/Common/10.10.10.10:443'
+        assert vs['rate_limit_dst_mask'] == 0
+        assert vs['source_address_translation'] == dict(type='automap')
+        assert [x['name'] for x in vs['profiles']] == ['tcp', 'http']
+        assert 'self_link' not in vs
+
+    def test_filter_on_full_path(self, *args):
+        client = FakeRestClient({'/mgmt/tm/ltm/virtual': self.virtuals})
+
+        results = RestFacts(client, regex='/Common/web.*').exec_module(['virtual_server'])
+
+        assert list(results['virtual_server'].keys()) == ['/Common/web-virtual']
+
+    def test_provision_facts(self, *args):
+        client = FakeRestClient({
+            '/mgmt/tm/sys/provision': dict(items=[
+                dict(name='ltm', fullPath='ltm', level='nominal'),
+                dict(name='gtm', fullPath='gtm', level='none'),
+                dict(name='asm', fullPath='asm', level='minimum'),
+            ])
+        })
+
+        results = RestFacts(client).exec_module(['provision'])
+
+        assert results['provision']['list'] == ['ltm', 'gtm', 'asm']
+        assert results['provision']['provisioned_list'] == ['ltm', 'asm']
+
+    def test_categories_are_read_concurrently(self, *args):
+        include = ['virtual_server', 'pool', 'node', 'self_ip', 'vlan', 'rule']
+        client = FakeRestClient({'/mgmt/tm/ltm/virtual': self.virtuals}, latency=0.05)
+
+        results = RestFacts(client).exec_module(include)
+
+        assert sorted(results.keys()) == sorted(include)
+        assert len(client.uris) == len(include)
+        assert 1 < client.most_running <= 4
+
+
+class TestBenchmark(unittest.TestCase):
+    """Compares the round trips, and time, of the SOAP and REST engines
+
+    The same recorded virtual servers are served to both engines, with the
+    same latency for each round trip to the device.
+    """
+    latency = 0.002
+
+    def test_virtual_server_facts(self, *args):
+        items = load_fixture('load_ltm_virtual_collection_expanded.json')
+
+        soap = FakeSoapInterface(items['items'], latency=self.latency)
+        f5 = Mock()
+        f5.get_api.return_value.LocalLB.VirtualServer = soap
+        started = time.time()
+        soap_facts = generate_vs_dict(f5, None)
+        soap_time = time.time() - started
+
+        client = FakeRestClient({'/mgmt/tm/ltm/virtual': items}, latency=self.latency)
+        started = time.time()
+        rest_facts = RestFacts(client).exec_module(['virtual_server'])
+        rest_time = time.time() - started
+
+        assert sorted(soap_facts.keys()) == sorted(rest_facts['virtual_server'].keys())
+        assert soap.calls > 40
+        assert len(client.uris) == 1
+        assert rest_time < soap_time
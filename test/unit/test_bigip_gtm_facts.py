@@ -9,6 +9,8 @@ __metaclass__ = type
 import os
 import json
 import sys
+import threading
+import time
 
 from nose.plugins.skip import SkipTest
 if sys.version_info < (2, 7):
@@ -19,6 +21,7 @@ from ansible.compat.tests.mock import Mock
 from ansible.compat.tests.mock import patch
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.six import iteritems
+from multiprocessing.pool import ThreadPool
 
 try:
     from library.bigip_gtm_facts import Parameters
@@ -150,3 +153,78 @@ class TestManager(unittest.TestCase):
         assert 'pool' in results
         assert len(results['pool']) > 0
         assert 'load_balancing_mode' in results['pool'][0]
+
+    def test_filter_typed_pool_facts_by_name(self, *args):
+        set_module_args(dict(
+            include='pool',
+            filter='foo',
+            password='passsword',
+            server='localhost',
+            user='admin'
+        ))
+
+        fixture1 = load_fixture('load_gtm_pool_a_collection.json')
+        fixture2 = load_fixture('load_gtm_pool_a_example_stats.json')
+        collection = [FakeARecord(attrs=x) for x in fixture1['items']]
+        collection.append(FakeARecord(attrs=dict(fixture1['items'][0], name='bar.pool')))
+        stats = Stats(FakeStatResource(fixture2['entries']))
+
+        module = AnsibleModule(
+            argument_spec=self.spec.argument_spec,
+            supports_check_mode=self.spec.supports_check_mode
+        )
+
+        tfm = TypedPoolFactManager(module=module)
+        tfm.read_collection_from_device = Mock(return_value=collection)
+        tfm.read_stats_from_device = Mock(return_value=stats.stat)
+
+        results = tfm.exec_module()
+
+        # One record type is read six times, each with a single match
+        assert len(results) == 6
+        assert all(x['name'] == 'foo.pool' for x in results)
+        assert 'load_balancing_mode' in results[0]
+        assert tfm.read_stats_from_device.call_count == 6
+
+
+class TestConcurrency(unittest.TestCase):
+    def setUp(self):
+        self.spec = ArgumentSpec()
+        self.lock = threading.Lock()
+        self.running = 0
+        self.most_running = 0
+
+    def read(self, *args):
+        with self.lock:
+            self.running += 1
+            self.most_running = max(self.most_running, self.running)
+        time.sleep(0.05)
+        with self.lock:
+            self.running -= 1
+        return []
+
+    def test_collections_are_read_concurrently(self, *args):
+        set_module_args(dict(
+            include='wide_ip',
+            password='passsword',
+            server='localhost',
+            user='admin'
+        ))
+
+        module = AnsibleModule(
+            argument_spec=self.spec.argument_spec,
+            supports_check_mode=self.spec.supports_check_mode
+        )
+
+        executor = ThreadPool(processes=4)
+        try:
+            tfm = TypedWideIpFactManager(module=module, executor=executor)
+            tfm.read_collection_from_device = Mock(side_effect=self.read)
+            results = tfm.exec_module()
+        finally:
+            executor.close()
+            executor.join()
+
+        assert results == []
+        assert tfm.read_collection_from_device.call_count == 6
+        assert 1 < self.most_running <= 4
@@ -8,6 +8,7 @@ __metaclass__ = type
 
 import os
 import json
+import pytest
 import sys
 
 from nose.plugins.skip import SkipTest
@@ -23,6 +24,7 @@ try:
     from library.bigip_node import Parameters
     from library.bigip_node import ModuleManager
     from library.bigip_node import ArgumentSpec
+    from library.bigip_node import AggregateManager
     from library.module_utils.network.f5.common import F5ModuleError
     from library.module_utils.network.f5.common import iControlUnexpectedHTTPError
     from test.unit.modules.utils import set_module_args
@@ -31,6 +33,7 @@ except ImportError:
         from ansible.modules.network.f5.bigip_node import Parameters
         from ansible.modules.network.f5.bigip_node import ModuleManager
         from ansible.modules.network.f5.bigip_node import ArgumentSpec
+        from ansible.modules.network.f5.bigip_node import AggregateManager
         from ansible.module_utils.network.f5.common import F5ModuleError
         from ansible.module_utils.network.f5.common import iControlUnexpectedHTTPError
         from units.modules.utils import set_module_args
@@ -139,3 +142,66 @@ class TestManager(unittest.TestCase):
         results = mm.exec_module()
 
         assert results['changed'] is False
+
+
+class TestAggregateManager(unittest.TestCase):
+    def setUp(self):
+        self.spec = ArgumentSpec()
+
+    def get_manager(self):
+        set_module_args(dict(
+            aggregate=[
+                dict(name='web1', address='10.20.30.41'),
+                dict(name='web2', address='10.20.30.42', description='changed'),
+                dict(name='web3', address='10.20.30.43'),
+                dict(name='web4', state='absent'),
+            ],
+            partition='Common',
+            password='password',
+            server='localhost',
+            user='admin'
+        ))
+        module = AnsibleModule(
+            argument_spec=self.spec.argument_spec,
+            supports_check_mode=self.spec.supports_check_mode,
+            required_one_of=self.spec.required_one_of,
+            mutually_exclusive=self.spec.mutually_exclusive
+        )
+        am = AggregateManager(module=module, client=Mock())
+        am.collection.fetch = Mock(return_value=[
+            dict(name='web2', partition='Common', fullPath='/Common/web2', address='10.20.30.42', description='old',
+                 session='user-enabled', state='unchecked'),
+            dict(name='web3', partition='Common', fullPath='/Common/web3', address='10.20.30.43',
+                 session='user-enabled', state='unchecked'),
+            dict(name='web4', partition='Common', fullPath='/Common/web4', address='10.20.30.44'),
+        ])
+        return am
+
+    def test_changes_are_batched(self, *args):
+        am = self.get_manager()
+        am.batch.commit = Mock(return_value={})
+
+        results = am.exec_module()
+
+        assert results['changed'] is True
+        assert results['aggregate'] == [
+            dict(name='/Common/web1', changed=True),
+            dict(name='/Common/web2', changed=True),
+            dict(name='/Common/web3', changed=False),
+            dict(name='/Common/web4', changed=True),
+        ]
+        assert am.batch.names == ['/Common/web1', '/Common/web2', '/Common/web4']
+        assert am.batch.commit.call_count == 1
+        assert am.collection.fetch.call_count == 1
+
+    def test_errors_are_reported_per_item(self, *args):
+        am = self.get_manager()
+        am.batch.commit = Mock(return_value={
+            '/Common/web1': 'The requested node (/Common/web1) already exists',
+            '/Common/web2': 'Not committed because other changes in the transaction failed.',
+        })
+
+        with pytest.raises(F5ModuleError) as ex:
+            am.exec_module()
+        assert 'Failed to commit 2 of 4 nodes.' in str(ex.value)
+        assert '/Common/web1: The requested node (/Common/web1) already exists' in str(ex.value)
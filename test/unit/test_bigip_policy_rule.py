@@ -24,6 +24,7 @@ try:
     from library.bigip_policy_rule import ModuleParameters
     from library.bigip_policy_rule import ApiParameters
     from library.bigip_policy_rule import ModuleManager
+    from library.bigip_policy_rule import BulkManager
     from library.bigip_policy_rule import ArgumentSpec
     from library.module_utils.network.f5.common import F5ModuleError
     from library.module_utils.network.f5.common import iControlUnexpectedHTTPError
@@ -34,6 +35,7 @@ except ImportError:
         from ansible.modules.network.f5.bigip_policy_rule import ModuleParameters
         from ansible.modules.network.f5.bigip_policy_rule import ApiParameters
         from ansible.modules.network.f5.bigip_policy_rule import ModuleManager
+        from ansible.modules.network.f5.bigip_policy_rule import BulkManager
         from ansible.modules.network.f5.bigip_policy_rule import ArgumentSpec
         from ansible.module_utils.network.f5.common import F5ModuleError
         from ansible.module_utils.network.f5.common import iControlUnexpectedHTTPError
@@ -193,3 +195,136 @@ class TestManager(unittest.TestCase):
         results = mm.exec_module()
 
         assert results['changed'] is True
+
+
+class FakeRule(object):
+    def __init__(self, name, pool, path):
+        self.name = name
+        self.attrs = dict(
+            name=name,
+            actionsReference=dict(items=[
+                dict(name='0', forward=True, pool=pool)
+            ]),
+            conditionsReference=dict(items=[
+                dict(name='0', httpUri=True, path=True, startsWith=True, values=[path])
+            ])
+        )
+        self.modify = Mock()
+        self.delete = Mock()
+
+
+class TestBulkManager(unittest.TestCase):
+
+    def setUp(self):
+        self.spec = ArgumentSpec()
+        self.rules = [
+            FakeRule('rule1', '/Common/pool1', '/euro'),
+            FakeRule('rule2', '/Common/pool1', '/HomePage/'),
+            FakeRule('rule3', '/Common/pool1', '/old'),
+        ]
+        self.client = Mock()
+        policy = self.client.api.tm.ltm.policys.policy.load.return_value
+        policy.rules_s.get_collection.return_value = self.rules
+        self.policy = policy
+
+    def rule(self, name, pool, path):
+        return dict(
+            name=name,
+            actions=[dict(type='forward', pool=pool)],
+            conditions=[dict(type='http_uri', path_begins_with_any=[path])]
+        )
+
+    def test_rules_are_published_once(self, *args):
+        set_module_args(dict(
+            policy='policy1',
+            rules=[
+                self.rule('rule1', 'pool1', '/euro'),
+                self.rule('rule2', 'pool2', '/HomePage/'),
+                self.rule('rule4', 'pool1', '/new'),
+            ],
+            replace_all_with=True,
+            password='password',
+            server='localhost',
+            user='admin'
+        ))
+
+        module = AnsibleModule(
+            argument_spec=self.spec.argument_spec,
+            supports_check_mode=self.spec.supports_check_mode,
+            mutually_exclusive=self.spec.mutually_exclusive,
+            required_one_of=self.spec.required_one_of
+        )
+
+        mm = BulkManager(module=module, client=self.client)
+        mm.draft_exists = Mock(return_value=False)
+        mm._create_existing_policy_draft_on_device = Mock(return_value=True)
+        mm.publish_on_device = Mock(return_value=True)
+
+        results = mm.exec_module()
+
+        assert results['changed'] is True
+        assert [(x['name'], x['changed'], x['state']) for x in results['rules']] == [
+            ('rule1', False, 'present'),
+            ('rule2', True, 'present'),
+            ('rule4', True, 'present'),
+            ('rule3', True, 'absent'),
+        ]
+        assert mm._create_existing_policy_draft_on_device.call_count == 1
+        assert mm.publish_on_device.call_count == 1
+        assert self.policy.rules_s.rules.create.call_count == 1
+        assert self.policy.rules_s.rules.create.call_args[1]['name'] == 'rule4'
+        assert self.rules[0].modify.call_count == 0
+        assert self.rules[1].modify.call_count == 1
+        assert self.rules[2].delete.call_count == 1
+
+    def test_rules_idempotent(self, *args):
+        set_module_args(dict(
+            policy='policy1',
+            rules=[
+                self.rule('rule1', 'pool1', '/euro'),
+                self.rule('rule2', 'pool1', '/HomePage/'),
+            ],
+            password='password',
+            server='localhost',
+            user='admin'
+        ))
+
+        module = AnsibleModule(
+            argument_spec=self.spec.argument_spec,
+            supports_check_mode=self.spec.supports_check_mode,
+            mutually_exclusive=self.spec.mutually_exclusive,
+            required_one_of=self.spec.required_one_of
+        )
+
+        mm = BulkManager(module=module, client=self.client)
+        mm.draft_exists = Mock(return_value=False)
+        mm._create_existing_policy_draft_on_device = Mock(return_value=True)
+        mm.publish_on_device = Mock(return_value=True)
+
+        results = mm.exec_module()
+
+        assert results['changed'] is False
+        assert mm._create_existing_policy_draft_on_device.call_count == 0
+        assert mm.publish_on_device.call_count == 0
+        assert self.rules[2].delete.call_count == 0
+
+    def test_rule_action_type_is_validated(self, *args):
+        rule = self.rule('rule1', 'pool1', '/euro')
+        rule['actions'] = [dict(type='foward', pool='pool1')]
+        set_module_args(dict(
+            policy='policy1',
+            rules=[rule],
+            password='password',
+            server='localhost',
+            user='admin'
+        ))
+
+        with patch('ansible.module_utils.basic.AnsibleModule.fail_json', unsafe=True) as mo:
+            AnsibleModule(
+                argument_spec=self.spec.argument_spec,
+                supports_check_mode=self.spec.supports_check_mode,
+                mutually_exclusive=self.spec.mutually_exclusive,
+                required_one_of=self.spec.required_one_of
+            )
+            mo.assert_called_once()
+            assert 'foward' in mo.call_args[1]['msg']
@@ -9,7 +9,9 @@ __metaclass__ = type
 import os
 import json
 import pytest
+import shutil
 import sys
+import tempfile
 
 from nose.plugins.skip import SkipTest
 if sys.version_info < (2, 7):
@@ -26,6 +28,7 @@ try:
     from library.bigip_pool_member import NodeApiParameters
     from library.bigip_pool_member import ModuleManager
     from library.bigip_pool_member import ArgumentSpec
+    from library.bigip_pool_member import AggregateManager
     from library.module_utils.network.f5.common import F5ModuleError
     from library.module_utils.network.f5.common import iControlUnexpectedHTTPError
     from test.unit.modules.utils import set_module_args
@@ -36,6 +39,7 @@ except ImportError:
         from ansible.modules.network.f5.bigip_pool_member import NodeApiParameters
         from ansible.modules.network.f5.bigip_pool_member import ModuleManager
         from ansible.modules.network.f5.bigip_pool_member import ArgumentSpec
+        from ansible.modules.network.f5.bigip_pool_member import AggregateManager
         from ansible.module_utils.network.f5.common import F5ModuleError
         from ansible.module_utils.network.f5.common import iControlUnexpectedHTTPError
         from units.modules.utils import set_module_args
@@ -336,3 +340,228 @@ class TestLegacyManager(unittest.TestCase):
         assert results['fqdn_auto_populate'] is False
         assert results['address'] == '10.10.10.10'
         assert results['state'] == 'forced_offline'
+
+
+class TestCollectionCache(unittest.TestCase):
+    def setUp(self):
+        self.spec = ArgumentSpec()
+        self.path = tempfile.mkdtemp()
+        self.env = patch.dict(os.environ, {
+            'F5_COLLECTION_CACHE_TTL': '60',
+            'F5_COLLECTION_CACHE_DIR': self.path
+        })
+        self.env.start()
+        self.pools = [
+            dict(
+                name='my-pool',
+                partition='Common',
+                fullPath='/Common/my-pool',
+                membersReference=dict(
+                    items=[
+                        dict(
+                            name='1.1.1.1:80',
+                            partition='Common',
+                            fullPath='/Common/1.1.1.1:80',
+                            address='1.1.1.1',
+                            ratio=10
+                        )
+                    ]
+                )
+            )
+        ]
+
+    def tearDown(self):
+        self.env.stop()
+        shutil.rmtree(self.path)
+
+    def manager(self, name):
+        set_module_args(dict(
+            pool='my-pool',
+            name=name,
+            port=80,
+            state='present',
+            partition='Common',
+            password='password',
+            server='localhost',
+            user='admin'
+        ))
+        module = AnsibleModule(
+            argument_spec=self.spec.argument_spec,
+            supports_check_mode=self.spec.supports_check_mode
+        )
+        client = Mock()
+        client.merge_provider_params.return_value = dict(server='localhost', server_port=443, user='admin')
+        mm = ModuleManager(module=module, client=client)
+        mm.read_pools_from_device = Mock(return_value=self.pools)
+        return mm
+
+    def test_fetch_once_across_tasks(self, *args):
+        mm1 = self.manager('1.1.1.1')
+        mm2 = self.manager('2.2.2.2')
+
+        assert mm1.exists() is True
+        assert mm1.read_current_from_device().ratio == 10
+        assert mm2.exists() is False
+
+        assert mm1.read_pools_from_device.call_count == 1
+        assert mm2.read_pools_from_device.call_count == 0
+        assert mm1.client.api.tm.ltm.pools.pool.load.called is False
+
+    def test_missing_pool(self, *args):
+        self.pools = []
+        mm = self.manager('1.1.1.1')
+        with pytest.raises(F5ModuleError) as ex:
+            mm.exists()
+        assert 'pool does not exist' in str(ex.value)
+
+    def test_write_discards_member(self, *args):
+        mm1 = self.manager('1.1.1.1')
+        mm1.exists()
+        mm1.create_on_device()
+
+        mm2 = self.manager('1.1.1.1')
+        mm2.client.api.tm.ltm.pools.pool.load.return_value.members_s.members.exists.return_value = True
+        assert mm2.exists() is True
+        assert mm2.client.api.tm.ltm.pools.pool.load.called is True
+
+        # Other members are still answered from the cache
+        mm3 = self.manager('2.2.2.2')
+        assert mm3.exists() is False
+        assert mm3.client.api.tm.ltm.pools.pool.load.called is False
+
+
+class TestAggregateManager(unittest.TestCase):
+    def setUp(self):
+        self.spec = ArgumentSpec()
+
+    def test_changes_are_batched(self, *args):
+        set_module_args(dict(
+            pool='my-pool',
+            port=80,
+            aggregate=[
+                dict(name='1.1.1.1'),
+                dict(name='2.2.2.2', ratio=5),
+                dict(name='3.3.3.3', port=8080),
+            ],
+            partition='Common',
+            password='password',
+            server='localhost',
+            user='admin'
+        ))
+        module = AnsibleModule(
+            argument_spec=self.spec.argument_spec,
+            supports_check_mode=self.spec.supports_check_mode,
+            mutually_exclusive=self.spec.mutually_exclusive,
+            required_one_of=self.spec.required_one_of
+        )
+        am = AggregateManager(module=module, client=Mock())
+        am.pools.fetch = Mock(return_value=[
+            dict(
+                name='my-pool',
+                partition='Common',
+                fullPath='/Common/my-pool',
+                membersReference=dict(
+                    items=[
+                        dict(
+                            name='1.1.1.1:80', partition='Common', fullPath='/Common/1.1.1.1:80',
+                            address='1.1.1.1', ratio=1, session='user-enabled', state='unchecked'
+                        ),
+                        dict(
+                            name='2.2.2.2:80', partition='Common', fullPath='/Common/2.2.2.2:80',
+                            address='2.2.2.2', ratio=1, session='user-enabled', state='unchecked'
+                        ),
+                    ]
+                )
+            )
+        ])
+        am.nodes.fetch = Mock(return_value=[])
+        am.batch.commit = Mock(return_value={})
+
+        results = am.exec_module()
+
+        assert results['changed'] is True
+        assert [x['changed'] for x in results['aggregate']] == [False, True, True]
+        assert am.batch.names == [
+            '/Common/my-pool /Common/2.2.2.2:80',
+            '/Common/my-pool /Common/3.3.3.3:8080'
+        ]
+        assert am.batch.commit.call_count == 1
+        assert am.pools.fetch.call_count == 1
+
+    def test_shared_node_is_deleted_once(self, *args):
+        set_module_args(dict(
+            port=80,
+            aggregate=[
+                dict(name='web1', pool='a'),
+                dict(name='web1', pool='b'),
+            ],
+            state='absent',
+            preserve_node=False,
+            partition='Common',
+            password='password',
+            server='localhost',
+            user='admin'
+        ))
+        module = AnsibleModule(
+            argument_spec=self.spec.argument_spec,
+            supports_check_mode=self.spec.supports_check_mode,
+            mutually_exclusive=self.spec.mutually_exclusive,
+            required_one_of=self.spec.required_one_of
+        )
+        client = Mock()
+        # Each load returns a separate resource, as the SDK does
+        client.api.tm.ltm.nodes.node.load.side_effect = lambda **kwargs: Mock()
+        am = AggregateManager(module=module, client=client)
+        am.pools.fetch = Mock(return_value=[
+            dict(
+                name=name,
+                partition='Common',
+                fullPath='/Common/{0}'.format(name),
+                membersReference=dict(
+                    items=[
+                        dict(
+                            name='web1:80', partition='Common', fullPath='/Common/web1:80',
+                            address='1.1.1.1', ratio=1, session='user-enabled', state='unchecked'
+                        ),
+                    ]
+                )
+            ) for name in ['a', 'b']
+        ])
+        am.nodes.fetch = Mock(return_value=[
+            dict(name='web1', partition='Common', fullPath='/Common/web1', address='1.1.1.1')
+        ])
+        am.batch.commit = Mock(return_value={})
+
+        results = am.exec_module()
+
+        assert results['changed'] is True
+        assert am.batch.names == [
+            '/Common/a /Common/web1:80',
+            '/Common/web1',
+            '/Common/b /Common/web1:80'
+        ]
+        assert len(am.batch) == 3
+
+    def test_pool_is_required(self, *args):
+        set_module_args(dict(
+            port=80,
+            aggregate=[
+                dict(name='1.1.1.1', pool='my-pool'),
+                dict(name='2.2.2.2'),
+            ],
+            password='password',
+            server='localhost',
+            user='admin'
+        ))
+        module = AnsibleModule(
+            argument_spec=self.spec.argument_spec,
+            supports_check_mode=self.spec.supports_check_mode,
+            mutually_exclusive=self.spec.mutually_exclusive,
+            required_one_of=self.spec.required_one_of
+        )
+        am = AggregateManager(module=module, client=Mock())
+        am.pools.fetch = Mock(return_value=[])
+
+        with pytest.raises(F5ModuleError) as ex:
+            am.exec_module()
+        assert "'pool' parameter is required" in str(ex.value)
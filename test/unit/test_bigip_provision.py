@@ -117,6 +117,42 @@ class TestManager(unittest.TestCase):
         assert results['changed'] is True
         assert results['level'] == 'nominal'
 
+    def test_reconnect_while_provisioning(self, *args):
+        set_module_args(dict(
+            module='gtm',
+            password='passsword',
+            server='localhost',
+            user='admin'
+        ))
+
+        current = Parameters(
+            dict(
+                module='gtm',
+                level='none'
+            )
+        )
+        module = AnsibleModule(
+            argument_spec=self.spec.argument_spec,
+            supports_check_mode=self.spec.supports_check_mode
+        )
+        client = Mock()
+        client.reconnect.side_effect = [Exception('restjavad is restarting'), None]
+        mm = ModuleManager(module=module, client=client)
+
+        mm.update_on_device = Mock(return_value=True)
+        mm.read_current_from_device = Mock(return_value=current)
+
+        # A connection error while restjavad restarts counts as mprov running
+        mm._is_mprov_running_on_device = Mock(side_effect=[
+            Exception('connection refused'), False, False, Exception('connection refused'), False, False, False
+        ])
+
+        results = mm.exec_module()
+
+        assert results['changed'] is True
+        assert client.reconnect.call_count == 2
+        assert mm._is_mprov_running_on_device.call_count == 7
+
     def test_provision_all_modules(self, *args):
         modules = [
             'afm', 'am', 'sam', 'asm', 'avr', 'fps',
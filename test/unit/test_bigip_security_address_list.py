@@ -92,6 +92,21 @@ class TestParameters(unittest.TestCase):
         assert sorted(p.address_ranges) == ['2.2.2.2-3.3.3.3', '5.5.5.5-6.6.6.6']
         assert p.address_lists[0] == '/Common/foo'
 
+    def test_module_parameters_optimize(self):
+        addresses = ['10.0.0.{0}'.format(x) for x in range(255, -1, -1)]
+        addresses += ['10.0.2.128/25', '192.168.1.1', '2001:db8::1', '10.0.2.0/25', '2001:db8::']
+        args = dict(
+            addresses=addresses,
+            address_ranges=['192.168.1.3-192.168.1.2'],
+            optimize=True
+        )
+
+        p = ModuleParameters(params=args)
+        assert p.addresses == ['10.0.0.0/24', '10.0.2.0/24', '2001:db8::/127']
+        assert p.address_ranges == ['192.168.1.1-192.168.1.3']
+        assert p.optimized['before'] == 262
+        assert p.optimized['after'] == 4
+
 
 class TestManager(unittest.TestCase):
 
@@ -136,3 +151,86 @@ class TestManager(unittest.TestCase):
         assert len(results['address_ranges']) == 2
         assert len(results['address_lists']) == 2
         assert results['description'] == 'this is a description'
+
+    def test_update_in_other_order_is_idempotent(self, *args):
+        set_module_args(dict(
+            name='foo',
+            addresses=['2700:BC00:1F10:101:0::6', '1.1.1.1'],
+            address_ranges=['6.6.6.6-5.5.5.5', '2.2.2.2-2.2.2.9', '2.2.2.5-3.3.3.3'],
+            password='password',
+            server='localhost',
+            user='admin'
+        ))
+
+        module = AnsibleModule(
+            argument_spec=self.spec.argument_spec,
+            supports_check_mode=self.spec.supports_check_mode
+        )
+        mm = ModuleManager(module=module)
+
+        current = ApiParameters(params=load_fixture('load_security_address_list_1.json'))
+        mm.exists = Mock(return_value=True)
+        mm.read_current_from_device = Mock(return_value=current)
+        mm.update_on_device = Mock(return_value=True)
+
+        results = mm.exec_module()
+
+        assert results['changed'] is False
+        assert mm.update_on_device.call_count == 0
+
+    def test_update_reports_delta(self, *args):
+        set_module_args(dict(
+            name='foo',
+            addresses=['1.1.1.1', '10.0.0.1'],
+            password='password',
+            server='localhost',
+            user='admin'
+        ))
+
+        module = AnsibleModule(
+            argument_spec=self.spec.argument_spec,
+            supports_check_mode=self.spec.supports_check_mode
+        )
+        mm = ModuleManager(module=module)
+
+        current = ApiParameters(params=load_fixture('load_security_address_list_1.json'))
+        mm.exists = Mock(return_value=True)
+        mm.read_current_from_device = Mock(return_value=current)
+        mm.update_on_device = Mock(return_value=True)
+
+        results = mm.exec_module()
+
+        assert results['changed'] is True
+        assert results['delta'] == dict(
+            addresses=dict(added=['10.0.0.1'], removed=['2700:bc00:1f10:101::6'])
+        )
+
+        # The ranges on the device are sent along with the new addresses
+        addresses = [x['name'] for x in mm.changes.api_params()['addresses']]
+        assert sorted(addresses) == ['1.1.1.1', '10.0.0.1', '2.2.2.2-3.3.3.3', '5.5.5.5-6.6.6.6']
+
+    def test_create_optimized(self, *args):
+        set_module_args(dict(
+            name='foo',
+            addresses=['1.1.1.{0}'.format(x) for x in range(0, 8)],
+            address_ranges=['1.1.1.8-1.1.1.9'],
+            optimize=True,
+            password='password',
+            server='localhost',
+            user='admin'
+        ))
+
+        module = AnsibleModule(
+            argument_spec=self.spec.argument_spec,
+            supports_check_mode=self.spec.supports_check_mode
+        )
+        mm = ModuleManager(module=module)
+
+        mm.exists = Mock(return_value=False)
+        mm.create_on_device = Mock(return_value=True)
+
+        results = mm.exec_module()
+
+        assert results['changed'] is True
+        assert results['optimized'] == dict(before=9, after=1)
+        assert mm.changes.api_params()['addresses'] == [dict(name='1.1.1.0-1.1.1.9')]
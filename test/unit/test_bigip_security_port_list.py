@@ -128,3 +128,56 @@ class TestManager(unittest.TestCase):
         assert len(results['port_ranges']) == 3
         assert len(results['port_lists']) == 2
         assert results['description'] == 'this is a description'
+
+    def test_update_reports_delta(self, *args):
+        set_module_args(dict(
+            name='foo',
+            ports=[4, 3, 2, 8080],
+            password='password',
+            server='localhost',
+            user='admin'
+        ))
+
+        module = AnsibleModule(
+            argument_spec=self.spec.argument_spec,
+            supports_check_mode=self.spec.supports_check_mode
+        )
+        mm = ModuleManager(module=module)
+
+        current = ApiParameters(params=load_fixture('load_security_port_list_1.json'))
+        mm.exists = Mock(return_value=True)
+        mm.read_current_from_device = Mock(return_value=current)
+        mm.update_on_device = Mock(return_value=True)
+
+        results = mm.exec_module()
+
+        assert results['changed'] is True
+        assert results['delta'] == dict(ports=dict(added=[8080], removed=[1]))
+
+        # The ranges on the device are sent along with the new ports
+        ports = [x['name'] for x in mm.changes.api_params()['ports']]
+        assert sorted(ports) == ['10-20', '2', '3', '30-40', '4', '50-60', '8080']
+
+    def test_overlapping_ranges_are_idempotent(self, *args):
+        set_module_args(dict(
+            name='foo',
+            port_ranges=['50-60', '10-15', '16-20', '30-40', '35-38'],
+            password='password',
+            server='localhost',
+            user='admin'
+        ))
+
+        module = AnsibleModule(
+            argument_spec=self.spec.argument_spec,
+            supports_check_mode=self.spec.supports_check_mode
+        )
+        mm = ModuleManager(module=module)
+
+        current = ApiParameters(params=load_fixture('load_security_port_list_1.json'))
+        mm.exists = Mock(return_value=True)
+        mm.read_current_from_device = Mock(return_value=current)
+        mm.update_on_device = Mock(return_value=True)
+
+        results = mm.exec_module()
+
+        assert results['changed'] is False
@@ -24,6 +24,8 @@ try:
     from library.bigip_virtual_server import ApiParameters
     from library.bigip_virtual_server import ModuleManager
     from library.bigip_virtual_server import ArgumentSpec
+    from library.bigip_virtual_server import ProfileIndex
+    from library.bigip_virtual_server import VirtualServerValidator
     from library.module_utils.network.f5.common import F5ModuleError
     from library.module_utils.network.f5.common import iControlUnexpectedHTTPError
     from test.unit.modules.utils import set_module_args
@@ -33,6 +35,8 @@ except ImportError:
         from ansible.modules.network.f5.bigip_virtual_server import ModuleParameters
         from ansible.modules.network.f5.bigip_virtual_server import ModuleManager
         from ansible.modules.network.f5.bigip_virtual_server import ArgumentSpec
+        from ansible.modules.network.f5.bigip_virtual_server import ProfileIndex
+        from ansible.modules.network.f5.bigip_virtual_server import VirtualServerValidator
         from ansible.module_utils.network.f5.common import F5ModuleError
         from ansible.module_utils.network.f5.common import iControlUnexpectedHTTPError
         from units.modules.utils import set_module_args
@@ -353,6 +357,64 @@ class TestParameters(unittest.TestCase):
         assert p.address_translation == 'disabled'
 
 
+class TestProfileIndex(unittest.TestCase):
+    def setUp(self):
+        ProfileIndex.indexes.clear()
+        self.client = Mock()
+        self.client.merge_provider_params.return_value = dict(server='localhost', server_port=443)
+        names = dict(
+            diameters=['diameter'],
+            sips=['sip'],
+            fastl4s=['fastL4', 'my-fastl4'],
+            fasthttps=['fasthttp'],
+            dhcpv4s=['dhcpv4'],
+            dhcpv6s=['dhcpv6'],
+            udps=['udp', 'udp_gtm_dns'],
+        )
+        for collection, profiles in names.items():
+            items = []
+            for name in profiles:
+                # The name argument of Mock names the mock itself
+                item = Mock()
+                item.name = name
+                items.append(item)
+            getattr(self.client.api.tm.ltm.profile, collection).get_collection.return_value = items
+
+    def tearDown(self):
+        ProfileIndex.indexes.clear()
+
+    def test_collections_are_read_once(self, *args):
+        want = ModuleParameters(client=self.client, params=dict(
+            profiles=['my-fastl4'],
+            type='performance-l4',
+            partition='Common'
+        ))
+        have = ApiParameters(client=self.client, params=dict(
+            profilesReference=dict(items=[dict(name='fasthttp', fullPath='/Common/fasthttp', context='all')])
+        ))
+        validator = VirtualServerValidator(client=self.client, want=want, have=have)
+
+        for x in range(3):
+            assert want.has_fastl4_profiles is True
+            assert want.has_fasthttp_profiles is False
+            assert want.has_message_routing_profiles is False
+            assert have.has_fasthttp_profiles is True
+        assert validator.read_dhcp_profiles_from_device() == ['/Common/dhcpv4', '/Common/dhcpv6']
+        assert validator.read_udp_profiles_from_device() == ['/Common/udp', '/Common/udp_gtm_dns']
+        assert validator._verify_fastl4_profile() is True
+
+        for collection in ProfileIndex.collections.values():
+            getattr(self.client.api.tm.ltm.profile, collection).get_collection.assert_called_once()
+
+    def test_index_is_shared_by_host(self, *args):
+        first = ProfileIndex.for_client(self.client)
+        assert ProfileIndex.for_client(self.client) is first
+
+        other = Mock()
+        other.merge_provider_params.return_value = dict(server='10.0.2.15', server_port=443)
+        assert ProfileIndex.for_client(other) is not first
+
+
 class TestManager(unittest.TestCase):
 
     def setUp(self):
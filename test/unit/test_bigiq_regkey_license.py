@@ -25,6 +25,7 @@ try:
     from library.bigiq_regkey_license import ApiParameters
     from library.bigiq_regkey_license import ModuleManager
     from library.bigiq_regkey_license import ArgumentSpec
+    from library.bigiq_regkey_license import BulkManager
     from library.module_utils.network.f5.common import F5ModuleError
     from library.module_utils.network.f5.common import iControlUnexpectedHTTPError
     from test.unit.modules.utils import set_module_args
@@ -34,6 +35,7 @@ except ImportError:
         from ansible.modules.network.f5.bigiq_regkey_license import ApiParameters
         from ansible.modules.network.f5.bigiq_regkey_license import ModuleManager
         from ansible.modules.network.f5.bigiq_regkey_license import ArgumentSpec
+        from ansible.modules.network.f5.bigiq_regkey_license import BulkManager
         from ansible.module_utils.network.f5.common import F5ModuleError
         from ansible.module_utils.network.f5.common import iControlUnexpectedHTTPError
         from units.modules.utils import set_module_args
@@ -62,6 +64,38 @@ def load_fixture(name):
     return data
 
 
+class FakeOffering(object):
+    """A license in the pool that goes through the given statuses as it is refreshed"""
+    def __init__(self, regKey, statuses, description=None):
+        self.regKey = regKey
+        self.statuses = list(statuses)
+        self.status = self.statuses.pop(0)
+        self.attrs = dict(regKey=regKey, status=self.status, description=description)
+        self.eulaText = 'EULA'
+        self.message = 'License {0} could not be activated'.format(regKey)
+        self.modified = []
+        self.deleted = False
+
+    def refresh(self):
+        if self.statuses:
+            self.status = self.statuses.pop(0)
+
+    def modify(self, **kwargs):
+        self.modified.append(kwargs)
+
+    def delete(self):
+        self.deleted = True
+
+
+def paged(items):
+    """Answers get_collection a page at a time, as the device does for $top and $skip"""
+    def get_collection(requests_params=None):
+        params = dict(x.split('=') for x in requests_params['params'].split('&'))
+        skip = int(params['$skip'])
+        return items[skip:skip + int(params['$top'])]
+    return get_collection
+
+
 class TestParameters(unittest.TestCase):
     def test_module_parameters(self):
         args = dict(
@@ -77,6 +111,18 @@ class TestParameters(unittest.TestCase):
         assert p.accept_eula is True
         assert p.description == 'this is a description'
 
+    def test_regkey_pool_filter_is_encoded(self):
+        client = Mock()
+        get_collection = client.api.cm.device.licensing.pool.regkey.licenses_s.get_collection
+        get_collection.return_value = [Mock(id='1234')]
+        get_collection.return_value[0].name = 'my pool&x'
+
+        p = ModuleParameters(params=dict(regkey_pool='my pool&x'), client=client)
+
+        assert p.regkey_pool_uuid == '1234'
+        params = get_collection.call_args[1]['requests_params']['params']
+        assert params == "$filter=name+eq+'my%20pool%26x'"
+
     def test_api_parameters(self):
         args = load_fixture('load_regkey_license_key.json')
 
@@ -119,3 +165,152 @@ class TestManager(unittest.TestCase):
 
         assert results['changed'] is True
         assert results['description'] == 'this is a description'
+
+    def test_license_is_looked_up_once(self, *args):
+        set_module_args(dict(
+            regkey_pool='foo',
+            license_key='XXXX-XXXX-XXXX-XXXX-XXXX',
+            description='this is a description',
+            password='passsword',
+            server='localhost',
+            user='admin'
+        ))
+
+        module = AnsibleModule(
+            argument_spec=self.spec.argument_spec,
+            supports_check_mode=self.spec.supports_check_mode
+        )
+        offering = Mock(regKey='XXXX-XXXX-XXXX-XXXX-XXXX', attrs=dict(description='old'))
+        client = Mock()
+        licenses = client.api.cm.device.licensing.pool.regkey.licenses_s.licenses
+        get_collection = licenses.load.return_value.offerings_s.get_collection
+        get_collection.return_value = [offering]
+        mm = ModuleManager(module=module, client=client)
+        mm.want.update(dict(regkey_pool_uuid='1234'))
+
+        results = mm.exec_module()
+
+        assert results['changed'] is True
+        assert results['description'] == 'this is a description'
+        offering.modify.assert_called_once_with(description='this is a description')
+
+        # Checking that the license exists, reading it and changing it all
+        # use the one lookup.
+        assert get_collection.call_count == 1
+        params = get_collection.call_args[1]['requests_params']['params']
+        assert params == "$filter=regKey+eq+'XXXX-XXXX-XXXX-XXXX-XXXX'"
+
+
+class TestBulkManager(unittest.TestCase):
+    def setUp(self):
+        self.spec = ArgumentSpec()
+        self.patcher1 = patch('time.sleep')
+        self.patcher1.start()
+
+    def tearDown(self):
+        self.patcher1.stop()
+
+    def get_client(self, offerings, created):
+        client = Mock()
+        pool = client.api.cm.device.licensing.pool.regkey.licenses_s.licenses.load.return_value
+        pool.offerings_s.get_collection.side_effect = paged(offerings)
+        pool.offerings_s.offerings.create.side_effect = lambda **kwargs: created[kwargs['regKey']]
+        return client, pool
+
+    def get_module(self, **kwargs):
+        args = dict(
+            regkey_pool='foo',
+            password='passsword',
+            server='localhost',
+            user='admin'
+        )
+        args.update(kwargs)
+        set_module_args(args)
+        return AnsibleModule(
+            argument_spec=self.spec.argument_spec,
+            supports_check_mode=self.spec.supports_check_mode
+        )
+
+    def test_add_many_licenses(self, *args):
+        module = self.get_module(
+            license_keys=['AAAA', 'BBBB', 'CCCC', 'DDDD'],
+            description='my license',
+            accept_eula=True
+        )
+        existing = FakeOffering('AAAA', ['READY'], description='my license')
+        outdated = FakeOffering('DDDD', ['READY'], description='old')
+        created = dict(
+            BBBB=FakeOffering('BBBB', ['ACTIVATING_AUTOMATIC', 'ACTIVATING_AUTOMATIC_NEED_EULA_ACCEPT', 'READY']),
+            CCCC=FakeOffering('CCCC', ['ACTIVATING_AUTOMATIC', 'ACTIVATING_AUTOMATIC', 'ACTIVATION_FAILED']),
+        )
+        client, pool = self.get_client([existing, outdated], created)
+        mm = BulkManager(module=module, client=client)
+        mm.want.update(dict(regkey_pool_uuid='1234'))
+
+        results = mm.exec_module()
+
+        assert results['changed'] is True
+        assert results['failed'] is True
+        assert results['licenses'] == [
+            dict(license_key='AAAA', changed=False, status='READY'),
+            dict(license_key='BBBB', changed=True, status='READY'),
+            dict(license_key='CCCC', changed=False, status='ACTIVATION_FAILED',
+                 msg='License CCCC could not be activated'),
+            dict(license_key='DDDD', changed=True, status='READY'),
+        ]
+
+        # The pool is read once, for all of the keys. The second page is empty.
+        assert pool.offerings_s.get_collection.call_count == 2
+        assert pool.offerings_s.offerings.create.call_count == 2
+        assert existing.modified == []
+        assert outdated.modified == [dict(description='my license')]
+        assert created['BBBB'].modified == [
+            dict(status='ACTIVATING_AUTOMATIC_EULA_ACCEPTED', eulaText='EULA')
+        ]
+
+    def test_remove_many_licenses(self, *args):
+        module = self.get_module(
+            license_keys=['AAAA', 'BBBB'],
+            state='absent'
+        )
+        existing = FakeOffering('AAAA', ['READY'])
+        client, pool = self.get_client([existing], {})
+        mm = BulkManager(module=module, client=client)
+        mm.want.update(dict(regkey_pool_uuid='1234'))
+
+        results = mm.exec_module()
+
+        assert results['changed'] is True
+        assert 'failed' not in results
+        assert existing.deleted is True
+        assert [x['changed'] for x in results['licenses']] == [True, False]
+
+    def test_offerings_are_read_from_every_page(self, *args):
+        module = self.get_module(
+            license_keys=['KEY0', 'KEY150', 'KEY249'],
+            state='absent'
+        )
+        offerings = [FakeOffering('KEY{0}'.format(x), ['READY']) for x in range(250)]
+        client, pool = self.get_client(offerings, {})
+        mm = BulkManager(module=module, client=client)
+        mm.want.update(dict(regkey_pool_uuid='1234'))
+
+        results = mm.exec_module()
+
+        assert [x['changed'] for x in results['licenses']] == [True, True, True]
+        assert offerings[249].deleted is True
+        assert pool.offerings_s.get_collection.call_count == 4
+
+    def test_concurrency_must_be_positive(self, *args):
+        module = self.get_module(
+            license_keys=['AAAA', 'BBBB'],
+            state='absent',
+            concurrency=0
+        )
+        client, pool = self.get_client([FakeOffering('AAAA', ['READY'])], {})
+        mm = BulkManager(module=module, client=client)
+        mm.want.update(dict(regkey_pool_uuid='1234'))
+
+        with self.assertRaises(F5ModuleError) as ex:
+            mm.exec_module()
+        assert 'concurrency' in str(ex.exception)
@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright: (c) 2017, F5 Networks Inc.
+# GNU General Public License v3.0 (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import sys
+
+from nose.plugins.skip import SkipTest
+if sys.version_info < (2, 7):
+    raise SkipTest("F5 Ansible modules require Python >= 2.7")
+
+from ansible.compat.tests import unittest
+from ansible.compat.tests.mock import Mock
+from ansible.compat.tests.mock import patch
+from ansible.module_utils.f5_utils import AnsibleF5Client
+
+try:
+    from library.iworkflow_local_connector_node import ArgumentSpec
+    from library.iworkflow_local_connector_node import BulkManager
+    from library.iworkflow_local_connector_node import ModuleManager
+    from library.module_utils.network.f5.common import Waiter
+    from test.unit.modules.utils import set_module_args
+except ImportError:
+    try:
+        from ansible.modules.network.f5.iworkflow_local_connector_node import ArgumentSpec
+        from ansible.modules.network.f5.iworkflow_local_connector_node import BulkManager
+        from ansible.modules.network.f5.iworkflow_local_connector_node import ModuleManager
+        from ansible.module_utils.network.f5.common import Waiter
+        from units.modules.utils import set_module_args
+    except ImportError:
+        raise SkipTest("F5 Ansible modules require the f5-sdk Python library")
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def device(address, hostname):
+    return Mock(
+        product='BIG-IP', selfLink='https://localhost/mgmt/shared/resolver/device-groups/{0}'.format(address),
+        hostname=hostname, address=address, managementAddress=address
+    )
+
+
+def node(address, status=None):
+    result = Mock(ipAddress=address)
+    result.attrs = dict(ipAddress=address)
+    if status:
+        result.attrs['currentConfigDeviceTaskReference'] = dict(status=status, errorMessage='{0} failed'.format(address))
+    return result
+
+
+def interfaces(address):
+    return [dict(local_address=address, subnet_address='10.0.0.0/24')]
+
+
+class TestBulkManager(unittest.TestCase):
+    def setUp(self):
+        self.spec = ArgumentSpec()
+        self.clock = FakeClock()
+        self.patcher1 = patch('time.sleep')
+        self.patcher1.start()
+        self.patcher2 = patch(
+            'library.iworkflow_local_connector_node.Waiter',
+            lambda **kwargs: Waiter(sleep=self.clock.sleep, clock=self.clock.time, **kwargs)
+        )
+        self.patcher2.start()
+
+        self.api = Mock()
+        devices = self.api.shared.resolver.device_groups.cm_cloud_managed_devices.devices_s
+        devices.get_collection.return_value = [
+            device('10.0.0.1', 'bigip1.local'),
+            device('10.0.0.2', 'bigip2.local'),
+            device('10.0.0.3', 'bigip3.local'),
+        ]
+        self.connector = Mock(displayName='BIG-IP', selfLink='https://localhost/mgmt/cm/cloud/connectors/local/1')
+        self.connector.name = 'connector1'
+        self.api.cm.cloud.connectors.locals.get_collection.return_value = [self.connector]
+
+    def tearDown(self):
+        self.patcher1.stop()
+        self.patcher2.stop()
+
+    def get_client(self, **kwargs):
+        args = dict(
+            connector='connector1',
+            password_credential='secret',
+            username_credential='admin',
+            server='localhost',
+            user='admin',
+            password='password'
+        )
+        args.update(kwargs)
+        set_module_args(args)
+        with patch('ansible.module_utils.f5_utils.AnsibleF5Client._get_mgmt_root', return_value=self.api):
+            return AnsibleF5Client(
+                argument_spec=self.spec.argument_spec,
+                supports_check_mode=self.spec.supports_check_mode,
+                required_if=self.spec.required_if,
+                required_one_of=self.spec.required_one_of,
+                mutually_exclusive=self.spec.mutually_exclusive
+            )
+
+    def test_create_many_nodes(self, *args):
+        client = self.get_client(devices=[
+            dict(device='10.0.0.1', interfaces=interfaces('10.0.0.1')),
+            dict(device='bigip2.local', interfaces=interfaces('10.0.0.2')),
+            dict(device='10.0.0.3', interfaces=interfaces('10.0.0.3')),
+            dict(device='10.0.0.9', interfaces=interfaces('10.0.0.9')),
+        ])
+        failed = node('10.0.0.3', 'FAILED')
+        self.connector.nodes_s.get_collection.side_effect = [
+            [failed],
+            [node('10.0.0.1', 'RUNNING'), node('10.0.0.2', 'RUNNING'), node('10.0.0.3', 'RUNNING')],
+            [node('10.0.0.1', 'FINISHED'), node('10.0.0.2', 'FAILED'), node('10.0.0.3', 'FINISHED')],
+        ]
+
+        mm = BulkManager(client)
+        results = mm.exec_module()
+
+        assert results['changed'] is True
+        assert results['failed'] is True
+        assert results['msg'] == '2 of 4 nodes failed.'
+        nodes = dict((x['device'], x) for x in results['nodes'])
+        assert nodes['10.0.0.1'] == dict(device='10.0.0.1', address='10.0.0.1', changed=True, status='FINISHED')
+        assert nodes['bigip2.local']['changed'] is False
+        assert nodes['bigip2.local']['msg'] == '10.0.0.2 failed'
+        assert nodes['10.0.0.3']['status'] == 'FINISHED'
+        assert nodes['10.0.0.9']['msg'] == 'Device 10.0.0.9 was not found'
+
+        # The FAILED node was deleted and created again
+        assert failed.delete.call_count == 1
+        created = [x[1]['ipAddress'] for x in self.connector.nodes_s.node.create.call_args_list]
+        assert sorted(created) == ['10.0.0.1', '10.0.0.2', '10.0.0.3']
+
+        # The devices are read once, and the nodes once per poll
+        assert self.api.shared.resolver.device_groups.cm_cloud_managed_devices.devices_s.get_collection.call_count == 1
+        assert self.connector.nodes_s.get_collection.call_count == 3
+
+    def test_interfaces_are_required(self, *args):
+        client = self.get_client(devices=[
+            dict(device='10.0.0.1'),
+        ])
+        self.connector.nodes_s.get_collection.return_value = []
+
+        mm = BulkManager(client)
+        results = mm.exec_module()
+
+        assert results['failed'] is True
+        assert results['nodes'][0]['msg'] == 'The interfaces of the device are required when state is present.'
+        assert self.connector.nodes_s.node.create.called is False
+
+    def test_timeout(self, *args):
+        client = self.get_client(devices=[
+            dict(device='10.0.0.1', interfaces=interfaces('10.0.0.1')),
+            dict(device='10.0.0.2', interfaces=interfaces('10.0.0.2')),
+        ])
+        polls = [[]]
+
+        def get_collection(**kwargs):
+            if polls:
+                return polls.pop()
+            return [node('10.0.0.1', 'FINISHED'), node('10.0.0.2', 'RUNNING')]
+        self.connector.nodes_s.get_collection.side_effect = get_collection
+
+        mm = BulkManager(client)
+        results = mm.exec_module()
+
+        assert results['failed'] is True
+        assert results['nodes'][0]['status'] == 'FINISHED'
+        assert 'msg' not in results['nodes'][0]
+        assert results['nodes'][1]['msg'] == 'Timed out waiting 30 minutes for node to finish.'
+        assert self.clock.now >= 1800
+
+    def test_remove_many_nodes(self, *args):
+        client = self.get_client(
+            devices=[
+                dict(device='10.0.0.1'),
+                dict(device='10.0.0.2'),
+            ],
+            state='absent'
+        )
+        existing = node('10.0.0.1', 'FINISHED')
+        self.connector.nodes_s.get_collection.return_value = [existing]
+
+        mm = BulkManager(client)
+        results = mm.exec_module()
+
+        assert results['changed'] is True
+        assert 'failed' not in results
+        assert [x['changed'] for x in results['nodes']] == [True, False]
+        assert existing.delete.call_count == 1
+
+    def test_concurrency_must_be_positive(self, *args):
+        client = self.get_client(
+            devices=[
+                dict(device='10.0.0.1'),
+            ],
+            state='absent',
+            concurrency=0
+        )
+        self.connector.nodes_s.get_collection.return_value = [node('10.0.0.1', 'FINISHED')]
+
+        mm = BulkManager(client)
+        with self.assertRaises(Exception) as ex:
+            mm.exec_module()
+        assert 'concurrency' in str(ex.exception)
+
+
+class TestManager(unittest.TestCase):
+    def setUp(self):
+        self.spec = ArgumentSpec()
+        self.api = Mock()
+        devices = self.api.shared.resolver.device_groups.cm_cloud_managed_devices.devices_s
+        devices.get_collection.return_value = [device('10.0.0.1', 'bigip1.local')]
+        self.connector = Mock(displayName='BIG-IP', selfLink='https://localhost/mgmt/cm/cloud/connectors/local/1')
+        self.connector.name = 'connector1'
+        self.api.cm.cloud.connectors.locals.get_collection.return_value = [self.connector]
+
+    def test_remove_node(self, *args):
+        set_module_args(dict(
+            connector='connector1',
+            device='10.0.0.1',
+            state='absent',
+            server='localhost',
+            user='admin',
+            password='password'
+        ))
+        with patch('ansible.module_utils.f5_utils.AnsibleF5Client._get_mgmt_root', return_value=self.api):
+            client = AnsibleF5Client(
+                argument_spec=self.spec.argument_spec,
+                supports_check_mode=self.spec.supports_check_mode,
+                required_one_of=self.spec.required_one_of,
+                mutually_exclusive=self.spec.mutually_exclusive
+            )
+        existing = node('10.0.0.1')
+        self.connector.nodes_s.get_collection.side_effect = [[existing], [existing], []]
+
+        mm = ModuleManager(client)
+        results = mm.exec_module()
+
+        assert results['changed'] is True
+        assert existing.delete.call_count == 1
+        params = self.connector.nodes_s.get_collection.call_args[1]['requests_params']['params']
+        assert params == "$filter=ipAddress+eq+'10.0.0.1'"
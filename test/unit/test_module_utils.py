@@ -7,8 +7,219 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
+import hashlib
+import json
+import multiprocessing
+import os
+import shutil
+import socket
+import ssl
+import tempfile
+import threading
+import time
+
 from ansible.compat.tests import unittest
+from ansible.compat.tests.mock import MagicMock
+from ansible.compat.tests.mock import Mock
+from ansible.compat.tests.mock import patch
+from ansible.module_utils.network.common.parsing import Conditional
+from ansible.module_utils.network.common.parsing import FailedConditionsError
+from ansible.module_utils.six.moves import BaseHTTPServer
+from ansible.module_utils.six.moves import socketserver
+from icontrol.session import iControlRESTSession
+from io import BytesIO
+from library.module_utils.network.f5.bigip import F5Client
+from library.module_utils.network.f5.bigip import F5RestClient
+from library.module_utils.network.f5.bigip import FileUpload
+from library.module_utils.network.f5.bigip import TransactionBatch
+from library.module_utils.network.f5.bigip import upload_fileobj
+from library.module_utils.network.f5.bigip import upload_summary
 from library.module_utils.network.f5.common import AnsibleF5Parameters
+from library.module_utils.network.f5.common import CollectionCache
+from library.module_utils.network.f5.common import CommandRunner
+from library.module_utils.network.f5.common import F5BaseClient
+from library.module_utils.network.f5.common import F5ModuleError
+from library.module_utils.network.f5.common import ListDifference
+from library.module_utils.network.f5.common import RetryPolicy
+from library.module_utils.network.f5.common import TokenCache
+from library.module_utils.network.f5.common import Waiter
+from library.module_utils.network.f5.common import cleanup_tokens
+from library.module_utils.network.f5.common import collapse_ranges
+from library.module_utils.network.f5.common import map_concurrently
+from library.module_utils.network.f5.icontrol import CollectionReader
+from library.module_utils.network.f5.icontrol import PagedCollection
+from library.module_utils.network.f5.icontrol import close_connection_pools
+from library.module_utils.network.f5.icontrol import iControlRestSession
+
+fixture_path = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+class StandInHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    wbufsize = -1
+
+    def do_GET(self):
+        self.server.requests += 1
+        if self.headers.get('X-F5-Auth-Token') in self.server.revoked:
+            self.send_response(401)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        body = json.dumps(dict(kind='tm:ltm:pool:poolstate', name='foo')).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        if self.server.drop_every and self.server.requests % self.server.drop_every == 0:
+            # Close the socket without telling the client, as an idle
+            # keep-alive timeout on the device would.
+            self.close_connection = True
+
+    def do_POST(self):
+        self.server.logins += 1
+        length = int(self.headers.get('Content-Length', 0))
+        self.rfile.read(length)
+        token = dict(
+            name='TOKEN{0}'.format(self.server.logins), timeout=1200,
+            lastUpdateMicros=1520000000000000, expirationMicros=1520001200000000
+        )
+        body = json.dumps(dict(token=token)).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class UploadHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    """Writes each Content-Range chunk into the server's file
+
+    Chunks listed in the server's ``failures`` fail instead, once for every
+    entry in their list. A ``503`` entry answers with that status, and a
+    ``drop`` entry closes the connection after reading the chunk.
+    """
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        data = self.rfile.read(length)
+        first, rest = self.headers['Content-Range'].split('-')
+        last, size = rest.split('/')
+        first, last = int(first), int(last)
+        with self.server.lock:
+            self.server.requests += 1
+            self.server.running += 1
+            self.server.most_running = max(self.server.most_running, self.server.running)
+            failures = self.server.failures.get(first, [])
+            failure = failures.pop(0) if failures else None
+        time.sleep(0.01)
+        with self.server.lock:
+            self.server.running -= 1
+        if failure == 'drop':
+            self.close_connection = True
+            return
+        if failure == '503':
+            self.send_response(503)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        with self.server.lock:
+            if len(self.server.data) < int(size):
+                self.server.data.extend(b'\0' * (int(size) - len(self.server.data)))
+            self.server.data[first:last + 1] = data
+            self.server.chunks.append(first)
+        body = json.dumps(dict(remainingByteCount=0, totalByteCount=int(size))).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class CollectionHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    """Serves the server's ``collection`` a page at a time
+
+    The body is sent in small chunks, so that clients see it arrive in
+    pieces, as they would from a large collection on the device.
+    """
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.server.requests += 1
+        self.server.paths.append(self.path)
+        path, query = self.path.split('?')
+        query = dict(x.split('=') for x in query.split('&'))
+        top, skip = int(query['$top']), int(query['$skip'])
+        body = dict(
+            kind='tm:ltm:virtual:virtualcollectionstate',
+            selfLink='https://localhost{0}'.format(self.path),
+            items=self.server.collection[skip:skip + top],
+        )
+        if skip + top < len(self.server.collection):
+            body['nextLink'] = 'https://localhost{0}?$top={1}&$skip={2}'.format(path, top, skip + top)
+        body = json.dumps(body).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        for x in range(0, len(body), 100):
+            chunk = body[x:x + 100]
+            self.wfile.write('{0:x}\r\n'.format(len(chunk)).encode('ascii') + chunk + b'\r\n')
+        self.wfile.write(b'0\r\n\r\n')
+
+    def log_message(self, *args):
+        pass
+
+
+class StandInServer(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    """A local HTTPS stand-in for the iControl REST server
+
+    Counts the TLS handshakes it performs so that tests can tell how many
+    connections a client opened.
+    """
+    daemon_threads = True
+
+    def __init__(self, drop_every=None, handler=StandInHandler):
+        BaseHTTPServer.HTTPServer.__init__(self, ('127.0.0.1', 0), handler)
+        self.context = ssl.SSLContext(ssl.PROTOCOL_SSLv23)
+        self.context.load_cert_chain(
+            os.path.join(fixture_path, 'cert1.crt'), os.path.join(fixture_path, 'cert1.key')
+        )
+        self.drop_every = drop_every
+        self.handshakes = 0
+        self.logins = 0
+        self.requests = 0
+        self.lock = threading.Lock()
+        self.running = 0
+        self.most_running = 0
+        self.failures = dict()
+        self.chunks = []
+        self.data = bytearray()
+        self.collection = []
+        self.paths = []
+        self.revoked = set()
+
+    def get_request(self):
+        sock, addr = self.socket.accept()
+        self.handshakes += 1
+        return self.context.wrap_socket(sock, server_side=True), addr
+
+    def __enter__(self):
+        self.thread = threading.Thread(target=self.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+        self.server_close()
 
 
 class TestRegular(unittest.TestCase):
@@ -199,3 +410,899 @@ class TestAssureNoInstanceAttributes(unittest.TestCase):
         assert test.destination == '10.10.10.10'
         assert test.reject == 'yes'
         assert 'destination' not in dir(test)
+
+
+class TestSetterNames(unittest.TestCase):
+    def test_setters_are_kept_for_each_class(self):
+        TestInheritence.Foo(params=dict(foo='alice'))
+        TestInheritence.Baz(params=dict(baz='carol'))
+
+        assert TestInheritence.Foo._setters() == frozenset(['foo', 'bar', 'baz', 'partition'])
+        assert TestInheritence.Baz._setters() == frozenset(['baz', 'partition'])
+        assert TestInheritence.Bar._setters() == frozenset(['bar', 'baz', 'partition'])
+
+    def test_properties_without_setters_are_not_included(self):
+        assert TestMissingAttrSetter.Foo._setters() == frozenset(['partition'])
+        assert TestReferenceAnother.Foo._setters() == frozenset(['poolLbMode', 'lb_method', 'partition'])
+
+
+class TestListDifference(unittest.TestCase):
+    def test_order_does_not_matter(self):
+        diff = ListDifference(['b', 'a', 'c'], ['c', 'b', 'a'])
+        assert diff.changed is False
+        assert diff.to_return() == dict(added=[], removed=[])
+
+    def test_added_and_removed(self):
+        diff = ListDifference([3, 1, 4], [1, 5, 9])
+        assert diff.changed is True
+        assert diff.added == [3, 4]
+        assert diff.removed == [5, 9]
+
+    def test_collapse_ranges(self):
+        ranges = [(50, 60), (10, 20), (15, 30), (31, 40), (70, 70)]
+        assert collapse_ranges(ranges) == [(10, 40), (50, 60), (70, 70)]
+
+
+class TestCompactParameters(unittest.TestCase):
+    class Foo(AnsibleF5Parameters):
+        api_map = {
+            'loadBalancingMode': 'lb_method',
+            'dns.proxy.__iter__': 'proxy',
+            'maxAnswers': 'max_answers',
+        }
+
+        api_attributes = [
+            'loadBalancingMode', 'maxAnswers', 'description'
+        ]
+
+        returnables = [
+            'lb_method', 'max_answers', 'description', 'proxy'
+        ]
+
+        @property
+        def max_answers(self):
+            if self._values['max_answers'] is None:
+                return None
+            return int(self._values['max_answers'])
+
+        @property
+        def lb_method(self):
+            return self._values['lb_method']
+
+        @lb_method.setter
+        def lb_method(self, value):
+            self._values['lb_method'] = value.replace('_', '-')
+
+    def test_compact_class_is_made_once(self):
+        compact = TestCompactParameters.Foo.compact()
+
+        assert compact is TestCompactParameters.Foo.compact()
+        assert issubclass(compact, TestCompactParameters.Foo)
+        assert 'description' in compact.__slots__
+        assert '_v_max_answers' in compact.__slots__
+
+    def test_values_match_the_regular_class(self):
+        args = {
+            'loadBalancingMode': 'round_robin',
+            'maxAnswers': '3',
+            'description': 'my pool',
+            'dns.proxy.__iter__': 'alice',
+            'monitor': '/Common/http',
+            'partition': '/Common/',
+        }
+        regular = TestCompactParameters.Foo(params=args)
+        compact = TestCompactParameters.Foo.compact()(params=args)
+
+        for name in ['lb_method', 'max_answers', 'description', 'proxy', 'monitor', 'partition', 'missing']:
+            assert getattr(compact, name) == getattr(regular, name)
+        assert compact.api_params() == regular.api_params()
+        assert compact.lb_method == 'round-robin'
+        assert compact.max_answers == 3
+
+    def test_values_work_as_a_mapping(self):
+        compact = TestCompactParameters.Foo.compact()(params={
+            'maxAnswers': '3',
+            'enabled': True,
+        })
+
+        assert 'enabled' in compact._values
+        assert 'max_answers' in compact._values
+        assert 'disabled' not in compact._values
+        assert 'description' not in compact._values
+        assert sorted(compact._values.keys()) == ['enabled', 'max_answers']
+        assert sorted(compact._values) == ['enabled', 'max_answers']
+        assert dict(compact._values.items()) == dict(enabled=True, max_answers='3')
+        assert compact.__dict__ == {}
+
+    def test_from_collection(self):
+        items = [
+            dict(name='foo', loadBalancingMode='ratio_member', maxAnswers='1'),
+            dict(name='bar', description='second'),
+        ]
+        client = Mock()
+
+        results = TestCompactParameters.Foo.from_collection(items, client=client)
+
+        assert [x.name for x in results] == ['foo', 'bar']
+        assert results[0].lb_method == 'ratio-member'
+        assert results[0].description is None
+        assert results[1].max_answers is None
+        assert results[1].client is client
+
+    def test_values_can_be_changed(self):
+        test = TestCompactParameters.Foo.from_collection([dict(name='foo')])[0]
+
+        test.update(dict(name='bar', type='a'))
+        test._values['__warnings'].append(dict(msg='careful'))
+
+        assert test.name == 'bar'
+        assert test.type == 'a'
+        assert test._values.get('__warnings') == [dict(msg='careful')]
+        assert test._values.get('missing', 'default') == 'default'
+
+
+class TestConnectionPool(unittest.TestCase):
+    def tearDown(self):
+        close_connection_pools()
+
+    def session(self, server, **kwargs):
+        return iControlRestSession(
+            server='127.0.0.1', server_port=server.server_address[1],
+            validate_certs=False, token='abc', **kwargs
+        )
+
+    def test_keep_alive_saves_handshakes(self):
+        with StandInServer() as server:
+            session = self.session(server)
+            for x in range(500):
+                response = session.get('/mgmt/tm/ltm/pool/~Common~foo')
+                assert response.json()['name'] == 'foo'
+
+        stats = session.pool_stats
+        assert server.requests == 500
+        assert server.handshakes == 1
+        assert stats['misses'] == 1
+        assert stats['hits'] == 499
+
+        # Without the pool, every request would have been its own handshake.
+        assert server.requests - server.handshakes == 499
+
+    def test_sessions_share_pool(self):
+        with StandInServer() as server:
+            for x in range(10):
+                self.session(server).get('/mgmt/tm/ltm/pool/~Common~foo')
+        assert server.handshakes == 1
+
+    def test_retry_stale_connection(self):
+        with StandInServer(drop_every=10) as server:
+            session = self.session(server)
+            for x in range(50):
+                session.get('/mgmt/tm/ltm/pool/~Common~foo')
+
+        stats = session.pool_stats
+        assert server.requests == 50
+        assert stats['retries'] == 4
+        assert server.handshakes == 5
+
+    def test_no_retry_of_sent_post(self):
+        with StandInServer(drop_every=1) as server:
+            session = self.session(server)
+            session.get('/mgmt/tm/ltm/pool/~Common~foo')
+            with self.assertRaises(Exception):
+                session.post('/mgmt/shared/authn/login', json=dict(username='admin'))
+
+        assert session.pool_stats['retries'] == 0
+
+
+class TestStreamedCollections(unittest.TestCase):
+    def tearDown(self):
+        close_connection_pools()
+
+    def session(self, server, **kwargs):
+        return iControlRestSession(
+            server='127.0.0.1', server_port=server.server_address[1],
+            validate_certs=False, token='abc', **kwargs
+        )
+
+    def test_reader_yields_items_across_chunks(self):
+        body = json.dumps(dict(
+            kind='tm:ltm:virtual:virtualcollectionstate',
+            items=[dict(name=u'caf\xe9', rateLimit=123456789), dict(name='bar', rules=[])],
+            nextLink='https://localhost/mgmt/tm/ltm/virtual?$top=2&$skip=2',
+            totalItems=12345,
+        )).encode('utf-8')
+
+        reader = CollectionReader(BytesIO(body), chunk_size=3)
+        items = list(reader)
+
+        assert items == [dict(name=u'caf\xe9', rateLimit=123456789), dict(name='bar', rules=[])]
+        assert reader.properties['totalItems'] == 12345
+        assert reader.properties['nextLink'].endswith('$skip=2')
+
+    def test_reader_fails_on_truncated_response(self):
+        reader = CollectionReader(BytesIO(b'{"items": [{"name": "foo"}, {"na'))
+
+        with self.assertRaises(F5ModuleError):
+            list(reader)
+
+    def test_iter_collection_follows_next_link(self):
+        with StandInServer(handler=CollectionHandler) as server:
+            server.collection = [dict(name='vs{0}'.format(x)) for x in range(250)]
+            session = self.session(server)
+            items = list(session.iter_collection('/mgmt/tm/ltm/virtual?expandSubcollections=true'))
+
+        assert [x['name'] for x in items] == ['vs{0}'.format(x) for x in range(250)]
+        assert server.paths == [
+            '/mgmt/tm/ltm/virtual?expandSubcollections=true&$top=100&$skip=0',
+            '/mgmt/tm/ltm/virtual?$top=100&$skip=100',
+            '/mgmt/tm/ltm/virtual?$top=100&$skip=200',
+        ]
+        assert server.handshakes == 1
+
+    def test_stopping_early_frees_the_connection(self):
+        with StandInServer(handler=CollectionHandler) as server:
+            server.collection = [dict(name='vs{0}'.format(x), description='x' * 100) for x in range(1000)]
+            session = self.session(server, pool_size=1)
+
+            # The page is larger than one read from the socket, so most of
+            # it is still unread when the caller stops.
+            items = session.iter_collection('/mgmt/tm/ltm/virtual', page_size=1000)
+            assert next(items)['name'] == 'vs0'
+            items.close()
+
+            # With a pool of one, this would block if the connection was
+            # still held by the abandoned page.
+            response = session.get('/mgmt/tm/ltm/virtual?$top=1&$skip=0')
+
+        assert response.json()['items'] == [dict(name='vs0', description='x' * 100)]
+        assert server.handshakes == 2
+
+
+class TestPagedCollection(unittest.TestCase):
+    def tearDown(self):
+        close_connection_pools()
+
+    def session(self, server, **kwargs):
+        return iControlRestSession(
+            server='127.0.0.1', server_port=server.server_address[1],
+            validate_certs=False, token='abc', **kwargs
+        )
+
+    def test_lookup_reads_only_the_pages_it_needs(self):
+        with StandInServer(handler=CollectionHandler) as server:
+            server.collection = [dict(regKey='KEY{0}'.format(x)) for x in range(250)]
+            offerings = PagedCollection(self.session(server), '/mgmt/cm/offerings', key='regKey')
+
+            assert offerings.get('KEY120') == dict(regKey='KEY120')
+            assert offerings.pages_read == 2
+            assert offerings.get('KEY5') == dict(regKey='KEY5')
+            assert offerings.pages_read == 2
+            assert offerings.get('MISSING') is None
+            assert offerings.pages_read == 3
+
+    def test_prefetch_reads_the_next_page_in_the_background(self):
+        with StandInServer(handler=CollectionHandler) as server:
+            server.collection = [dict(regKey='KEY{0}'.format(x)) for x in range(250)]
+            offerings = PagedCollection(
+                self.session(server), '/mgmt/cm/offerings', page_size=50, prefetch=True, key='regKey'
+            )
+
+            assert offerings.get('KEY5') == dict(regKey='KEY5')
+            offerings.close()
+
+        # The second page was asked for while the first was searched
+        assert offerings.pages_read == 2
+        assert server.paths[-1] == '/mgmt/cm/offerings?$top=50&$skip=50'
+
+    def test_iterate_with_prefetch(self):
+        with StandInServer(handler=CollectionHandler) as server:
+            server.collection = [dict(regKey='KEY{0}'.format(x)) for x in range(250)]
+            offerings = PagedCollection(self.session(server), '/mgmt/cm/offerings', prefetch=True)
+            items = list(offerings)
+
+        assert [x['regKey'] for x in items] == ['KEY{0}'.format(x) for x in range(250)]
+        assert offerings.pages_read == 3
+
+
+def login_through_cache(path, results):
+    cache = TokenCache('10.1.1.1', 443, 'admin', path=path)
+    with cache:
+        token = cache.get()
+        if token is None:
+            # Give the other processes time to queue up on the lock
+            time.sleep(0.2)
+            token = 'TOKEN{0}'.format(os.getpid())
+            cache.set(token, time.time() + 1200)
+    results.put(token)
+
+
+class TestTokenCache(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+        close_connection_pools()
+
+    def test_get_set(self):
+        cache = TokenCache('10.1.1.1', 443, 'admin', path=self.path)
+        with cache:
+            assert cache.get() is None
+            cache.set('ABC', time.time() + 1200)
+        assert cache.get() == 'ABC'
+        assert cache.contains('ABC')
+        assert oct(os.stat(cache.filename).st_mode & 0o777) == oct(0o600)
+
+    def test_entries_are_keyed(self):
+        cache1 = TokenCache('10.1.1.1', 443, 'admin', path=self.path)
+        cache2 = TokenCache('10.1.1.1', 443, 'operator', path=self.path)
+        cache3 = TokenCache('10.1.1.1', 443, 'admin', auth_provider='ldap', path=self.path)
+        cache1.set('ABC', time.time() + 1200)
+        assert cache2.get() is None
+        assert cache3.get() is None
+
+    def test_refresh_near_expiry(self):
+        cache = TokenCache('10.1.1.1', 443, 'admin', path=self.path, refresh_margin=120)
+        cache.set('ABC', time.time() + 60)
+        assert cache.get() is None
+
+    def test_invalidate(self):
+        cache = TokenCache('10.1.1.1', 443, 'admin', path=self.path)
+        cache.set('ABC', time.time() + 1200)
+        cache.invalidate('DEF')
+        assert cache.get() == 'ABC'
+        cache.invalidate('ABC')
+        assert cache.get() is None
+
+    def test_disabled(self):
+        with patch.dict(os.environ, {'F5_TOKEN_CACHE': 'no'}):
+            cache = TokenCache('10.1.1.1', 443, 'admin')
+        assert cache.enabled is False
+        with cache:
+            cache.set('ABC', time.time() + 1200)
+        assert cache.get() is None
+
+    def test_parallel_forks_share_token(self):
+        results = multiprocessing.Queue()
+        procs = [
+            multiprocessing.Process(target=login_through_cache, args=(self.path, results))
+            for x in range(5)
+        ]
+        for proc in procs:
+            proc.start()
+        for proc in procs:
+            proc.join()
+        tokens = set(results.get() for x in range(5))
+        assert len(tokens) == 1
+
+    def test_rest_clients_share_login(self):
+        with StandInServer() as server:
+            with patch.dict(os.environ, {'F5_TOKEN_CACHE_DIR': self.path}):
+                for x in range(3):
+                    provider = dict(
+                        server='127.0.0.1', server_port=server.server_address[1], user='admin',
+                        password='secret', validate_certs=False
+                    )
+                    client = F5RestClient(provider=provider, server=None, server_port=None, validate_certs=None)
+                    client.api.get('/mgmt/tm/ltm/pool/~Common~foo')
+        assert server.logins == 1
+
+    def test_rest_client_caches_new_token_after_401(self):
+        with StandInServer() as server:
+            server.revoked.add('OLD')
+            provider = dict(
+                server='127.0.0.1', server_port=server.server_address[1], user='admin',
+                password='secret', validate_certs=False
+            )
+            with patch.dict(os.environ, {'F5_TOKEN_CACHE_DIR': self.path}):
+                client = F5RestClient(provider=provider, server=None, server_port=None, validate_certs=None)
+                client.token_cache.set('OLD', time.time() + 1200)
+                client.api.get('/mgmt/tm/ltm/pool/~Common~foo')
+        assert server.logins == 1
+        assert client.token_cache.get() == 'TOKEN1'
+
+    def test_sdk_client_reuses_token_with_credentials(self):
+        provider = dict(server='10.1.1.1', server_port=443, user='operator', password='secret', validate_certs=False)
+        with patch.dict(os.environ, {'F5_TOKEN_CACHE_DIR': self.path}):
+            client = F5Client(provider=provider, server=None, server_port=None, validate_certs=None)
+            expiration = time.time() + 1200
+            client.token_cache.set('ABC', expiration)
+            with patch('library.module_utils.network.f5.bigip.ManagementRoot') as root:
+                api = client.api
+        assert root.call_args[1]['token_to_use'] == 'ABC'
+        auth = api.icrs.session.auth
+        assert auth.username == 'operator'
+        assert auth.password == 'secret'
+        assert auth.login_provider_name == 'tmos'
+        assert auth.expiration == expiration
+
+    def test_cleanup_tokens_keeps_shared_token(self):
+        cache = TokenCache('10.1.1.1', 443, 'admin', path=self.path)
+        cache.set('ABC', time.time() + 1200)
+        client = Mock()
+        client.token_cache = cache
+        client.api.icrs.token = 'ABC'
+        cleanup_tokens(client)
+        assert client.api.shared.authz.tokens_s.token.load.called is False
+
+        client.api.icrs.token = 'DEF'
+        cleanup_tokens(client)
+        assert client.api.shared.authz.tokens_s.token.load.called is True
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class HTTPError(Exception):
+    def __init__(self, code):
+        super(HTTPError, self).__init__('{0} Unexpected Error'.format(code))
+        self.response = Mock(status_code=code)
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def policy(self, **kwargs):
+        return RetryPolicy(sleep=self.clock.sleep, clock=self.clock.time, **kwargs)
+
+    def test_succeeds_after_connect_errors(self):
+        func = Mock(side_effect=[socket.error('Connection refused'), socket.error('Connection refused'), 'ok'])
+        assert self.policy().call(func) == 'ok'
+        assert func.call_count == 3
+
+    def test_connect_budget(self):
+        func = Mock(side_effect=socket.error('Connection refused'))
+        with self.assertRaises(socket.error):
+            self.policy(connect_retries=4).call(func)
+        assert func.call_count == 5
+
+    def test_server_error_budget_is_separate(self):
+        errors = [socket.error('Connection refused')] * 2 + [HTTPError(503)] * 2 + ['ok']
+        func = Mock(side_effect=errors)
+        assert self.policy(connect_retries=2, server_error_retries=2).call(func) == 'ok'
+
+        func = Mock(side_effect=HTTPError(503))
+        with self.assertRaises(HTTPError):
+            self.policy(connect_retries=10, server_error_retries=2).call(func)
+        assert func.call_count == 3
+
+    def test_fail_fast_on_auth_error(self):
+        func = Mock(side_effect=HTTPError(401))
+        with self.assertRaises(HTTPError):
+            self.policy().call(func)
+        assert func.call_count == 1
+
+    def test_fail_fast_on_rest_session_auth_error(self):
+        func = Mock(side_effect=F5ModuleError('HTTP Error 401: Unauthorized'))
+        with self.assertRaises(F5ModuleError):
+            self.policy().call(func)
+        assert func.call_count == 1
+
+    def test_fail_fast_on_dns_error(self):
+        func = Mock(side_effect=socket.gaierror(socket.EAI_NONAME, 'Name or service not known'))
+        with self.assertRaises(socket.gaierror):
+            self.policy().call(func)
+        assert func.call_count == 1
+
+    def test_deadline(self):
+        func = Mock(side_effect=socket.error('Connection timed out'))
+        with self.assertRaises(socket.error):
+            self.policy(connect_retries=1000, base_delay=4, max_delay=4, deadline=10).call(func)
+        assert self.clock.now <= 10
+
+    def test_full_jitter(self):
+        policy = self.policy(base_delay=1, max_delay=16)
+        for attempt in range(10):
+            delay = policy.delay(attempt)
+            assert 0 <= delay <= min(16, 2 ** attempt)
+
+    def test_client_reports_error(self):
+        client = F5BaseClient(
+            provider=dict(server='10.1.1.1', server_port=None, user='admin', password='secret'),
+            retry_policy=self.policy()
+        )
+        func = Mock(side_effect=HTTPError(401))
+        with self.assertRaises(F5ModuleError) as ex:
+            client.connect(func, client.merge_provider_params())
+        assert 'Unable to connect to 10.1.1.1 on port 443' in str(ex.exception)
+        assert self.clock.sleeps == []
+
+
+class TestWaiter(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def waiter(self, **kwargs):
+        return Waiter(sleep=self.clock.sleep, clock=self.clock.time, **kwargs)
+
+    def test_backs_off_while_unchanged(self):
+        poll = Mock(side_effect=['running'] * 5 + ['done'])
+        result = self.waiter(interval=1, max_interval=4, backoff=2).wait(poll, done=lambda x: x == 'done')
+        assert result == 'done'
+        assert self.clock.sleeps == [1, 2, 4, 4, 4]
+
+    def test_resets_interval_on_new_generation(self):
+        progress = []
+        states = [(1, 'a'), (1, 'b'), (1, 'c'), (2, 'd'), (2, 'e'), (3, 'f')]
+        poll = Mock(side_effect=states)
+        waiter = self.waiter(interval=1, max_interval=8, backoff=2, progress=lambda x, y: progress.append(x))
+        waiter.wait(poll, done=lambda x: x[0] == 3, generation=lambda x: x[0])
+        assert self.clock.sleeps == [1, 2, 4, 1, 2]
+        assert progress == [(1, 'a'), (2, 'd')]
+
+    def test_deadline(self):
+        poll = Mock(return_value=False)
+        with self.assertRaises(F5ModuleError) as ex:
+            self.waiter(interval=5, deadline=12, delay=1).wait(poll, message='Timed out')
+        assert str(ex.exception) == 'Timed out'
+        assert self.clock.sleeps == [1, 5, 5, 1]
+        assert self.clock.now == 12
+
+    def test_settle_and_ignore(self):
+        poll = Mock(side_effect=[True, socket.error('Connection refused'), True, True, True])
+        assert self.waiter(interval=1).wait(poll, settle=3, ignore=(socket.error,)) is True
+        assert poll.call_count == 5
+
+    def test_failure_is_raised(self):
+        def done(status):
+            if status == 'failed':
+                raise F5ModuleError(status)
+            return status == 'complete'
+
+        poll = Mock(side_effect=['installing', 'failed', 'complete'])
+        with self.assertRaises(F5ModuleError):
+            self.waiter().wait(poll, done=done)
+        assert poll.call_count == 2
+
+
+class TestMapConcurrently(unittest.TestCase):
+    def test_results_are_in_order(self):
+        running = dict(lock=threading.Lock(), now=0, most=0)
+
+        def func(x):
+            with running['lock']:
+                running['now'] += 1
+                running['most'] = max(running['most'], running['now'])
+            time.sleep(0.01)
+            with running['lock']:
+                running['now'] -= 1
+            return x * 2
+
+        assert map_concurrently(func, range(10), 3) == [x * 2 for x in range(10)]
+        assert 1 < running['most'] <= 3
+
+    def test_errors_go_to_on_error(self):
+        errors = dict()
+
+        def func(x):
+            if x == 'bad':
+                raise Exception('failed for bad')
+            return x
+
+        result = map_concurrently(func, ['a', 'bad', 'c'], 2, on_error=lambda x, ex: errors.update({x: str(ex)}))
+        assert result == ['a', None, 'c']
+        assert errors == dict(bad='failed for bad')
+
+        with self.assertRaises(Exception):
+            map_concurrently(func, ['a', 'bad'], 2)
+
+    def test_concurrency_must_be_positive(self):
+        with self.assertRaises(F5ModuleError):
+            map_concurrently(lambda x: x, ['a'], 0)
+        assert map_concurrently(lambda x: x, [], 1) == []
+
+
+class FakeCommands(object):
+    def __init__(self, outputs):
+        self.outputs = outputs
+        self.runs = []
+
+    def __call__(self, commands):
+        self.runs.append(list(commands))
+        result = []
+        for command in commands:
+            outputs = self.outputs[command]
+            result.append(outputs.pop(0) if len(outputs) > 1 else outputs[0])
+        return result
+
+
+class TestCommandRunner(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def runner(self, run, **kwargs):
+        return CommandRunner(run, sleep=self.clock.sleep, clock=self.clock.time, **kwargs)
+
+    def test_reruns_only_unsatisfied_commands(self):
+        run = FakeCommands(dict(
+            pager=[None],
+            version=['BIG-IP 13.1.0'],
+            failover=['standby', 'standby', 'standby', 'active'],
+            connections=['100 connections'],
+        ))
+        conditionals = [
+            Conditional('result[0] contains BIG-IP'),
+            Conditional('result[1] contains active'),
+        ]
+
+        runner = self.runner(run, retries=10, interval=1)
+        result = runner.wait(['pager', 'version', 'failover', 'connections'], conditionals)
+
+        assert result == ['BIG-IP 13.1.0', 'active', '100 connections']
+        assert run.runs == [['pager', 'version', 'failover', 'connections'], ['failover'], ['failover'], ['failover']]
+        assert self.clock.sleeps == [1, 2, 4]
+        assert runner.cache[1] == (0, 'BIG-IP 13.1.0')
+        assert runner.cache[2] == (7, 'active')
+
+    def test_interval_is_capped(self):
+        run = FakeCommands(dict(version=['none']))
+        runner = self.runner(run, retries=6, interval=5, max_interval=30)
+        with self.assertRaises(FailedConditionsError) as ex:
+            runner.wait(['version'], [Conditional('result[0] contains BIG-IP')])
+        assert ex.exception.failed_conditions == ['result[0] contains BIG-IP']
+        assert self.clock.sleeps == [5, 10, 20, 30, 30]
+        assert len(run.runs) == 6
+
+    def test_match_any(self):
+        run = FakeCommands(dict(version=['BIG-IP 13.1.0'], failover=['standby']))
+        conditionals = [
+            Conditional('result[0] contains BIG-IP'),
+            Conditional('result[1] contains active'),
+        ]
+        result = self.runner(run, match='any').wait(['version', 'failover'], conditionals)
+        assert result == ['BIG-IP 13.1.0', 'standby']
+        assert len(run.runs) == 1
+
+    def test_conditional_on_all_results_reruns_everything(self):
+        run = FakeCommands(dict(version=['BIG-IP 13.1.0'], failover=['standby', 'active']))
+        conditionals = [
+            Conditional('result[0] contains BIG-IP'),
+            Conditional('result contains active'),
+        ]
+        self.runner(run).wait(['version', 'failover'], conditionals)
+        assert run.runs == [['version', 'failover'], ['version', 'failover']]
+
+
+class TestCollectionCache(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.client = Mock()
+        self.client.merge_provider_params.return_value = dict(server='10.1.1.1', server_port=443, user='admin')
+        self.fetch = Mock(return_value=[
+            dict(name='foo', partition='Common', fullPath='/Common/foo'),
+            dict(name='bar', partition='Common', fullPath='/Common/bar'),
+        ])
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def cache(self, **kwargs):
+        kwargs.setdefault('ttl', 60)
+        return CollectionCache(self.client, 'ltm/pool', self.fetch, path=self.path, **kwargs)
+
+    def test_lookup(self):
+        cache = self.cache()
+        assert cache.lookup('foo') == (True, self.fetch.return_value[0])
+        assert cache.lookup('/Common/bar') == (True, self.fetch.return_value[1])
+        assert cache.lookup('baz') == (True, None)
+        assert self.fetch.call_count == 1
+
+    def test_shared_between_instances(self):
+        self.cache().lookup('foo')
+        self.cache().lookup('bar')
+        assert self.fetch.call_count == 1
+
+    def test_expires(self):
+        cache = self.cache(ttl=1)
+        cache.lookup('foo')
+        with patch('time.time', return_value=time.time() + 2):
+            cache.lookup('foo')
+        assert self.fetch.call_count == 2
+
+    def test_discard(self):
+        cache = self.cache()
+        cache.lookup('foo')
+        cache.discard('foo')
+        assert self.cache().lookup('foo') == (False, None)
+        assert self.cache().lookup('bar')[0] is True
+        assert self.fetch.call_count == 1
+
+    def test_disabled_by_default(self):
+        with patch.dict(os.environ, {'F5_COLLECTION_CACHE_TTL': '0'}):
+            cache = CollectionCache(self.client, 'ltm/pool', self.fetch)
+        assert cache.lookup('foo') == (False, None)
+        assert self.fetch.called is False
+
+
+class TestTransactionBatch(unittest.TestCase):
+    def setUp(self):
+        self.context = MagicMock()
+        self.context.return_value.__exit__.return_value = False
+        self.patcher = patch('library.module_utils.network.f5.bigip.TransactionContextManager', self.context)
+        self.patcher.start()
+
+    def tearDown(self):
+        self.patcher.stop()
+
+    def test_commit(self):
+        batch = TransactionBatch(Mock())
+        funcs = [Mock(), Mock()]
+        batch.add('/Common/foo', funcs[0], name='foo')
+        batch.add('/Common/bar', funcs[1], name='bar')
+
+        assert batch.commit() == {}
+        funcs[0].assert_called_once_with(name='foo')
+        funcs[1].assert_called_once_with(name='bar')
+        assert self.context.call_count == 1
+
+    def test_nothing_to_commit(self):
+        batch = TransactionBatch(Mock())
+        assert batch.commit() == {}
+        assert self.context.called is False
+
+    def test_queue_error_aborts(self):
+        batch = TransactionBatch(Mock())
+        batch.add('/Common/foo', Mock(side_effect=Exception('400 Bad Request: invalid address')))
+        batch.add('/Common/bar', Mock())
+
+        errors = batch.commit()
+        assert errors['/Common/foo'] == '400 Bad Request: invalid address'
+        assert errors['/Common/bar'].startswith('Not committed')
+        # The context saw the abort, so it does not commit the transaction
+        assert self.context.return_value.__exit__.call_args[0][0] is not None
+
+    def test_commit_error_is_attributed(self):
+        self.context.return_value.__exit__.side_effect = Exception(
+            '01020066:3: The requested Node (/Common/bar) already exists'
+        )
+        batch = TransactionBatch(Mock())
+        batch.add('/Common/foo', Mock())
+        batch.add('/Common/bar', Mock())
+
+        errors = batch.commit()
+        assert 'already exists' in errors['/Common/bar']
+        assert errors['/Common/foo'].startswith('Not committed')
+
+    def test_commit_error_matches_whole_names(self):
+        self.context.return_value.__exit__.side_effect = Exception(
+            '01070734:3: Configuration error: Node /Common/web10 is referenced by a pool.'
+        )
+        batch = TransactionBatch(Mock())
+        batch.add('/Common/web1', Mock())
+        batch.add('/Common/web10', Mock())
+
+        errors = batch.commit()
+        assert 'referenced' in errors['/Common/web10']
+        assert errors['/Common/web1'].startswith('Not committed')
+
+    def test_queued_items(self):
+        batch = TransactionBatch(Mock())
+        batch.add('/Common/foo', Mock(), name='foo')
+
+        assert '/Common/foo' in batch
+        assert '/Common/bar' not in batch
+
+
+class TestUploadFileobj(unittest.TestCase):
+    def test_upload_in_chunks(self):
+        uploads = Mock()
+        uploads._meta_data = dict(
+            uri='https://localhost/mgmt/shared/file-transfer/uploads/',
+            icr_session=Mock()
+        )
+        fileobj = BytesIO(b'0123456789' * 5)
+
+        upload_fileobj(uploads, fileobj, 'foo.txt', chunk_size=20)
+
+        calls = uploads._meta_data['icr_session'].post.call_args_list
+        assert len(calls) == 3
+        assert calls[0][0][0] == 'https://localhost/mgmt/shared/file-transfer/uploads/foo.txt'
+        assert [x[1]['headers']['Content-Range'] for x in calls] == ['0-19/50', '20-39/50', '40-49/50']
+        assert b''.join(x[1]['data'] for x in calls) == b'0123456789' * 5
+
+
+class TestFileUpload(unittest.TestCase):
+    def setUp(self):
+        self.content = os.urandom(1024 * 1024 + 1000)
+        self.fileobj = BytesIO(self.content)
+        self.retry = RetryPolicy(base_delay=0, max_delay=0)
+
+    def uploads(self, server):
+        uploads = Mock()
+        uploads._meta_data = dict(
+            uri='https://127.0.0.1:{0}/mgmt/shared/file-transfer/uploads/'.format(server.server_address[1]),
+            icr_session=iControlRESTSession('admin', 'admin')
+        )
+        return uploads
+
+    def test_upload_with_failures(self):
+        progress = []
+        with StandInServer(handler=UploadHandler) as server:
+            server.failures = {
+                64 * 1024 * 3: ['503', '503'],
+                64 * 1024 * 7: ['drop'],
+            }
+            upload = FileUpload(
+                self.uploads(server), self.fileobj, 'foo.iso', chunk_size=64 * 1024,
+                max_workers=4, retry=self.retry, progress=lambda sent, size: progress.append(sent)
+            )
+            upload.upload()
+
+        assert bytes(server.data) == self.content
+        assert server.chunks[0] == 0
+        assert len(server.chunks) == 17
+        assert server.requests == 20
+        assert 1 < server.most_running <= 4
+        assert upload.offset == len(self.content)
+        assert upload.checksum == hashlib.sha256(self.content).hexdigest()
+        assert upload.bytes_sent == len(self.content)
+        assert upload.throughput > 0
+        assert progress[-1] == len(self.content)
+
+    def test_upload_in_order_by_default(self):
+        with StandInServer(handler=UploadHandler) as server:
+            upload = FileUpload(self.uploads(server), self.fileobj, 'foo.iso', chunk_size=64 * 1024)
+            upload.upload()
+
+        assert bytes(server.data) == self.content
+        assert server.chunks == sorted(server.chunks)
+        assert server.most_running == 1
+
+    def test_upload_summary(self):
+        uploads = [Mock(bytes_sent=3000, elapsed=1.5), Mock(bytes_sent=1000, elapsed=0.5)]
+        assert upload_summary(uploads) == dict(bytes=4000, seconds=2.0, throughput=2000)
+        assert upload_summary([Mock(bytes_sent=0, elapsed=0)])['throughput'] == 0
+
+    def test_resume_after_failure(self):
+        with StandInServer(handler=UploadHandler) as server:
+            server.failures = {
+                64 * 1024 * 5: ['503'] * 4,
+            }
+            upload = FileUpload(
+                self.uploads(server), self.fileobj, 'foo.iso', chunk_size=64 * 1024,
+                max_workers=1, retry=self.retry
+            )
+            with self.assertRaises(F5ModuleError) as ex:
+                upload.upload()
+            assert 'the first 327680 of 1049576 bytes were acknowledged' in str(ex.exception)
+            assert upload.offset == 64 * 1024 * 5
+            assert upload.checksum is None
+
+            server.chunks = []
+            upload.upload()
+
+        assert bytes(server.data) == self.content
+        assert server.chunks[0] == 64 * 1024 * 5
+        assert len(server.chunks) == 12
+        assert upload.checksum == hashlib.sha256(self.content).hexdigest()
+
+    def test_verify_checksum(self):
+        upload = FileUpload(Mock(_meta_data=dict(uri='', icr_session=Mock())), self.fileobj, 'foo.iso')
+        upload.upload()
+        checksum = hashlib.sha256(self.content).hexdigest()
+        client = Mock()
+        client.api.tm.util.bash.exec_cmd.return_value = Mock(
+            commandResult='{0}  /shared/images/foo.iso\n'.format(checksum)
+        )
+
+        upload.verify(client, '/shared/images/foo.iso')
+
+        upload.verify(client, '/shared/images/foo bar.iso')
+        assert client.api.tm.util.bash.exec_cmd.call_args[1]['utilCmdArgs'] == '-c "sha256sum \'/shared/images/foo bar.iso\'"'
+
+        client.api.tm.util.bash.exec_cmd.return_value = Mock(
+            commandResult='{0}  /shared/images/foo.iso\n'.format('0' * 64)
+        )
+        with self.assertRaises(F5ModuleError):
+            upload.verify(client, '/shared/images/foo.iso')